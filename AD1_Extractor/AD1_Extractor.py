@@ -32,6 +32,7 @@
 # 
 # Comments 
 #   Version 1.0 - Initial version - June 2020
+#   Version 1.1 - Ask for the local .ad1 files in the data source instead of every file
 # 
 
 import jarray
@@ -72,6 +73,9 @@ from org.sleuthkit.autopsy.casemodule import AddLocalFilesTask
 from org.sleuthkit.autopsy.casemodule.services.FileManager import FileAddProgressUpdater
 from org.sleuthkit.autopsy.ingest import ModuleContentEvent;
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+
 class ProgressUpdater(FileAddProgressUpdater):
 
     def __init__(self):
@@ -158,8 +162,19 @@ class AD1ExtractorIngestModule(DataSourceIngestModule):
 
         # get the current case
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "%", "/")
+        # Only the local files added to the data source have a path to hand to the program, ask
+        # for those instead of going through every file in the data source
+        files = skCase.findAllFilesWhere("data_source_obj_id = " + str(dataSource.getId()) + \
+                                         " and type = " + str(TskData.TSK_DB_FILES_TYPE_ENUM.LOCAL.getFileType()) + \
+                                         " and lower(name) like '%.ad1'")
         numFiles = len(files)
         self.log(Level.INFO, "Number of files to process ==> " + str(numFiles))
         for file in files:
@@ -174,12 +189,7 @@ class AD1ExtractorIngestModule(DataSourceIngestModule):
                     pipe = Popen([self.path_to_exe, imageFile, modDir, os.path.join(modDir, filename + ".db3")], stdout=PIPE, stderr=PIPE) 
                     outText = pipe.communicate()[0]
 
-                    try:
-                        self.log(Level.INFO, "Begin Create New Artifacts")
-                        artIdAD1 = skCase.addArtifactType( "AD1_EXTRACTOR", "AD1 Extraction")
-                    except:		
-                        self.log(Level.INFO, "Artifacts Creation Error, Artifact AD1_EXTRACTOR may exist. ==> ")
-                        artIdAD1 = skCase.getArtifactTypeID("AD1_EXTRACTOR")
+                    artIdAD1 = registry.getOrAddArtifactType( "AD1_EXTRACTOR", "AD1 Extraction").getTypeID()
 
                     try: 
                         Class.forName("org.sqlite.JDBC").newInstance()
@@ -199,7 +209,6 @@ class AD1ExtractorIngestModule(DataSourceIngestModule):
                     # Cycle through each row and get the installed programs and install time
                     while resultSet.next():
                         try: 
-                            artAD1 = file.newArtifact(artIdAD1)
                             attributes = ArrayList()
                             attributes.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_NAME, moduleName, resultSet.getString("file_name")))
                             attributes.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_TEMP_DIR, moduleName, resultSet.getString("ad1_path_name")))
@@ -209,13 +218,7 @@ class AD1ExtractorIngestModule(DataSourceIngestModule):
                             attributes.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_HASH_MD5, moduleName, resultSet.getString("md5_hash")))
                             attributes.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_HASH_SHA1, moduleName, resultSet.getString("sha1_hash")))
                
-                            artAD1.addAttributes(attributes)
-
-                            # index the artifact for keyword search
-                            try:
-                                blackboard.postArtifact(artAD1)
-                            except:
-                                pass
+                            poster.newArtifact(file, artIdAD1, attributes)
                         except SQLException as e:
                             self.log(Level.INFO, "Error getting values from AD1tables (" + e.getMessage() + ")")
 
@@ -226,6 +229,8 @@ class AD1ExtractorIngestModule(DataSourceIngestModule):
                 except:
                     pass                    
                    
+        poster.flush()
+
         dir_list = []
         dir_list.append(modDir)
     
@@ -66,6 +66,11 @@ from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 from org.sleuthkit.datamodel import TskCoreException
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -111,6 +116,8 @@ class Alexa_DB_ParseIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(Alexa_DB_ParseIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(Alexa_DB_ParseIngestModuleFactory.moduleName, Alexa_DB_ParseIngestModuleFactory().getModuleVersionNumber())
 
         # Get path to EXE based on where this script is run from.
         # Assumes EXE is in same folder as script
@@ -139,6 +146,12 @@ class Alexa_DB_ParseIngestModule(DataSourceIngestModule):
 
         skCase = Case.getCurrentCase().getSleuthkitCase();
 
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(Alexa_DB_ParseIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(Alexa_DB_ParseIngestModuleFactory.moduleName)
+
         head, tail = os.path.split(os.path.abspath(__file__)) 
         settings_db = os.path.join(head, "Alexa_DB.db3")
 
@@ -164,7 +177,7 @@ class Alexa_DB_ParseIngestModule(DataSourceIngestModule):
         # Process all the artifacts based on version of the OS   
         while resultSet.next():
             fileManager = Case.getCurrentCase().getServices().getFileManager()
-            files = fileManager.findFiles(dataSource, resultSet.getString("file_name"))
+            files = self.ledger.unprocessed(fileManager.findFiles(dataSource, resultSet.getString("file_name")))
             numFiles = len(files)
             self.log(Level.INFO, "found " + str(numFiles) + " files for file_name ==> " + resultSet.getString("file_name"))
             progressBar.switchToDeterminate(numFiles)
@@ -174,7 +187,7 @@ class Alexa_DB_ParseIngestModule(DataSourceIngestModule):
                # Open the DB using JDBC
                #lclDbPath = os.path.join(Case.getCurrentCase().getTempDirectory(), SQLite_DB)
                lclDbPath = os.path.join(Case.getCurrentCase().getTempDirectory(), file.getName() + "-" + str(file.getId()))
-               ContentUtils.writeToFile(file, File(lclDbPath))
+               self.extractionCache.copyTo(file, lclDbPath)
 
                #self.log(Level.INFO, "Path the prefetch database file created ==> " + lclDbPath)
                try: 
@@ -209,14 +222,7 @@ class Alexa_DB_ParseIngestModule(DataSourceIngestModule):
                        continue
 #                      return IngestModule.ProcessResult.OK
 
-                    try:
-                        #self.log(Level.INFO, "Begin Create New Artifacts")
-                        artID_sql = skCase.addArtifactType(resultSet_sql.getString("artifact_name"), resultSet_sql.getString("artifact_description"))
-                    except:		
-                        self.log(Level.INFO, "Artifacts Creation Error, for artifact. ==> " + resultSet_sql.getString("artifact_name"))
-
-                    artID_hst = skCase.getArtifactTypeID(resultSet_sql.getString("artifact_name"))
-                    artID_hst_evt = skCase.getArtifactType(resultSet_sql.getString("artifact_name"))
+                    artID_hst = registry.getOrAddArtifactType(resultSet_sql.getString("artifact_name"), resultSet_sql.getString("artifact_description")).getTypeID()
 
                     meta = resultSet_3.getMetaData()
                     columncount = meta.getColumnCount()
@@ -224,10 +230,7 @@ class Alexa_DB_ParseIngestModule(DataSourceIngestModule):
                     self.log(Level.INFO, "Number of Columns in the table ==> " + str(columncount))
                     for x in range (1, columncount + 1):
                         self.log(Level.INFO, "Column Name ==> " + meta.getColumnLabel(x))
-                        try:
-                            attID_ex1 = skCase.addArtifactAttributeType("TSK_ALEXA_" + meta.getColumnLabel(x).upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, meta.getColumnLabel(x))
-                        except:		
-                            self.log(Level.INFO, "Attributes Creation Error, " + "TSK_ALEXA_" + meta.getColumnLabel(x) + " ==> ")
+                        attID_ex1 = registry.getOrAddAttributeType("TSK_ALEXA_" + meta.getColumnLabel(x).upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, meta.getColumnLabel(x))
                         column_names.append(meta.getColumnLabel(x))
                     
                     self.log(Level.INFO, "All Columns ==> " + str(column_names))
@@ -237,48 +240,48 @@ class Alexa_DB_ParseIngestModule(DataSourceIngestModule):
                            #self.log(Level.INFO, SQL_String_1)
                            self.log(Level.INFO, "Artifact Is ==> " + str(artID_hst))
                            
-                           art = file.newArtifact(artID_hst)
+                           attributes = []
                            self.log(Level.INFO, "Inserting attribute URL")
                            for col_name in column_names:
-                               attID_ex1 = skCase.getAttributeType("TSK_ALEXA_" + col_name.upper())
+                               attID_ex1 = registry.getAttributeType("TSK_ALEXA_" + col_name.upper())
                                self.log(Level.INFO, "Inserting attribute ==> " + str(attID_ex1))
                                self.log(Level.INFO, "Attribute Type ==> " + str(attID_ex1.getValueType()))
                                if attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, Alexa_DB_ParseIngestModuleFactory.moduleName, resultSet_3.getString(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, Alexa_DB_ParseIngestModuleFactory.moduleName, resultSet_3.getString(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes String Creation Error, " + col_name + " ==> ")
                                elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.INTEGER:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, Alexa_DB_ParseIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, Alexa_DB_ParseIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes Integer Creation Error, " + col_name + " ==> ")
                                elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, Alexa_DB_ParseIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, Alexa_DB_ParseIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes Long Creation Error, " + col_name + " ==> ")
                                elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DOUBLE:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, Alexa_DB_ParseIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, Alexa_DB_ParseIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes Double Creation Error, " + col_name + " ==> ")
                                elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.BYTE:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, Alexa_DB_ParseIngestModuleFactory.moduleName, resultSet_3.getString(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, Alexa_DB_ParseIngestModuleFactory.moduleName, resultSet_3.getString(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes Byte Creation Error, " + col_name + " ==> ")
                                else:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, Alexa_DB_ParseIngestModuleFactory.moduleName, resultSet_3.getReal(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, Alexa_DB_ParseIngestModuleFactory.moduleName, resultSet_3.getReal(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes Datatime Creation Error, " + col_name + " ==> ")
+                           poster.newArtifact(file, artID_hst, attributes)
 
                        except SQLException as e:
                            self.log(Level.INFO, "Error getting values from sql statement ==> " + resultSet_sql.getString("artifact_name"))
 
-                    IngestServices.getInstance().fireModuleDataEvent(
-                           ModuleDataEvent(Alexa_DB_ParseIngestModuleFactory.moduleName, artID_hst_evt, None))
+                    poster.flush()
 
 
                     stmt_1.close()
@@ -291,6 +294,9 @@ class Alexa_DB_ParseIngestModule(DataSourceIngestModule):
             "Mac OS Recent Artifacts", " Mac OS Recents Artifacts Have Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
 
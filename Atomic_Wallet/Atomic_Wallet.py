@@ -70,6 +70,11 @@ from org.sleuthkit.datamodel import CommunicationsManager
 from org.sleuthkit.datamodel import Relationship
 from org.sleuthkit.datamodel import Account
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 
 # Factory that defines the name and details of the module and allows Autopsy
@@ -116,6 +121,8 @@ class AttomicWalletIngestModule(DataSourceIngestModule):
 
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(AttomicWalletIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(AttomicWalletIngestModuleFactory.moduleName, AttomicWalletIngestModuleFactory().getModuleVersionNumber())
         pass
         
     # Where the analysis is done.
@@ -127,7 +134,10 @@ class AttomicWalletIngestModule(DataSourceIngestModule):
         # get current case and the store.vol abstract file information
         skCase = Case.getCurrentCase().getSleuthkitCase();
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        connectionFiles = fileManager.findFiles(dataSource, "Connection.log%", ".atomic")
+        connectionFiles = self.ledger.unprocessed(fileManager.findFiles(dataSource, "Connection.log%", ".atomic"))
+        # Look up the artifact and attribute types once for the whole job
+        self.registry = TypeRegistry(AttomicWalletIngestModuleFactory.moduleName)
+        self.poster = BlackboardPoster(AttomicWalletIngestModuleFactory.moduleName)
         numFiles = len(connectionFiles)
         progressBar.switchToDeterminate(numFiles)
         fileCount = 0;
@@ -148,14 +158,9 @@ class AttomicWalletIngestModule(DataSourceIngestModule):
 
                 fileCount += 1
 
-                # Save the file locally. Use file id as name to reduce collisions
-                extractedFile = os.path.join(temporaryDirectory, str(file.getId()) + "-" + file.getName())
-                ContentUtils.writeToFile(file, File(extractedFile))
+                # The log is only read, so read the extraction cache copy
+                extractedFile = self.extractionCache.getLocalPath(file)
                 self.processConnectionLogs(extractedFile, file)
-                try:
-                    os.remove(extractedFile)
-                except:
-                    self.log(Level.INFO, "Failed to remove file " + extractedFile)
 
             else:
                 extractedFile = os.path.join(temporaryDirectory, str(file.getId()) + "-" + file.getName())
@@ -166,7 +171,7 @@ class AttomicWalletIngestModule(DataSourceIngestModule):
 
 
         # Get and process history file            
-        historyFiles = fileManager.findFiles(dataSource, "history.json", ".atomic")
+        historyFiles = self.ledger.unprocessed(fileManager.findFiles(dataSource, "history.json", ".atomic"))
         numFiles = len(historyFiles)
 
         for file in historyFiles:	
@@ -177,14 +182,9 @@ class AttomicWalletIngestModule(DataSourceIngestModule):
                 #self.log(Level.INFO, "Processing file: " + file.getName())
                 fileCount += 1
 
-                # Save the file locally. Use file id as name to reduce collisions
-                extractedFile = os.path.join(temporaryDirectory, str(file.getId()) + "-" + file.getName())
-                ContentUtils.writeToFile(file, File(extractedFile))
+                # The history is only read, so read the extraction cache copy
+                extractedFile = self.extractionCache.getLocalPath(file)
                 self.processHistory(extractedFile, file)
-                try:
-                    os.remove(extractedFile)
-                except:
-                    self.log(Level.INFO, "Failed to remove file " + extractedFile)
             else:
                 extractedFile = os.path.join(temporaryDirectory, str(file.getId()) + "-" + file.getName())
                 try:
@@ -192,6 +192,8 @@ class AttomicWalletIngestModule(DataSourceIngestModule):
                 except:
                     self.log(Level.INFO, "Failed to remove file " + extractedFile)
 
+        self.poster.flush()
+
         try:
            shutil.rmtree(temporaryDirectory)		
         except:
@@ -202,6 +204,9 @@ class AttomicWalletIngestModule(DataSourceIngestModule):
             "Atomic Wallet", " Atomic Wallet Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
     def processConnectionLogs(self, logFile, abstractFile):
@@ -233,10 +238,7 @@ class AttomicWalletIngestModule(DataSourceIngestModule):
                    artifact.addAttributes(attributes)
                except:
                    self.log(Level.INFO, "Error adding attribute to artifact")
-               try:
-                   self.indexArtifact(artifact)
-               except:
-                   self.log(Level.INFO, "Error indexing artifact")
+               self.poster.postArtifact(artifact)
            for disTime in disconnectTimes:
                artifact = abstractFile.newArtifact(artId)
                attributes = ArrayList()
@@ -248,10 +250,7 @@ class AttomicWalletIngestModule(DataSourceIngestModule):
                    artifact.addAttributes(attributes)
                except:
                    self.log(Level.INFO, "Error adding attribute to artifact")
-               try:
-                   self.indexArtifact(artifact)
-               except:
-                   self.log(Level.INFO, "Error indexing artifact")
+               self.poster.postArtifact(artifact)
        except:
            self.log(Level.INFO, "Error adding attribute")
 
@@ -305,10 +304,7 @@ class AttomicWalletIngestModule(DataSourceIngestModule):
                    artifact.addAttributes(attributes)
                except:
                    self.log(Level.INFO, "Error adding attribute to artifact")
-               try:
-                   self.indexArtifact(artifact)
-               except:
-                   self.log(Level.INFO, "Error indexing artifact")
+               self.poster.postArtifact(artifact)
        except:
            self.log(Level.INFO, "Error adding attribute")
                
@@ -320,50 +316,16 @@ class AttomicWalletIngestModule(DataSourceIngestModule):
     
     def createAttribute(self, attributeName, attributeType, attributeDescription):
         
-        skCase = Case.getCurrentCase().getSleuthkitCase()
-        
-        try:
-            if "string" == attributeType:
-                attributeId = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, attributeDescription)
-                return skCase.getAttributeType(attributeName)
-            elif "datetime" == attributeType:
-                attributeId = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, attributeDescription)
-                return skCase.getAttributeType(attributeName)
-            elif "integer" == attributeType:
-                attributeId = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.INTEGER, attributeDescription)
-                return skCase.getAttributeType(attributeName)
-            elif "long" == attributeType:
-                attributeId = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, attributeDescription)
-                return skCase.getAttributeType(attributeName)
-            elif "double" == attributeType:
-                attributeId = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DOUBLE, attributeDescription)
-                return skCase.getAttributeType(attributeName)
-            elif "byte" == attributeType:
-                attributeId = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.BYTE, attributeDescription)
-                return skCase.getAttributeType(attributeName)
-            else:
-                attributeId = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, attributeDescription)
-                return skCase.getAttributeType(attributeName)
-        except:		
-            self.log(Level.INFO, "Attributes Creation Error  ==> " + str(attributeName) + " <<>> " + str(attributeType) + " <<>> " + str(attributeDescription))
-            return skCase.getAttributeType(attributeName)
+        valueTypes = {"string": BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING,
+                      "datetime": BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME,
+                      "integer": BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.INTEGER,
+                      "long": BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG,
+                      "double": BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DOUBLE,
+                      "byte": BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.BYTE}
+        valueType = valueTypes.get(attributeType, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING)
+        return self.registry.getOrAddAttributeType(attributeName, valueType, attributeDescription)
 
     def createArtifact(self, artifactName, artifactDescription):
     
-        skCase = Case.getCurrentCase().getSleuthkitCase();
-                
-        try:
-             artId = skCase.addArtifactType(artifactName, artifactDescription)
-             return skCase.getArtifactTypeID(artifactName)
-        except:		
-             #self.log(Level.INFO, "Artifacts Creation Error for artifact ==> " + str(artifactName) + " <<>> " + artifactDescription)
-             return skCase.getArtifactTypeID(artifactName)
-
-    def indexArtifact(self, artifact):
-        blackboard = Case.getCurrentCase().getServices().getBlackboard()
-
-        try:
-            blackboard.indexArtifact(artChat)
-        except:
-            pass
+        return self.registry.getOrAddArtifactType(artifactName, artifactDescription).getTypeID()
     
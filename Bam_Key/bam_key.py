@@ -75,6 +75,11 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -117,6 +122,8 @@ class BamKeyIngestModule(DataSourceIngestModule):
     # Where any setup and configuration is done
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(BamKeyIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(BamKeyIngestModuleFactory.moduleName, BamKeyIngestModuleFactory().getModuleVersionNumber())
         # Hive Keys to parse, use / as it is easier to parse out then \\
         self.registrySAMKey = 'SAM/Domains/Account/Users'
         self.registryBamKey = 'controlset001/services/bam/UserSettings'
@@ -133,6 +140,10 @@ class BamKeyIngestModule(DataSourceIngestModule):
         
         # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(BamKeyIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
 
         # Create BAM directory in temp directory, if it exists then continue on processing		
@@ -148,6 +159,13 @@ class BamKeyIngestModule(DataSourceIngestModule):
         systemHiveFile = []
         userRids = {}
         bamRecord = []
+
+        # The SYSTEM and SAM hives are read together, only go on if one of them changed
+        hiveFiles = []
+        for fileName in filesToExtract:
+            hiveFiles.extend(fileManager.findFiles(dataSource, fileName, "Windows/System32/Config"))
+        if len(self.ledger.unprocessed(hiveFiles, together=True)) == 0:
+            return IngestModule.ProcessResult.OK
         
         for fileName in filesToExtract:
             files = fileManager.findFiles(dataSource, fileName, "Windows/System32/Config")
@@ -161,9 +179,8 @@ class BamKeyIngestModule(DataSourceIngestModule):
 
                 # Check path to only get the hive files in the config directory and no others
                 if file.getParentPath().upper() == '/WINDOWS/SYSTEM32/CONFIG/':    
-                    # Save the DB locally in the temp folder. use file id as name to reduce collisions
-                    filePath = os.path.join(temp_dir, file.getName())
-                    ContentUtils.writeToFile(file, File(filePath))
+                    # The hive is only read, so read the extraction cache copy
+                    filePath = self.extractionCache.getLocalPath(file)
                     # Save SYSTEM Hive abstract file information to use later
                     if file.getName() == 'SYSTEM':
                        systemHiveFile = file
@@ -173,21 +190,17 @@ class BamKeyIngestModule(DataSourceIngestModule):
                         userRids = self.processSAMHive(filePath)
         
         # Setup Artifact
-        try:
-            self.log(Level.INFO, "Begin Create New Artifacts")
-            artID_ls = skCase.addArtifactType( "TSK_BAM_KEY", "BAM Registry Key")
-        except:		
-            self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
+        artID_ls = registry.getOrAddArtifactType( "TSK_BAM_KEY", "BAM Registry Key").getTypeID()
             
         artifactName = "TSK_BAM_KEY"
-        artId = skCase.getArtifactTypeID(artifactName)
+        artId = registry.getArtifactTypeID(artifactName)
 
         moduleName = BamKeyIngestModuleFactory.moduleName
+        poster = BlackboardPoster(moduleName)
         
         # Attributes to use TSK_USER_NAME, TSK_PROG_NAME, TSK_DATETIME
         for bamRec in bamRecord:
             attributes = ArrayList()
-            art = systemHiveFile.newArtifact(artId)
             
             self.log(Level.INFO, "BamRec ==> " + str(bamRec))
             
@@ -197,13 +210,9 @@ class BamKeyIngestModule(DataSourceIngestModule):
                 attributes.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), moduleName, bamRec[0]))
             attributes.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PROG_NAME.getTypeID(), moduleName, bamRec[1]))
             attributes.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME.getTypeID(), moduleName, int(bamRec[2])))
-            art.addAttributes(attributes)
+            poster.newArtifact(systemHiveFile, artId, attributes)
 
-            # index the artifact for keyword search
-            try:
-                blackboard.indexArtifact(artChat)
-            except:
-                self._logger.log(Level.WARNING, "Error indexing artifact " + art.getDisplayName())
+        poster.flush()
         
 		#Clean up prefetch directory and files
         try:
@@ -216,6 +225,9 @@ class BamKeyIngestModule(DataSourceIngestModule):
             "BamKey", " BamKey Files Have Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 
     def processSYSTEMHive(self, systemHive):
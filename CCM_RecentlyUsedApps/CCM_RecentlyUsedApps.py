@@ -66,6 +66,11 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -108,6 +113,8 @@ class ParseRecentlyUsedAppsIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ParseRecentlyUsedAppsIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ParseRecentlyUsedAppsIngestModuleFactory.moduleName, ParseRecentlyUsedAppsIngestModuleFactory().getModuleVersionNumber())
 
         # Get path to EXE based on where this script is run from.
         # Assumes EXE is in same folder as script
@@ -146,6 +153,9 @@ class ParseRecentlyUsedAppsIngestModule(DataSourceIngestModule):
             "CCM Recently Used Apps", " CCM Recently Used Apps Have Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
     def parse_recentApps(self, dataSource, progressBar):
@@ -155,8 +165,15 @@ class ParseRecentlyUsedAppsIngestModule(DataSourceIngestModule):
         
        # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(ParseRecentlyUsedAppsIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ParseRecentlyUsedAppsIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "%", "/Windows/System32/wbem/Repository/")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "%", "/Windows/System32/wbem/Repository/"), together=True)
         numFiles = len(files)
         progressBar.switchToDeterminate(numFiles)
         fileCount = 0;
@@ -185,7 +202,7 @@ class ParseRecentlyUsedAppsIngestModule(DataSourceIngestModule):
             else:
                 # Save the DB locally in the temp folder. use file id as name to reduce collisions
                 lclDbPath = os.path.join(temp_dir, file.getName())
-                ContentUtils.writeToFile(file, File(lclDbPath))
+                self.extractionCache.linkTo(file, lclDbPath)
 
         self.log(Level.INFO, "Running prog ==> " + self.path_to_recentApps_exe + " win7 " + temp_dir + " " + \
                                      temp_dir + "\recentlyUsedApps.db3")
@@ -201,85 +218,25 @@ class ParseRecentlyUsedAppsIngestModule(DataSourceIngestModule):
             IngestServices.getInstance().postMessage(message)
         else:
             # Add custom Artifact to blackboard
-            try:
-               self.log(Level.INFO, "Begin Create New Artifacts ==> TSK_CCM_RECENTLY_USED_APPS")
-               artID_art = skCase.addArtifactType("TSK_CCM_RECENTLY_USED_APPS", "WMI Recently Used Apps")
-            except:		
-               self.log(Level.INFO, "Artifacts Creation Error, artifact TSK_CCM_RECENTLY_USED_APPS exists. ==> ")
-
-            # Add Custom attributes to blackboard
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_EXPLORER_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Explorer File Name")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Explorer File Name ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_FILE_SIZE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Size")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, File Size ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_LAST_USED_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Last Used Time")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Last Used Time ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_TIME_ZONE_OFFSET", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Time Zone Offset")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Time Zone Offset ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_LAUNCH_COUNT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Launch Count")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Launch Count ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_ORIG_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Original File Name")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Original File Name ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_FILE_DESC", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Description")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, File Description ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_PROD_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Name")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Product Name ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_PROD_VERSION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Version")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Product Version ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_FILE_VERSION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Version")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, File Version ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_ADDITIONAL_PROD_CODES", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Additional Product Codes")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Additional Product Codes ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_MSI_VERSION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "MSI Version")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, MSI Version ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_MSI_DISPLAY_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "MSI Display Name")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, MSI Display Name ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_PRODUCT_CODE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Code")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Product Code ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_SOFTWARE_PROP_HASH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Software Property Hash")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Software Property Hash ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_PROD_LANG", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Language")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Product Language ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_FILE_PROP_HASH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Property Hash")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, File Property Hash ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_MSI_PUBLISHER", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "MSI Publisher")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, MSI Publisher ==> ")
+            artID_art = registry.getOrAddArtifactType("TSK_CCM_RECENTLY_USED_APPS", "WMI Recently Used Apps").getTypeID()
+            attID_efn = registry.getOrAddAttributeType("TSK_EXPLORER_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Explorer File Name")
+            attID_efn = registry.getOrAddAttributeType("TSK_FILE_SIZE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Size")
+            attID_efn = registry.getOrAddAttributeType("TSK_LAST_USED_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Last Used Time")
+            attID_efn = registry.getOrAddAttributeType("TSK_TIME_ZONE_OFFSET", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Time Zone Offset")
+            attID_efn = registry.getOrAddAttributeType("TSK_LAUNCH_COUNT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Launch Count")
+            attID_efn = registry.getOrAddAttributeType("TSK_ORIG_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Original File Name")
+            attID_efn = registry.getOrAddAttributeType("TSK_FILE_DESC", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Description")
+            attID_efn = registry.getOrAddAttributeType("TSK_PROD_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Name")
+            attID_efn = registry.getOrAddAttributeType("TSK_PROD_VERSION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Version")
+            attID_efn = registry.getOrAddAttributeType("TSK_FILE_VERSION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Version")
+            attID_efn = registry.getOrAddAttributeType("TSK_ADDITIONAL_PROD_CODES", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Additional Product Codes")
+            attID_efn = registry.getOrAddAttributeType("TSK_MSI_VERSION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "MSI Version")
+            attID_efn = registry.getOrAddAttributeType("TSK_MSI_DISPLAY_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "MSI Display Name")
+            attID_efn = registry.getOrAddAttributeType("TSK_PRODUCT_CODE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Code")
+            attID_efn = registry.getOrAddAttributeType("TSK_SOFTWARE_PROP_HASH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Software Property Hash")
+            attID_efn = registry.getOrAddAttributeType("TSK_PROD_LANG", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Language")
+            attID_efn = registry.getOrAddAttributeType("TSK_FILE_PROP_HASH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Property Hash")
+            attID_efn = registry.getOrAddAttributeType("TSK_MSI_PUBLISHER", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "MSI Publisher")
 
             for file in files:
                if (file.getName() == "OBJECTS.DATA"):
@@ -316,8 +273,7 @@ class ParseRecentlyUsedAppsIngestModule(DataSourceIngestModule):
                        self.log(Level.INFO, "Error querying database for recently_used table (" + e.getMessage() + ")")
                        return IngestModule.ProcessResult.OK
 
-                    artID_hst = skCase.getArtifactTypeID("TSK_CCM_RECENTLY_USED_APPS")
-                    artID_hst_evt = skCase.getArtifactType("TSK_CCM_RECENTLY_USED_APPS")
+                    artID_hst = registry.getArtifactTypeID("TSK_CCM_RECENTLY_USED_APPS")
 
                     meta = resultSet.getMetaData()
                     columncount = meta.getColumnCount()
@@ -334,48 +290,48 @@ class ParseRecentlyUsedAppsIngestModule(DataSourceIngestModule):
                            #self.log(Level.INFO, SQL_String_1)
                            self.log(Level.INFO, "Artifact Is ==> " + str(artID_hst))
                            
-                           art = file.newArtifact(artID_hst)
+                           attributes = []
                            self.log(Level.INFO, "Inserting attribute URL")
                            for col_name in column_names:
-                               attID_ex1 = skCase.getAttributeType(col_name)
+                               attID_ex1 = registry.getAttributeType(col_name)
                                self.log(Level.INFO, "Inserting attribute ==> " + str(attID_ex1))
                                self.log(Level.INFO, "Attribute Type ==> " + str(attID_ex1.getValueType()))
                                if attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, ParseRecentlyUsedAppsIngestModuleFactory.moduleName, resultSet.getString(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, ParseRecentlyUsedAppsIngestModuleFactory.moduleName, resultSet.getString(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes String Creation Error, " + col_name + " ==> ")
                                elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.INTEGER:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, ParseRecentlyUsedAppsIngestModuleFactory.moduleName, resultSet.getInt(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, ParseRecentlyUsedAppsIngestModuleFactory.moduleName, resultSet.getInt(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes Integer Creation Error, " + col_name + " ==> ")
                                elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, ParseRecentlyUsedAppsIngestModuleFactory.moduleName, resultSet.getInt(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, ParseRecentlyUsedAppsIngestModuleFactory.moduleName, resultSet.getInt(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes Long Creation Error, " + col_name + " ==> ")
                                elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DOUBLE:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, ParseRecentlyUsedAppsIngestModuleFactory.moduleName, resultSet.getInt(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, ParseRecentlyUsedAppsIngestModuleFactory.moduleName, resultSet.getInt(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes Double Creation Error, " + col_name + " ==> ")
                                elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.BYTE:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, ParseRecentlyUsedAppsIngestModuleFactory.moduleName, resultSet.getString(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, ParseRecentlyUsedAppsIngestModuleFactory.moduleName, resultSet.getString(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes Byte Creation Error, " + col_name + " ==> ")
                                else:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, ParseRecentlyUsedAppsIngestModuleFactory.moduleName, int(resultSet.getString(col_name))))
+                                        attributes.append(BlackboardAttribute(attID_ex1, ParseRecentlyUsedAppsIngestModuleFactory.moduleName, int(resultSet.getString(col_name))))
                                     except:		
                                         self.log(Level.INFO, "Attributes Datatime Creation Error, " + col_name + " ==> ")
+                           poster.newArtifact(file, artID_hst, attributes)
 
                        except SQLException as e:
                            self.log(Level.INFO, "Error getting values from web_history table (" + e.getMessage() + ")")
 
-                    IngestServices.getInstance().fireModuleDataEvent(
-                           ModuleDataEvent(ParseRecentlyUsedAppsIngestModuleFactory.moduleName, artID_hst_evt, None))
+                    poster.flush()
 
                     stmt.close()
                     dbConn.close()
@@ -70,6 +70,11 @@ from org.sleuthkit.datamodel import CommunicationsManager
 from org.sleuthkit.datamodel import Relationship
 from org.sleuthkit.datamodel import Account
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 
 # Factory that defines the name and details of the module and allows Autopsy
@@ -113,6 +118,8 @@ class DJIPhantomDroneIngestModule(DataSourceIngestModule):
 
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(DJIPhantomDroneIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(DJIPhantomDroneIngestModuleFactory.moduleName, DJIPhantomDroneIngestModuleFactory().getModuleVersionNumber())
 
         # Get path to executable based on where this script is run from.
         # Assumes executable is in same folder as script
@@ -134,8 +141,12 @@ class DJIPhantomDroneIngestModule(DataSourceIngestModule):
         
         # get current case and the store.vol abstract file information
         skCase = Case.getCurrentCase().getSleuthkitCase()
+
+        # Look up the artifact and attribute types once for the whole job
+        self.registry = TypeRegistry(DJIPhantomDroneIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "%.dat")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "%.dat"))
         numFiles = len(files)
         #self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -168,7 +179,7 @@ class DJIPhantomDroneIngestModule(DataSourceIngestModule):
 
             # Save the file locally. Use file id as name to reduce collisions
             extractedFile = os.path.join(temporaryDirectory, file.getName())
-            ContentUtils.writeToFile(file, File(extractedFile))
+            self.extractionCache.linkTo(file, extractedFile)
             self.DJIPhantomDroneFile(moduleDirectory, extractedFile)
             self.DJIPhantomAddExtractedFiles(moduleDirectory, file, skCase)
         
@@ -186,6 +197,9 @@ class DJIPhantomDroneIngestModule(DataSourceIngestModule):
             "DJI_Phantom_Parser", " DJI_Phantom DAT Files Parsed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
     def DJIPhantomDroneFile(self,moduleDirectory, extractedFile):
@@ -220,14 +234,10 @@ class DJIPhantomDroneIngestModule(DataSourceIngestModule):
         #  54 -  SerialNumber   -  TSK__DJIPHANTOM_BATTERY_SERIALNUMBER
         #  72 -  BatteryBarCode -  TSK__DJIPHANTOM_BATTERY_BARCODE
  
-        try:
-            self.log(Level.INFO, "Begin Create New Artifacts")
-            artId = skCase.addArtifactType("TSK_DJIPHANTOM_DRONE_DATA", "DJI Phantom Drone Data")
-        except:		
-            self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-            artId = skCase.getArtifactTypeID("TSK_DJIPHANTOM_DRONE_DATA")
+        artId = self.registry.getOrAddArtifactType("TSK_DJIPHANTOM_DRONE_DATA", "DJI Phantom Drone Data").getTypeID()
  
         moduleName = DJIPhantomDroneIngestModuleFactory.moduleName
+        poster = BlackboardPoster(moduleName)
         fileToParse = self.getCSVFileName(moduleDirectory, file.getName())
         self.log(Level.INFO, "CSV File To Parse ==> " + fileToParse)
         with open (fileToParse) as csvFile:
@@ -259,18 +269,13 @@ class DJIPhantomDroneIngestModule(DataSourceIngestModule):
                     attributes.add(BlackboardAttribute(self.checkAttribute("TSK_DJIPHANTOM_BATTERY_BARCODE", "Battery Bar Code", skCase), moduleName, row[72]))
                 
                     artDJI.addAttributes(attributes)
-                    # index the artifact for keyword search
-                    try:
-                        blackboard.indexArtifact(artDJI)
-                    except:
-                        pass
-                        #self.log(Level.INFO, "Index Artifact Failed")
+                    poster.postArtifact(artDJI)
 
 
                     lineCount = lineCount + 1
         
         # Fire an event to notify the UI and others that there are new artifacts  
-        IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(moduleName, skCase.getArtifactType("TSK_DJIPHANTOM_DRONE_DATA"), None))
+        poster.flush()
 
     def getCSVFileName(self, moduleDirectory, fileName):
     
@@ -280,8 +285,5 @@ class DJIPhantomDroneIngestModule(DataSourceIngestModule):
         
     def checkAttribute(self, attributeName, attributeDescription, skCase):
 
-        try:
-            attID = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, attributeDescription)
-        except:		
-            attID = skCase.getAttributeType(attributeName)
+        attID = self.registry.getOrAddAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, attributeDescription)
         return attID
\ No newline at end of file
@@ -33,6 +33,9 @@ class SQLiteDb(object):
     self._cursor = None
     self.filename = None
     self.read_only = None
+    self.bulk_batch_size = 5000
+    self._bulk_statements = {}
+    self._bulk_rows = {}
     self.reserved_word_list_dict = {'ABORT':0, 'ACTION':0, 'ADD':0, 'AFTER':0, 'ALL':0, 'ALTER':0, 'ANALYZE':0, 'AND':0, 'AS':0, 'ASC':0, \
                                     'ATTACH':0, 'AUTOINCREMENT':0, 'BEFORE':0, 'BEGIN':0, 'BETWEEN':0, 'BY':0, 'CASCADE':0, 'CASE':0, \
                                     'CAST':0, 'CHECK':0, 'COLLATE':0, 'COLUMN':0, 'COMMIT':0, 'CONFLICT':0, 'CONSTRAINT':0, 'CREATE':0, \
@@ -93,6 +96,9 @@ class SQLiteDb(object):
     if not self._connection:
       raise RuntimeError(u'Cannot close database not opened.')
 
+    # Write out anything still sitting in the bulk insert buffers
+    self.FlushBulkInserts()
+
     # We need to run commit or not all data is stored in the database.
     self._connection.commit()
     self._connection.close()
@@ -101,6 +107,8 @@ class SQLiteDb(object):
     self._cursor = None
     self.filename = None
     self.read_only = None
+    self._bulk_statements = {}
+    self._bulk_rows = {}
 
   def CreateTable(self, table_name, column_definitions):
     #Creates a table.
@@ -291,6 +299,101 @@ class SQLiteDb(object):
 	
     self._cursor.execute(sql_query, column_values)
 
+  def SetBulkOptions(self, batch_size=5000):
+    #Tunes the connection for loading scratch output.  The output database is rebuilt
+    #on every run so durability is traded for speed.
+    #
+    #Args:
+    #  batch_size: the number of rows buffered per table before they are written.
+
+    #Raises:
+    #  RuntimeError: if the database is not opened or
+    #                if the database is in read-only mode.
+
+    if not self._connection:
+      raise RuntimeError(u'Cannot set bulk options database not opened.')
+
+    if self.read_only:
+      raise RuntimeError(u'Cannot set bulk options database in read-only mode.')
+
+    self.bulk_batch_size = batch_size
+    self._connection.commit()
+    self._cursor.execute(u'PRAGMA journal_mode = MEMORY')
+    self._cursor.execute(u'PRAGMA synchronous = OFF')
+    self._cursor.execute(u'PRAGMA cache_size = -65536')
+
+  def BulkInsertBindValues(self, table_name, column_definitions, column_values):
+    #Buffers a row to be inserted into a table.  The insert statement is built once per
+    #table and column list and the buffer is written with executemany when it holds
+    #bulk_batch_size rows.  FlushBulkInserts must be called before the rows are read back.
+    #
+    #Args:
+    #  table_name: the table name.
+    #  column_definitions: list of strings containing column.
+    #  column_values: the values to actually inserted
+
+    #Raises:
+    #  RuntimeError: if the database is not opened or
+    #                if the database is in read-only mode.
+
+    if not self._connection:
+      raise RuntimeError(u'Cannot insert values database not opened.')
+
+    if self.read_only:
+      raise RuntimeError(u'Cannot insert values database in read-only mode.')
+
+    statement_key = (table_name, column_definitions)
+    if statement_key not in self._bulk_statements:
+      table_name = re.sub('[{}!@#$]', '', table_name)
+      table_name = re.sub('-', '_', table_name)
+      table_name = "'" + table_name + "'"
+      self._bulk_statements[statement_key] = u'insert into {0:s} ( {1:s} ) values ( {2:s} )'.format(
+          table_name, column_definitions, self.create_question_bind_variables(len(column_values)))
+      self._bulk_rows[statement_key] = []
+
+    bulk_rows = self._bulk_rows[statement_key]
+    bulk_rows.append(column_values)
+    if len(bulk_rows) >= self.bulk_batch_size:
+      self._WriteBulkRows(statement_key)
+
+  def FlushBulkInserts(self):
+    #Writes all the rows still buffered by BulkInsertBindValues.
+
+    #Raises:
+    #  RuntimeError: if the database is not opened.
+
+    if not self._connection:
+      raise RuntimeError(u'Cannot flush inserts database not opened.')
+
+    for statement_key in self._bulk_rows:
+      self._WriteBulkRows(statement_key)
+
+  def _WriteBulkRows(self, statement_key):
+    #Writes the buffered rows for one statement in a single transaction.  If the batch
+    #fails it is rolled back and the rows are retried one at a time so one bad row
+    #does not lose the rest of the batch.
+    #
+    #Args:
+    #  statement_key: the (table name, column definitions) the rows were buffered under.
+
+    bulk_rows = self._bulk_rows[statement_key]
+    if not bulk_rows:
+      return
+    sql_query = self._bulk_statements[statement_key]
+
+    self._connection.commit()
+    try:
+      self._cursor.executemany(sql_query, bulk_rows)
+    except (sqlite3.Error, UnicodeError):
+      self._connection.rollback()
+      for column_values in bulk_rows:
+        try:
+          self._cursor.execute(sql_query, column_values)
+        except (sqlite3.Error, UnicodeError):
+          print ("Error inserting row into " + statement_key[0] + " ==> " + str(column_values))
+    self._connection.commit()
+    del bulk_rows[:]
+
   def GetColumnHeadings(self, sql_statement):
     #Returns the column headings from a SQL Statement
     #
@@ -104,8 +104,7 @@ def parse_orphan(registry):
         reg_key_write_time = progs.timestamp()
         file_val = orphan_sub.split('@')
         #file_val.append(service.name())
-        file_val2 = "'" + file_val[0] + "','" + file_val[1] + "', '" + str(reg_key_write_time) + "'"
-        SQLitedb.InsertValues(table_name_5 + "_Temp", "Volume_id, File_entry, reg_key_writetime", file_val2)
+        SQLitedb.BulkInsertBindValues(table_name_5 + "_Temp", "Volume_id, File_entry, reg_key_writetime", [file_val[0], file_val[1], str(reg_key_write_time)])
 
 def parse_programs(registry):
     programs = registry.open("root\\Programs")
@@ -126,16 +125,14 @@ def parse_programs(registry):
               for file in  prog.value():
                  if ('@' in file):
                     file_val = file.split('@')
-                    file_val2 = "'" + file_val[0] + "','" + file_val[1] + "','" + progs.name() + "'"
-                    SQLitedb.InsertValues(table_name_3 + "_Temp", "Volume_id, File_entry, program_id", file_val2)
+                    SQLitedb.BulkInsertBindValues(table_name_3 + "_Temp", "Volume_id, File_entry, program_id", [file_val[0], file_val[1], progs.name()])
            elif prog.name() == "a":
               sql_ins_columns.append(cache_psql_col[prog.name()]) 
               sql_val_columns.append(str(prog.value()))
            elif prog.name() == "d":
               for file_path in prog.value():
                  if len(file_path) > 0:
-                    f_path = "'" + file_path + "','" + progs.name() + "'"
-                    SQLitedb.InsertValues(table_name_4 + "_Temp", "file_path, program_id", f_path)
+                    SQLitedb.BulkInsertBindValues(table_name_4 + "_Temp", "file_path, program_id", [file_path, progs.name()])
            elif prog.name() == "7":
               p_val = prog.value()
               sql_ins_columns.append(cache_psql_col[prog.name()]) 
@@ -151,8 +148,7 @@ def parse_programs(registry):
            else:
               sql_ins_columns.append(cache_psql_col[prog.name()]) 
               sql_val_columns.append(prog.value())
-        sql_bind_values = SQLitedb.create_question_bind_variables(len(sql_ins_columns))
-        SQLitedb.InsertBindValues(table_name_2 + "_Temp", ', '.join(sql_ins_columns), sql_bind_values, sql_val_columns)
+        SQLitedb.BulkInsertBindValues(table_name_2 + "_Temp", ', '.join(sql_ins_columns), sql_val_columns)
 
         
 def parse_files(registry):
@@ -177,8 +173,7 @@ def parse_files(registry):
                   #print ("Value Name ==> ", prog.name(), "Value Value ==> ", prog.value()) 
                   sql_ins_columns.append(cache_sql_col[prog.name()]) 
                   sql_val_columns.append(prog.value())                      
-              sql_bind_values = SQLitedb.create_question_bind_variables(len(sql_ins_columns))
-              SQLitedb.InsertBindValues(table_name_1 + "_Temp", ', '.join(sql_ins_columns), sql_bind_values, sql_val_columns)
+              SQLitedb.BulkInsertBindValues(table_name_1 + "_Temp", ', '.join(sql_ins_columns), sql_val_columns)
 
 def Consolidate_Data():
     SQLitedb.UpdateTable(Unassoc_Progs)
@@ -223,6 +218,7 @@ print ('DB file is ', SQLite_DB_Name)
 SQLitedb = SQLiteDb()
 SQLitedb.RemoveDB_File(SQLite_DB_Name)
 SQLitedb.Open(SQLite_DB_Name)
+SQLitedb.SetBulkOptions()
 
 SQLitedb.CreateTempTable(table_name_1 + "_Temp", table_col_1)
 SQLitedb.CreateTempTable(table_name_2 + "_Temp", table_col_2)
@@ -235,6 +231,7 @@ reg = Registry.Registry(Registry_To_Parse)
 parse_programs(reg)
 parse_files(reg)
 parse_orphan(reg)
+SQLitedb.FlushBulkInserts()
 
 SQLitedb.CreatePermanentTable(table_name_1, table_name_1 + "_Temp")
 SQLitedb.CreatePermanentTable(table_name_2, table_name_2 + "_Temp")
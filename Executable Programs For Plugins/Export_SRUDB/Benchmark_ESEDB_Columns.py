@@ -0,0 +1,108 @@
+# Benchmark_ESEDB_Columns.py = Python script to time exporting ESE records through ESEDB_Columns
+#
+# Copyright (C) 2016 Mark McKinnon (Mark.McKinnon@Davenport.edu)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You can view the GNU General Public License at <http://www.gnu.org/licenses/>
+#
+# Version History:
+#  Initial Version - Compares working out the columns per record with a Table_Plan made once, using
+#                    synthetic Application_Resource_Usage sized records so pyesedb is not needed
+#
+# Usage Examples:
+# python3 Benchmark_ESEDB_Columns.py 200000
+
+import os
+import sys
+import time
+import tempfile
+from struct import pack
+from Database import SQLiteDb
+from ESEDB_Columns import Column_Decoders, Table_Plan, Record_Values
+
+table_name = 'Application_Resource_Usage_temp'
+# (column name, ESE column type) of the SRUM application resource usage table
+table_schema = [('AutoIncId', 4), ('TimeStamp', 8), ('AppId', 4), ('UserId', 4), ('ForegroundCycleTime', 15), \
+                ('BackgroundCycleTime', 15), ('FaceTime', 15), ('ForegroundContextSwitches', 14), \
+                ('BackgroundContextSwitches', 14), ('ForegroundBytesRead', 15), ('ForegroundBytesWritten', 15), \
+                ('ForegroundNumReadOperations', 14), ('ForegroundNumWriteOperations', 14), ('ForegroundNumberOfFlushes', 14), \
+                ('BackgroundBytesRead', 15), ('BackgroundBytesWritten', 15), ('BackgroundNumReadOperations', 14), \
+                ('BackgroundNumWriteOperations', 14), ('BackgroundNumberOfFlushes', 14)]
+table_columns = ', '.join([column_name + ' ' + ('Text' if column_type == 8 else 'Integer') for column_name, column_type in table_schema])
+
+class Synthetic_Record(object):
+    # Answers the pyesedb record calls the exporters make
+    def __init__(self, i):
+        self.i = i
+    def get_column_name(self, column_number):
+        return table_schema[column_number][0]
+    def get_column_type(self, column_number):
+        return table_schema[column_number][1]
+    def get_value_data(self, column_number):
+        return pack('<d', 42000.5 + (self.i % 1000) / 24.0)
+    def get_value_data_as_integer(self, column_number):
+        return self.i * 31 + column_number
+    def get_value_data_as_floating_point(self, column_number):
+        return self.i / 7.0
+
+class Synthetic_Table(object):
+    def __init__(self, number_of_records):
+        self.number_of_records = number_of_records
+    def get_number_of_columns(self):
+        return len(table_schema)
+    def get_number_of_records(self):
+        return self.number_of_records
+    def get_record(self, i):
+        return Synthetic_Record(i)
+
+def per_record_values(SQLitedb, EsedbTable_Record, number_of_columns):
+    # What the exporters did before, the column list and decoder are worked out again for every record
+    SQL_Statement_Columns = SQLitedb.Check_SQL_Reserved_Word(EsedbTable_Record.get_column_name(0))
+    SQL_Bind_Values = [Column_Decoders[EsedbTable_Record.get_column_type(0)](EsedbTable_Record, 0)]
+    for x in range(1, number_of_columns):
+        SQL_Statement_Columns = SQL_Statement_Columns + ',' + SQLitedb.Check_SQL_Reserved_Word(EsedbTable_Record.get_column_name(x))
+        SQL_Bind_Values.append(Column_Decoders[EsedbTable_Record.get_column_type(x)](EsedbTable_Record, x))
+    return SQL_Statement_Columns, SQL_Bind_Values
+
+def time_export(db_name, number_of_rows, planned):
+    SQLitedb = SQLiteDb()
+    SQLitedb.RemoveDB_File(db_name)
+    SQLitedb.Open(db_name)
+    SQLitedb.SetBulkOptions()
+    SQLitedb.CreateTable(table_name, table_columns)
+    EsedbTable = Synthetic_Table(number_of_rows)
+    start_time = time.time()
+    if planned:
+       Table_Columns, Table_Decoders = Table_Plan(SQLitedb, EsedbTable)
+       for i in range(0, EsedbTable.get_number_of_records()):
+          SQLitedb.BulkInsertBindValues(table_name, Table_Columns, Record_Values(EsedbTable.get_record(i), Table_Decoders))
+    else:
+       for i in range(0, EsedbTable.get_number_of_records()):
+          Table_Columns, Table_Values = per_record_values(SQLitedb, EsedbTable.get_record(i), EsedbTable.get_number_of_columns())
+          SQLitedb.BulkInsertBindValues(table_name, Table_Columns, Table_Values)
+    SQLitedb.Close()
+    elapsed_time = time.time() - start_time
+    SQLitedb.RemoveDB_File(db_name)
+    return elapsed_time
+
+args = sys.argv[1:]
+if len(args) > 0:
+   Number_Of_Rows = int(args[0])
+else:
+   Number_Of_Rows = 100000
+DB_Name = os.path.join(tempfile.gettempdir(), 'benchmark_esedb_columns.db3')
+
+Record_Time = time_export(DB_Name, Number_Of_Rows, False)
+Plan_Time = time_export(DB_Name, Number_Of_Rows, True)
+print ('Records exported ==> ', Number_Of_Rows)
+print ('Columns per record ==> %.0f rows per second' % (Number_Of_Rows / Record_Time))
+print ('Table_Plan ==> %.0f rows per second' % (Number_Of_Rows / Plan_Time))
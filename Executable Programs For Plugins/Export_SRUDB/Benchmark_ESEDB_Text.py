@@ -0,0 +1,109 @@
+# Benchmark_ESEDB_Text.py = Python script to check and time the 7-bit compressed text decoder in ESEDB_Columns
+#
+# Copyright (C) 2016 Mark McKinnon (Mark.McKinnon@Davenport.edu)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You can view the GNU General Public License at <http://www.gnu.org/licenses/>
+#
+# Version History:
+#  Initial Version - Checks Unpack_7bit against the byte at a time loop the exporters used before, for every
+#                    buffer length up to 2048 (so the NumPy path is checked when NumPy is installed),
+#                    then times the loop, Unpack_7bit and the memoised Decode_Large_Text
+#
+# Usage Examples:
+# python3 Benchmark_ESEDB_Text.py 100000
+
+import os
+import sys
+import time
+import random
+import ESEDB_Columns
+from ESEDB_Columns import Unpack_7bit, Decode_Large_Text
+
+def reference_7bit(compressed_data):
+    # The LARGE_TEXT loop from Check_Column_Type in Export_SRUDB
+    compressed_data_size = len(compressed_data)
+    value_16bit = 0
+    bit_index = 0
+    compressed_data_index = 1
+    uncompressed_data = []
+    while compressed_data_index < compressed_data_size:
+       comp_data = (compressed_data[compressed_data_index])
+       value_16bit |= comp_data << bit_index
+       uncompressed_data.append(chr(value_16bit & 0x7f))
+       value_16bit >>= 7
+       bit_index += 1
+       if bit_index == 7:
+          uncompressed_data.append(chr(value_16bit & 0x7f))
+          value_16bit >>= 7
+          bit_index = 0
+       compressed_data_index += 1
+    last_char = uncompressed_data.pop()
+    return "".join(uncompressed_data)
+
+def pack_7bit(text):
+    # Header byte then the characters packed 7 bits each, as ESE stores them
+    packed_bits = 0
+    for char_number in range(0, len(text)):
+       packed_bits |= (ord(text[char_number]) & 0x7f) << (char_number * 7)
+    return bytes([0x17]) + packed_bits.to_bytes((len(text) * 7 + 7) // 8, 'little')
+
+def check_decoder():
+    random.seed(2016)
+    failures = 0
+    for buffer_length in range(2, 2049):
+       compressed_data = bytes([0x17]) + bytes([random.randrange(256) for i in range(0, buffer_length - 1)])
+       if Unpack_7bit(compressed_data[1:]) != reference_7bit(compressed_data):
+          print ('Mismatch for random buffer of length ', buffer_length)
+          failures = failures + 1
+    for text_length in range(1, 600):
+       text = ''.join([chr(random.randrange(32, 127)) for i in range(0, text_length)])
+       compressed_data = pack_7bit(text)
+       if Unpack_7bit(compressed_data[1:]) != reference_7bit(compressed_data):
+          print ('Mismatch for text of length ', text_length)
+          failures = failures + 1
+    return failures
+
+def time_decoder(decoder, values):
+    start_time = time.time()
+    for value in values:
+       decoder(value)
+    return time.time() - start_time
+
+args = sys.argv[1:]
+if len(args) > 0:
+   Number_Of_Values = int(args[0])
+else:
+   Number_Of_Values = 100000
+
+print ('NumPy ==> ', 'not installed' if ESEDB_Columns.numpy == None else ESEDB_Columns.numpy.__version__)
+Failures = check_decoder()
+print ('Decoder check ==> ', 'passed' if Failures == 0 else str(Failures) + ' mismatches')
+
+# Mostly short app names with some long URLs, 1 in 10 values distinct like a SRUM IdMap or Webcache container
+random.seed(7)
+Distinct_Values = []
+for i in range(0, Number_Of_Values // 10 + 1):
+   if i % 20 == 0:
+      Distinct_Values.append(pack_7bit('https://www.example.com/' + 'x' * random.randrange(300, 1500) + '/' + str(i)))
+   else:
+      Distinct_Values.append(pack_7bit('\\Device\\HarddiskVolume2\\Program Files\\App' + str(i) + '\\app.exe'))
+Values = [Distinct_Values[random.randrange(len(Distinct_Values))] for i in range(0, Number_Of_Values)]
+
+Loop_Time = time_decoder(reference_7bit, Values)
+Unpack_Time = time_decoder(lambda compressed_data: Unpack_7bit(compressed_data[1:]), Values)
+Decode_Large_Text.cache_clear()
+Memo_Time = time_decoder(Decode_Large_Text, Values)
+print ('Values decoded ==> ', Number_Of_Values)
+print ('Byte loop ==> %.0f values per second' % (Number_Of_Values / Loop_Time))
+print ('Unpack_7bit ==> %.0f values per second' % (Number_Of_Values / Unpack_Time))
+print ('Decode_Large_Text ==> %.0f values per second' % (Number_Of_Values / Memo_Time))
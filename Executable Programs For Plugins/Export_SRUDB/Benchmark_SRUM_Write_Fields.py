@@ -0,0 +1,123 @@
+# Benchmark_SRUM_Write_Fields.py = Python script to time filling the SRUM_Write fields of a SRUM table
+#
+# Copyright (C) 2016 Mark McKinnon (Mark.McKinnon@Davenport.edu)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You can view the GNU General Public License at <http://www.gnu.org/licenses/>
+#
+# Version History:
+#  Initial Version - Compares the ALTER TABLE and UPDATE passes Export_SRUDB used to run with working the
+#                    fields out as the rows are inserted, on hourly Application_Resource_Usage sized rows,
+#                    and checks both give the same values
+#
+# Usage Examples:
+# python3 Benchmark_SRUM_Write_Fields.py 1000000
+
+import os
+import sys
+import time
+import datetime
+import tempfile
+from Database import SQLiteDb
+from SRUM_Write_Fields import SRUM_Write_Columns, SRUM_Write_Column_Names, SRUM_Write_Values
+
+table_name = 'Application_Resource_Usage_temp'
+table_columns = 'AutoIncId Integer, TimeStamp Text, AppId Integer, UserId Integer, ForegroundCycleTime Integer, ' + \
+                'BackgroundCycleTime Integer, FaceTime Integer, ForegroundBytesRead Integer, ForegroundBytesWritten Integer, ' + \
+                'BackgroundBytesRead Integer, BackgroundBytesWritten Integer'
+sql_ins_columns = 'AutoIncId, TimeStamp, AppId, UserId, ForegroundCycleTime, BackgroundCycleTime, FaceTime, ' + \
+                  'ForegroundBytesRead, ForegroundBytesWritten, BackgroundBytesRead, BackgroundBytesWritten'
+First_Time_Stamp = datetime.datetime(2016, 1, 1, 0, 0, 0, 250000)
+
+def make_record(i):
+    # 40 applications written together every hour, one in a thousand records without a TimeStamp
+    if i % 1000 == 999:
+       Time_Stamp = ''
+    else:
+       Time_Stamp = First_Time_Stamp + datetime.timedelta(hours = i // 40)
+    return [i, Time_Stamp, i % 40, 1, i * 3, i * 5, i * 7, i * 11, i * 13, i * 17, i * 19]
+
+def update_fields(SQLitedb):
+    # Post_Database_Processing from Export_SRUDB 1.1, with December on '12' rather than '07'
+    for Column_Name, Column_Type in SRUM_Write_Columns:
+        SQLitedb.AddColumn(table_name, Column_Name + ' ' + Column_Type)
+    SQL_Statement = "update " + table_name + " set SRUM_Write_Date = date(timestamp), " \
+                         "SRUM_Write_Time = time(timestamp), SRUM_Write_Time_Hour = strftime('%H', timestamp), " \
+                         "srum_Write_Time_Minute = strftime('%M', timestamp), srum_Write_Time_Day_Of_Week = " \
+                         "(case when strftime('%w', timestamp) = '0' then 'Sunday' " \
+                         "when strftime('%w', timestamp) = '1' then 'Monday' when strftime('%w', timestamp) = '2' then 'Tuesday' " \
+                         "when strftime('%w', timestamp) = '3' then 'Wednesday' when strftime('%w', timestamp) = '4' then 'Thursday' " \
+                         "when strftime('%w', timestamp) = '5' then 'Friday' when strftime('%w', timestamp) = '6' then 'Saturday' " \
+                         "end), srum_Write_epochtime = strftime('%s', timestamp), srum_write_Date_Day = strftime('%d', timestamp);"
+    SQLitedb.UpdateTable(SQL_Statement)
+    SQL_Statement = "update " + table_name + " set SRUM_Write_Date_Month  = " \
+                         "(case when strftime('%m', timestamp) = '01' then 'January' " \
+                         "when strftime('%m', timestamp) = '02' then 'February' " \
+                         "when strftime('%m', timestamp) = '03' then 'March' " \
+                         "when strftime('%m', timestamp) = '04' then 'April' " \
+                         "when strftime('%m', timestamp) = '05' then 'May' " \
+                         "when strftime('%m', timestamp) = '06' then 'June' " \
+                         "when strftime('%m', timestamp) = '07' then 'July' " \
+                         "when strftime('%m', timestamp) = '08' then 'August' " \
+                         "when strftime('%m', timestamp) = '09' then 'September' " \
+                         "when strftime('%m', timestamp) = '10' then 'October' " \
+                         "when strftime('%m', timestamp) = '11' then 'November' " \
+                         "when strftime('%m', timestamp) = '12' then 'December' end);"
+    SQLitedb.UpdateTable(SQL_Statement)
+
+def time_fields(db_name, number_of_rows, at_insert):
+    SQLitedb = SQLiteDb()
+    SQLitedb.RemoveDB_File(db_name)
+    SQLitedb.Open(db_name)
+    SQLitedb.SetBulkOptions()
+    if at_insert:
+       SQLitedb.CreateTable(table_name, table_columns + ', ' + ', '.join([Column_Name + ' ' + Column_Type for Column_Name, Column_Type in SRUM_Write_Columns]))
+    else:
+       SQLitedb.CreateTable(table_name, table_columns)
+    start_time = time.time()
+    for i in range(0, number_of_rows):
+       SQL_Bind_Values = make_record(i)
+       if at_insert:
+          SQL_Bind_Values.extend(SRUM_Write_Values(SQL_Bind_Values[1]))
+          SQLitedb.BulkInsertBindValues(table_name, sql_ins_columns + ',' + ','.join(SRUM_Write_Column_Names), SQL_Bind_Values)
+       else:
+          SQLitedb.BulkInsertBindValues(table_name, sql_ins_columns, SQL_Bind_Values)
+    SQLitedb.FlushBulkInserts()
+    if not at_insert:
+       update_fields(SQLitedb)
+    SQLitedb.Close()
+    elapsed_time = time.time() - start_time
+    return elapsed_time
+
+def read_fields(db_name):
+    SQLitedb = SQLiteDb()
+    SQLitedb.Open(db_name)
+    Rows = SQLitedb.SelectAllRows('select ' + ', '.join(SRUM_Write_Column_Names) + ' from ' + table_name + ' order by AutoIncId')
+    SQLitedb.Close()
+    SQLitedb.RemoveDB_File(db_name)
+    return Rows
+
+args = sys.argv[1:]
+if len(args) > 0:
+   Number_Of_Rows = int(args[0])
+else:
+   Number_Of_Rows = 350000
+Update_DB_Name = os.path.join(tempfile.gettempdir(), 'benchmark_srum_update.db3')
+Insert_DB_Name = os.path.join(tempfile.gettempdir(), 'benchmark_srum_insert.db3')
+
+Update_Time = time_fields(Update_DB_Name, Number_Of_Rows, False)
+Insert_Time = time_fields(Insert_DB_Name, Number_Of_Rows, True)
+Same_Values = read_fields(Update_DB_Name) == read_fields(Insert_DB_Name)
+print ('Rows ==> ', Number_Of_Rows)
+print ('Insert then UPDATE ==> %.1f seconds' % Update_Time)
+print ('Fields at insert ==> %.1f seconds' % Insert_Time)
+print ('Same values ==> ', Same_Values)
@@ -0,0 +1,57 @@
+# SRUM_Write_Fields.py = Works out the SRUM write date and time fields from the TimeStamp of a SRUM record
+#
+# Copyright (C) 2016 Mark McKinnon (Mark.McKinnon@Davenport.edu)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You can view the GNU General Public License at <http://www.gnu.org/licenses/>
+#
+# Version History:
+#  Initial Version - Fields the Post_Database_Processing UPDATEs of Export_SRUDB used to fill with strftime
+#
+# Usage Examples:
+# Table_Columns = Table_Columns + ',' + ','.join(SRUM_Write_Column_Names)
+# SQL_Bind_Values.extend(SRUM_Write_Values(Time_Stamp))
+
+import datetime
+import functools
+
+# (column name, column type) added to each SRUM data table
+SRUM_Write_Columns = [('SRUM_Write_Date', 'text'), ('SRUM_Write_time', 'text'), ('SRUM_Write_Time_Hour', 'integer'), \
+                      ('SRUM_Write_time_Minute', 'integer'), ('SRUM_Write_time_Day_Of_Week', 'integer'), \
+                      ('SRUM_Write_epochtime', 'integer'), ('SRUM_Write_Date_Month', 'text'), ('SRUM_Write_Date_Day', 'Integer')]
+SRUM_Write_Column_Names = [Column_Name for Column_Name, Column_Type in SRUM_Write_Columns]
+
+Day_Of_Week_Names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+Month_Names = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', \
+               'October', 'November', 'December']
+
+def Has_SRUM_Write_Fields(Table_Name):
+    # The SRUM data tables, not the ESE system tables or the SruDb id map and checkpoint tables
+    return not (Table_Name.lower().startswith('msys') or Table_Name.lower().startswith('sru'))
+
+Epoch_Ordinal = datetime.date(1970, 1, 1).toordinal()
+No_SRUM_Write_Values = (None,) * len(SRUM_Write_Columns)
+
+@functools.lru_cache(maxsize=1024)
+def SRUM_Write_Values(Time_Stamp):
+    # Date, time, hour, minute, day of week, epoch, month and day of a TimeStamp.  A missing
+    # TimeStamp is decoded as '' and gets NULLs, the same as strftime gave it.  SRUM writes
+    # the records for all the applications at once, so the same TimeStamp comes in many times.
+    # strftime('%s') rounds to the millisecond before dropping it, so the epoch does the same.
+    if not isinstance(Time_Stamp, datetime.datetime):
+       return No_SRUM_Write_Values
+    return ('%04d-%02d-%02d' % (Time_Stamp.year, Time_Stamp.month, Time_Stamp.day), \
+            '%02d:%02d:%02d' % (Time_Stamp.hour, Time_Stamp.minute, Time_Stamp.second), Time_Stamp.hour, Time_Stamp.minute, \
+            Day_Of_Week_Names[Time_Stamp.weekday()], \
+            (Time_Stamp.toordinal() - Epoch_Ordinal) * 86400 + Time_Stamp.hour * 3600 + Time_Stamp.minute * 60 + Time_Stamp.second + \
+            (Time_Stamp.microsecond >= 999500), \
+            Month_Names[Time_Stamp.month - 1], Time_Stamp.day)
@@ -0,0 +1,191 @@
+# ESEDB_Columns.py = Turns the columns of pyesedb records into SQLite bind values
+#
+# Copyright (C) 2016 Mark McKinnon (Mark.McKinnon@Davenport.edu)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You can view the GNU General Public License at <http://www.gnu.org/licenses/>
+#
+# Version History:
+#  Initial Version - Column decoders taken out of Check_Column_Type, a copy sits next to each ESE exporter
+#  Version 1.1 - Unpack 7-bit compressed text a whole buffer at a time (NumPy for long buffers when it is installed)
+#                and remember the values already decoded
+#
+# Usage Examples:
+# Table_Columns, Table_Decoders = Table_Plan(SQLitedb, EsedbTable)
+# SQLitedb.BulkInsertBindValues(Table_Name, Table_Columns, Record_Values(EsedbTable.get_record(i), Table_Decoders))
+#
+# The schema of an ESE table is the same for every record, so the column list and the decoder
+# for each column are worked out once from the first record.  Each record then just runs the
+# list of decoders, the column name and type are never looked at again.
+#
+# 7-bit compressed text is unpacked a whole buffer at a time.  The buffer is read as one integer
+# and the 7 bit characters are spread out to a byte each with a few shift and mask steps, the
+# masks are kept per buffer size.  With NumPy installed long buffers are unpacked with it instead,
+# NumPy is optional.  The same app names and URLs are stored over and over, so decoded values are
+# kept in a LRU memo.
+
+import datetime
+import functools
+import math
+from struct import unpack
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Compressed buffers at least this long are unpacked with NumPy
+NUMPY_MIN_BYTES = 1024
+# Distinct large text values kept decoded
+LARGE_TEXT_CACHE_SIZE = 65536
+
+def ole_date_bin_to_datetime(ole_date_bin):
+    """
+        Converts a OLE date from a binary 8 bytes little endian hex form to a datetime
+    """
+    #Conversion to OLE date float, where:
+    # - integer part: days from epoch (1899/12/30 00:00)
+    # - decimal part: percentage of the day, where 0,5 is midday
+    date_float = unpack('<d', ole_date_bin)[0]
+    date_decimal, date_integer = math.modf(date_float)
+    date_decimal = abs(date_decimal)
+    date_integer = int(date_integer)
+
+    #Calculate the result
+    res = datetime.datetime(1899, 12, 30) + datetime.timedelta(days=date_integer) #adding days to epoch
+    res = res + datetime.timedelta(seconds = 86400*date_decimal) #adding percentage of the day
+    return res
+
+def Null_Value(EsedbTable_Record, Column_Number):
+    return None
+
+def Boolean_Value(EsedbTable_Record, Column_Number):
+    Value_Data = EsedbTable_Record.get_value_data(Column_Number)
+    if Value_Data == None:
+       return 'NULL'
+    return str(Value_Data.decode('utf-16', 'ignore'))
+
+def Integer_Value(EsedbTable_Record, Column_Number):
+    return EsedbTable_Record.get_value_data_as_integer(Column_Number)
+
+def Float_Value(EsedbTable_Record, Column_Number):
+    return EsedbTable_Record.get_value_data_as_floating_point(Column_Number)
+
+def Date_Value(EsedbTable_Record, Column_Number):
+    Value_Data = EsedbTable_Record.get_value_data(Column_Number)
+    if Value_Data == None:
+       return ''
+    return ole_date_bin_to_datetime(Value_Data)
+
+def Binary_Value(EsedbTable_Record, Column_Number):
+    Value_Data = EsedbTable_Record.get_value_data(Column_Number)
+    if Value_Data == None:
+       return ''
+    return Value_Data
+
+def Text_Value(EsedbTable_Record, Column_Number):
+    Value_Data = EsedbTable_Record.get_value_data(Column_Number)
+    if Value_Data == None:
+       return ''
+    return Value_Data.decode('utf-16', 'ignore')
+
+@functools.lru_cache(maxsize=1024)
+def Spread_Masks(Number_Of_Groups):
+    # (mask, shift) steps that move each 7 byte group of 8 characters into 8 bytes and then each
+    # character in the group up to its own byte.  The moves are done a power of two at a time,
+    # largest first, so nothing being moved runs into something that has not moved yet.
+    Steps = []
+    Group_Mask = (1 << 56) - 1
+    Bit = max(Number_Of_Groups - 1, 0).bit_length() - 1
+    while Bit >= 0:
+       # Groups whose number has this bit set move up 8 bits for every group before them
+       Moved = ~((1 << (Bit + 1)) - 1)
+       Mask = 0
+       for Group in range(0, Number_Of_Groups):
+          if (Group >> Bit) & 1:
+             Mask |= Group_Mask << (56 * Group + 8 * (Group & Moved))
+       Steps.append((Mask, 8 << Bit))
+       Bit -= 1
+    for Shift in (4, 2, 1):
+       # Character j of a group ends up at bit 8j, it is moved j bits in steps of 4, 2 and 1
+       Char_Mask = 0
+       for Char in range(0, 8):
+          if Char & Shift:
+             Char_Mask |= 0x7f << (7 * Char + (Char & ~((Shift << 1) - 1)))
+       Mask = 0
+       for Group in range(0, Number_Of_Groups):
+          Mask |= Char_Mask << (64 * Group)
+       Steps.append((Mask, Shift))
+    return tuple(Steps)
+
+def Unpack_7bit(packed_data):
+    # Characters are 7 bits each, packed least significant bit first.  Every byte gives one
+    # character and every 7th byte one more, the last character is only partly there and dropped.
+    Number_Of_Chars = len(packed_data) + len(packed_data) // 7 - 1
+    if Number_Of_Chars < 1:
+       return ''
+    if numpy != None and len(packed_data) >= NUMPY_MIN_BYTES:
+       bits = numpy.unpackbits(numpy.frombuffer(packed_data, dtype=numpy.uint8), bitorder='little')
+       chars = numpy.zeros((Number_Of_Chars, 8), dtype=numpy.uint8)
+       chars[:, :7] = bits[:Number_Of_Chars * 7].reshape(Number_Of_Chars, 7)
+       return numpy.packbits(chars, bitorder='little').tobytes().decode('ascii')
+    Number_Of_Groups = (len(packed_data) + 6) // 7
+    chars = int.from_bytes(packed_data, 'little')
+    for Mask, Shift in Spread_Masks(Number_Of_Groups):
+       chars = (chars & ~Mask) | ((chars & Mask) << Shift)
+    return chars.to_bytes(8 * Number_Of_Groups, 'little')[:Number_Of_Chars].decode('ascii')
+
+@functools.lru_cache(maxsize=LARGE_TEXT_CACHE_SIZE)
+def Decode_Large_Text(compressed_text):
+    comp_text = compressed_text[1]
+    if comp_text == 24:
+       #print ("This text is EXPRESS Compressed")
+       return compressed_text.decode('utf-16', 'ignore')
+    elif comp_text >= 23:
+       #print ("This text is compressed using 7-bit")
+       return Unpack_7bit(compressed_text[1:])
+    else:
+       # print ("This text is not compressed")
+       return compressed_text.decode('utf-16', 'ignore')
+
+def Large_Text_Value(EsedbTable_Record, Column_Number):
+    compressed_text = EsedbTable_Record.get_value_data(Column_Number)
+    if compressed_text == None:
+       return ''
+    return Decode_Large_Text(compressed_text)
+
+def Guid_Value(EsedbTable_Record, Column_Number):
+    Value_Data = EsedbTable_Record.get_value_data(Column_Number)
+    if Value_Data == None:
+       return ''
+    return str(Value_Data.decode('utf-16', 'ignore'))
+
+# ESE column type ==> decoder
+Column_Decoders = {0:Null_Value, 1:Boolean_Value, 2:Integer_Value, 3:Integer_Value, 4:Integer_Value, 5:Integer_Value, \
+                   6:Float_Value, 7:Float_Value, 8:Date_Value, 9:Binary_Value, 10:Text_Value, 11:Binary_Value, \
+                   12:Large_Text_Value, 13:Integer_Value, 14:Integer_Value, 15:Integer_Value, 16:Guid_Value, 17:Integer_Value}
+
+def Table_Plan(SQLitedb, EsedbTable, Column_Type_Overrides={}):
+    # Returns the column list to insert with and a (column number, decoder) list for the table.
+    # Column_Type_Overrides maps a column name to the ESE type it should be decoded as.
+    Table_Record = EsedbTable.get_record(0)
+    Column_Names = []
+    Table_Decoders = []
+    for Column_Number in range(0, EsedbTable.get_number_of_columns()):
+        Column_Name = Table_Record.get_column_name(Column_Number)
+        Column_Type = Column_Type_Overrides.get(Column_Name, Table_Record.get_column_type(Column_Number))
+        Column_Names.append(SQLitedb.Check_SQL_Reserved_Word(Column_Name))
+        Table_Decoders.append((Column_Number, Column_Decoders[Column_Type]))
+    return ','.join(Column_Names), Table_Decoders
+
+def Record_Values(EsedbTable_Record, Table_Decoders):
+    return [Decoder(EsedbTable_Record, Column_Number) for Column_Number, Decoder in Table_Decoders]
@@ -16,9 +16,15 @@
 #
 # Version History:
 #  Initial Version - Requires pyesedb python binding from the project libyal/libesedb
+#  Version 1.1 - Run the record ranges on a pool of Export_Webcache_Records workers, each writing to its
+#                own shard database that is merged into the main database at the end
+#  Version 1.2 - Build All_Containers with one insert/select that names the containers and converts the
+#                times as it goes, index it on container_name
+#  Version 1.3 - Leave out and list the record ranges of workers that failed, merge the shards in one transaction
 # 
 # Usage Examples:
 # python3 export_Webcache.py /home/mark/webcachev01.dat Webcache.db3
+# python3 export_Webcache.py /home/mark/webcachev01.dat Webcache.db3 4     (number of workers, default one per processor)
 
 import pyesedb
 from Database import SQLiteDb
@@ -27,130 +33,17 @@ import sys
 import re
 import subprocess 
 
+# SQLite attaches at most 10 databases to one connection, the shards are all attached for the merge
+Max_Shards = 10
+
 # Setup dictionary for column types
 Column_Dict = {0:'NULL', 1:'Text', 2:'Integer', 3:'Integer', 4:'Integer', 5:'Integer', 6:'Real', 7:'Real', 8:'Integer', 9:'Blob', \
               10:'Text', 11:'Blob', 12:'Text', 13:'Integer', 14:'Integer', 15:'Integer', 16:'Text', 17:'Integer'}
 
-create_table_name = "All_Container_Data"  
-create_table_columns = "EntryId Integer , ContainerId Integer, UrlHash Integer, AccessCount Integer, SyncTime Integer, " + \
-                       " CreationTime Integer, ExpiryTime Integer, ModifiedTime Integer, AccessedTime Integer, " \
-                       " Url Text, Filename Text, FileSize Integer, container_name text"
 create_tab_columns = "EntryId Integer , ContainerId Integer, UrlHash Integer, AccessCount Integer, SyncTime text, " + \
                        " CreationTime text, ExpiryTime text, ModifiedTime text, AccessedTime text, " \
                        " Url Text, Filename Text, FileSize Integer, container_name text"
-              
-              
-def ole_date_bin_to_datetime(ole_date_bin):
-    """
-        Converts a OLE date from a binary 8 bytes little endian hex form to a datetime
-    """
-    #Conversion to OLE date float, where:
-    # - integer part: days from epoch (1899/12/30 00:00) 
-    # - decimal part: percentage of the day, where 0,5 is midday
-    date_float = unpack('<d', ole_date_bin)[0]
-    date_decimal, date_integer = math.modf(date_float)
-    date_decimal = abs(date_decimal)
-    date_integer = int(date_integer)
 
-    #Calculate the result
-    res = datetime.datetime(1899, 12, 30) + datetime.timedelta(days=date_integer) #adding days to epoch
-    res = res + datetime.timedelta(seconds = 86400*date_decimal) #adding percentage of the day
-    return res
-
-def Check_Column_Type(EsedbTable_Record, Column_Type, Column_Number, Record_List):
-    if (Column_Type == 0):   # Null
-       return "NULL"
-    elif (Column_Type == 1): #Boolean
-       if (EsedbTable_Record.get_value_data(Column_Number) == None):
-          return Record_List.append('NULL')
-       else:
-          return Record_List.append(str(EsedbTable_Record.get_value_data(Column_Number).decode('utf-16', 'ignore')))	
-    elif (Column_Type == 2): #INTEGER_8BIT_UNSIGNED
-       return Record_List.append(EsedbTable_Record.get_value_data_as_integer(Column_Number))
-    elif (Column_Type == 3): #INTEGER_16BIT_SIGNED
-       return Record_List.append(EsedbTable_Record.get_value_data_as_integer(Column_Number))	
-    elif (Column_Type == 4): #INTEGER_32BIT_SIGNED	
-       return Record_List.append(EsedbTable_Record.get_value_data_as_integer(Column_Number))
-    elif (Column_Type == 5): #CURRENCY
-       return Record_List.append(EsedbTable_Record.get_value_data_as_integer(Column_Number))	
-    elif (Column_Type == 6): #INTEGER_8BIT_UNSIGNED
-       return Record_List.append(EsedbTable_Record.get_value_data_as_floating_point(Column_Number))
-    elif (Column_Type == 7): #DOUBLE_64BIT
-       return Record_List.append(EsedbTable_Record.get_value_data_as_floating_point(Column_Number))	
-    elif (Column_Type == 8): #FLOAT_32BIT	
-       if (EsedbTable_Record.get_value_data(Column_Number) == None):
-          return Record_List.append('')
-       else:
-          return Record_List.append(ole_date_bin_to_datetime(EsedbTable_Record.get_value_data(Column_Number)))
-    elif (Column_Type == 9): #BINARY_DATA
-       if (EsedbTable_Record.get_value_data(Column_Number) == None):
-          return Record_List.append('')
-       else:
-          return Record_List.append(EsedbTable_Record.get_value_data(Column_Number))
-    elif (Column_Type == 10): #TEXT	
-       if (EsedbTable_Record.get_value_data(Column_Number) == None):
-          return Record_List.append('')
-       else:
-          return Record_List.append(EsedbTable_Record.get_value_data(Column_Number).decode('utf-16', 'ignore'))
-    elif (Column_Type == 11): #LARGE_BINARY_DATA
-       if (EsedbTable_Record.get_value_data(Column_Number) == None):
-          return Record_List.append('')
-       else:
-          return Record_List.append(EsedbTable_Record.get_value_data(Column_Number))
-    elif (Column_Type == 12): #LARGE_TEXT	
-       if (EsedbTable_Record.get_value_data(Column_Number) == None):
-          return Record_List.append('')
-       else:
-          compressed_text = EsedbTable_Record.get_value_data(Column_Number)
-          comp_text = compressed_text[1]
-          if comp_text == 24:
-             #print ("This text is EXPRESS Compressed")
-             return Record_List.append(EsedbTable_Record.get_value_data(Column_Number).decode('utf-16', 'ignore'))
-          elif comp_text >= 23:
-             #print ("This text is compressed using 7-bit")
-             compressed_data_index = 0
-             compressed_data = compressed_text
-             uncompressed_data_index = 0
-             compressed_data_size = len(compressed_data)
-             value_16bit = 0
-             bit_index = 0
-             compressed_data_index = 1
-             comp_data = 0
-             uncompressed_data = []
-             while compressed_data_index < compressed_data_size:
-                comp_data = (compressed_data[compressed_data_index])
-                value_16bit |= comp_data << bit_index
-                uncompressed_data_index = uncompressed_data_index + 1
-                uncompressed_data.append(chr(value_16bit & 0x7f))
-                value_16bit >>= 7
-                bit_index += 1
-                if bit_index == 7:
-                   uncompressed_data_index = uncompressed_data_index + 1
-                   uncompressed_data.append(chr(value_16bit & 0x7f))
-                   value_16bit >>= 7
-                   bit_index = 0
-                compressed_data_index += 1
-             last_char = uncompressed_data.pop()
-             out = "".join(uncompressed_data)
-             return Record_List.append(out) 
-          else:	
-             # print ("This text is not compressed")
-             return Record_List.append(EsedbTable_Record.get_value_data(Column_Number).decode('utf-16', 'ignore'))
-    elif (Column_Type == 13): #SUPER_LARGE_VALUE
-       return Record_List.append(EsedbTable_Record.get_value_data_as_integer(Column_Number))	
-    elif (Column_Type == 14): #INTEGER_32BIT_UNSIGNED	
-       return Record_List.append(EsedbTable_Record.get_value_data_as_integer(Column_Number))	
-    elif (Column_Type == 15): #INTEGER_64BIT_SIGNED
-       return Record_List.append(EsedbTable_Record.get_value_data_as_integer(Column_Number))	
-    elif (Column_Type == 16): #GUID	
-       if (EsedbTable_Record.get_value_data(Column_Number) == None):
-          return Record_List.append('')
-       else:
-          return Record_List.append(str(EsedbTable_Record.get_value_data(Column_Number).decode('utf-16', 'ignore')))
-    elif (Column_Type == 17): #INTEGER_16BIT_UNSIGNED
-       return Record_List.append(EsedbTable_Record.get_value_data_as_integer(Column_Number))	
- 
-			  
 def Parse_ESEDB_File(File_To_Parse, SQLite_DB_Name):
    file_object = open(File_To_Parse, "rb")
    esedb_file = pyesedb.file()
@@ -184,13 +77,13 @@ def Parse_ESEDB_File(File_To_Parse, SQLite_DB_Name):
           Num_Records_End = 20000
           while True:
              if Table_Num_Records < 19999:
-                ESEDB_Process_Records.append(["Export_Webcache_Records.exe", File_To_Parse, SQLite_DB_Name, Table_name, str(Num_Records_Begin), str(Table_Num_Records)])
+                ESEDB_Process_Records.append([Table_name, str(Num_Records_Begin), str(Table_Num_Records)])
                 break
              elif Table_Num_Records < Num_Records_End:
-                ESEDB_Process_Records.append(["Export_Webcache_Records.exe", File_To_Parse, SQLite_DB_Name, Table_name, str(Num_Records_Begin), str(Table_Num_Records)])
+                ESEDB_Process_Records.append([Table_name, str(Num_Records_Begin), str(Table_Num_Records)])
                 break
              else:
-                ESEDB_Process_Records.append(["Export_Webcache_Records.exe", File_To_Parse, SQLite_DB_Name, Table_name, str(Num_Records_Begin), str(Num_Records_End)])
+                ESEDB_Process_Records.append([Table_name, str(Num_Records_Begin), str(Num_Records_End)])
              Num_Records_Begin = Num_Records_Begin + 20000
              Num_Records_End = Num_Records_End + 20000
        else:
@@ -206,71 +99,109 @@ def Create_Permanent_Tables():
         print ("creating permanent " + str(Table_name), str(Table_name) + "_temp")
         SQLitedb.CreatePermanentTable(Table_name, str(Table_name) + "_temp")
 
-def Populate_ESEDB_DB(File_To_Parse, SQLite_DB_Name):
-   for Record_To_Process in ESEDB_Process_Records:
-      #print (Record_To_Process)
-      #print (Record_To_Process[0])
-      subprocess.run(Record_To_Process)
+def Populate_ESEDB_DB(File_To_Parse, SQLite_DB_Name, Number_Of_Workers):
+   # The record ranges are dealt out to the workers in turn.  Each worker is one Export_Webcache_Records
+   # run that opens the Webcache once for all of its ranges and writes them to its own shard database,
+   # so the workers never wait on each other for the database.  Returns the shard databases of the
+   # workers that finished, the shard of a worker that failed is removed and its ranges are listed.
+   Number_Of_Workers = max(1, min(Number_Of_Workers, len(ESEDB_Process_Records), Max_Shards))
+   Worker_Ranges = [[] for Worker in range(Number_Of_Workers)]
+   for Range_Number in range(0, len(ESEDB_Process_Records)):
+      Worker_Ranges[Range_Number % Number_Of_Workers].append(ESEDB_Process_Records[Range_Number])
+   Workers = []
+   for Worker in range(0, Number_Of_Workers):
+      Shard_DB_Name = SQLite_DB_Name + ".shard" + str(Worker)
+      Task_File_Name = Shard_DB_Name + ".tasks"
+      SQLitedb.RemoveDB_File(Shard_DB_Name)
+      with open(Task_File_Name, "w") as Task_File:
+         for Record_Range in Worker_Ranges[Worker]:
+            Task_File.write("\t".join(Record_Range) + "\n")
+      print ("Starting worker " + str(Worker) + " with " + str(len(Worker_Ranges[Worker])) + " record ranges")
+      Workers.append((Shard_DB_Name, Task_File_Name, subprocess.Popen(["Export_Webcache_Records.exe", File_To_Parse, Shard_DB_Name, Task_File_Name])))
+   Shards = []
+   for Worker in range(0, len(Workers)):
+      Shard_DB_Name, Task_File_Name, Worker_Process = Workers[Worker]
+      if Worker_Process.wait() != 0:
+         print ("Worker for " + Shard_DB_Name + " ended with return code " + str(Worker_Process.returncode) + \
+                ", its records are not in the database")
+         for Record_Range in Worker_Ranges[Worker]:
+            print ("   Skipped table " + Record_Range[0] + " records " + Record_Range[1] + " to " + Record_Range[2])
+         SQLitedb.RemoveDB_File(Shard_DB_Name)
+      elif os.path.isfile(Shard_DB_Name):
+         Shards.append(Shard_DB_Name)
+      os.remove(Task_File_Name)
+   return Shards
+
+def Merge_Shards(Shards):
+   # Copy every table of each shard into the same table of the main database in one transaction.  A
+   # database cannot be detached inside a transaction, so all the shards are attached first, the inserts
+   # all run in the transaction the first one opens and the first detach commits it.
+   for Shard_Number in range(0, len(Shards)):
+      SQLitedb.AttachDatabase(Shards[Shard_Number], "shard" + str(Shard_Number))
+   for Shard_Number in range(0, len(Shards)):
+      print ("Merging " + Shards[Shard_Number])
+      Shard_Name = "shard" + str(Shard_Number)
+      Shard_Tables = SQLitedb.SelectAllRows("select name from " + Shard_Name + ".sqlite_master where type = 'table'")
+      for Shard_Table in Shard_Tables:
+         Table_name = str(Shard_Table[0]).replace('"', '""')
+         SQLitedb.InsertSelect('insert into main."' + Table_name + '" select * from ' + Shard_Name + '."' + Table_name + '"')
+   for Shard_Number in range(0, len(Shards)):
+      SQLitedb.DetachDatabase("shard" + str(Shard_Number))
+      SQLitedb.RemoveDB_File(Shards[Shard_Number])
+
+def Filetime_To_Date(Column_Name):
+   # FILETIME (100 nanosecond ticks since 1601) to a date, a NULL or 0 time has no date and stays NULL
+   return "case when " + Column_Name + " is null or " + Column_Name + " = 0 then null " + \
+          "else datetime(SUBSTR(" + Column_Name + ",1,11)-11644473600, 'unixepoch') end"
 
 def Consolidate_Data():
+   # All the container tables go into All_Containers in one insert/select, the join to containers names
+   # each row and the times are converted on the way in, so the rows are only written once.  The index
+   # lets Parse_Webcache read one container at a time.  The container name loses its trailing character,
+   # its length is taken as a blob because length() on text stops at a null.
    Table_Names = SQLitedb.SelectAllRows("select 'container_'||containerid from containers where 'container_'||containerid in " + \
                                          " (select lower(name) from sqlite_master);")      
-   SQLitedb.CreateTable(create_table_name, create_table_columns)
+   SQLitedb.CreateTable("All_Containers", create_tab_columns)
+   Select_stmts = []
    for Table_Name in Table_Names:
         Table_name = str(Table_Name[0])
         print ("Inserting From " + str(Table_name))
-        ins_stmt = "insert into all_container_data (entryid, containerid, urlhash, accessCount, synctime, " + \
-                   " creationtime, expirytime, modifiedtime, accessedtime, url, filename, filesize) " + \
-                   " Select entryid, a.containerid, urlhash, accessCount, synctime, creationtime, expirytime, " + \
-                   " modifiedtime, accessedtime, url, filename, filesize " + \
-                   " from " + Table_name + " a, containers b where a.containerid = b.containerid;"
-        SQLitedb.InsertSelect(ins_stmt)
-   Container_Info = SQLitedb.SelectAllRows("select distinct name, containerid from containers")      
-   for Container_info in Container_Info:
-        container_name = str(Container_info[0])
-        container_name = container_name[:-1]
-        container_id = str(Container_info[1])
-        print ("Updating From " + str(container_name))
-        Upd_stmt = "Update All_Container_data set container_name = '" + container_name + "' where containerid = " + container_id + ";"
-        print (Upd_stmt)
-        SQLitedb.UpdateTable(Upd_stmt)
-   Upd_stmt = "Update all_container_data set synctime = (SUBSTR(synctime,1,11)-11644473600) where synctime <> 0;"
-   SQLitedb.UpdateTable(Upd_stmt)
-   Upd_stmt = "Update all_container_data set creationtime = (SUBSTR(creationtime,1,11)-11644473600) where creationtime <> 0;"
-   SQLitedb.UpdateTable(Upd_stmt)
-   Upd_stmt = "Update all_container_data set expirytime = (SUBSTR(expirytime,1,11)-11644473600) where expirytime <> 0;"
-   SQLitedb.UpdateTable(Upd_stmt)
-   Upd_stmt = "Update all_container_data set modifiedtime = (SUBSTR(modifiedtime,1,11)-11644473600) where modifiedtime <> 0;"
-   SQLitedb.UpdateTable(Upd_stmt)
-   Upd_stmt = "Update all_container_data set accessedtime = (SUBSTR(accessedtime,1,11)-11644473600) where accessedtime <> 0;"
-   SQLitedb.UpdateTable(Upd_stmt)
-   SQLitedb.CreateTable("All_Containers", create_tab_columns)
-   Insert_stmt = "insert into All_Containers select EntryId, ContainerId, UrlHash, AccessCount, " + \
-                 "datetime(SyncTime, 'unixepoch') SyncTime, datetime(CreationTime,'unixepoch') CreationTime, " + \
-                 "datetime(ExpiryTime,'unixepoch') ExpiryTime, datetime(ModifiedTime,'unixepoch') ModifiedTime, " + \
-                 "datetime(AccessedTime,'unixepoch') AccessTime, Url, Filename, FileSize, container_name from all_container_data;"
-   SQLitedb.InsertSelect(Insert_stmt)
-   
-   
+        Select_stmts.append("Select entryid, a.containerid, urlhash, accessCount, " + Filetime_To_Date("synctime") + ", " + \
+                            Filetime_To_Date("creationtime") + ", " + Filetime_To_Date("expirytime") + ", " + \
+                            Filetime_To_Date("modifiedtime") + ", " + Filetime_To_Date("accessedtime") + ", " + \
+                            " url, filename, filesize, substr(b.name, 1, length(cast(b.name as blob)) - 1) " + \
+                            " from " + Table_name + " a, containers b where a.containerid = b.containerid")
+   if len(Select_stmts) > 0:
+      Insert_stmt = "insert into All_Containers (EntryId, ContainerId, UrlHash, AccessCount, SyncTime, CreationTime, ExpiryTime, " + \
+                    " ModifiedTime, AccessedTime, Url, Filename, FileSize, container_name) " + " union all ".join(Select_stmts) + ";"
+      SQLitedb.InsertSelect(Insert_stmt)
+   SQLitedb.CreateIndex("All_Containers_Container_Name", "All_Containers", "container_name")
 
 args = sys.argv[1:]
 File_To_Parse = args[0]
 SQLite_DB_Name = args[1]
+if len(args) > 2:
+   Number_Of_Workers = int(args[2])
+else:
+   Number_Of_Workers = os.cpu_count() or 1
 print ('Webcache is ', str(File_To_Parse))
 print ('DB file is ', SQLite_DB_Name)
         
 SQLitedb = SQLiteDb()
 SQLitedb.RemoveDB_File(SQLite_DB_Name)
 SQLitedb.Open(SQLite_DB_Name)
+SQLitedb.SetBulkOptions()
 ESEDB_Process_Records = []
 
 Parse_ESEDB_File(File_To_Parse,SQLite_DB_Name)
 
 SQLitedb.Close()
 
-Populate_ESEDB_DB(File_To_Parse,SQLite_DB_Name)
+Shards = Populate_ESEDB_DB(File_To_Parse,SQLite_DB_Name,Number_Of_Workers)
 
 SQLitedb.Open(SQLite_DB_Name)
+SQLitedb.SetBulkOptions()
+Merge_Shards(Shards)
 Consolidate_Data()
 SQLitedb.Close()
 	
\ No newline at end of file
@@ -201,7 +201,7 @@ def parse_registry_file(file_to_parse):
             if ( x & user_acb_flags):
                 acb_desc = acb_desc + acb_flags_dict[x] + "\n"
          sql_val_columns.append(acb_desc)
-         SQLitedb.InsertBindValues(table_name, sql_ins_columns, sql_bind, sql_val_columns)
+         SQLitedb.BulkInsertBindValues(table_name, sql_ins_columns, sql_val_columns)
       except:
          print ("Bad Character")		  
 	  
@@ -220,6 +220,7 @@ print ('DB file is ', SQLite_DB_Name)
 SQLitedb = SQLiteDb()
 SQLitedb.RemoveDB_File(SQLite_DB_Name)
 SQLitedb.Open(SQLite_DB_Name)
+SQLitedb.SetBulkOptions()
 SQLitedb.CreateTable(table_name, table_columns)
 
 parse_registry_file(Registry_To_Parse)
@@ -0,0 +1,70 @@
+# Benchmark_Database.py = Python script to time row inserts through the SQLiteDb class
+#
+# Copyright (C) 2016 Mark McKinnon (Mark.McKinnon@Davenport.edu)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You can view the GNU General Public License at <http://www.gnu.org/licenses/>
+#
+# Version History:
+#  Initial Version - Compares InsertBindValues with BulkInsertBindValues using Event_Logs sized rows
+#
+# Usage Examples:
+# python3 Benchmark_Database.py 200000
+
+import os
+import sys
+import time
+import tempfile
+from Database import SQLiteDb
+
+table_name = 'Event_Logs'
+table_columns = 'file_name text, Recovered_Record text, Computer_name text, Event_Identifier number, Event_Identifier_Qualifiers text, ' + \
+                'Event_Level number, Event_Offset number, identifier number, Event_Source_Name text,' + \
+                'Event_User_Security_Identifier text, Event_Time text, Event_time_epoch number, Event_detail_text text'
+sql_ins_columns = 'file_name, recovered_record, Computer_name, Event_Identifier, Event_Identifier_Qualifiers, Event_Level, Event_Offset, ' + \
+                'identifier, Event_Source_Name, Event_User_Security_Identifier, Event_Time, Event_time_epoch, Event_detail_text'
+sql_bind = '?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?'
+
+def make_record(i):
+    return ['SECURITY.EVTX', 'N', 'WORKSTATION01', 4624, 0, 0, i, i * 1024, 'Microsoft-Windows-Security-Auditing', \
+            'S-1-5-18', '2016-03-01 12:00:00', 131012352000000000 + i, 'S-1-5-18 \nWORKSTATION01$ \nWORKGROUP \n0x3e7 \n']
+
+def time_inserts(db_name, number_of_rows, bulk):
+    SQLitedb = SQLiteDb()
+    SQLitedb.RemoveDB_File(db_name)
+    SQLitedb.Open(db_name)
+    if bulk:
+       SQLitedb.SetBulkOptions()
+    SQLitedb.CreateTable(table_name, table_columns)
+    start_time = time.time()
+    for i in range(0, number_of_rows):
+       if bulk:
+          SQLitedb.BulkInsertBindValues(table_name, sql_ins_columns, make_record(i))
+       else:
+          SQLitedb.InsertBindValues(table_name, sql_ins_columns, sql_bind, make_record(i))
+    SQLitedb.Close()
+    elapsed_time = time.time() - start_time
+    SQLitedb.RemoveDB_File(db_name)
+    return elapsed_time
+
+args = sys.argv[1:]
+if len(args) > 0:
+   Number_Of_Rows = int(args[0])
+else:
+   Number_Of_Rows = 100000
+DB_Name = os.path.join(tempfile.gettempdir(), 'benchmark_database.db3')
+
+Row_Time = time_inserts(DB_Name, Number_Of_Rows, False)
+Bulk_Time = time_inserts(DB_Name, Number_Of_Rows, True)
+print ('Rows inserted ==> ', Number_Of_Rows)
+print ('InsertBindValues ==> %.0f rows per second' % (Number_Of_Rows / Row_Time))
+print ('BulkInsertBindValues ==> %.0f rows per second' % (Number_Of_Rows / Bulk_Time))
@@ -33,6 +33,9 @@ class SQLiteDb(object):
     self._cursor = None
     self.filename = None
     self.read_only = None
+    self.bulk_batch_size = 5000
+    self._bulk_statements = {}
+    self._bulk_rows = {}
     self.reserved_word_list_dict = {'ABORT':0, 'ACTION':0, 'ADD':0, 'AFTER':0, 'ALL':0, 'ALTER':0, 'ANALYZE':0, 'AND':0, 'AS':0, 'ASC':0, \
                                     'ATTACH':0, 'AUTOINCREMENT':0, 'BEFORE':0, 'BEGIN':0, 'BETWEEN':0, 'BY':0, 'CASCADE':0, 'CASE':0, \
                                     'CAST':0, 'CHECK':0, 'COLLATE':0, 'COLUMN':0, 'COMMIT':0, 'CONFLICT':0, 'CONSTRAINT':0, 'CREATE':0, \
@@ -93,6 +96,9 @@ class SQLiteDb(object):
     if not self._connection:
       raise RuntimeError(u'Cannot close database not opened.')
 
+    # Write out anything still sitting in the bulk insert buffers
+    self.FlushBulkInserts()
+
     # We need to run commit or not all data is stored in the database.
     self._connection.commit()
     self._connection.close()
@@ -101,6 +107,8 @@ class SQLiteDb(object):
     self._cursor = None
     self.filename = None
     self.read_only = None
+    self._bulk_statements = {}
+    self._bulk_rows = {}
 
   def CreateTable(self, table_name, column_definitions):
     #Creates a table.
@@ -283,6 +291,200 @@ class SQLiteDb(object):
 	
     self._cursor.execute(sql_query, column_values)
 
+  def SetBulkOptions(self, batch_size=5000):
+    #Tunes the connection for loading scratch output.  The output database is rebuilt
+    #on every run so durability is traded for speed.
+    #
+    #Args:
+    #  batch_size: the number of rows buffered per table before they are written.
+
+    #Raises:
+    #  RuntimeError: if the database is not opened or
+    #                if the database is in read-only mode.
+
+    if not self._connection:
+      raise RuntimeError(u'Cannot set bulk options database not opened.')
+
+    if self.read_only:
+      raise RuntimeError(u'Cannot set bulk options database in read-only mode.')
+
+    self.bulk_batch_size = batch_size
+    self._connection.commit()
+    self._cursor.execute(u'PRAGMA journal_mode = MEMORY')
+    self._cursor.execute(u'PRAGMA synchronous = OFF')
+    self._cursor.execute(u'PRAGMA cache_size = -65536')
+
+  def BulkInsertBindValues(self, table_name, column_definitions, column_values):
+    #Buffers a row to be inserted into a table.  The insert statement is built once per
+    #table and column list and the buffer is written with executemany when it holds
+    #bulk_batch_size rows.  FlushBulkInserts must be called before the rows are read back.
+    #
+    #Args:
+    #  table_name: the table name.
+    #  column_definitions: list of strings containing column.
+    #  column_values: the values to actually inserted
+
+    #Raises:
+    #  RuntimeError: if the database is not opened or
+    #                if the database is in read-only mode.
+
+    if not self._connection:
+      raise RuntimeError(u'Cannot insert values database not opened.')
+
+    if self.read_only:
+      raise RuntimeError(u'Cannot insert values database in read-only mode.')
+
+    statement_key = (table_name, column_definitions)
+    if statement_key not in self._bulk_statements:
+      self._bulk_statements[statement_key] = u'insert into {0:s} ( {1:s} ) values ( {2:s} )'.format(
+          table_name, column_definitions, self.create_question_bind_variables(len(column_values)))
+      self._bulk_rows[statement_key] = []
+
+    bulk_rows = self._bulk_rows[statement_key]
+    bulk_rows.append(column_values)
+    if len(bulk_rows) >= self.bulk_batch_size:
+      self._WriteBulkRows(statement_key)
+
+  def FlushBulkInserts(self):
+    #Writes all the rows still buffered by BulkInsertBindValues.
+
+    #Raises:
+    #  RuntimeError: if the database is not opened.
+
+    if not self._connection:
+      raise RuntimeError(u'Cannot flush inserts database not opened.')
+
+    for statement_key in self._bulk_rows:
+      self._WriteBulkRows(statement_key)
+
+  def _WriteBulkRows(self, statement_key):
+    #Writes the buffered rows for one statement in a single transaction.  If the batch
+    #fails it is rolled back and the rows are retried one at a time so one bad row
+    #does not lose the rest of the batch.
+    #
+    #Args:
+    #  statement_key: the (table name, column definitions) the rows were buffered under.
+
+    bulk_rows = self._bulk_rows[statement_key]
+    if not bulk_rows:
+      return
+    sql_query = self._bulk_statements[statement_key]
+
+    self._connection.commit()
+    try:
+      self._cursor.executemany(sql_query, bulk_rows)
+    except (sqlite3.Error, UnicodeError):
+      self._connection.rollback()
+      for column_values in bulk_rows:
+        try:
+          self._cursor.execute(sql_query, column_values)
+        except (sqlite3.Error, UnicodeError):
+          print ("Error inserting row into " + statement_key[0] + " ==> " + str(column_values))
+    self._connection.commit()
+    del bulk_rows[:]
+
+  def AttachDatabase(self, file_name, schema_name):
+    #Attaches another database file so its tables can be read as schema_name.table.
+    #
+    #Args:
+    #  file_name: the database file to attach.
+    #  schema_name: the name the attached database is referenced by.
+
+    #Raises:
+    #  RuntimeError: if the database is not opened.
+
+    if not self._connection:
+      raise RuntimeError(u'Cannot attach database database not opened.')
+
+    # Attach cannot be run inside of a transaction
+    self._connection.commit()
+    self._cursor.execute(u'ATTACH DATABASE ? AS {0:s}'.format(schema_name), (file_name,))
+
+  def DetachDatabase(self, schema_name):
+    #Detaches a database attached with AttachDatabase.
+    #
+    #Args:
+    #  schema_name: the name the attached database is referenced by.
+
+    #Raises:
+    #  RuntimeError: if the database is not opened.
+
+    if not self._connection:
+      raise RuntimeError(u'Cannot detach database database not opened.')
+
+    self._connection.commit()
+    self._cursor.execute(u'DETACH DATABASE {0:s}'.format(schema_name))
+
+  def AppendAttachedTable(self, table_name, schema_name):
+    #Copies a table from an attached database into the same table in this database,
+    #creating the table the first time.
+    #
+    #Args:
+    #  table_name: the table name.
+    #  schema_name: the name the attached database is referenced by.
+
+    #Raises:
+    #  RuntimeError: if the database is not opened or
+    #                if the database is in read-only mode.
+
+    if not self._connection:
+      raise RuntimeError(u'Cannot append attached table database not opened.')
+
+    if self.read_only:
+      raise RuntimeError(u'Cannot append attached table database in read-only mode.')
+
+    if self.TableExists(table_name):
+      sql_query = 'insert into ' + table_name + ' select * from ' + schema_name + '.' + table_name + ';'
+    else:
+      sql_query = 'Create Table ' + table_name + ' as select * from ' + schema_name + '.' + table_name + ';'
+
+    self._cursor.execute(sql_query)
+    self._connection.commit()
+
+  def CreateIndex(self, index_name, table_name, column_definitions):
+    #Creates an index on a table if it does not already exist.
+    #
+    #Args:
+    #  index_name: the index name.
+    #  table_name: the table name.
+    #  column_definitions: list of strings containing the indexed columns.
+
+    #Raises:
+    #  RuntimeError: if the database is not opened or
+    #                if the database is in read-only mode.
+
+    if not self._connection:
+      raise RuntimeError(u'Cannot create index database not opened.')
+
+    if self.read_only:
+      raise RuntimeError(u'Cannot create index database in read-only mode.')
+
+    sql_query = u'CREATE INDEX IF NOT EXISTS {0:s} ON {1:s} ( {2:s} )'.format(
+        index_name, table_name, column_definitions)
+
+    self._cursor.execute(sql_query)
+
+  def CreateTableAsSelect(self, table_name, sql_query):
+    #Creates a table from the results of a select statement.
+    #
+    #Args:
+    #  table_name: the table name.
+    #  sql_query: the select statement that populates the table.
+
+    #Raises:
+    #  RuntimeError: if the database is not opened or
+    #                if the database is in read-only mode.
+
+    if not self._connection:
+      raise RuntimeError(u'Cannot create table database not opened.')
+
+    if self.read_only:
+      raise RuntimeError(u'Cannot create table database in read-only mode.')
+
+    sql_query = u'Create Table {0:s} as {1:s}'.format(table_name, sql_query)
+
+    self._cursor.execute(sql_query)
+
   def TableExists(self, table_name):
     # Checks if the table exists in the database
 
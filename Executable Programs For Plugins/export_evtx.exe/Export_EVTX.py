@@ -19,6 +19,8 @@
 # 
 # Usage Examples:
 # python3 export_EVTX.py /home/mark/eventlog_directory event_logs.db3
+# python3 export_EVTX.py /home/mark/eventlog_directory event_logs.db3 --workers 4
+# python3 export_EVTX.py /home/mark/eventlog_directory event_logs.db3 --event-ids 4624,4625,4688 --start-time "2016-03-01 00:00:00"
 
 import os
 import sys
@@ -27,14 +29,22 @@ import codecs
 from Database import SQLiteDb
 import ntpath
 import argparse
+import multiprocessing
+import tempfile
+import datetime
 
 table_name = 'Event_Logs'
 table_columns = 'file_name text, Recovered_Record text, Computer_name text, Event_Identifier number, Event_Identifier_Qualifiers text, ' + \
                 'Event_Level number, Event_Offset number, identifier number, Event_Source_Name text,' + \
-                'Event_User_Security_Identifier text, Event_Time text, Event_time_epoch number, Event_detail_text text'
+                'Event_User_Security_Identifier text, Event_Time text, Event_time_epoch number, Event_detail_text text, File_Name_Key text'
 sql_ins_columns = 'file_name, recovered_record, Computer_name, Event_Identifier, Event_Identifier_Qualifiers, Event_Level, Event_Offset, ' + \
-                'identifier, Event_Source_Name, Event_User_Security_Identifier, Event_Time, Event_time_epoch, Event_detail_text' 
-sql_bind = '?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?'
+                'identifier, Event_Source_Name, Event_User_Security_Identifier, Event_Time, Event_time_epoch, Event_detail_text, File_Name_Key' 
+sql_bind = '?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?'
+
+# Per file event id histogram that the ingest modules read for the long tail view
+count_table_name = 'Event_Id_Counts'
+count_table_select = 'select File_Name_Key, file_name, Event_Identifier, count(*) Number_Of_Events from Event_Logs ' + \
+                     'group by File_Name_Key, file_name, Event_Identifier'
 
 def uprint(*objects, sep=' ', end='\n', file=sys.stdout):
     enc = file.encoding
@@ -60,22 +70,81 @@ def get_filepaths(directory):
     return file_paths # Self-explanatory.
 
 
-def parse_event_log(file_to_parse):
+def filetime_from_string(time_string):
+
+    # Event times are compared as FILETIME integers so records never have to be converted
+    time_value = datetime.datetime.strptime(time_string, '%Y-%m-%d %H:%M:%S')
+    return int((time_value - datetime.datetime(1601, 1, 1)).total_seconds()) * 10000000
+
+def event_id_list(event_ids):
+
+    # argparse type for --event-ids, blank entries are skipped and an id that is not a number is refused
+    event_id_numbers = []
+    for event_id in event_ids.split(','):
+       if event_id.strip() == '':
+          continue
+       try:
+          event_id_numbers.append(int(event_id))
+       except ValueError:
+          raise argparse.ArgumentTypeError("event id '" + event_id.strip() + "' is not a number")
+    if len(event_id_numbers) == 0:
+       raise argparse.ArgumentTypeError('no event ids in ' + repr(event_ids))
+    return event_id_numbers
+
+def build_event_filter(args):
+
+    # Returns None when nothing is filtered so the record loop can skip the checks entirely
+    if args.event_ids == None and args.providers == None and args.start_time == None and args.end_time == None:
+       return None
+    event_filter = {'event_ids': None, 'providers': None, 'start_time': None, 'end_time': None}
+    if args.event_ids != None:
+       event_filter['event_ids'] = set(args.event_ids)
+    if args.providers != None:
+       event_filter['providers'] = set([provider.strip().upper() for provider in args.providers.split(',') if provider.strip() != ''])
+    if args.start_time != None:
+       event_filter['start_time'] = filetime_from_string(args.start_time)
+    if args.end_time != None:
+       event_filter['end_time'] = filetime_from_string(args.end_time)
+    return event_filter
+
+def match_event_filter(evtx_record, event_filter):
+
+    # Only the fields needed to decide are read, strings and detail text are left alone
+    if event_filter['event_ids'] != None and evtx_record.get_event_identifier() not in event_filter['event_ids']:
+       return False
+    if event_filter['start_time'] != None or event_filter['end_time'] != None:
+       written_time = evtx_record.get_written_time_as_integer()
+       if event_filter['start_time'] != None and written_time < event_filter['start_time']:
+          return False
+       if event_filter['end_time'] != None and written_time > event_filter['end_time']:
+          return False
+    if event_filter['providers'] != None:
+       source_name = evtx_record.get_source_name()
+       if source_name == None or source_name.upper() not in event_filter['providers']:
+          return False
+    return True
+
+def parse_event_log(file_to_parse, SQLitedb, event_filter=None):
 
    
+   file_name = ntpath.basename(file_to_parse)
+   file_name_key = file_name.upper()
    file_object = open(file_to_parse, "rb")
    evtx_file = pyevtx.file()
    evtx_file.open_file_object(file_object)
-   SQLitedb.CreateTempTable(table_name + '_temp', table_columns)   
+   if not SQLitedb.TableExists(table_name):
+      SQLitedb.CreateTable(table_name, table_columns)
 
    print (' Number of Records in Event Log ==> ', evtx_file.get_number_of_records())
    print (' Number of recovered Records in Event Log ==> ', evtx_file.get_number_of_recovered_records())
 
    for i in range (0, evtx_file.get_number_of_records()):
-      event_record = []
-      event_record.append(ntpath.basename(file_to_parse))
-      event_string = ""
       evtx_record = evtx_file.get_record(i)
+      if event_filter != None and not match_event_filter(evtx_record, event_filter):
+         continue
+      event_record = []
+      event_record.append(file_name)
+      event_strings = []
       event_record.append('N')
       if (evtx_record.get_computer_name() == None):
          event_record.append('NULL')
@@ -97,35 +166,94 @@ def parse_event_log(file_to_parse):
       event_record.append(evtx_record.get_written_time())
       event_record.append(evtx_record.get_written_time_as_integer()) 
       for x in range (0, evtx_record.get_number_of_strings()):
-         if (evtx_record.get_string(x) == None):
-            event_string = event_string + " \n"
+         event_string = evtx_record.get_string(x)
+         if (event_string == None):
+            event_strings.append(" \n")
          else:
-            event_string = event_string + evtx_record.get_string(x) + " \n"
-      event_record.append(event_string)	  
-  
-      SQLitedb.InsertBindValues(table_name + '_temp', sql_ins_columns, sql_bind, event_record) 
+            event_strings.append(event_string + " \n")
+      event_record.append("".join(event_strings))
+      event_record.append(file_name_key)
 
+      # Rows go straight into the permanent table, the bulk insert buffer keeps memory flat
+      SQLitedb.BulkInsertBindValues(table_name, sql_ins_columns, event_record)
 
-   if (SQLitedb.TableExists(table_name)):  
-      SQLitedb.AppendTempToPermanentTable(table_name)
-   else:
-      SQLitedb.CreatePermanentTable(table_name)
-   SQLitedb.DropTable(table_name + '_temp')
+   SQLitedb.FlushBulkInserts()
+   evtx_file.close()
+   file_object.close()
 
+def create_indexes(SQLitedb):
 
-   
-args = sys.argv[1:]
-Directory_To_Parse = args[0]
-SQLite_DB_Name = args[1]
-print ('Dir is ', str(Directory_To_Parse))
-print ('DB file is ', SQLite_DB_Name)
-SQLitedb = SQLiteDb()
-SQLitedb.Open(SQLite_DB_Name)
-
-# Run the above function and store its results in a variable.   
-Full_File_Paths = get_filepaths(Directory_To_Parse)
-
-for files in Full_File_Paths:
-   parse_event_log(files)
-SQLitedb.Close()  
+   # Post load step so the ingest modules can read each file's rows with an index lookup
+   # instead of scanning Event_Logs once per file
+   SQLitedb.CreateIndex('Event_Logs_File_Name_Key', table_name, 'File_Name_Key')
+   SQLitedb.CreateIndex('Event_Logs_Event_Id_File_Name', table_name, 'Event_Identifier, File_Name_Key')
+   if SQLitedb.TableExists(count_table_name):
+      SQLitedb.DropTable(count_table_name)
+   SQLitedb.CreateTableAsSelect(count_table_name, count_table_select)
+   SQLitedb.CreateIndex('Event_Id_Counts_File_Name_Key', count_table_name, 'File_Name_Key')
+
+def parse_event_log_shard(shard_to_parse):
+
+   # Runs in a worker process, each event log gets its own shard database
+   file_to_parse, shard_db_name, event_filter = shard_to_parse
+   Shard_db = SQLiteDb()
+   Shard_db.RemoveDB_File(shard_db_name)
+   Shard_db.Open(shard_db_name)
+   Shard_db.SetBulkOptions()
+   parse_event_log(file_to_parse, Shard_db, event_filter)
+   Shard_db.Close()
+   return shard_db_name
+
+def parse_event_logs_parallel(Full_File_Paths, SQLitedb, number_of_workers, event_filter=None):
+
+   # Shards are merged back in the same order as the file list so the Event_Logs
+   # table ends up the same as a serial run
+   Shard_Dir = tempfile.mkdtemp(prefix='evtx_shards_', dir=os.path.dirname(os.path.abspath(SQLitedb.filename)))
+   Shards = []
+   for i in range(0, len(Full_File_Paths)):
+      Shards.append([Full_File_Paths[i], os.path.join(Shard_Dir, 'shard_' + str(i) + '.db3'), event_filter])
+
+   with multiprocessing.Pool(number_of_workers) as pool:
+      for shard_db_name in pool.imap(parse_event_log_shard, Shards):
+         SQLitedb.AttachDatabase(shard_db_name, 'shard')
+         SQLitedb.AppendAttachedTable(table_name, 'shard')
+         SQLitedb.DetachDatabase('shard')
+         SQLitedb.RemoveDB_File(shard_db_name)
+   os.rmdir(Shard_Dir)
+
+
+if __name__ == '__main__':
+   multiprocessing.freeze_support()
+
+   parser = argparse.ArgumentParser(description='Export EVTX logs to a SQLite database')
+   parser.add_argument('directory', help='directory containing the event logs')
+   parser.add_argument('database', help='SQLite database to write to')
+   parser.add_argument('--workers', type=int, default=1, help='number of worker processes to parse the event logs with')
+   parser.add_argument('--event-ids', dest='event_ids', type=event_id_list, help='comma delimited list of event ids to export, all others are skipped')
+   parser.add_argument('--providers', help='comma delimited list of event source names to export')
+   parser.add_argument('--start-time', dest='start_time', help='only export events written at or after this UTC time (YYYY-MM-DD HH:MM:SS)')
+   parser.add_argument('--end-time', dest='end_time', help='only export events written at or before this UTC time (YYYY-MM-DD HH:MM:SS)')
+   args = parser.parse_args()
+   Event_Filter = build_event_filter(args)
+   Directory_To_Parse = args.directory
+   SQLite_DB_Name = args.database
+   print ('Dir is ', str(Directory_To_Parse))
+   print ('DB file is ', SQLite_DB_Name)
+   SQLitedb = SQLiteDb()
+   SQLitedb.Open(SQLite_DB_Name)
+   SQLitedb.SetBulkOptions()
+   if not SQLitedb.TableExists(table_name):
+      SQLitedb.CreateTable(table_name, table_columns)
+
+   # Run the above function and store its results in a variable.   
+   Full_File_Paths = get_filepaths(Directory_To_Parse)
+
+   if args.workers > 1 and len(Full_File_Paths) > 1:
+      print ('Number of workers ==> ', args.workers)
+      parse_event_logs_parallel(Full_File_Paths, SQLitedb, args.workers, Event_Filter)
+   else:
+      for files in Full_File_Paths:
+         parse_event_log(files, SQLitedb, Event_Filter)
+   create_indexes(SQLitedb)
+   SQLitedb.Close()  
 
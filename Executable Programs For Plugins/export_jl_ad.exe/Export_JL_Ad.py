@@ -150,10 +150,8 @@ def parse_Compound_File(file_to_parse):
         new_link_item = pylnk.file()
         new_link_item.open_file_object(new_item)
         jl_record = Create_Bind_Values(jl_record, new_link_item)
-        try:
-            SQLitedb.InsertBindValues(table_name + '_temp', sql_ins_columns, sql_bind, jl_record)
-        except:
-            print ("Error in Link Item ==> " + str(jl_record[1]) + " <==> " + str(jl_record[2]))
+        SQLitedb.BulkInsertBindValues(table_name + '_temp', sql_ins_columns, jl_record)
+    SQLitedb.FlushBulkInserts()
     if (SQLitedb.TableExists(table_name)):
         SQLitedb.AppendTempToPermanentTable(table_name)
     else:
@@ -173,6 +171,7 @@ App_Id.Open(App_id_db)
 #SQLite_DB_Name = input("What is the Name of the SQLite DB to create: ")
 SQLitedb = SQLiteDb()
 SQLitedb.Open(SQLite_DB_Name)
+SQLitedb.SetBulkOptions()
 # Run the above function and store its results in a variable.   
 Full_File_Paths = get_filepaths(Directory_To_Parse)
 #Full_File_Paths = get_filepaths(str(sys.argv[0]))
@@ -67,6 +67,11 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -106,6 +111,8 @@ class ParseFileHistoryIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ParseFileHistoryIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ParseFileHistoryIngestModuleFactory.moduleName, ParseFileHistoryIngestModuleFactory().getModuleVersionNumber())
 
         # Get path to EXE based on where this script is run from.
         # Assumes EXE is in same folder as script
@@ -134,102 +141,59 @@ class ParseFileHistoryIngestModule(DataSourceIngestModule):
 		# exist and if not then create them
         skCase = Case.getCurrentCase().getSleuthkitCase();
                 
-        # This will work in 4.0.1 and beyond
-        # Use blackboard class to index blackboard artifacts for keyword search
-        blackboard = Case.getCurrentCase().getServices().getBlackboard()
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(ParseFileHistoryIngestModuleFactory.moduleName)
 
-        try:
-             self.log(Level.INFO, "Begin Create New Artifacts")
-             artID_cat1 = skCase.addArtifactType( "TSK_FH_CATALOG_1", "File History Catalog 1")
-        except:		
-             self.log(Level.INFO, "Artifacts Creation Error, Catalog 1. ==> ")
-             artID_cat1 = skCase.getArtifactTypeID("TSK_FH_CATALOG_1")
-        try:
-             self.log(Level.INFO, "Begin Create New Artifacts")
-             artID_cat2 = skCase.addArtifactType( "TSK_FH_CATALOG_2", "File History Catalog 2")
-        except:		
-             self.log(Level.INFO, "Artifacts Creation Error, Catalog 2. ==> ")
-             artID_cat2 = skCase.getArtifactTypeID("TSK_FH_CATALOG_2")
-             
-        # Create the attribute type, if it exists then catch the error
-        try:
-            attID_fh_pn = skCase.addArtifactAttributeType('TSK_FH_PATH', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Parent Path")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Prefetch Parent Path. ==> ")
+# Artifacts are posted to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ParseFileHistoryIngestModuleFactory.moduleName)
 
-        try:
-            attID_fh_fn = skCase.addArtifactAttributeType('TSK_FH_FILE_NAME', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Name")			 
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, File Name. ==> ")
+        artID_cat1 = registry.getOrAddArtifactType( "TSK_FH_CATALOG_1", "File History Catalog 1").getTypeID()
+        artID_cat2 = registry.getOrAddArtifactType( "TSK_FH_CATALOG_2", "File History Catalog 2").getTypeID()
+        attID_fh_pn = registry.getOrAddAttributeType('TSK_FH_PATH', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Parent Path")
 
-        try:
-            attID_fh_fs = skCase.addArtifactAttributeType('TSK_FH_FILE_SIZE', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Size")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, File Size. ==> ")
+        attID_fh_fn = registry.getOrAddAttributeType('TSK_FH_FILE_NAME', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Name")
 
-        try:
-            attID_fh_usn = skCase.addArtifactAttributeType('TSK_FH_USN_JOURNAL_ENTRY', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "USN Journal Entry")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, USN Journal Entry. ==> ")
+        attID_fh_fs = registry.getOrAddAttributeType('TSK_FH_FILE_SIZE', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Size")
 
-        try:
-            attID_fh_fc = skCase.addArtifactAttributeType('TSK_FH_FILE_CREATED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "File Created")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, File Created. ==> ")
+        attID_fh_usn = registry.getOrAddAttributeType('TSK_FH_USN_JOURNAL_ENTRY', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "USN Journal Entry")
 
-        try:
-            attID_fh_fm = skCase.addArtifactAttributeType('TSK_FH_FILE_MODIFIED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "File Modified")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 3. ==> ")
+        attID_fh_fc = registry.getOrAddAttributeType('TSK_FH_FILE_CREATED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "File Created")
 
-        try:
-            attID_fh_bq = skCase.addArtifactAttributeType('TSK_FH_BACKUP_QUEUED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Queued")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Backup Queued ==> ")
+        attID_fh_fm = registry.getOrAddAttributeType('TSK_FH_FILE_MODIFIED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "File Modified")
 
-        try:
-            attID_fh_bc = skCase.addArtifactAttributeType('TSK_FH_BACKUP_CREATED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Created")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Backup Created ==> ")
+        attID_fh_bq = registry.getOrAddAttributeType('TSK_FH_BACKUP_QUEUED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Queued")
 
-        try:
-            attID_fh_bcp = skCase.addArtifactAttributeType('TSK_FH_BACKUP_CAPTURED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Captured")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Backup Captured. ==> ")
+        attID_fh_bc = registry.getOrAddAttributeType('TSK_FH_BACKUP_CREATED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Created")
 
-        try:
-            attID_fh_bu = skCase.addArtifactAttributeType('TSK_FH_BACKUP_UPDATED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Updated")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Backup Updated. ==> ")
+        attID_fh_bcp = registry.getOrAddAttributeType('TSK_FH_BACKUP_CAPTURED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Captured")
 
-        try:
-            attID_fh_bv = skCase.addArtifactAttributeType('TSK_FH_BACKUP_VISIBLE', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Visible")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Backup Visible ==> ")
+        attID_fh_bu = registry.getOrAddAttributeType('TSK_FH_BACKUP_UPDATED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Updated")
+
+        attID_fh_bv = registry.getOrAddAttributeType('TSK_FH_BACKUP_VISIBLE', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Visible")
 
         self.log(Level.INFO, "Get Artifacts after they were created.")
         # Get the new artifacts and attributes that were just created
-        #artID_wfh = skCase.getArtifactTypeID("TSK_PREFETCH")
-        #artID_cat1 = skCase.getArtifactType("TSK_FH_CATALOG_1")
-        #artID_cat2 = skCase.getArtifactType("TSK_FH_CATALOG_2")
-        attID_fh_pn = skCase.getAttributeType("TSK_FH_PATH")
-        attID_fh_fn = skCase.getAttributeType("TSK_FH_FILE_NAME")
-        attID_fh_fs = skCase.getAttributeType("TSK_FH_FILE_SIZE")
-        attID_fh_usn = skCase.getAttributeType("TSK_FH_USN_JOURNAL_ENTRY")
-        attID_fh_fc = skCase.getAttributeType("TSK_FH_FILE_CREATED")
-        attID_fh_fm = skCase.getAttributeType("TSK_FH_FILE_MODIFIED")
-        attID_fh_bq = skCase.getAttributeType("TSK_FH_BACKUP_QUEUED")
-        attID_fh_bc = skCase.getAttributeType("TSK_FH_BACKUP_CREATED")
-        attID_fh_bcp = skCase.getAttributeType("TSK_FH_BACKUP_CAPTURED")
-        attID_fh_bu = skCase.getAttributeType("TSK_FH_BACKUP_UPDATED")
-        attID_fh_bv = skCase.getAttributeType("TSK_FH_BACKUP_VISIBLE")
+        #artID_wfh = registry.getArtifactTypeID("TSK_PREFETCH")
+        #artID_cat1 = registry.getArtifactType("TSK_FH_CATALOG_1")
+        #artID_cat2 = registry.getArtifactType("TSK_FH_CATALOG_2")
+        attID_fh_pn = registry.getAttributeType("TSK_FH_PATH")
+        attID_fh_fn = registry.getAttributeType("TSK_FH_FILE_NAME")
+        attID_fh_fs = registry.getAttributeType("TSK_FH_FILE_SIZE")
+        attID_fh_usn = registry.getAttributeType("TSK_FH_USN_JOURNAL_ENTRY")
+        attID_fh_fc = registry.getAttributeType("TSK_FH_FILE_CREATED")
+        attID_fh_fm = registry.getAttributeType("TSK_FH_FILE_MODIFIED")
+        attID_fh_bq = registry.getAttributeType("TSK_FH_BACKUP_QUEUED")
+        attID_fh_bc = registry.getAttributeType("TSK_FH_BACKUP_CREATED")
+        attID_fh_bcp = registry.getAttributeType("TSK_FH_BACKUP_CAPTURED")
+        attID_fh_bu = registry.getAttributeType("TSK_FH_BACKUP_UPDATED")
+        attID_fh_bv = registry.getAttributeType("TSK_FH_BACKUP_VISIBLE")
 
         # we don't know how much work there is yet
         progressBar.switchToIndeterminate()
         
         # Find the file history files from the users folders
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "%edb", "%/Windows/FileHistory/%")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "%edb", "%/Windows/FileHistory/%"))
         
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
@@ -254,11 +218,10 @@ class ParseFileHistoryIngestModule(DataSourceIngestModule):
             #self.log(Level.INFO, "Processing file: " + file.getName())
             fileCount += 1
 
-            # Save the DB locally in the temp folder. use file id as name to reduce collisions
-            lclDbPath = os.path.join(Temp_Dir, file.getName() + "_" + str(file.getId()))
+            # The program only reads the catalog, so it reads the extraction cache copy
+            lclDbPath = self.extractionCache.getLocalPath(file)
             db_name = os.path.splitext(file.getName())[0]
             lclSQLPath = os.path.join(Temp_Dir, db_name + "_" + str(file.getId()) + ".db3")
-            ContentUtils.writeToFile(file, File(lclDbPath))
                         
             # Run the EXE, saving output to a sqlite database
             if PlatformUtil.isWindowsOS():
@@ -272,11 +235,9 @@ class ParseFileHistoryIngestModule(DataSourceIngestModule):
             self.log(Level.INFO, "Output from run is ==> " + out_text)                
 		
             if db_name == "Catalog1":
-                artID_fh = skCase.getArtifactTypeID("TSK_FH_CATALOG_1")
-                artID_fh_evt = skCase.getArtifactType("TSK_FH_CATALOG_1")
+                artID_fh = registry.getArtifactTypeID("TSK_FH_CATALOG_1")
             else:
-                artID_fh = skCase.getArtifactTypeID("TSK_FH_CATALOG_2")
-                artID_fh_evt = skCase.getArtifactType("TSK_FH_CATALOG_2")
+                artID_fh = registry.getArtifactTypeID("TSK_FH_CATALOG_2")
 
             userpath = file.getParentPath()
             username = userpath.split('/')
@@ -343,13 +304,9 @@ class ParseFileHistoryIngestModule(DataSourceIngestModule):
                                   (BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), \
                                     ParseFileHistoryIngestModuleFactory.moduleName, username[2]))))
                 
-                try:
-                    #index the artifact for keyword search
-                    blackboard.indexArtifact(art)
-                except Blackboard.BlackboardException as e:
-                    self.log(Level.SEVERE, "Error indexing artifact " + art.getDisplayName())
+                poster.postArtifact(art)
                 
-            IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(ParseFileHistoryIngestModuleFactory.moduleName, artID_fh_evt, None))
+            poster.flush()
             
             # Clean up
             stmt.close()
@@ -367,4 +324,7 @@ class ParseFileHistoryIngestModule(DataSourceIngestModule):
             "Windows File History Parser", " Windows File History Has Been Parsed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
@@ -32,6 +32,7 @@
 # 
 # Comments 
 #   Version 1.0 - Initial version - May 2020
+#   Version 1.1 - Only look at the local files in the data source for takeout archives
 # 
 
 import jarray
@@ -153,7 +154,10 @@ class GoogleTakeoutIngestModule(DataSourceIngestModule):
         # get the current case
         skCase = Case.getCurrentCase().getSleuthkitCase();
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "%", "/")
+        # Only the local files added to the data source have a path to hand to the program, ask
+        # for those instead of going through every file in the data source
+        files = skCase.findAllFilesWhere("data_source_obj_id = " + str(dataSource.getId()) + \
+                                         " and type = " + str(TskData.TSK_DB_FILES_TYPE_ENUM.LOCAL.getFileType()))
         numFiles = len(files)
         self.log(Level.INFO, "Number of files to process ==> " + str(numFiles))
         for file in files:
@@ -68,6 +68,11 @@ from org.sleuthkit.autopsy.datamodel import ContentUtils
 #from org.sleuthkit.datamodel import Relationship
 #from org.sleuthkit.datamodel import Account
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 
 # Factory that defines the name and details of the module and allows Autopsy
@@ -114,6 +119,8 @@ class LeveldbParserIngestModule(DataSourceIngestModule):
 
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(LeveldbParserIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(LeveldbParserIngestModuleFactory.moduleName, LeveldbParserIngestModuleFactory().getModuleVersionNumber())
         if PlatformUtil.isWindowsOS(): 
            self.pathToExe = os.path.join(os.path.dirname(os.path.abspath(__file__)), "leveldb-dump.exe")
 #           self.pathToExe = os.path.join(os.path.dirname(os.path.abspath(__file__)), "leveldb_Parser.exe")
@@ -133,8 +140,13 @@ class LeveldbParserIngestModule(DataSourceIngestModule):
         
         # get current case and the store.vol abstract file information
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(LeveldbParserIngestModuleFactory.moduleName)
+
+        poster = BlackboardPoster(LeveldbParserIngestModuleFactory.moduleName)
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "manifest-%")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "manifest-%"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -142,12 +154,7 @@ class LeveldbParserIngestModule(DataSourceIngestModule):
 
         artifactId = 0
 
-        try:
-             artId = skCase.addArtifactType("TSK_LEVELDB", "LevelDb Database(s)")
-             artifactId = skCase.getArtifactTypeID("TSK_LEVELDB")
-        except:		
-             artifactId = skCase.getArtifactTypeID("TSK_LEVELDB")
-             self.log(Level.INFO, "Artifacts Creation Error for artifact ==> TSK_LEVELDB")
+        artifactId = registry.getOrAddArtifactType("TSK_LEVELDB", "LevelDb Database(s)").getTypeID()
 
 
 		# Create Event Log directory in temp directory, if it exists then continue on processing		
@@ -188,7 +195,7 @@ class LeveldbParserIngestModule(DataSourceIngestModule):
                     else:                    
             
                         extractedLevelDbFile = os.path.join(manifestDirectory, levelDbFile.getName())
-                        ContentUtils.writeToFile(levelDbFile, File(extractedLevelDbFile))
+                        self.extractionCache.copyTo(levelDbFile, extractedLevelDbFile)
                         #os.remove(extractedFile)
 
                 sqliteDbFile = os.path.join(temporaryDirectory, str(file.getId()) + ".db3")
@@ -204,24 +211,28 @@ class LeveldbParserIngestModule(DataSourceIngestModule):
                 with open(csvOutFile + ".csv", 'rU') as csvfile:
                     csvreader = csv.reader(csvfile, delimiter=',', quotechar='|')
                     for row in csvreader:
-                        art = file.newArtifact(artifactId)
+                        attributes = []
                         for (data, head) in zip(row, attribute_names): 
-                            art.addAttribute(BlackboardAttribute(skCase.getAttributeType(head), LeveldbParserIngestModuleFactory.moduleName, data))
+                            attributes.append(BlackboardAttribute(registry.getAttributeType(head), LeveldbParserIngestModuleFactory.moduleName, data))
                                 #self.log(Level.INFO, "artifact_created. ==> " + "TSK_CSV_" + col_name.upper() + " =====> " + data)
-                        art.addAttribute(BlackboardAttribute(skCase.getAttributeType("TSK_PATH"), LeveldbParserIngestModuleFactory.moduleName, file.getParentPath()))
+                        attributes.append(BlackboardAttribute(registry.getAttributeType("TSK_PATH"), LeveldbParserIngestModuleFactory.moduleName, file.getParentPath()))
+                        poster.newArtifact(file, artifactId, attributes)
             
 
             #self.processFbChat(databaseFile)
             #self.processChats(skCase, file)
             #os.remove(extractedFile)
  
-			
+        poster.flush()
 
         # After all databases, post a message to the ingest messages in box.
         message = IngestMessage.createMessage(IngestMessage.MessageType.DATA,
             "LevelDb Parser", " LevelDb's Have Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
 
@@ -0,0 +1,142 @@
+# Ingest_Ledger.py = Jython helper that remembers which inputs a module has already processed
+#
+# Contact: Mark McKinnon [Mark [dot] McKinnon <at> Davenport [dot] edu]
+#
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+# Copied next to each data source module that uses it, same as Blackboard_Poster.py.
+#
+# Comments
+#   Version 1.0 - Initial version - October 2026
+#
+# Usage:
+#   self.ledger = IngestLedger(SomeIngestModuleFactory.moduleName, SomeIngestModuleFactory().getModuleVersionNumber(), \
+#                              self.local_settings, ['Setting_1', 'Setting_2'])
+#   files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "SOME_FILE"))
+#   ... extract, parse and post the artifacts ...
+#   self.ledger.commit()
+#
+# The ledger is a SQLite database in the case module output directory with one row per
+# (module, input obj_id) holding the size, MD5, modified time, module version and a hash of
+# the settings the input was processed with.  unprocessed only hands back the inputs that
+# are new or where one of those changed, so running a module again only does the new work
+# instead of adding the same artifacts a second time.  The inputs are only recorded when
+# commit is called, a run that stops part way through is done again the next time.
+
+import hashlib
+import os
+
+from java.lang import Class
+from java.lang import System
+from java.sql import DriverManager
+from org.sleuthkit.autopsy.casemodule import Case
+
+class IngestLedger(object):
+
+    def __init__(self, module_name, module_version, settings=None, setting_names=[]):
+        self.module_name = module_name
+        self.module_version = module_version
+        settings_text = ""
+        for setting_name in setting_names:
+            settings_text = settings_text + setting_name + "=" + str(settings.getSetting(setting_name)) + "\n"
+        self.settings_hash = hashlib.md5(settings_text).hexdigest()
+        self.ledger_file = os.path.join(Case.getCurrentCase().getModuleDirectory(), "Ingest_Ledger.db3")
+        self._pending = []
+
+    def unprocessed(self, inputs, together=False):
+        # Returns the inputs that have not been processed with the same content, module version
+        # and settings and queues them for commit.  With together the inputs are only useful as
+        # a set (a hive and the files next to it), if any one of them changed all are returned.
+        changed = []
+        dbConn = self._connect()
+        try:
+            stmt = dbConn.prepareStatement("select size, md5, mtime, module_version, settings_hash from ingest_ledger " + \
+                                           " where module_name = ? and obj_id = ?")
+            for content in inputs:
+                size, md5, mtime = self._fingerprint(content)
+                stmt.setString(1, self.module_name)
+                stmt.setLong(2, content.getId())
+                resultSet = stmt.executeQuery()
+                if not (resultSet.next() and resultSet.getLong("size") == size and resultSet.getLong("mtime") == mtime and \
+                        (md5 == None or resultSet.getString("md5") == None or resultSet.getString("md5") == md5) and \
+                        resultSet.getString("module_version") == self.module_version and \
+                        resultSet.getString("settings_hash") == self.settings_hash):
+                    changed.append(content)
+                resultSet.close()
+            stmt.close()
+        finally:
+            dbConn.close()
+
+        if together and len(changed) > 0:
+            changed = list(inputs)
+        self._pending.extend(changed)
+        return changed
+
+    def commit(self):
+        # Records everything unprocessed handed out as done
+        if len(self._pending) == 0:
+            return
+        dbConn = self._connect()
+        try:
+            dbConn.setAutoCommit(False)
+            stmt = dbConn.prepareStatement("insert or replace into ingest_ledger (module_name, obj_id, size, md5, mtime, " + \
+                                           " module_version, settings_hash, processed_time) values (?, ?, ?, ?, ?, ?, ?, ?)")
+            for content in self._pending:
+                size, md5, mtime = self._fingerprint(content)
+                stmt.setString(1, self.module_name)
+                stmt.setLong(2, content.getId())
+                stmt.setLong(3, size)
+                stmt.setString(4, md5)
+                stmt.setLong(5, mtime)
+                stmt.setString(6, self.module_version)
+                stmt.setString(7, self.settings_hash)
+                stmt.setLong(8, System.currentTimeMillis())
+                stmt.addBatch()
+            stmt.executeBatch()
+            stmt.close()
+            dbConn.commit()
+        finally:
+            dbConn.close()
+        self._pending = []
+
+    def _fingerprint(self, content):
+        # Files have a MD5 (once the hash module has run) and a modified time, data sources only a size
+        md5 = None
+        mtime = 0
+        if hasattr(content, "getMd5Hash"):
+            md5 = content.getMd5Hash()
+        if hasattr(content, "getMtime"):
+            mtime = content.getMtime()
+        return content.getSize(), md5, mtime
+
+    def _connect(self):
+        Class.forName("org.sqlite.JDBC").newInstance()
+        dbConn = DriverManager.getConnection("jdbc:sqlite:%s" % self.ledger_file)
+        stmt = dbConn.createStatement()
+        # Shared by all the modules in the case
+        stmt.execute("PRAGMA busy_timeout = 30000")
+        stmt.execute("create table if not exists ingest_ledger (module_name text, obj_id integer, size integer, md5 text, " + \
+                     " mtime integer, module_version text, settings_hash text, processed_time integer, primary key (module_name, obj_id))")
+        stmt.close()
+        return dbConn
@@ -84,6 +84,11 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -131,6 +136,8 @@ class MacFSEventsIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(MacFSEventsIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(MacFSEventsIngestModuleFactory.moduleName, MacFSEventsIngestModuleFactory().getModuleVersionNumber())
 
         #Show parameters that are passed in
         if PlatformUtil.isWindowsOS():
@@ -172,8 +179,13 @@ class MacFSEventsIngestModule(DataSourceIngestModule):
 
         # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(MacFSEventsIngestModuleFactory.moduleName)
+
+        poster = BlackboardPoster(MacFSEventsIngestModuleFactory.moduleName)
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "%", ".fseventsd")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "%", ".fseventsd"))
         numFiles = len(files)
 
         for file in files:
@@ -188,7 +200,7 @@ class MacFSEventsIngestModule(DataSourceIngestModule):
 
                 # Save the DB locally in the temp folder. use file id as name to reduce collisions
                 filePath = os.path.join(temp_dir, file.getName())
-                ContentUtils.writeToFile(file, File(filePath))
+                self.extractionCache.linkTo(file, filePath)
 
         
         self.log(Level.INFO, "Number of files to process ==> " + str(numFiles))
@@ -216,36 +228,20 @@ class MacFSEventsIngestModule(DataSourceIngestModule):
             #self.log(Level.INFO, "SQL Statement ==> " + sql_statement)
             resultSet1 = stmt1.executeQuery(sql_statement1)
             while resultSet1.next():
-                try:
-                     self.log(Level.INFO, "Begin Create New Artifacts")
-                     artID_fse = skCase.addArtifactType( resultSet1.getString("artifact_name"), resultSet1.getString("artifact_title"))
-                except:		
-                     self.log(Level.INFO, "Artifacts Creation Error, " + resultSet1.getString("artifact_name") + " some artifacts may not exist now. ==> ")
+                artID_fse = registry.getOrAddArtifactType( resultSet1.getString("artifact_name"), resultSet1.getString("artifact_title")).getTypeID()
                                       
         except SQLException as e:
            self.log(Level.INFO, "Could not open database file (not SQLite) " + database_file + " (" + e.getMessage() + ")")
            #return IngestModule.ProcessResult.OK
         
         # Create the attribute type, if it exists then catch the error
-        try:
-            attID_fse_fn = skCase.addArtifactAttributeType("TSK_FSEVENTS_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Name")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, File Name. ==> ")
+        attID_fse_fn = registry.getOrAddAttributeType("TSK_FSEVENTS_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Name")
         
-        try:
-            attID_fse_msk = skCase.addArtifactAttributeType("TSK_FSEVENTS_FILE_MASK", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Mask")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Mask. ==> ")
+        attID_fse_msk = registry.getOrAddAttributeType("TSK_FSEVENTS_FILE_MASK", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Mask")
         
-        try:
-            attID_fse_src = skCase.addArtifactAttributeType("TSK_FSEVENTS_SOURCE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Source File")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Mask. ==> ")
+        attID_fse_src = registry.getOrAddAttributeType("TSK_FSEVENTS_SOURCE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Source File")
 
-        try:
-            attID_fse_dte = skCase.addArtifactAttributeType("TSK_FSEVENTS_DATES", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Date(s)")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Mask. ==> ")
+        attID_fse_dte = registry.getOrAddAttributeType("TSK_FSEVENTS_DATES", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Date(s)")
              
         try: 
             Class.forName("org.sqlite.JDBC").newInstance()
@@ -254,67 +250,54 @@ class MacFSEventsIngestModule(DataSourceIngestModule):
             self.log(Level.INFO, "Could not open database file (not SQLite) " + database_file + " (" + e.getMessage() + ")")
             return IngestModule.ProcessResult.OK
         
-        #artID_fse = skCase.getArtifactTypeID("TSK_MACOS_FSEVENTS")
-        #artID_fse_evt = skCase.getArtifactType("TSK_MACOS_FSEVENTS")
-        artID_fse = skCase.getArtifactTypeID("TSK_MACOS_ALL_FSEVENTS")
-        artID_fse_evt = skCase.getArtifactType("TSK_MACOS_ALL_FSEVENTS")
-        attID_fse_fn = skCase.getAttributeType("TSK_FSEVENTS_FILE_NAME")
-        attID_fse_msk = skCase.getAttributeType("TSK_FSEVENTS_FILE_MASK")
-        attID_fse_src = skCase.getAttributeType("TSK_FSEVENTS_SOURCE")
-        attID_fse_dte = skCase.getAttributeType("TSK_FSEVENTS_DATES")
+        #artID_fse = registry.getArtifactTypeID("TSK_MACOS_FSEVENTS")
+        artID_fse = registry.getArtifactTypeID("TSK_MACOS_ALL_FSEVENTS")
+        attID_fse_fn = registry.getAttributeType("TSK_FSEVENTS_FILE_NAME")
+        attID_fse_msk = registry.getAttributeType("TSK_FSEVENTS_FILE_MASK")
+        attID_fse_src = registry.getAttributeType("TSK_FSEVENTS_SOURCE")
+        attID_fse_dte = registry.getAttributeType("TSK_FSEVENTS_DATES")
  
-        # Query the database 
+        # Map each FSEvents file name back to the file(s) it was extracted from, the parser
+        # records the path of the copy it read in the source column
+        fseventsFiles = {}
         for file in files:
-            if ('slack' in file.getName()):
-                pass
-            elif (file.getName() == '..') or (file.getName() == '.'):
-                pass
-            else:
-               stmt1 = dbConn1.createStatement()
-               sql_statement1 = "select sql_statement, artifact_name, artifact_title from extracted_content_sql;"
-               #self.log(Level.INFO, "SQL Statement ==> " + sql_statement)
-               resultSet1 = stmt1.executeQuery(sql_statement1)
-               while resultSet1.next():
-                    try:
-                        artID_fse = skCase.getArtifactTypeID(resultSet1.getString("artifact_name"))
-                        artID_fse_evt = skCase.getArtifactType(resultSet1.getString("artifact_name"))
-                                 
-                        try:
-                            stmt = dbConn.createStatement()
-                            sql_statement = resultSet1.getString("sql_statement") + " and source like '%" + file.getName() + "';"
-                            #self.log(Level.INFO, "SQL Statement ==> " + sql_statement)
-                            resultSet = stmt.executeQuery(sql_statement)
-                            #self.log(Level.INFO, "query SQLite Master table ==> " )
-                            #self.log(Level.INFO, "query " + str(resultSet))
-                            # Cycle through each row and create artifact
-                            while resultSet.next():
-                            # Add the attributes to the artifact.
-                                art = file.newArtifact(artID_fse)
-                                #self.log(Level.INFO, "Result ==> " + resultSet.getString("mask") + ' <==> ' + resultSet.getString("source"))
-                                art.addAttributes(((BlackboardAttribute(attID_fse_fn, MacFSEventsIngestModuleFactory.moduleName, resultSet.getString("filename"))), \
-                                              (BlackboardAttribute(attID_fse_msk, MacFSEventsIngestModuleFactory.moduleName, resultSet.getString("mask"))), \
-                                              (BlackboardAttribute(attID_fse_src, MacFSEventsIngestModuleFactory.moduleName, resultSet.getString("source"))), \
-                                              (BlackboardAttribute(attID_fse_dte, MacFSEventsIngestModuleFactory.moduleName, resultSet.getString("OTHER_DATES")))))
-                                              
-                                #try:
-                                # index the artifact for keyword search
-                                   #blackboard.indexArtifact(art)
-                                #except:
-                                   #self.log(Level.INFO, "Error indexing artifact " + art.getDisplayName())
-
-                        except SQLException as e:
-                           self.log(Level.INFO, "Could not open database file (not SQLite) " + database_file + " (" + e.getMessage() + ")")
-                           return IngestModule.ProcessResult.OK
-                    except SQLException as e:
-                        self.log(Level.INFO, "Could not open database file (not SQLite) " + database_file + " (" + e.getMessage() + ")")
+            if ('slack' in file.getName()) or (file.getName() == '..') or (file.getName() == '.'):
+                continue
+            if file.getName() not in fseventsFiles:
+                fseventsFiles[file.getName()] = []
+            fseventsFiles[file.getName()].append(file)
 
+        # Run each category statement once and route every row to the file it came from
+        stmt1 = dbConn1.createStatement()
+        stmt = dbConn.createStatement()
+        sql_statement1 = "select sql_statement, artifact_name, artifact_title from extracted_content_sql;"
+        resultSet1 = stmt1.executeQuery(sql_statement1)
+        while resultSet1.next():
+            # Check if the user pressed cancel while we were busy
+            if self.context.isJobCancelled():
+                return IngestModule.ProcessResult.OK
+
+            artID_fse = registry.getArtifactTypeID(resultSet1.getString("artifact_name"))
+            self.log(Level.INFO, "Processing FSEvents ==> " + resultSet1.getString("artifact_title"))
             try:
-               stmt.close()
-            except:
-                 self.log(Level.INFO, "Error closing statement for " + file.getName())
-                 
-            # Fire an event to notify the UI and others that there are new artifacts  
-            IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(MacFSEventsIngestModuleFactory.moduleName, artID_fse_evt, None))
+                resultSet = stmt.executeQuery(resultSet1.getString("sql_statement"))
+                resultSet.setFetchSize(500)
+                while resultSet.next():
+                    source = resultSet.getString("source")
+                    if source == None:
+                        continue
+                    for file in fseventsFiles.get(source.replace("\\", "/").split("/")[-1], []):
+                        poster.newArtifact(file, artID_fse, \
+                                      ((BlackboardAttribute(attID_fse_fn, MacFSEventsIngestModuleFactory.moduleName, resultSet.getString("filename"))), \
+                                      (BlackboardAttribute(attID_fse_msk, MacFSEventsIngestModuleFactory.moduleName, resultSet.getString("mask"))), \
+                                      (BlackboardAttribute(attID_fse_src, MacFSEventsIngestModuleFactory.moduleName, source)), \
+                                      (BlackboardAttribute(attID_fse_dte, MacFSEventsIngestModuleFactory.moduleName, resultSet.getString("OTHER_DATES")))))
+                resultSet.close()
+            except SQLException as e:
+                self.log(Level.INFO, "Error running FSEvents query for " + resultSet1.getString("artifact_name") + " (" + e.getMessage() + ")")
+
+        # Fire an event to notify the UI and others that there are new artifacts  
+        poster.flush()
 
         try:
              stmt.close()
@@ -333,6 +316,9 @@ class MacFSEventsIngestModule(DataSourceIngestModule):
             "MacFSEventsSettings", " MacFSEventsSettings Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
    
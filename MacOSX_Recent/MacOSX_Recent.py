@@ -65,6 +65,11 @@ from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 from org.sleuthkit.datamodel import TskCoreException
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -110,6 +115,8 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ParseMacOS_RecentIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ParseMacOS_RecentIngestModuleFactory.moduleName, ParseMacOS_RecentIngestModuleFactory().getModuleVersionNumber())
 
         # Get path to EXE based on where this script is run from.
         # Assumes EXE is in same folder as script
@@ -192,6 +199,9 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
             "Mac OS Recent Artifacts", " Mac OS Recents Artifacts Have Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
 
@@ -201,6 +211,12 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
         progressBar.switchToIndeterminate()
 
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(ParseMacOS_RecentIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ParseMacOS_RecentIngestModuleFactory.moduleName)
         
         try: 
            Class.forName("org.sqlite.JDBC").newInstance()
@@ -234,13 +250,9 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
            self.log(Level.INFO, "Artifact Type (" + resultSet_art.getString("autopsy_art_type") + ")")
            
            if resultSet_art.getString("autopsy_art_type") != 'AUTOPSY':
-               try:
-                  self.log(Level.INFO, "Begin Create New Artifacts ==> " + resultSet_art.getString("autopsy_art_name"))
-                  self.artifact_name = resultSet_art.getString("autopsy_art_name")
-                  artID_art = skCase.addArtifactType( resultSet_art.getString("autopsy_art_name"), \
-                                                      resultSet_art.getString("autopsy_art_description"))
-               except TskCoreException as ex:		
-                  self.log(Level.INFO, "Artifacts Creation Error, artifact " + resultSet_art.getString("autopsy_art_name") + " exists. ==> " + str(ex), ex)
+               self.artifact_name = resultSet_art.getString("autopsy_art_name")
+               artID_art = registry.getOrAddArtifactType(resultSet_art.getString("autopsy_art_name"), \
+                                                         resultSet_art.getString("autopsy_art_description")).getTypeID()
            else:
                self.artifact_name = resultSet_art.getString("autopsy_art_name")
 
@@ -256,35 +268,17 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
            while resultSet_att.next():
                 if resultSet_att.getString("autopsy_attrib_type")  == 'CUSTOM':
                     if resultSet_att.getString("autopsy_attrib_value_type_desc") == 'String':
-                        try:
-                           attID_vss_num = skCase.addArtifactAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet_att.getString("autopsy_attrib_desc"))
-                        except:		
-                           self.log(Level.INFO, "Attributes Creation Error for ," +  resultSet_att.getString("autopsy_attrib_name") + " ==> ")
+                        attID_vss_num = registry.getOrAddAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet_att.getString("autopsy_attrib_desc"))
                     elif resultSet_att.getString("autopsy_attrib_value_type_desc") == 'Integer':
-                        try:
-                           attID_vss_num = skCase.addArtifactAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.INTEGER, resultSet_att.getString("autopsy_attrib_desc"))
-                        except:		
-                           self.log(Level.INFO, "Attributes Creation Error for ," +  resultSet_att.getString("autopsy_attrib_name") + " ==> ")
+                        attID_vss_num = registry.getOrAddAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.INTEGER, resultSet_att.getString("autopsy_attrib_desc"))
                     elif resultSet_att.getString("autopsy_attrib_value_type_desc") == 'Long':
-                        try:
-                           attID_vss_num = skCase.addArtifactAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet_att.getString("autopsy_attrib_desc"))
-                        except:		
-                           self.log(Level.INFO, "Attributes Creation Error for ," +  resultSet_att.getString("autopsy_attrib_name") + " ==> ")
+                        attID_vss_num = registry.getOrAddAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet_att.getString("autopsy_attrib_desc"))
                     elif resultSet_att.getString("autopsy_attrib_value_type_desc") == 'Double':
-                        try:
-                           attID_vss_num = skCase.addArtifactAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DOUBLE, resultSet_att.getString("autopsy_attrib_desc"))
-                        except:		
-                           self.log(Level.INFO, "Attributes Creation Error for ," +  resultSet_att.getString("autopsy_attrib_name") + " ==> ")
+                        attID_vss_num = registry.getOrAddAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DOUBLE, resultSet_att.getString("autopsy_attrib_desc"))
                     elif resultSet_att.getString("autopsy_attrib_value_type_desc") == 'Byte':
-                        try:
-                           attID_vss_num = skCase.addArtifactAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.BYTE, resultSet_att.getString("autopsy_attrib_desc"))
-                        except:		
-                           self.log(Level.INFO, "Attributes Creation Error for ," +  resultSet_att.getString("autopsy_attrib_name") + " ==> ")
+                        attID_vss_num = registry.getOrAddAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.BYTE, resultSet_att.getString("autopsy_attrib_desc"))
                     else:
-                        try:
-                           attID_vss_num = skCase.addArtifactAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, resultSet_att.getString("autopsy_attrib_desc"))
-                        except:		
-                           self.log(Level.INFO, "Attributes Creation Error for ," +  resultSet_att.getString("autopsy_attrib_name") + " ==> ")
+                        attID_vss_num = registry.getOrAddAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, resultSet_att.getString("autopsy_attrib_desc"))
         except SQLException as e:
            self.log(Level.INFO, "Error querying database for artifacts/attributes (" + e.getMessage() + ")")
            return IngestModule.ProcessResult.OK
@@ -299,7 +293,7 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
             macos_table_name = resultSet.getString("mac_osx_art_table_name")
             self.path_to_plist_exe = os.path.join(os.path.dirname(os.path.abspath(__file__)), resultSet.getString("mac_osx_art_exec_file"))
             fileManager = Case.getCurrentCase().getServices().getFileManager()
-            files = fileManager.findFiles(dataSource, macos_file_name, macos_dir_name)
+            files = self.ledger.unprocessed(fileManager.findFiles(dataSource, macos_file_name, macos_dir_name))
             numFiles = len(files)
             self.log(Level.INFO, "found " + str(numFiles) + " files")
             progressBar.switchToDeterminate(numFiles)
@@ -335,7 +329,7 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
 
                 # Save the DB locally in the temp folder. use file id as name to reduce collisions
                 lclDbPath = os.path.join(Temp_Dir + "\macos_recent", file.getName())
-                ContentUtils.writeToFile(file, File(lclDbPath))
+                self.extractionCache.linkTo(file, lclDbPath)
 
                 lclDbPath = os.path.join(Temp_Dir + "\macos_recent", macos_database_name)
                 lclFilePath = os.path.join(Temp_Dir + "\macos_recent", macos_file_name)
@@ -375,8 +369,7 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
                    self.log(Level.INFO, "Error querying database for history table (" + e.getMessage() + ")")
                    return IngestModule.ProcessResult.OK
 
-                artID_hst = skCase.getArtifactTypeID(self.artifact_name)
-                artID_hst_evt = skCase.getArtifactType(self.artifact_name)
+                artID_hst = registry.getArtifactTypeID(self.artifact_name)
 
                 meta = resultSet_3.getMetaData()
                 columncount = meta.getColumnCount()
@@ -393,50 +386,50 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
                        #self.log(Level.INFO, SQL_String_1)
                        self.log(Level.INFO, "Artifact Is ==> " + str(artID_hst))
                        
-                       art = file.newArtifact(artID_hst)
+                       attributes = []
                        self.log(Level.INFO, "Inserting attribute URL")
                        for col_name in column_names:
                            if ((col_name == "TSK_VERSION") and (mac_os_art_id == 1)):
                                self.os_version = resultSet_3.getString(col_name)
-                           attID_ex1 = skCase.getAttributeType(col_name)
+                           attID_ex1 = registry.getAttributeType(col_name)
                            self.log(Level.INFO, "Inserting attribute ==> " + str(attID_ex1))
                            self.log(Level.INFO, "Attribute Type ==> " + str(attID_ex1.getValueType()))
                            if attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING:
                                 try:
-                                    art.addAttribute(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getString(col_name)))
+                                    attributes.append(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getString(col_name)))
                                 except:		
                                     self.log(Level.INFO, "Attributes String Creation Error, " + col_name + " ==> ")
                            elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.INTEGER:
                                 try:
-                                    art.addAttribute(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
+                                    attributes.append(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
                                 except:		
                                     self.log(Level.INFO, "Attributes Integer Creation Error, " + col_name + " ==> ")
                            elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG:
                                 try:
-                                    art.addAttribute(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
+                                    attributes.append(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
                                 except:		
                                     self.log(Level.INFO, "Attributes Long Creation Error, " + col_name + " ==> ")
                            elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DOUBLE:
                                 try:
-                                    art.addAttribute(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
+                                    attributes.append(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
                                 except:		
                                     self.log(Level.INFO, "Attributes Double Creation Error, " + col_name + " ==> ")
                            elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.BYTE:
                                 try:
-                                    art.addAttribute(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getString(col_name)))
+                                    attributes.append(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getString(col_name)))
                                 except:		
                                     self.log(Level.INFO, "Attributes Byte Creation Error, " + col_name + " ==> ")
                            else:
                                 try:
-                                    art.addAttribute(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getReal(col_name)))
+                                    attributes.append(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getReal(col_name)))
                                 except:		
                                     self.log(Level.INFO, "Attributes Datatime Creation Error, " + col_name + " ==> ")
+                       poster.newArtifact(file, artID_hst, attributes)
 
                    except SQLException as e:
                        self.log(Level.INFO, "Error getting values from web_history table (" + e.getMessage() + ")")
 
-                IngestServices.getInstance().fireModuleDataEvent(
-                       ModuleDataEvent(ParseMacOS_RecentIngestModuleFactory.moduleName, artID_hst_evt, None))
+                poster.flush()
 
                 stmt_3.close()
                 stmt_2.close()
@@ -465,6 +458,12 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
         progressBar.switchToIndeterminate()
 
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(ParseMacOS_RecentIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ParseMacOS_RecentIngestModuleFactory.moduleName)
         
         try: 
            Class.forName("org.sqlite.JDBC").newInstance()
@@ -498,13 +497,9 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
            self.log(Level.INFO, "Artifact Type (" + resultSet_art.getString("autopsy_art_type") + ")")
            
            if resultSet_art.getString("autopsy_art_type") != 'AUTOPSY':
-               try:
-                  self.log(Level.INFO, "Begin Create New Artifacts ==> " + resultSet_art.getString("autopsy_art_name"))
-                  artID_art = skCase.addArtifactType( resultSet_art.getString("autopsy_art_name"), \
-                                                      resultSet_art.getString("autopsy_art_desctiption"))
-                  self.artifact_name = resultSet_art.getString("autopsy_art_name")
-               except:		
-                  self.log(Level.INFO, "Artifacts Creation Error, artifact " + resultSet_art.getString("autopsy_art_name") + " exists. ==> ")
+               self.artifact_name = resultSet_art.getString("autopsy_art_name")
+               artID_art = registry.getOrAddArtifactType(resultSet_art.getString("autopsy_art_name"), \
+                                                         resultSet_art.getString("autopsy_art_description")).getTypeID()
            else:
                self.artifact_name = resultSet_art.getString("autopsy_art_name")
 
@@ -520,35 +515,17 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
            while resultSet_att.next():
                if resultSet_att.getString("autopsy_attrib_type")  == 'CUSTOM':
                     if resultSet_att.getString("autopsy_attrib_value_type_desc") == 'String':
-                        try:
-                           attID_vss_num = skCase.addArtifactAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet_att.getString("autopsy_attrib_desc"))
-                        except:		
-                           self.log(Level.INFO, "Attributes Creation Error for ," +  resultSet_att.getString("autopsy_attrib_name") + " ==> ")
+                        attID_vss_num = registry.getOrAddAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet_att.getString("autopsy_attrib_desc"))
                     elif resultSet_att.getString("autopsy_attrib_value_type_desc") == 'Integer':
-                        try:
-                           attID_vss_num = skCase.addArtifactAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.INTEGER, resultSet_att.getString("autopsy_attrib_desc"))
-                        except:		
-                           self.log(Level.INFO, "Attributes Creation Error for ," +  resultSet_att.getString("autopsy_attrib_name") + " ==> ")
+                        attID_vss_num = registry.getOrAddAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.INTEGER, resultSet_att.getString("autopsy_attrib_desc"))
                     elif resultSet_att.getString("autopsy_attrib_value_type_desc") == 'Long':
-                        try:
-                           attID_vss_num = skCase.addArtifactAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet_att.getString("autopsy_attrib_desc"))
-                        except:		
-                           self.log(Level.INFO, "Attributes Creation Error for ," +  resultSet_att.getString("autopsy_attrib_name") + " ==> ")
+                        attID_vss_num = registry.getOrAddAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet_att.getString("autopsy_attrib_desc"))
                     elif resultSet_att.getString("autopsy_attrib_value_type_desc") == 'Double':
-                        try:
-                           attID_vss_num = skCase.addArtifactAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DOUBLE, resultSet_att.getString("autopsy_attrib_desc"))
-                        except:		
-                           self.log(Level.INFO, "Attributes Creation Error for ," +  resultSet_att.getString("autopsy_attrib_name") + " ==> ")
+                        attID_vss_num = registry.getOrAddAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DOUBLE, resultSet_att.getString("autopsy_attrib_desc"))
                     elif resultSet_att.getString("autopsy_attrib_value_type_desc") == 'Byte':
-                        try:
-                           attID_vss_num = skCase.addArtifactAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.BYTE, resultSet_att.getString("autopsy_attrib_desc"))
-                        except:		
-                           self.log(Level.INFO, "Attributes Creation Error for ," +  resultSet_att.getString("autopsy_attrib_name") + " ==> ")
+                        attID_vss_num = registry.getOrAddAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.BYTE, resultSet_att.getString("autopsy_attrib_desc"))
                     else:
-                        try:
-                           attID_vss_num = skCase.addArtifactAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, resultSet_att.getString("autopsy_attrib_desc"))
-                        except:		
-                           self.log(Level.INFO, "Attributes Creation Error for ," +  resultSet_att.getString("autopsy_attrib_name") + " ==> ")
+                        attID_vss_num = registry.getOrAddAttributeType(resultSet_att.getString("autopsy_attrib_name"), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, resultSet_att.getString("autopsy_attrib_desc"))
         except SQLException as e:
            self.log(Level.INFO, "Error querying database for artifacts/attributes (" + e.getMessage() + ")")
            return IngestModule.ProcessResult.OK
@@ -563,7 +540,7 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
             #macos_table_name = resultSet.getString("mac_osx_art_table_name")
             #self.path_to_plist_exe = os.path.join(os.path.dirname(os.path.abspath(__file__)), resultSet.getString("mac_osx_art_exec_file"))
             fileManager = Case.getCurrentCase().getServices().getFileManager()
-            files = fileManager.findFiles(dataSource, macos_file_name + "%", macos_dir_name)
+            files = self.ledger.unprocessed(fileManager.findFiles(dataSource, macos_file_name + "%", macos_dir_name))
             numFiles = len(files)
             self.log(Level.INFO, "found " + str(numFiles) + " files")
             progressBar.switchToDeterminate(numFiles)
@@ -609,11 +586,11 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
                     self.log(Level.INFO, "File Name ==> " + file.getName() + " <==> " + macos_database_name + " <++> " + str(file.getId()))
                     lclDbPath = os.path.join(Temp_Dir + "\macos_recent", str(file_id) + "-" + file.getName())
                     self.log(Level.INFO, " Database name ==> " + lclDbPath)
-                    ContentUtils.writeToFile(file, File(lclDbPath))
+                    self.extractionCache.copyTo(file, lclDbPath)
                 else:
                     lclDbPath = os.path.join(Temp_Dir + "\macos_recent", str(file_id) + "-" + file.getName())
                     self.log(Level.INFO, " Database name ==> " + lclDbPath)
-                    ContentUtils.writeToFile(file, File(lclDbPath))
+                    self.extractionCache.copyTo(file, lclDbPath)
                     
 
                 lclDbPath = os.path.join(Temp_Dir + "\macos_recent", str(file_id) + "-" + macos_database_name)
@@ -648,8 +625,7 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
                    self.log(Level.INFO, "Error querying database for history table (" + e.getMessage() + ")")
                    return IngestModule.ProcessResult.OK
 
-                artID_hst = skCase.getArtifactTypeID(self.artifact_name)
-                artID_hst_evt = skCase.getArtifactType(self.artifact_name)
+                artID_hst = registry.getArtifactTypeID(self.artifact_name)
 
                 meta = resultSet_3.getMetaData()
                 columncount = meta.getColumnCount()
@@ -666,48 +642,48 @@ class ParseMacOS_RecentIngestModule(DataSourceIngestModule):
                        #self.log(Level.INFO, SQL_String_1)
                        self.log(Level.INFO, "Artifact Is ==> " + str(artID_hst))
                        
-                       art = file.newArtifact(artID_hst)
+                       attributes = []
                        self.log(Level.INFO, "Inserting attribute URL")
                        for col_name in column_names:
-                           attID_ex1 = skCase.getAttributeType(col_name)
+                           attID_ex1 = registry.getAttributeType(col_name)
                            self.log(Level.INFO, "Inserting attribute ==> " + str(attID_ex1))
                            self.log(Level.INFO, "Attribute Type ==> " + str(attID_ex1.getValueType()))
                            if attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING:
                                 try:
-                                    art.addAttribute(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getString(col_name)))
+                                    attributes.append(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getString(col_name)))
                                 except:		
                                     self.log(Level.INFO, "Attributes String Creation Error, " + col_name + " ==> ")
                            elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.INTEGER:
                                 try:
-                                    art.addAttribute(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
+                                    attributes.append(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
                                 except:		
                                     self.log(Level.INFO, "Attributes Integer Creation Error, " + col_name + " ==> ")
                            elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG:
                                 try:
-                                    art.addAttribute(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
+                                    attributes.append(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
                                 except:		
                                     self.log(Level.INFO, "Attributes Long Creation Error, " + col_name + " ==> ")
                            elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DOUBLE:
                                 try:
-                                    art.addAttribute(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
+                                    attributes.append(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getInt(col_name)))
                                 except:		
                                     self.log(Level.INFO, "Attributes Double Creation Error, " + col_name + " ==> ")
                            elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.BYTE:
                                 try:
-                                    art.addAttribute(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getString(col_name)))
+                                    attributes.append(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getString(col_name)))
                                 except:		
                                     self.log(Level.INFO, "Attributes Byte Creation Error, " + col_name + " ==> ")
                            else:
                                 try:
-                                    art.addAttribute(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getReal(col_name)))
+                                    attributes.append(BlackboardAttribute(attID_ex1, ParseMacOS_RecentIngestModuleFactory.moduleName, resultSet_3.getReal(col_name)))
                                 except:		
                                     self.log(Level.INFO, "Attributes Datatime Creation Error, " + col_name + " ==> ")
+                       poster.newArtifact(file, artID_hst, attributes)
 
                    except SQLException as e:
                        self.log(Level.INFO, "Error getting values from web_history table (" + e.getMessage() + ")")
 
-                IngestServices.getInstance().fireModuleDataEvent(
-                       ModuleDataEvent(ParseMacOS_RecentIngestModuleFactory.moduleName, artID_hst_evt, None))
+                poster.flush()
 
                 stmt_3.close()
                 stmt_2.close()
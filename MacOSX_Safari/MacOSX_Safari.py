@@ -66,6 +66,11 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -109,6 +114,8 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ParseMACOSXSafariIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ParseMACOSXSafariIngestModuleFactory.moduleName, ParseMACOSXSafariIngestModuleFactory().getModuleVersionNumber())
 
         # Get path to EXE based on where this script is run from.
         # Assumes EXE is in same folder as script
@@ -134,6 +141,9 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
         progressBar.switchToIndeterminate()
         
         self.log(Level.INFO, "Starting 2 to process, Just before call to parse_safari_history")
+        # Look up the artifact and attribute types once for the whole job
+        self.registry = TypeRegistry(ParseMACOSXSafariIngestModuleFactory.moduleName)
+        self.poster = BlackboardPoster(ParseMACOSXSafariIngestModuleFactory.moduleName)
         self.parse_safari_history(dataSource, progressBar)
         self.parse_safari_bookmarks(dataSource, progressBar)
         self.parse_safari_downloads(dataSource, progressBar)
@@ -147,6 +157,9 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
             "Mac OSX Safari", " Safari Artifacts Have Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
 
@@ -158,7 +171,7 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
        # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "History.db%", "%Users/%/Library/Safari")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "History.db%", "%Users/%/Library/Safari"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -184,7 +197,7 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
 
             # Save the DB locally in the temp folder. use file id as name to reduce collisions
             lclDbPath = os.path.join(Temp_Dir + "\Safari_History", file.getName())
-            ContentUtils.writeToFile(file, File(lclDbPath))
+            self.extractionCache.copyTo(file, lclDbPath)
                         
         for file in files:
            if (file.getName() == "History.db"):
@@ -217,8 +230,7 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
                    return IngestModule.ProcessResult.OK
 
                 artifact_name = "TSK_WEB_HISTORY"
-                artID_hst = skCase.getArtifactTypeID(artifact_name)
-                artID_hst_evt = skCase.getArtifactType(artifact_name)
+                artID_hst = self.registry.getArtifactTypeID(artifact_name)
 
                # Cycle through each row and create artifacts
                 while resultSet.next():
@@ -226,74 +238,72 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
                        #self.log(Level.INFO, SQL_String_1)
                        #self.log(Level.INFO, SQL_String_2)
                        
-                       art = file.newArtifact(artID_hst)
+                       attributes = []
                        self.log(Level.INFO, "Inserting attribute URL")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("URL")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("URL")))
                        self.log(Level.INFO, "Inserting attribute Date_Accessed")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME_ACCESSED.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("Date_Accessed")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME_ACCESSED.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("Date_Accessed")))
                        self.log(Level.INFO, "Inserting attribute Referer")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_REFERRER.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Referrer_URL")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_REFERRER.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Referrer_URL")))
                        self.log(Level.INFO, "Inserting attribute Title")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_TITLE.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Title")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_TITLE.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Title")))
                        self.log(Level.INFO, "Inserting attribute PROG_NAME")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PROG_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Program_Name")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PROG_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Program_Name")))
                        try:
                           slashparts = resultSet.getString("URL").split('/')
                           self.log(Level.INFO, "Inserting attribute Domain " + slashparts[0] + " " + slashparts[1] + " " + slashparts[2]   )
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, slashparts[2]))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, slashparts[2]))
                        except:
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
                        try:
                           userpath = file.getParentPath()
                           username = userpath.split('/')
                           self.log(Level.INFO, "Getting Username " + username[2]   )
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, username[2]))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, username[2]))
                        except:
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
 
                        query_string = parse_qs(urlparse(resultSet.getString("URL")).query)
                        if ('q' in query_string):
-                           artID_srch = skCase.getArtifactTypeID("TSK_WEB_SEARCH_QUERY")
-                           artID_srch_evt = skCase.getArtifactType("TSK_WEB_SEARCH_QUERY")
+                           artID_srch = self.registry.getArtifactTypeID("TSK_WEB_SEARCH_QUERY")
                            try: 
                                #self.log(Level.INFO, SQL_String_1)
                                #self.log(Level.INFO, SQL_String_2)
                                
-                               art_srch = file.newArtifact(artID_srch)
+                               srch_attributes = []
                                self.log(Level.INFO, "Inserting attribute URL")
                                try:
                                   slashparts = resultSet.getString("URL").split('/')
                                   self.log(Level.INFO, "Inserting attribute Domain " + slashparts[0] + " " + slashparts[1] + " " + slashparts[2]   )
-                                  art_srch.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, slashparts[2]))
+                                  srch_attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, slashparts[2]))
                                except:
-                                  art_srch.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                                  srch_attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
                                self.log(Level.INFO, "Inserting attribute Text")
-                               art_srch.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_TEXT.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, str(query_string['q'][0])))
+                               srch_attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_TEXT.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, str(query_string['q'][0])))
                                self.log(Level.INFO, "Inserting attribute PROG_NAME")
-                               art_srch.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PROG_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Program_Name")))
+                               srch_attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PROG_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Program_Name")))
                                self.log(Level.INFO, "Inserting attribute Date_Accessed")
-                               art_srch.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME_ACCESSED.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("Date_Accessed")))
+                               srch_attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME_ACCESSED.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("Date_Accessed")))
                                self.log(Level.INFO, "Inserting attribute PROG_NAME")
-                               art_srch.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PROG_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Program_Name")))
+                               srch_attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PROG_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Program_Name")))
                                try:
                                   userpath = file.getParentPath()
                                   username = userpath.split('/')
                                   self.log(Level.INFO, "Getting Username " + username[2]   )
-                                  art_srch.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, username[2]))
+                                  srch_attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, username[2]))
                                except:
-                                  art_srch.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                                  srch_attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
 
-                               IngestServices.getInstance().fireModuleDataEvent(
-                                       ModuleDataEvent(ParseMACOSXSafariIngestModuleFactory.moduleName, artID_srch_evt, None))
+                               self.poster.newArtifact(file, artID_srch, srch_attributes)
                                        
                            except SQLException as e:
                                self.log(Level.INFO, "Error getting values from web_history table (" + e.getMessage() + ")")
+                       self.poster.newArtifact(file, artID_hst, attributes)
 
                    except SQLException as e:
                        self.log(Level.INFO, "Error getting values from web_history table (" + e.getMessage() + ")")
 
-                IngestServices.getInstance().fireModuleDataEvent(
-                       ModuleDataEvent(ParseMACOSXSafariIngestModuleFactory.moduleName, artID_hst_evt, None))
+                self.poster.flush()
 
                 stmt.close()
                 dbConn.close()
@@ -320,7 +330,7 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
        # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "Downloads.plist", "%Users/%/Library/Safari")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "Downloads.plist", "%Users/%/Library/Safari"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -346,7 +356,7 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
 
             # Save the DB locally in the temp folder. use file id as name to reduce collisions
             lclDbPath = os.path.join(Temp_Dir + "\Safari_downloads", file.getName())
-            ContentUtils.writeToFile(file, File(lclDbPath))
+            self.extractionCache.linkTo(file, lclDbPath)
                         
         #file = files[0]
         for file in files:
@@ -388,8 +398,7 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
                    return IngestModule.ProcessResult.OK
 
                 artifact_name = "TSK_WEB_DOWNLOAD"
-                artID_web = skCase.getArtifactTypeID(artifact_name)
-                artID_web_evt = skCase.getArtifactType(artifact_name)
+                artID_web = self.registry.getArtifactTypeID(artifact_name)
 
                # Cycle through each row and create artifacts
                 while resultSet.next():
@@ -397,34 +406,34 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
                        #self.log(Level.INFO, SQL_String_1)
                        #self.log(Level.INFO, SQL_String_2)
                        
-                       art = file.newArtifact(artID_web)
+                       attributes = []
                        self.log(Level.INFO, "Inserting attribute Path")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PATH.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Path")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PATH.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Path")))
                        self.log(Level.INFO, "Inserting attribute URL")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("URL")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("URL")))
                        self.log(Level.INFO, "Inserting attribute Date_Accessed")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME_ACCESSED.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("Date_Accessed")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME_ACCESSED.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("Date_Accessed")))
                        self.log(Level.INFO, "Inserting attribute PROG_NAME")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PROG_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Program_Name")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PROG_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Program_Name")))
                        try:
                           slashparts = resultSet.getString("URL").split('/')
                           self.log(Level.INFO, "Inserting attribute Domain " + slashparts[0] + " " + slashparts[1] + " " + slashparts[2]   )
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, slashparts[2]))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, slashparts[2]))
                        except:
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
                        try:
                           userpath = file.getParentPath()
                           username = userpath.split('/')
                           self.log(Level.INFO, "Getting Username " + username[2]   )
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, username[2]))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, username[2]))
                        except:
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                       self.poster.newArtifact(file, artID_web, attributes)
 
                    except SQLException as e:
                        self.log(Level.INFO, "Error getting values from the downloads table (" + e.getMessage() + ")")
 
-                IngestServices.getInstance().fireModuleDataEvent(
-                       ModuleDataEvent(ParseMACOSXSafariIngestModuleFactory.moduleName, artID_web_evt, None))
+                self.poster.flush()
 
                 stmt.close()
                 dbConn.close()
@@ -451,7 +460,7 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
        # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "Bookmarks.plist", "%Users/%/Library/Safari")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "Bookmarks.plist", "%Users/%/Library/Safari"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -477,7 +486,7 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
 
             # Save the DB locally in the temp folder. use file id as name to reduce collisions
             lclDbPath = os.path.join(Temp_Dir + "\Safari_bookmarks", file.getName())
-            ContentUtils.writeToFile(file, File(lclDbPath))
+            self.extractionCache.linkTo(file, lclDbPath)
                         
         #file = files[0]
         for file in files:
@@ -519,8 +528,7 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
                    return IngestModule.ProcessResult.OK
 
                 artifact_name = "TSK_WEB_BOOKMARK"
-                artID_book = skCase.getArtifactTypeID(artifact_name)
-                artID_book_evt = skCase.getArtifactType(artifact_name)
+                artID_book = self.registry.getArtifactTypeID(artifact_name)
 
                # Cycle through each row and create artifacts
                 while resultSet.next():
@@ -528,34 +536,34 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
                        #self.log(Level.INFO, SQL_String_1)
                        #self.log(Level.INFO, SQL_String_2)
                        
-                       art = file.newArtifact(artID_book)
+                       attributes = []
                        self.log(Level.INFO, "Inserting attribute URL")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("URL")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("URL")))
                        self.log(Level.INFO, "Inserting attribute Title")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_TITLE.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Title")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_TITLE.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Title")))
                        #self.log(Level.INFO, "Inserting attribute Date_Created")
                        #art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME_CREATED.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("Date_Created")))
                        self.log(Level.INFO, "Inserting attribute PROG_NAME")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PROG_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Program_Name")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PROG_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Program_Name")))
                        try:
                           slashparts = resultSet.getString("URL").split('/')
                           self.log(Level.INFO, "Inserting attribute Domain " + slashparts[0] + " " + slashparts[1] + " " + slashparts[2]   )
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, slashparts[2]))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, slashparts[2]))
                        except:
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
                        try:
                           userpath = file.getParentPath()
                           username = userpath.split('/')
                           self.log(Level.INFO, "Getting Username " + username[2]   )
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, username[2]))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, username[2]))
                        except:
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                       self.poster.newArtifact(file, artID_book, attributes)
 
                    except SQLException as e:
                        self.log(Level.INFO, "Error getting values from bookmarks table (" + e.getMessage() + ")")
 
-                IngestServices.getInstance().fireModuleDataEvent(
-                       ModuleDataEvent(ParseMACOSXSafariIngestModuleFactory.moduleName, artID_book_evt, None))
+                self.poster.flush()
 
                 stmt.close()
                 dbConn.close()
@@ -582,7 +590,7 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
        # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "LastSession.plist", "%Users/%/Library/Safari")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "LastSession.plist", "%Users/%/Library/Safari"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -608,7 +616,7 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
 
             # Save the DB locally in the temp folder. use file id as name to reduce collisions
             lclDbPath = os.path.join(Temp_Dir + "\Safari_lastsession", file.getName())
-            ContentUtils.writeToFile(file, File(lclDbPath))
+            self.extractionCache.linkTo(file, lclDbPath)
                         
         #file = files[0]
         for file in files:
@@ -637,42 +645,18 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
                    return IngestModule.ProcessResult.OK
                 
                # Create the safari last session artifact
-                try:
-                     self.log(Level.INFO, "Begin Create New Artifacts")
-                     artID_ls = skCase.addArtifactType( "TSK_SAFARI_LASTSESSION", "Safari Last Session")
-                except:		
-                     self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-               # Create the artifacts need for lastsession
-                try:
-                   attID_lvt = skCase.addArtifactAttributeType("TSK_LAST_VISIT_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Last Visit Time")
-                except:		
-                     self.log(Level.INFO, "Attributes Creation Error, Last Visit Time ==> ")
-                try:
-                   attID_dtc = skCase.addArtifactAttributeType("TSK_DATE_CLOSED", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Date Closed")
-                except:		
-                     self.log(Level.INFO, "Attributes Creation Error, Date Closed ==> ")
-                try:
-                   attID_prw = skCase.addArtifactAttributeType("TSK_PRIVATE_WINDOW", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Private Window")
-                except:		
-                     self.log(Level.INFO, "Attributes Creation Error, Private Window ==> ")
-                try:
-                   attID_puw = skCase.addArtifactAttributeType("TSK_POPUP_WINDOW", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Popup Window")
-                except:		
-                     self.log(Level.INFO, "Attributes Creation Error, Popup Window ==> ")
-                try:
-                   attID_sen = skCase.addArtifactAttributeType("TSK_SESSION_ENCRYPTED", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Session Encrypted")
-                except:		
-                     self.log(Level.INFO, "Attributes Creation Error, Session Encrypted ==> ")
-                     
-                # Get the artifact and attributes
-                artID_ls = skCase.getArtifactTypeID("TSK_SAFARI_LASTSESSION")
-                artID_ls_evt = skCase.getArtifactType("TSK_SAFARI_LASTSESSION")
-                attID_lvt = skCase.getAttributeType("TSK_LAST_VISIT_TIME")
-                attID_dtc = skCase.getAttributeType("TSK_DATE_CLOSED")
-                attID_prw = skCase.getAttributeType("TSK_PRIVATE_WINDOW")
-                attID_puw = skCase.getAttributeType("TSK_POPUP_WINDOW")
-                attID_sen = skCase.getAttributeType("TSK_SESSION_ENCRYPTED")
+                artID_ls = self.registry.getOrAddArtifactType( "TSK_SAFARI_LASTSESSION", "Safari Last Session").getTypeID()
+                attID_lvt = self.registry.getOrAddAttributeType("TSK_LAST_VISIT_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Last Visit Time")
+                attID_dtc = self.registry.getOrAddAttributeType("TSK_DATE_CLOSED", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Date Closed")
+                attID_prw = self.registry.getOrAddAttributeType("TSK_PRIVATE_WINDOW", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Private Window")
+                attID_puw = self.registry.getOrAddAttributeType("TSK_POPUP_WINDOW", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Popup Window")
+                attID_sen = self.registry.getOrAddAttributeType("TSK_SESSION_ENCRYPTED", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Session Encrypted")
+                artID_ls = self.registry.getArtifactTypeID("TSK_SAFARI_LASTSESSION")
+                attID_lvt = self.registry.getAttributeType("TSK_LAST_VISIT_TIME")
+                attID_dtc = self.registry.getAttributeType("TSK_DATE_CLOSED")
+                attID_prw = self.registry.getAttributeType("TSK_PRIVATE_WINDOW")
+                attID_puw = self.registry.getAttributeType("TSK_POPUP_WINDOW")
+                attID_sen = self.registry.getAttributeType("TSK_SESSION_ENCRYPTED")
                 
                # Query the lastsession table in the database and get all columns. 
                 try:
@@ -694,39 +678,40 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
                        #self.log(Level.INFO, SQL_String_1)
                        #self.log(Level.INFO, SQL_String_2)
                        
-                       art = file.newArtifact(artID_ls)
+                       attributes = []
                        self.log(Level.INFO, "Inserting attribute URL")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("URL")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("URL")))
                        self.log(Level.INFO, "Inserting attribute TITLE")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_TITLE.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Title")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_TITLE.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Title")))
                        self.log(Level.INFO, "Inserting attribute Last Visit Date")
-                       art.addAttribute(BlackboardAttribute(attID_lvt, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("LAST_VISIT_TIME")))
+                       attributes.append(BlackboardAttribute(attID_lvt, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("LAST_VISIT_TIME")))
                        self.log(Level.INFO, "Inserting attribute Date Closed")
-                       art.addAttribute(BlackboardAttribute(attID_dtc, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("Date_Closed")))
+                       attributes.append(BlackboardAttribute(attID_dtc, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("Date_Closed")))
                        self.log(Level.INFO, "Inserting attribute Private Window")
-                       art.addAttribute(BlackboardAttribute(attID_prw, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("PRIVATE_WINDOW")))
+                       attributes.append(BlackboardAttribute(attID_prw, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("PRIVATE_WINDOW")))
                        self.log(Level.INFO, "Inserting attribute popup window")
-                       art.addAttribute(BlackboardAttribute(attID_puw, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("POPUP_WINDOW")))
+                       attributes.append(BlackboardAttribute(attID_puw, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("POPUP_WINDOW")))
                        self.log(Level.INFO, "Inserting attribute Session Encrypted")
-                       art.addAttribute(BlackboardAttribute(attID_sen, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("State_Encrypted")))
+                       attributes.append(BlackboardAttribute(attID_sen, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("State_Encrypted")))
                        try:
                           slashparts = resultSet.getString("URL").split('/')
                           self.log(Level.INFO, "Inserting attribute Domain " + slashparts[0] + " " + slashparts[1] + " " + slashparts[2]   )
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, slashparts[2]))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, slashparts[2]))
                        except:
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
                        try:
                           userpath = file.getParentPath()
                           username = userpath.split('/')
                           self.log(Level.INFO, "Getting Username " + username[2]   )
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, username[2]))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, username[2]))
                        except:
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                       self.poster.newArtifact(file, artID_ls, attributes)
 
                    except SQLException as e:
                        self.log(Level.INFO, "Error getting values from the lastsession table (" + e.getMessage() + ")")
 
-                IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(ParseMACOSXSafariIngestModuleFactory.moduleName, artID_ls_evt, None))
+                self.poster.flush()
 
                 stmt.close()
                 dbConn.close()
@@ -753,7 +738,7 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
        # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "RecentlyClosedTabs.plist", "%Users/%/Library/Safari")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "RecentlyClosedTabs.plist", "%Users/%/Library/Safari"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -779,7 +764,7 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
 
             # Save the DB locally in the temp folder. use file id as name to reduce collisions
             lclDbPath = os.path.join(Temp_Dir + "\Safari_recentlyclosed", file.getName())
-            ContentUtils.writeToFile(file, File(lclDbPath))
+            self.extractionCache.linkTo(file, lclDbPath)
                         
         #file = files[0]
         for file in files:
@@ -808,32 +793,14 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
                    return IngestModule.ProcessResult.OK
                 
                # Create the safari last session artifact
-                try:
-                     self.log(Level.INFO, "Begin Create New Artifacts")
-                     artID_rc = skCase.addArtifactType( "TSK_SAFARI_RECENTLYCLOSED", "Safari Recently Closed Tabs")
-                except:		
-                     self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-               # Create the artifacts need for lastsession
-                try:
-                   attID_lvt = skCase.addArtifactAttributeType("TSK_LAST_VISIT_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Last Visit Time")
-                except:		
-                     self.log(Level.INFO, "Attributes Creation Error, Last Visit Time ==> ")
-                try:
-                   attID_dtc = skCase.addArtifactAttributeType("TSK_DATE_CLOSED", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Date Closed")
-                except:		
-                     self.log(Level.INFO, "Attributes Creation Error, Date Closed ==> ")
-                try:
-                   attID_sen = skCase.addArtifactAttributeType("TSK_SESSION_ENCRYPTED", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Session Encrypted")
-                except:		
-                     self.log(Level.INFO, "Attributes Creation Error, Session Encrypted ==> ")
-                     
-                # Get the artifact and attributes
-                artID_rc = skCase.getArtifactTypeID("TSK_SAFARI_RECENTLYCLOSED")
-                artID_rc_evt = skCase.getArtifactType("TSK_SAFARI_RECENTLYCLOSED")
-                attID_lvt = skCase.getAttributeType("TSK_LAST_VISIT_TIME")
-                attID_dtc = skCase.getAttributeType("TSK_DATE_CLOSED")
-                attID_sen = skCase.getAttributeType("TSK_SESSION_ENCRYPTED")
+                artID_rc = self.registry.getOrAddArtifactType( "TSK_SAFARI_RECENTLYCLOSED", "Safari Recently Closed Tabs").getTypeID()
+                attID_lvt = self.registry.getOrAddAttributeType("TSK_LAST_VISIT_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Last Visit Time")
+                attID_dtc = self.registry.getOrAddAttributeType("TSK_DATE_CLOSED", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Date Closed")
+                attID_sen = self.registry.getOrAddAttributeType("TSK_SESSION_ENCRYPTED", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Session Encrypted")
+                artID_rc = self.registry.getArtifactTypeID("TSK_SAFARI_RECENTLYCLOSED")
+                attID_lvt = self.registry.getAttributeType("TSK_LAST_VISIT_TIME")
+                attID_dtc = self.registry.getAttributeType("TSK_DATE_CLOSED")
+                attID_sen = self.registry.getAttributeType("TSK_SESSION_ENCRYPTED")
                 
                # Query the recentlyclosedtabs table in the database and get all columns. 
                 try:
@@ -854,35 +821,36 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
                        #self.log(Level.INFO, SQL_String_1)
                        #self.log(Level.INFO, SQL_String_2)
                        
-                       art = file.newArtifact(artID_rc)
+                       attributes = []
                        self.log(Level.INFO, "Inserting attribute URL")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("URL")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("URL")))
                        self.log(Level.INFO, "Inserting attribute TITLE")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_TITLE.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Title")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_TITLE.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Title")))
                        self.log(Level.INFO, "Inserting attribute Last Visit Date")
-                       art.addAttribute(BlackboardAttribute(attID_lvt, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("LAST_VISIT_TIME")))
+                       attributes.append(BlackboardAttribute(attID_lvt, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("LAST_VISIT_TIME")))
                        self.log(Level.INFO, "Inserting attribute Date Closed")
-                       art.addAttribute(BlackboardAttribute(attID_dtc, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("Date_Closed")))
+                       attributes.append(BlackboardAttribute(attID_dtc, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("Date_Closed")))
                        self.log(Level.INFO, "Inserting attribute Session Encrypted")
-                       art.addAttribute(BlackboardAttribute(attID_sen, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("State_Encrypted")))
+                       attributes.append(BlackboardAttribute(attID_sen, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("State_Encrypted")))
                        try:
                           slashparts = resultSet.getString("URL").split('/')
                           self.log(Level.INFO, "Inserting attribute Domain " + slashparts[0] + " " + slashparts[1] + " " + slashparts[2]   )
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, slashparts[2]))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, slashparts[2]))
                        except:
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
                        try:
                           userpath = file.getParentPath()
                           username = userpath.split('/')
                           self.log(Level.INFO, "Getting Username " + username[2]   )
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, username[2]))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, username[2]))
                        except:
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                       self.poster.newArtifact(file, artID_rc, attributes)
 
                    except SQLException as e:
                        self.log(Level.INFO, "Error getting values from the recentlyclosedtabs table (" + e.getMessage() + ")")
 
-                IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(ParseMACOSXSafariIngestModuleFactory.moduleName, artID_rc_evt, None))
+                self.poster.flush()
 
                 stmt.close()
                 dbConn.close()
@@ -909,7 +877,7 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
        # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "TopSites.plist", "%Users/%/Library/Safari")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "TopSites.plist", "%Users/%/Library/Safari"))
         numFiles = len(files)
         progressBar.switchToDeterminate(numFiles)
         fileCount = 0;
@@ -934,7 +902,7 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
 
             # Save the DB locally in the temp folder. use file id as name to reduce collisions
             lclDbPath = os.path.join(Temp_Dir + "\Safari_topsites", file.getName())
-            ContentUtils.writeToFile(file, File(lclDbPath))
+            self.extractionCache.linkTo(file, lclDbPath)
                         
         #file = files[0]
         for file in files:
@@ -963,27 +931,12 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
                    return IngestModule.ProcessResult.OK
                 
                # Create the safari last session artifact
-                try:
-                     self.log(Level.INFO, "Begin Create New Artifacts")
-                     artID_ts = skCase.addArtifactType( "TSK_SAFARI_TOPSITES", "Safari Top Sites")
-                except:		
-                     self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-               # Create the artifacts need for lastsession
-                try:
-                   attID_slm = skCase.addArtifactAttributeType("TSK_SITE_LAST_MOD", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Site Last Modified")
-                except:		
-                     self.log(Level.INFO, "Attributes Creation Error, Last Visit Time ==> ")
-                try:
-                   attID_sbi = skCase.addArtifactAttributeType("TSK_SAFARI_SITE_BUILT_IN", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Site Built In")
-                except:		
-                     self.log(Level.INFO, "Attributes Creation Error, Site Built In ==> ")
-                     
-                # Get the artifact and attributes
-                artID_ts = skCase.getArtifactTypeID("TSK_SAFARI_TOPSITES")
-                artID_ts_evt = skCase.getArtifactType("TSK_SAFARI_TOPSITES")
-                attID_slm = skCase.getAttributeType("TSK_SITE_LAST_MOD")
-                attID_sbi = skCase.getAttributeType("TSK_SAFARI_SITE_BUILT_IN")
+                artID_ts = self.registry.getOrAddArtifactType( "TSK_SAFARI_TOPSITES", "Safari Top Sites").getTypeID()
+                attID_slm = self.registry.getOrAddAttributeType("TSK_SITE_LAST_MOD", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Site Last Modified")
+                attID_sbi = self.registry.getOrAddAttributeType("TSK_SAFARI_SITE_BUILT_IN", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Site Built In")
+                artID_ts = self.registry.getArtifactTypeID("TSK_SAFARI_TOPSITES")
+                attID_slm = self.registry.getAttributeType("TSK_SITE_LAST_MOD")
+                attID_sbi = self.registry.getAttributeType("TSK_SAFARI_SITE_BUILT_IN")
                 
                # Query the topsites table in the database and get all columns. 
                 try:
@@ -1004,33 +957,34 @@ class ParseMACOSXSafariIngestModule(DataSourceIngestModule):
                        #self.log(Level.INFO, SQL_String_1)
                        #self.log(Level.INFO, SQL_String_2)
                        
-                       art = file.newArtifact(artID_ts)
+                       attributes = []
                        self.log(Level.INFO, "Inserting attribute URL")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("URL")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("URL")))
                        self.log(Level.INFO, "Inserting attribute TITLE")
-                       art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_TITLE.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Title")))
+                       attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_TITLE.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("Title")))
                        self.log(Level.INFO, "Inserting attribute Last Mod Date")
-                       art.addAttribute(BlackboardAttribute(attID_slm, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("SITE_LAST_MODIFIED")))
+                       attributes.append(BlackboardAttribute(attID_slm, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getInt("SITE_LAST_MODIFIED")))
                        self.log(Level.INFO, "Inserting attribute Site Built In")
-                       art.addAttribute(BlackboardAttribute(attID_sbi, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("SITE_BUILT_IN")))
+                       attributes.append(BlackboardAttribute(attID_sbi, ParseMACOSXSafariIngestModuleFactory.moduleName, resultSet.getString("SITE_BUILT_IN")))
                        try:
                           slashparts = resultSet.getString("URL").split('/')
                           self.log(Level.INFO, "Inserting attribute Domain " + slashparts[0] + " " + slashparts[1] + " " + slashparts[2]   )
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, slashparts[2]))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, slashparts[2]))
                        except:
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DOMAIN.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
                        try:
                           userpath = file.getParentPath()
                           username = userpath.split('/')
                           self.log(Level.INFO, "Getting Username " + username[2]   )
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, username[2]))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, username[2]))
                        except:
-                          art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                          attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), ParseMACOSXSafariIngestModuleFactory.moduleName, ""))
+                       self.poster.newArtifact(file, artID_ts, attributes)
 
                    except SQLException as e:
                        self.log(Level.INFO, "Error getting values from the topsites table (" + e.getMessage() + ")")
 
-                IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(ParseMACOSXSafariIngestModuleFactory.moduleName, artID_ts_evt, None))
+                self.poster.flush()
                 
                 stmt.close()
                 dbConn.close()
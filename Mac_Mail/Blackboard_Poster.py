@@ -0,0 +1,86 @@
+# Blackboard_Poster.py = Jython helper that posts artifacts to the blackboard in batches
+#
+# Contact: Mark McKinnon [Mark [dot] McKinnon <at> Davenport [dot] edu]
+#
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+# Shared by the ingest modules, a copy sits next to each module that creates artifacts
+# since Autopsy only adds the module's own directory to the python path.
+#
+# Comments
+#   Version 1.0 - Initial version - October 2026
+#   Version 1.1 - Leave the module data events to postArtifacts
+#
+# Usage:
+#   poster = BlackboardPoster(SomeIngestModuleFactory.moduleName)
+#   poster.newArtifact(file, artID, [BlackboardAttribute(...), BlackboardAttribute(...)])
+#   poster.flush()
+#
+# Artifacts are held until batch_size of them are waiting, then the whole batch is posted
+# with one postArtifacts call, which is one keyword search index request and one module data
+# event per artifact type, so the UI only refreshes once per batch.  Call flush when the module
+# is done or the last partial batch is never posted.
+
+from java.util import ArrayList
+from java.util.logging import Level
+from org.sleuthkit.datamodel import Blackboard
+from org.sleuthkit.autopsy.casemodule import Case
+from org.sleuthkit.autopsy.coreutils import Logger
+
+class BlackboardPoster(object):
+
+    def __init__(self, module_name, batch_size=500):
+        self.module_name = module_name
+        self.batch_size = batch_size
+        self.skCase = Case.getCurrentCase().getSleuthkitCase()
+        self.blackboard = self.skCase.getBlackboard()
+        self._logger = Logger.getLogger(module_name)
+        self._artifacts = ArrayList()
+
+    def newArtifact(self, content, artifact_type_id, attributes=None):
+        # Creates the artifact, adds all of its attributes in one call and queues it
+        # to be posted.  Returns the artifact in case the caller needs to add more.
+        art = content.newArtifact(artifact_type_id)
+        if attributes:
+            art.addAttributes(attributes)
+        self.postArtifact(art)
+        return art
+
+    def postArtifact(self, art):
+        # Queues an artifact that was already created to be posted.
+        self._artifacts.add(art)
+        if self._artifacts.size() >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        # Posts everything queued so far, postArtifacts fires the module data events.
+        if self._artifacts.isEmpty():
+            return
+        artifacts = self._artifacts
+        self._artifacts = ArrayList()
+
+        try:
+            self.blackboard.postArtifacts(artifacts, self.module_name)
+        except Blackboard.BlackboardException as e:
+            self._logger.log(Level.SEVERE, "Error posting " + str(artifacts.size()) + " artifacts to the blackboard", e)
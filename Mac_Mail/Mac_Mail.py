@@ -69,6 +69,11 @@ from org.sleuthkit.datamodel import CommunicationsManager
 from org.sleuthkit.datamodel import Relationship
 from org.sleuthkit.datamodel import Account
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 
 # Factory that defines the name and details of the module and allows Autopsy
@@ -112,6 +117,8 @@ class ProcessMacMailIngestModule(DataSourceIngestModule):
 
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ProcessMacMailIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ProcessMacMailIngestModuleFactory.moduleName, ProcessMacMailIngestModuleFactory().getModuleVersionNumber())
 
         # May need this code if I want to run a program to parse out the actual email files.
         #
@@ -141,6 +148,9 @@ class ProcessMacMailIngestModule(DataSourceIngestModule):
         
         # get current case and the store.vol abstract file information
         skCase = Case.getCurrentCase().getSleuthkitCase();
+        # Look up the artifact and attribute types once for the whole job
+        self.registry = TypeRegistry(ProcessMacMailIngestModuleFactory.moduleName)
+        self.poster = BlackboardPoster(ProcessMacMailIngestModuleFactory.moduleName)
         fileManager = Case.getCurrentCase().getServices().getFileManager()
         files = fileManager.findFiles(dataSource, "%", "/Users/")
         numFiles = len(files)
@@ -188,12 +198,12 @@ class ProcessMacMailIngestModule(DataSourceIngestModule):
             for file in files:
                 if not (file.getName().endswith('-slack')):
                     extractedFile = os.path.join(os.path.join(temporaryDirectory, userPath), file.getName())
-                    ContentUtils.writeToFile(file, File(extractedFile))
+                    self.extractionCache.linkTo(file, extractedFile)
 
         # Get the user Envelope Index to see what emails there are
         for userPath in userPaths:
             self.log(Level.INFO, 'User directory to process' + os.path.join('/Users', userPath).replace('\\','/'))
-            dbFiles = fileManager.findFiles(dataSource, "Envelope Index%", os.path.join('/Users', userPath).replace('\\','/'))
+            dbFiles = self.ledger.unprocessed(fileManager.findFiles(dataSource, "Envelope Index%", os.path.join('/Users', userPath).replace('\\','/')))
             numFiles = len(dbFiles)
             self.log(Level.INFO, "found " + str(numFiles) + " files")
 
@@ -202,7 +212,7 @@ class ProcessMacMailIngestModule(DataSourceIngestModule):
                 if (not (file.getName().endswith('-slack')) or not (file.getName().endswith('-shm'))):
                     self.log(Level.INFO, "Writing file ==> " + file.getName())
                     extractedFile = os.path.join(os.path.join(temporaryDirectory, userPath), file.getName())
-                    ContentUtils.writeToFile(file, File(extractedFile))
+                    self.extractionCache.copyTo(file, extractedFile)
             self.log(Level.INFO, "FIles have been written no lets process them")
             # Process each users Envelope Index SQLite database
             for file in dbFiles:	
@@ -219,6 +229,7 @@ class ProcessMacMailIngestModule(DataSourceIngestModule):
      
                    self.processRecipients(dbConn, skCase, file)
                    self.processEmails(dbConn, skCase, file)
+                   self.poster.flush()
 
                    # Clean up
                    dbConn.close()
@@ -231,6 +242,9 @@ class ProcessMacMailIngestModule(DataSourceIngestModule):
         message = IngestMessage.createMessage(IngestMessage.MessageType.DATA, "Mac Mail Processor", " Mac Mail Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
     # May need this code if I want to process each individual emlx file besides using the SQLite db Envelope Index
@@ -257,16 +271,15 @@ class ProcessMacMailIngestModule(DataSourceIngestModule):
            return IngestModule.ProcessResult.OK
 
 
-       artIdEmail = skCase.getArtifactTypeID("TSK_ACCOUNT")
-       artIdEmailType = skCase.getArtifactType("TSK_ACCOUNT")
+       artIdEmail = self.registry.getArtifactTypeID("TSK_ACCOUNT")
          
        # Cycle through each row and create artifacts
        while resultSet.next():
            try: 
                #self.log(Level.INFO, "Result (" + resultSet.getString("recipients") + ")")
-               artEmail = file.newArtifact(artIdEmail)
-               artEmail.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_ACCOUNT_TYPE.getTypeID(), ProcessMacMailIngestModuleFactory.moduleName, "EMAIL"))
-               artEmail.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_ID.getTypeID(), ProcessMacMailIngestModuleFactory.moduleName, resultSet.getString("address")))
+               self.poster.newArtifact(file, artIdEmail, \
+                                  ((BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_ACCOUNT_TYPE.getTypeID(), ProcessMacMailIngestModuleFactory.moduleName, "EMAIL")), \
+                                  (BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_ID.getTypeID(), ProcessMacMailIngestModuleFactory.moduleName, resultSet.getString("address")))))
            except SQLException as e:
                pass
                #self.log(Level.INFO, "Error getting values from recipent table (" + e.getMessage() + ")")
@@ -329,8 +342,7 @@ class ProcessMacMailIngestModule(DataSourceIngestModule):
            return IngestModule.ProcessResult.OK
 
 
-       artIdEmail = skCase.getArtifactTypeID("TSK_EMAIL_MSG")
-       artIdEmailType = skCase.getArtifactType("TSK_EMAIL_MSG")
+       artIdEmail = self.registry.getArtifactTypeID("TSK_EMAIL_MSG")
          
        # Cycle through each row and create artifacts
        while resultSet.next():
@@ -338,8 +350,8 @@ class ProcessMacMailIngestModule(DataSourceIngestModule):
                senderAccount = self.getSenderAccount(dbConn, skCase, file, resultSet.getString("Sender"))
                otherAccounts, emailRecipients = self.getOtherAccounts(dbConn, skCase, file, resultSet.getString("message_id"))
                self.log(Level.INFO, "Message Id (" + resultSet.getString("message_id") + ")")
-               artEmail = file.newArtifact(artIdEmail)
-               artEmail.addAttributes(((BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PATH.getTypeID(), ProcessMacMailIngestModuleFactory.moduleName, resultSet.getString("url"))), \
+               artEmail = self.poster.newArtifact(file, artIdEmail, \
+                                  ((BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PATH.getTypeID(), ProcessMacMailIngestModuleFactory.moduleName, resultSet.getString("url"))), \
                                   (BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_EMAIL_TO.getTypeID(), ProcessMacMailIngestModuleFactory.moduleName, emailRecipients)), \
                                   (BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_EMAIL_FROM.getTypeID(), ProcessMacMailIngestModuleFactory.moduleName, resultSet.getString("Sender"))), \
                                   (BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_EMAIL_CONTENT_PLAIN.getTypeID(), ProcessMacMailIngestModuleFactory.moduleName, resultSet.getString("snippet"))), \
@@ -348,21 +360,9 @@ class ProcessMacMailIngestModule(DataSourceIngestModule):
                                   (BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_SUBJECT.getTypeID(), ProcessMacMailIngestModuleFactory.moduleName, resultSet.getString("subject")))))
                if (not resultSet.getString("url").startswith('feed:')):
                    skCase.getCommunicationsManager().addRelationships(senderAccount, otherAccounts, artEmail,Relationship.Type.MESSAGE, resultSet.getInt("date_sent"));
-               
-
-               # index the artifact for keyword search
-               try:
-                   blackboard.indexArtifact(artEmail)
-               except:
-                   pass
-#                   self._logger.log(Level.SEVERE, "Error indexing artifact " + artEmail.getDisplayName())
 
            except SQLException as e:
                self.log(Level.INFO, "Error getting values from message table (" + e.getMessage() + ")")
 
        # Close the database statement
        stmt.close()
-       
-       # fire event to let the system know new data was added
-       #IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(ProcessMacMailIngestModuleFactory.moduleName, \
-       #                                 artIdEmailType, None))
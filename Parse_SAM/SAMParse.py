@@ -68,6 +68,11 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -110,6 +115,8 @@ class ParseSAMIngestModule(DataSourceIngestModule):
     # 'context' is an instance of org.sleuthkit.autopsy.ingest.IngestJobContext.
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ParseSAMIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ParseSAMIngestModuleFactory.moduleName, ParseSAMIngestModuleFactory().getModuleVersionNumber())
 
         # Get path to EXE based on where this script is run from.
         # Assumes EXE is in same folder as script
@@ -137,22 +144,22 @@ class ParseSAMIngestModule(DataSourceIngestModule):
         
         # Set the database to be read to the once created by the SAM parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(ParseSAMIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ParseSAMIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "SAM", "config")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "SAM", "config"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
         fileCount = 0;
         lclDbPath = ''
 
-        try:
-             self.log(Level.INFO, "Begin Create New Artifacts")
-             artID_sam = skCase.addArtifactType( "TSK_SAM", "SAM File")
-        except:		
-             self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-        artID_sam = skCase.getArtifactTypeID("TSK_SAM")
-        artID_sam_evt = skCase.getArtifactType("TSK_SAM")
+        artID_sam = registry.getOrAddArtifactType( "TSK_SAM", "SAM File").getTypeID()
 
 	# Create SAM directory in temp directory, if it exists then continue on processing		
         Temp_Dir = Case.getCurrentCase().getTempDirectory()
@@ -173,9 +180,9 @@ class ParseSAMIngestModule(DataSourceIngestModule):
             #self.log(Level.INFO, "Processing file: " + file.getName())
             fileCount += 1
 
-            # Save the File locally in the temp folder. use file id as name to reduce collisions
+            # The program reads temp_dir/SAM, link the extraction cache copy there
             lclDbPath = os.path.join(temp_dir, file.getName())
-            ContentUtils.writeToFile(file, File(lclDbPath))
+            self.extractionCache.linkTo(file, lclDbPath)
                         
 
 
@@ -224,21 +231,15 @@ class ParseSAMIngestModule(DataSourceIngestModule):
                       Column_Names.append(resultSet2.getString("name").upper())
                       Column_Types.append(resultSet2.getString("type"))
                       if resultSet2.getString("type") == "text":
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                              #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
+                          attID_ex1 = registry.getOrAddAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
+                          #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
                       else:
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
-                              #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
+                          attID_ex1 = registry.getOrAddAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
+                          #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
 										 
                    resultSet3 = stmt.executeQuery(SQL_String_1)
                    while resultSet3.next():
-                      art = file.newArtifact(artID_sam)
+                      attributes = []
                       Column_Number = 1
                       for col_name in Column_Names:
                          #self.log(Level.INFO, "Result get information for column " + Column_Names[Column_Number - 1] + " ")
@@ -246,12 +247,13 @@ class ParseSAMIngestModule(DataSourceIngestModule):
                          #self.log(Level.INFO, "Result get information for column_number " + str(Column_Number) + " ")
                          c_name = "TSK_" + col_name
                          #self.log(Level.INFO, "Attribute Name is " + c_name + " Atribute Type is " + str(Column_Types[Column_Number - 1]))
-                         attID_ex1 = skCase.getAttributeType(c_name)
+                         attID_ex1 = registry.getAttributeType(c_name)
                          if Column_Types[Column_Number - 1] == "text":
-                             art.addAttribute(BlackboardAttribute(attID_ex1, ParseSAMIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
+                             attributes.append(BlackboardAttribute(attID_ex1, ParseSAMIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
                          else:
-                             art.addAttribute(BlackboardAttribute(attID_ex1, ParseSAMIngestModuleFactory.moduleName, resultSet3.getInt(Column_Number)))
+                             attributes.append(BlackboardAttribute(attID_ex1, ParseSAMIngestModuleFactory.moduleName, resultSet3.getInt(Column_Number)))
                          Column_Number = Column_Number + 1
+                      poster.newArtifact(file, artID_sam, attributes)
 						
                except SQLException as e:
                    self.log(Level.INFO, "Error getting values from contacts table (" + e.getMessage() + ")")
@@ -277,17 +279,15 @@ class ParseSAMIngestModule(DataSourceIngestModule):
             self.log(Level.INFO, "removal of SAM directory failed " + temp_dir)
 
         # Fire an event to notify the UI and others that there are new artifacts  
-        IngestServices.getInstance().fireModuleDataEvent(
-            ModuleDataEvent(ParseSAMIngestModuleFactory.moduleName, artID_sam_evt, None))
+        poster.flush()
                 
         # After all databases, post a message to the ingest messages in box.
         message = IngestMessage.createMessage(IngestMessage.MessageType.DATA,
             "SAM Parser", " SAM Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
-        # Fire an event to notify the UI and others that there are new artifacts  
-        IngestServices.getInstance().fireModuleDataEvent(
-            ModuleDataEvent(ParseSAMIngestModuleFactory.moduleName, artID_sam_evt, None))
-        
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
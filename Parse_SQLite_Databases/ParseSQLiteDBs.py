@@ -84,6 +84,12 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Column_Plan import ColumnPlan, hasRows, SQLITE_COLUMN_TYPES, SQLITE_DEFAULT_COLUMN
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -138,6 +144,9 @@ class ParseSQLiteDBIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ParseSQLiteDBIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ParseSQLiteDBIngestModuleFactory.moduleName, ParseSQLiteDBIngestModuleFactory().getModuleVersionNumber(), \
+                                   self.local_settings, ['Flag', 'databaseList'])
 
         if self.local_settings.getSetting('Flag') == 'true':
             #self.List_Of_DBs.append('Other')
@@ -163,9 +172,16 @@ class ParseSQLiteDBIngestModule(DataSourceIngestModule):
         
        # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(ParseSQLiteDBIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ParseSQLiteDBIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
         for SQLite_DB in self.List_Of_DBs:
-            files = fileManager.findFiles(dataSource, SQLite_DB)
+            files = self.ledger.unprocessed(fileManager.findFiles(dataSource, SQLite_DB))
             numFiles = len(files)
             self.log(Level.INFO, "found " + str(numFiles) + " files")
             progressBar.switchToDeterminate(numFiles)
@@ -175,7 +191,7 @@ class ParseSQLiteDBIngestModule(DataSourceIngestModule):
                # Open the DB using JDBC
                #lclDbPath = os.path.join(Case.getCurrentCase().getTempDirectory(), SQLite_DB)
                lclDbPath = os.path.join(Case.getCurrentCase().getTempDirectory(), file.getName() + "-" + str(file.getId()))
-               ContentUtils.writeToFile(file, File(lclDbPath))
+               self.extractionCache.copyTo(file, lclDbPath)
 
                #self.log(Level.INFO, "Path the prefetch database file created ==> " + lclDbPath)
                try: 
@@ -202,98 +218,21 @@ class ParseSQLiteDBIngestModule(DataSourceIngestModule):
                           self.log(Level.INFO, "Result (" + resultSet.getString("tbl_name") + ")")
                           table_name = resultSet.getString("tbl_name")
                           object_type = resultSet.getString("type")
-                          resultSet4  = stmt4.executeQuery("Select count(*) 'NumRows' from " + resultSet.getString("tbl_name") + " ")
- #                          while resultSet4.next():
-                          row_count = resultSet4.getInt("NumRows")
-                          self.log(Level.INFO, " Number of Rows is " + str(row_count) + " ")                           
-                          if row_count >= 1:
+                          if hasRows(stmt4, table_name):
                                #self.log(Level.INFO, "Result get information from table " + resultSet.getString("tbl_name") + " ")
                                SQL_String_1 = "Select * from " + table_name + ";"
-                               SQL_String_2 = "PRAGMA table_info('" + table_name + "')"
                                #self.log(Level.INFO, SQL_String_1)
-                               #self.log(Level.INFO, SQL_String_2)
                                artifact_name = "TSK_" + SQLite_DB.upper() + "_" + table_name.upper()
                                artifact_desc = "SQLite Database  " + SQLite_DB.upper() + "  " + object_type.title()  + "  "+ table_name.upper()
                                #self.log(Level.INFO, "Artifact Name ==> " + artifact_name + "  Artifact Desc ==> " + artifact_desc)
-                               try:
-                                    #self.log(Level.INFO, "Begin Create New Artifacts")
-                                    artID_sql = skCase.addArtifactType( artifact_name, artifact_desc)
-                               except:		
-                                    self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-                               artID_sql = skCase.getArtifactTypeID(artifact_name)
-                               artID_sql_evt = skCase.getArtifactType(artifact_name)
+                               artID_sql = registry.getOrAddArtifactType( artifact_name, artifact_desc).getTypeID()
                                                       
-                               Column_Names = []
-                               Column_Types = []
-                               resultSet2  = stmt2.executeQuery(SQL_String_2)
-                               while resultSet2.next(): 
-                                  Column_Names.append(resultSet2.getString("name").upper())
-                                  Column_Types.append(resultSet2.getString("type").upper())
-                                  #self.log(Level.INFO, "Add Attribute TSK_" + resultSet2.getString("name").upper() + " ==> " + resultSet2.getString("name"))
-                                  ##attID_ex1 = skCase.addAttrType("TSK_" + resultSet2.getString("name").upper(), resultSet2.getString("name"))
-                                  ##self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                                  attribute_name = "TSK_" + SQLite_DB + "_" + table_name.upper() + "_" + resultSet2.getString("name").upper()
-                                  #self.log(Level.INFO, "attribure id for " + attribute_name + " == " + resultSet2.getString("type").upper())
-                                  if resultSet2.getString("type").upper() == "TEXT":
-                                      try:
-                                          attID_ex1 = skCase.addArtifactAttributeType(attribute_name, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                                      except:		
-                                          self.log(Level.INFO, "Attributes Creation Error, " + attribute_name + " ==> ")
-                                  elif resultSet2.getString("type").upper() == "LONGVARCHAR":
-                                      try:
-                                          attID_ex1 = skCase.addArtifactAttributeType(attribute_name, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                                      except:		
-                                          self.log(Level.INFO, "Attributes Creation Error, " + attribute_name + " ==> ")
-                                  elif resultSet2.getString("type").upper() == "":
-                                      try:
-                                          attID_ex1 = skCase.addArtifactAttributeType(attribute_name, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                                      except:		
-                                          self.log(Level.INFO, "Attributes Creation Error, " + attribute_name + " ==> ")
-                                  elif resultSet2.getString("type").upper() == "BLOB":
-                                      try:
-                                          attID_ex1 = skCase.addArtifactAttributeType(attribute_name, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                                      except:		
-                                          self.log(Level.INFO, "Attributes Creation Error, " + attribute_name + " ==> ")
-                                  elif resultSet2.getString("type").upper() == "REAL":
-                                      try:
-                                          attID_ex1 = skCase.addArtifactAttributeType(attribute_name, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
-                                      except:		
-                                          self.log(Level.INFO, "Attributes Creation Error, " + attribute_name + " ==> ")
-                                  else:
-                                      try:
-                                          attID_ex1 = skCase.addArtifactAttributeType(attribute_name, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
-                                      except:		
-                                          self.log(Level.INFO, "Attributes Creation Error, " + attribute_name + " ==> ")
-
-                                                     
-                               resultSet3 = stmt3.executeQuery(SQL_String_1)
-                               while resultSet3.next():
-                                  art = file.newArtifact(artID_sql)
-                                  Column_Number = 1
-                                  for col_name in Column_Names:
-                                     #self.log(Level.INFO, "Result get information for column " + Column_Names[Column_Number - 1] + " ")
-                                     #self.log(Level.INFO, "Result get information for column_number " + str(Column_Number) + " ")
-                                     #self.log(Level.INFO, "Result get information for column type " + Column_Types[Column_Number - 1] + " <== ")
-                                     c_name = "TSK_" + SQLite_DB + "_" + table_name.upper() + "_" + Column_Names[Column_Number - 1]
-                                     #self.log(Level.INFO, "Attribute Name is " + c_name + " ")
-                                     attID_ex1 = skCase.getAttributeType(c_name)
-                                     if Column_Types[Column_Number - 1] == "TEXT":
-                                         art.addAttribute(BlackboardAttribute(attID_ex1, ParseSQLiteDBIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
-                                     elif Column_Types[Column_Number - 1] == "":
-                                         art.addAttribute(BlackboardAttribute(attID_ex1, ParseSQLiteDBIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
-                                     elif Column_Types[Column_Number - 1] == "LONGVARCHAR":
-                                         art.addAttribute(BlackboardAttribute(attID_ex1, ParseSQLiteDBIngestModuleFactory.moduleName, "BLOBS Not Supported - Look at actual file"))
-                                     elif Column_Types[Column_Number - 1] == "BLOB":
-                                         art.addAttribute(BlackboardAttribute(attID_ex1, ParseSQLiteDBIngestModuleFactory.moduleName, "BLOBS Not Supported - Look at actual file"))
-                                     elif Column_Types[Column_Number - 1] == "REAL":
-                                         art.addAttribute(BlackboardAttribute(attID_ex1, ParseSQLiteDBIngestModuleFactory.moduleName, long(resultSet3.getFloat(Column_Number))))
-                                     else:
-                                         art.addAttribute(BlackboardAttribute(attID_ex1, ParseSQLiteDBIngestModuleFactory.moduleName, long(resultSet3.getInt(Column_Number))))
-                                     Column_Number = Column_Number + 1
+                               plan = ColumnPlan(registry, ParseSQLiteDBIngestModuleFactory.moduleName, stmt2, table_name, "TSK_" + SQLite_DB + "_" + table_name.upper() + "_", \
+                                                 SQLITE_COLUMN_TYPES, SQLITE_DEFAULT_COLUMN)
+                               row_count = plan.postRows(poster, file, artID_sql, stmt3.executeQuery(SQL_String_1), progressBar, table_name)
+                               self.log(Level.INFO, " Number of Rows is " + str(row_count) + " ")
                                
-                               IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(ParseSQLiteDBIngestModuleFactory.moduleName, \
-                                    artID_sql_evt, None))
+                               poster.flush()
                                 
                        except SQLException as e:
                            self.log(Level.INFO, "Error getting values from table " +  resultSet.getString("tbl_name") + " (" + e.getMessage() + ")")
@@ -311,6 +250,9 @@ class ParseSQLiteDBIngestModule(DataSourceIngestModule):
         IngestServices.getInstance().postMessage(message)
 
         
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK
 
 class GUI_PSQLiteUISettingsPanel(IngestModuleIngestJobSettingsPanel):
@@ -70,6 +70,15 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Column_Plan import ColumnPlan, STRING, LONG, stringValue, longValue
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
+SHELLBAG_COLUMN_TYPES = {"TEXT": (STRING, stringValue)}
+SHELLBAG_DEFAULT_COLUMN = (LONG, longValue)
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -113,6 +122,8 @@ class ParseShellbagsIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ParseShellbagsIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ParseShellbagsIngestModuleFactory.moduleName, ParseShellbagsIngestModuleFactory().getModuleVersionNumber())
 
         # Get path to EXE based on where this script is run from.
         # Assumes EXE is in same folder as script
@@ -142,9 +153,16 @@ class ParseShellbagsIngestModule(DataSourceIngestModule):
         
        # Set the database to be read to the once created by the SAM parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(ParseShellbagsIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ParseShellbagsIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        ntUserFiles = fileManager.findFiles(dataSource, "ntuser.dat", "")
-        usrClassFiles = fileManager.findFiles(dataSource, "usrclass.dat", "")
+        ntUserFiles = self.ledger.unprocessed(fileManager.findFiles(dataSource, "ntuser.dat", ""))
+        usrClassFiles = self.ledger.unprocessed(fileManager.findFiles(dataSource, "usrclass.dat", ""))
         files = ntUserFiles + usrClassFiles  
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
@@ -168,14 +186,13 @@ class ParseShellbagsIngestModule(DataSourceIngestModule):
            #self.log(Level.INFO, "Processing file: " + file.getName())
            fileCount += 1
 
-           # Save the DB locally in the temp folder. use file id as name to reduce collisions
-           lclDbPath = os.path.join(temp_dir, file.getName())
-           ContentUtils.writeToFile(file, File(lclDbPath))
+           # The program only reads the hive, so it reads the extraction cache copy
+           lclDbPath = self.extractionCache.getLocalPath(file)
            self.log(Level.INFO, "Saved File ==> " + lclDbPath)
 
-           self.log(Level.INFO, "Running program ==> " + self.path_to_exe + " " + temp_dir + \
-                    file.getName() + " " + temp_dir + "\\shellbag_db.db3 " + file.getUniquePath())
-           pipe = Popen([self.path_to_exe, os.path.join(temp_dir, file.getName()), os.path.join(temp_dir, "Shellbag_db.db3"), \
+           self.log(Level.INFO, "Running program ==> " + self.path_to_exe + " " + lclDbPath + \
+                    " " + temp_dir + "\\shellbag_db.db3 " + file.getUniquePath())
+           pipe = Popen([self.path_to_exe, lclDbPath, os.path.join(temp_dir, "Shellbag_db.db3"), \
                    file.getUniquePath()], stdout=PIPE, stderr=PIPE)
            out_text = pipe.communicate()[0]
            self.log(Level.INFO, "Output from run is ==> " + out_text)               
@@ -200,14 +217,7 @@ class ParseShellbagsIngestModule(DataSourceIngestModule):
                self.log(Level.INFO, "Error querying database for system table (" + e.getMessage() + ")")
                return IngestModule.ProcessResult.OK
 
-           try:
-                self.log(Level.INFO, "Begin Create New Artifacts")
-                artID_shell = skCase.addArtifactType("TSK_SHELLBAGS", "Shellbags")
-           except:		
-                self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-           artID_shell = skCase.getArtifactTypeID("TSK_SHELLBAGS")
-           artID_shell_evt = skCase.getArtifactType("TSK_SHELLBAGS")
+           artID_shell = registry.getOrAddArtifactType("TSK_SHELLBAGS", "Shellbags").getTypeID()
              
              
            # Cycle through each row and create artifacts
@@ -217,45 +227,11 @@ class ParseShellbagsIngestModule(DataSourceIngestModule):
                    table_name = resultSet.getString("tbl_name")
                    #self.log(Level.INFO, "Result get information from table " + resultSet.getString("tbl_name") + " ")
                    SQL_String_1 = "Select * from " + table_name + ";"
-                   SQL_String_2 = "PRAGMA table_info('" + table_name + "')"
                    #self.log(Level.INFO, SQL_String_1)
-                   #self.log(Level.INFO, SQL_String_2)
 				   
-                   Column_Names = []
-                   Column_Types = []
-                   resultSet2  = stmt.executeQuery(SQL_String_2)
-                   while resultSet2.next(): 
-                      Column_Names.append(resultSet2.getString("name").upper())
-                      Column_Types.append(resultSet2.getString("type"))
-                      if resultSet2.getString("type").upper() == "TEXT":
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_SHELLBAG_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                              #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
-                      else:
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_SHELLBAG_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
-                              #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
-										 
-                   resultSet3 = stmt.executeQuery(SQL_String_1)
-                   while resultSet3.next():
-                      art = file.newArtifact(artID_shell)
-                      Column_Number = 1
-                      for col_name in Column_Names:
-                         #self.log(Level.INFO, "Result get information for column " + Column_Names[Column_Number - 1] + " ")
-                         #self.log(Level.INFO, "Result get information for column " + Column_Types[Column_Number - 1] + " ")
-                         #self.log(Level.INFO, "Result get information for column_number " + str(Column_Number) + " ")
-                         c_name = "TSK_SHELLBAG_" + col_name
-                         #self.log(Level.INFO, "Attribute Name is " + c_name + " Atribute Type is " + str(Column_Types[Column_Number - 1]))
-                         attID_ex1 = skCase.getAttributeType(c_name)
-                         if Column_Types[Column_Number - 1] == "TEXT":
-                             art.addAttribute(BlackboardAttribute(attID_ex1, ParseShellbagsIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
-                         else:
-                             art.addAttribute(BlackboardAttribute(attID_ex1, ParseShellbagsIngestModuleFactory.moduleName, resultSet3.getInt(Column_Number)))
-                         Column_Number = Column_Number + 1
+                   plan = ColumnPlan(registry, ParseShellbagsIngestModuleFactory.moduleName, stmt, table_name, "TSK_SHELLBAG_", \
+                                     SHELLBAG_COLUMN_TYPES, SHELLBAG_DEFAULT_COLUMN)
+                   plan.postRows(poster, file, artID_shell, stmt.executeQuery(SQL_String_1))
 						
                except SQLException as e:
                    self.log(Level.INFO, "Error getting values from Shellbag table (" + e.getMessage() + ")")
@@ -264,16 +240,10 @@ class ParseShellbagsIngestModule(DataSourceIngestModule):
            stmt.close()
            dbConn.close()
            # Fire an event to notify the UI and others that there are new artifacts  
-           IngestServices.getInstance().fireModuleDataEvent(
-               ModuleDataEvent(ParseShellbagsIngestModuleFactory.moduleName, artID_shell_evt, None))
+           poster.flush()
 
 		#Clean up EventLog directory and files
            #os.remove(lclDbPath)
-           for file in files:
-              try:
-			     os.remove(os.path.join(temp_dir, file.getName()))
-              except:
-			     self.log(Level.INFO, "removal of shellbag file failed " + temp_dir + "\\" + file.getName())
         try:
             os.rmdir(temp_dir)		
         except:
@@ -285,8 +255,10 @@ class ParseShellbagsIngestModule(DataSourceIngestModule):
         IngestServices.getInstance().postMessage(message)
 
         # Fire an event to notify the UI and others that there are new artifacts  
-        IngestServices.getInstance().fireModuleDataEvent(
-            ModuleDataEvent(ParseShellbagsIngestModuleFactory.moduleName, artID_shell_evt, None))
+        poster.flush()
         
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
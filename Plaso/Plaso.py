@@ -34,12 +34,20 @@
 # 
 # Comments 
 #   Version 1.0 - Initial version - Feb 2017
+#   Version 1.1 - Look up the root directory for the derived database instead of every directory
+#   Version 1.2 - Index the source and datetime columns of the psort database before reading it
+#   Version 1.3 - Add a parallel mode, log2timeline workers are set from the processors and free memory
+#                 and psort exports each parser group into its own database at the same time
+#   Version 1.4 - Stop when the job is cancelled during the parser group psorts, remove the group databases
+#                 before falling back to a single psort
+#   Version 1.5 - The source column is posted as TSK_PLASO_SOURCE, not as a second TSK_PLASO_SOURCE_TYPE
 # 
 
 import jarray
 import inspect
 import os
-from subprocess import Popen, PIPE
+import time
+from subprocess import Popen, PIPE, STDOUT
 
 from javax.swing import JCheckBox
 from javax.swing import JButton
@@ -57,7 +65,9 @@ from javax.swing import JComboBox
 from javax.swing.filechooser import FileNameExtensionFilter
 
 from java.lang import Class
+from java.lang import Runtime
 from java.lang import System
+from java.lang.management import ManagementFactory
 from java.sql  import DriverManager, SQLException
 from java.util.logging import Level
 from java.io import File
@@ -83,6 +93,19 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+
+# Free memory each log2timeline worker is given when the number of workers is worked out
+WORKER_MEMORY_MB = 2048
+
+# Parser groups psort exports side by side in the parallel mode, each into its own database.
+# Events no group matches go into an Other database so nothing is left out.
+PSORT_GROUPS = [("Registry", "parser contains 'winreg'"),
+                ("File_System", "parser contains 'filestat' or parser contains 'mft' or parser contains 'usnjrnl'"),
+                ("Event_Logs", "parser contains 'winevt'"),
+                ("Browsers", "parser contains 'chrome' or parser contains 'firefox' or parser contains 'msiecf' or parser contains 'safari'")]
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -153,6 +176,18 @@ class PlasoIngestModule(DataSourceIngestModule):
         else:
             self.log(Level.INFO, "Include File Information in import process")
             self.exclude_file_sources = False
+
+        # In the parallel mode log2timeline gets a worker per processor, as long as each one has
+        # WORKER_MEMORY_MB of free memory, and psort runs once per parser group at the same time
+        self.parallel_plaso = self.local_settings.getSetting('Parallel_Plaso') == 'true'
+        self.log2timeline_workers = Runtime.getRuntime().availableProcessors()
+        try:
+            free_memory_mb = ManagementFactory.getOperatingSystemMXBean().getFreePhysicalMemorySize() / (1024 * 1024)
+            self.log2timeline_workers = min(self.log2timeline_workers, int(free_memory_mb / WORKER_MEMORY_MB))
+        except:
+            pass
+        self.log2timeline_workers = max(1, self.log2timeline_workers)
+        self.log(Level.INFO, "Parallel Plaso ==> " + str(self.parallel_plaso) + " log2timeline workers ==> " + str(self.log2timeline_workers))
         
         # Create path to plaso storage file
         if self.local_settings.getSetting('Run_Plaso') == 'true':
@@ -193,6 +228,166 @@ class PlasoIngestModule(DataSourceIngestModule):
         # raise IngestModuleException(IngestModule(), "Oh No!")
         pass
 
+    # psort writes the log2timeline table without any indexes, so every query on it is a full table scan.
+    # Index the columns the import filters on once, straight after psort, and let SQLite gather statistics.
+    def index_psort_database(self, dbConn):
+        startTime = time.time()
+        try:
+            stmt = dbConn.createStatement()
+            stmt.execute("create index if not exists log2timeline_source on log2timeline (source)")
+            stmt.execute("create index if not exists log2timeline_datetime on log2timeline (datetime)")
+            stmt.execute("analyze log2timeline")
+            stmt.close()
+        except SQLException as e:
+            self.log(Level.INFO, "Could not index the log2timeline table (" + e.getMessage() + ")")
+            return
+        self.log(Level.INFO, "Indexed the log2timeline table in " + str(int(time.time() - startTime)) + " seconds")
+
+    # Runs psort once per parser group at the same time, each into its own database, plus one for the
+    # events no group matched.  Returns the databases, or None if any of them failed so the caller
+    # can fall back to a single psort.
+    def run_psort_groups(self, storage_file, base_path, base_file_name):
+        groups = list(PSORT_GROUPS)
+        groups.append(("Other", "not (" + " or ".join(["(" + event_filter + ")" for group_name, event_filter in PSORT_GROUPS]) + ")"))
+        running = []
+        for group_name, event_filter in groups:
+            output_file = os.path.join(base_path, base_file_name + "_" + group_name + ".db3")
+            command = [self.path_to_exe_psort, "-o", "4n6time_sqlite", "-w", output_file, storage_file, event_filter]
+            self.log(Level.INFO, "Running program ==> " + " ".join(command))
+            log_file = open(os.path.join(base_path, base_file_name + "_" + group_name + ".psort.log"), "w+")
+            running.append((group_name, output_file, Popen(command, stdout=log_file, stderr=STDOUT), log_file, time.time()))
+
+        output_files = []
+        failed = False
+        while len(running) > 0:
+            if self.context.isJobCancelled():
+                for group_name, output_file, pipe, log_file, start_time in running:
+                    pipe.kill()
+                    log_file.close()
+                self.remove_group_databases(groups, base_path, base_file_name)
+                return None
+            still_running = []
+            for group_name, output_file, pipe, log_file, start_time in running:
+                if pipe.poll() == None:
+                    still_running.append((group_name, output_file, pipe, log_file, start_time))
+                    continue
+                log_file.seek(0)
+                self.log(Level.INFO, "Output from psort of " + group_name + " is ==> " + log_file.read())
+                log_file.close()
+                self.log(Level.INFO, "psort of " + group_name + " took " + str(int(time.time() - start_time)) + " seconds")
+                if pipe.returncode != 0 or not os.path.exists(output_file):
+                    failed = True
+                output_files.append(output_file)
+            if len(still_running) == len(running):
+                time.sleep(0.5)
+            running = still_running
+
+        if failed:
+            self.log(Level.INFO, "psort by parser group failed, running a single psort instead")
+            self.remove_group_databases(groups, base_path, base_file_name)
+            return None
+        return output_files
+
+    # Removes the partial parser group databases so only the single psort database is left
+    def remove_group_databases(self, groups, base_path, base_file_name):
+        for group_name, event_filter in groups:
+            output_file = os.path.join(base_path, base_file_name + "_" + group_name + ".db3")
+            try:
+                if os.path.exists(output_file):
+                    os.remove(output_file)
+            except OSError as e:
+                self.log(Level.INFO, "Could not remove " + output_file + " (" + str(e) + ")")
+
+    # Adds the events in one psort database to the blackboard under the derived file for it
+    def import_database(self, output_file, file, registry, poster):
+
+        # Create the Attributes for plaso
+        attID_source = registry.getOrAddAttributeType("TSK_PLASO_SOURCE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Source")
+        attID_sourcetype = registry.getOrAddAttributeType("TSK_PLASO_SOURCE_TYPE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Source Type")
+        attID_type = registry.getOrAddAttributeType("TSK_PLASO_TYPE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Type")
+        attID_desc = registry.getOrAddAttributeType("TSK_PLASO_DESCRIPTION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Description")
+        attID_filename = registry.getOrAddAttributeType("TSK_PLASO_FILENAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso File Name")
+        attID_format = registry.getOrAddAttributeType("TSK_PLASO_FORMAT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Format")
+        attID_extra = registry.getOrAddAttributeType("TSK_PLASO_EXTRA", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Extra")
+        attID_vss_num = registry.getOrAddAttributeType("TSK_PLASO_VSS_STORE_NUM", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso VSS Store Num")
+
+        # Open the DB using JDBC
+        lclDbPath = output_file
+        self.log(Level.INFO, "Path the Plaso Import file database file created ==> " + lclDbPath)
+        try: 
+            Class.forName("org.sqlite.JDBC").newInstance()
+            dbConn = DriverManager.getConnection("jdbc:sqlite:%s"  % lclDbPath)
+        except SQLException as e:
+            self.log(Level.INFO, "Could not open database file (not SQLite) " + output_file + " (" + e.getMessage() + ")")
+            return
+
+        self.index_psort_database(dbConn)
+        
+        # Query the l2t_sources table to include or exclude FILES based on user response 
+        try:
+           stmt = dbConn.createStatement()
+           l2t_sources_sql = "select sources from l2t_sources"
+           if self.exclude_file_sources:
+               l2t_sources_sql = l2t_sources_sql + " where sources != 'FILE'"
+           self.log(Level.INFO, l2t_sources_sql)
+           resultSet = stmt.executeQuery(l2t_sources_sql)
+           self.log(Level.INFO, "query l2t_sources table")
+        except SQLException as e:
+           self.log(Level.INFO, "Error querying database for l2t_sources table (" + e.getMessage() + ")")
+           return
+
+        # Cycle through each row and create artifacts
+        while resultSet.next(): 
+            # Create the safari last session artifact
+            artID_art = registry.getOrAddArtifactType( "TSK_PLASO_" + resultSet.getString("sources"), "Plaso Source " + \
+                                               resultSet.getString("sources")).getTypeID()
+
+            try:
+               stmt = dbConn.createStatement()
+               log2timeline_sql = "select source, sourcetype, type, description, filename, format, extra, " + \
+                                  " strftime('%s',datetime) 'datetime', vss_store_number, url " + \
+                                  " from log2timeline where source = '" + resultSet.getString("sources") + "';"
+               self.log(Level.INFO, log2timeline_sql)
+               resultSet2 = stmt.executeQuery(log2timeline_sql)
+               self.log(Level.INFO, "query lastsession table")
+            except SQLException as e:
+               self.log(Level.INFO, "Error querying database for log2timeline table (" + e.getMessage() + ")")
+               return
+
+           # Cycle through each row and create artifacts
+            while resultSet2.next():
+               try: 
+                   attributes = []
+                   #self.log(Level.INFO, "Inserting attribute source ==> 2")
+                   attributes.append(BlackboardAttribute(attID_source, PlasoIngestModuleFactory.moduleName, resultSet2.getString("source")))
+                   #self.log(Level.INFO, "Inserting attribute sourcetype")
+                   attributes.append(BlackboardAttribute(attID_sourcetype, PlasoIngestModuleFactory.moduleName, resultSet2.getString("sourcetype")))
+                   #self.log(Level.INFO, "Inserting attribute Type")
+                   attributes.append(BlackboardAttribute(attID_type, PlasoIngestModuleFactory.moduleName, resultSet2.getString("type")))
+                   #self.log(Level.INFO, "Inserting attribute description")
+                   attributes.append(BlackboardAttribute(attID_desc, PlasoIngestModuleFactory.moduleName, resultSet2.getString("description")))
+                   #self.log(Level.INFO, "Inserting attribute filename")
+                   attributes.append(BlackboardAttribute(attID_filename, PlasoIngestModuleFactory.moduleName, resultSet2.getString("filename")))
+                   #self.log(Level.INFO, "Inserting attribute format")
+                   attributes.append(BlackboardAttribute(attID_format, PlasoIngestModuleFactory.moduleName, resultSet2.getString("format")))
+                   #self.log(Level.INFO, "Inserting attribute extra")
+                   attributes.append(BlackboardAttribute(attID_extra, PlasoIngestModuleFactory.moduleName, resultSet2.getString("extra")))
+                   #self.log(Level.INFO, "Inserting attribute Date/Time")
+                   attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME.getTypeID(), PlasoIngestModuleFactory.moduleName, resultSet2.getInt("datetime")))
+                   #self.log(Level.INFO, "Inserting attribute vss_store_number")
+                   attributes.append(BlackboardAttribute(attID_vss_num, PlasoIngestModuleFactory.moduleName, resultSet2.getString("vss_store_number")))
+                   #self.log(Level.INFO, "Inserting attribute URL")
+                   attributes.append(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID(), PlasoIngestModuleFactory.moduleName, resultSet2.getString("URL")))
+                   poster.newArtifact(file, artID_art, attributes)
+
+               except SQLException as e:
+                   self.log(Level.INFO, "Error getting values from the Log2timeline table (" + e.getMessage() + ")")
+
+            poster.flush()
+
+        stmt.close()
+        dbConn.close()
+
     # Where the analysis is done.
     # The 'dataSource' object being passed in is of type org.sleuthkit.datamodel.Content.
     # See:x http://www.sleuthkit.org/sleuthkit/docs/jni-docs/interfaceorg_1_1sleuthkit_1_1datamodel_1_1_content.html
@@ -207,8 +402,16 @@ class PlasoIngestModule(DataSourceIngestModule):
         
        # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
-        fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, ".", "/")
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(PlasoIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(PlasoIngestModuleFactory.moduleName)
+
+        # The derived database hangs off the root directory, ask for just that entry instead of every
+        # directory in the data source
+        files = skCase.findAllFilesWhere("data_source_obj_id = " + str(dataSource.getId()) + " and name = '.' and parent_path = '/'")
         numFiles = len(files)
 
         
@@ -223,7 +426,12 @@ class PlasoIngestModule(DataSourceIngestModule):
 		
         # Run log2timeline against the selected images
         plaso_image = dataSource.getPaths()
+        workers_option = []
+        if self.parallel_plaso:
+            workers_option = ["--workers", str(self.log2timeline_workers)]
         if self.local_settings.getSetting('Run_Plaso') == 'true':
+            phase_start = time.time()
+            progressBar.progress("Running log2timeline")
             for image in plaso_image:
                 base_path = temp_dir
                 self.log(Level.INFO, "image ==> " + str(image) + " <==")                
@@ -243,16 +451,17 @@ class PlasoIngestModule(DataSourceIngestModule):
                     self.log(Level.INFO, "Running prog ==> " + self.path_to_exe_log2t + " --status_view none --partitions all --logfile " + \
                                          log_file + " --vss_stores all " + storage_file + " " + image)
                     pipe = Popen([self.path_to_exe_log2t, "--status_view", "none", "--partitions", "all", "--logfile", log_file, \
-                                  "--hasher_file_size_limit", "1", "--hashers", "none", "--no_dependencies_check", \
-                                  "--vss_stores", "all", storage_file, image], stdout=PIPE, stderr=PIPE)
+                                  "--hasher_file_size_limit", "1", "--hashers", "none", "--no_dependencies_check"] + workers_option + \
+                                 ["--vss_stores", "all", storage_file, image], stdout=PIPE, stderr=PIPE)
                 else:
                     self.log(Level.INFO, "Running progxx ==> " + self.path_to_exe_log2t + " --status_view none --partitions all --logfile " + \
                                          log_file + " " + self.vss_option + " " + storage_file + " " + image)
                     pipe = Popen([self.path_to_exe_log2t, "--status_view", "none", "--partitions", "all", "--logfile", log_file, \
-                                  "--hasher_file_size_limit", "1", "--hashers", "none", "--no_dependencies_check", \
-                                  self.vss_option, storage_file, image], stdout=PIPE, stderr=PIPE)
+                                  "--hasher_file_size_limit", "1", "--hashers", "none", "--no_dependencies_check"] + workers_option + \
+                                 [self.vss_option, storage_file, image], stdout=PIPE, stderr=PIPE)
                 out_text = pipe.communicate()[0]
                 self.log(Level.INFO, "Output from run is ==> " + out_text)               
+            self.log(Level.INFO, "log2timeline took " + str(int(time.time() - phase_start)) + " seconds")
         
         # Run the psort.exe program against the storage file to convert the storage file from native to SQLite 
         base_path = temp_dir
@@ -269,158 +478,50 @@ class PlasoIngestModule(DataSourceIngestModule):
         storage_file = os.path.join(base_path, base_file_name + ".plaso")            
         self.log(Level.INFO, "Storage File ==> " + storage_file)
         ##self.database_file = Temp_Dir + "\\Plaso\\Plaso.db3"
-        if self.local_settings.getSetting('Run_Plaso') == 'true':
+        if self.local_settings.getSetting('Run_Plaso') != 'true':
+            storage_file = self.path_to_storage_file
+        phase_start = time.time()
+        progressBar.progress("Running psort")
+        output_files = None
+        if self.parallel_plaso:
+            output_files = self.run_psort_groups(storage_file, base_path, base_file_name)
+            # A cancelled job stops here, the single psort is only for groups that failed
+            if self.context.isJobCancelled():
+                return IngestModule.ProcessResult.OK
+        if output_files == None and self.local_settings.getSetting('Run_Plaso') == 'true':
             self.log(Level.INFO, "Running program ==> " + self.path_to_exe_psort + " -o 4n6time_sqlite -w " + output_file + " " + \
                      storage_file)
             pipe = Popen([self.path_to_exe_psort, "-o", "4n6time_sqlite", "-w", output_file, storage_file], stdout=PIPE, stderr=PIPE)
             out_text = pipe.communicate()[0]
             self.log(Level.INFO, "Output from run is ==> " + out_text)               
-        else:
+        elif output_files == None:
             self.log(Level.INFO, "Running program ==> " + self.path_to_exe_psort + " -o 4n6time_sqlite -w " + output_file + \
                      self.path_to_storage_file)
             pipe = Popen([self.path_to_exe_psort, "-o", "4n6time_sqlite", "-w", output_file, self.path_to_storage_file], stdout=PIPE, stderr=PIPE)
             out_text = pipe.communicate()[0]
             self.log(Level.INFO, "Output from run is ==> " + out_text)               
-
-        plaso_db_file = output_file
-        plaso_db_dir = temp_dir
-        self.log(Level.INFO, "Plaso DB File ==> " + plaso_db_file)
-        for file in files:
-            abstract_file_info = skCase.getAbstractFileById(file.getId())
-            #self.log(Level.INFO, "Abstract File Info ==> " + str(abstract_file_info))
-        
-        # Add dervived file
-        file = skCase.addDerivedFile(output_file, plaso_db_dir, os.path.getsize(plaso_db_file), + \
-                                     0, 0, 0, 0, True, abstract_file_info, "", "", "", "", TskData.EncodingType.NONE)
+        if output_files == None:
+            output_files = [output_file]
+        self.log(Level.INFO, "psort took " + str(int(time.time() - phase_start)) + " seconds")
+
+        abstract_file_info = files[len(files) - 1]
+        for output_file in output_files:
+            if self.context.isJobCancelled():
+                break
+            plaso_db_file = output_file
+            plaso_db_dir = temp_dir
+            self.log(Level.INFO, "Plaso DB File ==> " + plaso_db_file)
         
-        self.log(Level.INFO, "Derived File ==> " + str(file))
+            # Add dervived file
+            file = skCase.addDerivedFile(output_file, plaso_db_dir, os.path.getsize(plaso_db_file), + \
+                                         0, 0, 0, 0, True, abstract_file_info, "", "", "", "", TskData.EncodingType.NONE)
         
-        # Create the Attributes for plaso
-        try:
-           attID_source = skCase.addArtifactAttributeType("TSK_PLASO_SOURCE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Source")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso Source ==> ")
-        try:
-           attID_sourcetype = skCase.addArtifactAttributeType("TSK_PLASO_SOURCE_TYPE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Source Type")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso Source Type ==> ")
-        try:
-           attID_type = skCase.addArtifactAttributeType("TSK_PLASO_TYPE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Type")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso Type ==> ")
-        try:
-           attID_desc = skCase.addArtifactAttributeType("TSK_PLASO_DESCRIPTION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Description")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso Description ==> ")
-        try:
-           attID_filename = skCase.addArtifactAttributeType("TSK_PLASO_FILENAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso File Name")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso File Name ==> ")
-        try:
-           attID_format = skCase.addArtifactAttributeType("TSK_PLASO_FORMAT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Format")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso Format ==> ")
-        try:
-           attID_extra = skCase.addArtifactAttributeType("TSK_PLASO_EXTRA", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Extra")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso Extra ==> ")
-        try:
-           attID_vss_num = skCase.addArtifactAttributeType("TSK_PLASO_VSS_STORE_NUM", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso VSS Store Num")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso VSS Store Num ==> ")
-
-        # Get the artifact and attributes
-        attID_source = skCase.getAttributeType("TSK_PLASO_SOURCE")
-        artID_sourcetype = skCase.getAttributeType("TSK_PLASO_SOURCE_TYPE")
-        attID_type = skCase.getAttributeType("TSK_PLASO_TYPE")
-        attID_desc = skCase.getAttributeType("TSK_PLASO_DESCRIPTION")
-        self.log(Level.INFO, "Description Attribute ==> " + str(attID_desc))
-        attID_filename = skCase.getAttributeType("TSK_PLASO_FILENAME")
-        attID_format = skCase.getAttributeType("TSK_PLASO_FORMAT")
-        attID_extra = skCase.getAttributeType("TSK_PLASO_EXTRA")
-        attID_vss_num = skCase.getAttributeType("TSK_PLASO_VSS_STORE_NUM")
-
-        # Open the DB using JDBC
-        lclDbPath = output_file
-        self.log(Level.INFO, "Path the Plaso Import file database file created ==> " + lclDbPath)
-        try: 
-            Class.forName("org.sqlite.JDBC").newInstance()
-            dbConn = DriverManager.getConnection("jdbc:sqlite:%s"  % lclDbPath)
-        except SQLException as e:
-            self.log(Level.INFO, "Could not open database file (not SQLite) " + output_file + " (" + e.getMessage() + ")")
-            return IngestModule.ProcessResult.OK
-        
-        # Query the l2t_sources table to include or exclude FILES based on user response 
-        try:
-           stmt = dbConn.createStatement()
-           l2t_sources_sql = "select sources from l2t_sources"
-           if self.exclude_file_sources:
-               l2t_sources_sql = l2t_sources_sql + " where sources != 'FILE'"
-           self.log(Level.INFO, l2t_sources_sql)
-           resultSet = stmt.executeQuery(l2t_sources_sql)
-           self.log(Level.INFO, "query l2t_sources table")
-        except SQLException as e:
-           self.log(Level.INFO, "Error querying database for l2t_sources table (" + e.getMessage() + ")")
-           return IngestModule.ProcessResult.OK
-
-        # Cycle through each row and create artifacts
-        while resultSet.next(): 
-            # Create the safari last session artifact
-            try:
-                 self.log(Level.INFO, "Begin Create New Artifacts ==> " + resultSet.getString("sources"))
-                 artID_art = skCase.addArtifactType( "TSK_PLASO_" + resultSet.getString("sources"), "Plaso Source " + \
-                                                    resultSet.getString("sources"))
-            except:		
-                 self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-            # Get the artifact and attributes
-            artID_art = skCase.getArtifactTypeID("TSK_PLASO_" + resultSet.getString("sources"))
-            artID_art_evt = skCase.getArtifactType("TSK_PLASO_" + resultSet.getString("sources"))
-
-            try:
-               stmt = dbConn.createStatement()
-               log2timeline_sql = "select source, sourcetype, type, description, filename, format, extra, " + \
-                                  " strftime('%s',datetime) 'datetime', vss_store_number, url " + \
-                                  " from log2timeline where source = '" + resultSet.getString("sources") + "';"
-               self.log(Level.INFO, log2timeline_sql)
-               resultSet2 = stmt.executeQuery(log2timeline_sql)
-               self.log(Level.INFO, "query lastsession table")
-            except SQLException as e:
-               self.log(Level.INFO, "Error querying database for log2timeline table (" + e.getMessage() + ")")
-               return IngestModule.ProcessResult.OK
-
-           # Cycle through each row and create artifacts
-            while resultSet2.next():
-               try: 
-                   art = file.newArtifact(artID_art)
-                   #self.log(Level.INFO, "Inserting attribute source ==> 2")
-                   art.addAttribute(BlackboardAttribute(artID_sourcetype, PlasoIngestModuleFactory.moduleName, resultSet2.getString("source")))
-                   #self.log(Level.INFO, "Inserting attribute sourcetype")
-                   art.addAttribute(BlackboardAttribute(artID_sourcetype, PlasoIngestModuleFactory.moduleName, resultSet2.getString("sourcetype")))
-                   #self.log(Level.INFO, "Inserting attribute Type")
-                   art.addAttribute(BlackboardAttribute(attID_type, PlasoIngestModuleFactory.moduleName, resultSet2.getString("type")))
-                   #self.log(Level.INFO, "Inserting attribute description")
-                   art.addAttribute(BlackboardAttribute(attID_desc, PlasoIngestModuleFactory.moduleName, resultSet2.getString("description")))
-                   #self.log(Level.INFO, "Inserting attribute filename")
-                   art.addAttribute(BlackboardAttribute(attID_filename, PlasoIngestModuleFactory.moduleName, resultSet2.getString("filename")))
-                   #self.log(Level.INFO, "Inserting attribute format")
-                   art.addAttribute(BlackboardAttribute(attID_format, PlasoIngestModuleFactory.moduleName, resultSet2.getString("format")))
-                   #self.log(Level.INFO, "Inserting attribute extra")
-                   art.addAttribute(BlackboardAttribute(attID_extra, PlasoIngestModuleFactory.moduleName, resultSet2.getString("extra")))
-                   #self.log(Level.INFO, "Inserting attribute Date/Time")
-                   art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME.getTypeID(), PlasoIngestModuleFactory.moduleName, resultSet2.getInt("datetime")))
-                   #self.log(Level.INFO, "Inserting attribute vss_store_number")
-                   art.addAttribute(BlackboardAttribute(attID_vss_num, PlasoIngestModuleFactory.moduleName, resultSet2.getString("vss_store_number")))
-                   #self.log(Level.INFO, "Inserting attribute URL")
-                   art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID(), PlasoIngestModuleFactory.moduleName, resultSet2.getString("URL")))
-
-               except SQLException as e:
-                   self.log(Level.INFO, "Error getting values from the Log2timeline table (" + e.getMessage() + ")")
+            self.log(Level.INFO, "Derived File ==> " + str(file))
 
-            IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(PlasoIngestModuleFactory.moduleName, artID_art_evt, None))
-
-        stmt.close()
-        dbConn.close()
+            phase_start = time.time()
+            progressBar.progress("Importing " + os.path.basename(output_file))
+            self.import_database(output_file, file, registry, poster)
+            self.log(Level.INFO, "Importing " + output_file + " took " + str(int(time.time() - phase_start)) + " seconds")
 
         # After all databases, post a message to the ingest messages in box.
         message = IngestMessage.createMessage(IngestMessage.MessageType.DATA,
@@ -466,6 +567,11 @@ class PlasoSettingsWithUISettingsPanel(IngestModuleIngestJobSettingsPanel):
             self.local_settings.setSetting('Import_Plaso', 'true')
         else:
             self.local_settings.setSetting('Import_Plaso', 'false')
+
+        if self.Parallel_Plaso_CB.isSelected():
+            self.local_settings.setSetting('Parallel_Plaso', 'true')
+        else:
+            self.local_settings.setSetting('Parallel_Plaso', 'false')
             
            
     # When button to find file is clicked then open dialog to find the file and return it.       
@@ -687,10 +793,22 @@ class PlasoSettingsWithUISettingsPanel(IngestModuleIngestJobSettingsPanel):
         self.gbPanel0.setConstraints( self.Exclude_File_Sources_CB, self.gbcPanel0 ) 
         self.panel0.add( self.Exclude_File_Sources_CB ) 
 
+        self.Parallel_Plaso_CB = JCheckBox( "Run Plaso In Parallel (workers and psort by parser group)", actionPerformed=self.checkBoxEvent) 
+        self.gbcPanel0.gridx = 2 
+        self.gbcPanel0.gridy = 23
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints( self.Parallel_Plaso_CB, self.gbcPanel0 ) 
+        self.panel0.add( self.Parallel_Plaso_CB ) 
+
         self.Blank_4 = JLabel( " ") 
         self.Blank_4.setEnabled(True)
         self.gbcPanel0.gridx = 2 
-        self.gbcPanel0.gridy = 23
+        self.gbcPanel0.gridy = 25
         self.gbcPanel0.gridwidth = 1 
         self.gbcPanel0.gridheight = 1 
         self.gbcPanel0.fill = GridBagConstraints.BOTH 
@@ -703,7 +821,7 @@ class PlasoSettingsWithUISettingsPanel(IngestModuleIngestJobSettingsPanel):
         self.Label_3 = JLabel( "Message:") 
         self.Label_3.setEnabled(True)
         self.gbcPanel0.gridx = 2 
-        self.gbcPanel0.gridy = 25
+        self.gbcPanel0.gridy = 27
         self.gbcPanel0.gridwidth = 1 
         self.gbcPanel0.gridheight = 1 
         self.gbcPanel0.fill = GridBagConstraints.BOTH 
@@ -716,7 +834,7 @@ class PlasoSettingsWithUISettingsPanel(IngestModuleIngestJobSettingsPanel):
         self.Error_Message = JLabel( "") 
         self.Error_Message.setEnabled(True)
         self.gbcPanel0.gridx = 2
-        self.gbcPanel0.gridy = 27
+        self.gbcPanel0.gridy = 29
         self.gbcPanel0.gridwidth = 1 
         self.gbcPanel0.gridheight = 1 
         self.gbcPanel0.fill = GridBagConstraints.BOTH 
@@ -733,6 +851,7 @@ class PlasoSettingsWithUISettingsPanel(IngestModuleIngestJobSettingsPanel):
         self.Exclude_File_Sources_CB.setSelected(self.local_settings.getSetting('Exclude_File_Sources') == 'true')
         self.Run_Plaso_CB.setSelected(self.local_settings.getSetting('Run_Plaso') == 'true')
         self.Import_Plaso_CB.setSelected(self.local_settings.getSetting('Import_Plaso') == 'true')
+        self.Parallel_Plaso_CB.setSelected(self.local_settings.getSetting('Parallel_Plaso') == 'true')
         self.Program_Executable_TF.setText(self.local_settings.getSetting('Plaso_Directory'))
         self.Plaso_Storage_File_TF.setText(self.local_settings.getSetting('Plaso_Storage_File'))
         
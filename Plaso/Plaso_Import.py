@@ -33,11 +33,16 @@
 # 
 # Comments 
 #   Version 1.0 - Initial version - Feb 2017
+#   Version 1.1 - Look up the root directory for the derived database instead of every directory
+#   Version 1.2 - Read the log2timeline table in one streamed query with the source and date filters
+#                 in the SQL, report rows per second
+#   Version 1.3 - Index the source and datetime columns of the psort database before reading it
 # 
 
 import jarray
 import inspect
 import os
+import time
 from subprocess import Popen, PIPE
 
 from javax.swing import JCheckBox
@@ -80,6 +85,12 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+
+# Rows pulled from the psort database at a time
+FETCH_SIZE = 1000
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -147,6 +158,23 @@ class Plaso_ImportIngestModule(DataSourceIngestModule):
         else:
             self.log(Level.INFO, "Include File Information in import process")
             self.exclude_file_sources = False
+
+        # Optional filters, only these sources and only events between the start and end dates
+        self.plaso_sources = []
+        if self.local_settings.getSetting('Plaso_Sources') != None:
+            self.plaso_sources = [source.strip() for source in self.local_settings.getSetting('Plaso_Sources').split(",") if source.strip() != ""]
+        self.start_date = self.local_settings.getSetting('Start_Date')
+        if self.start_date == None:
+            self.start_date = ""
+        self.start_date = self.start_date.strip()
+        self.end_date = self.local_settings.getSetting('End_Date')
+        if self.end_date == None:
+            self.end_date = ""
+        self.end_date = self.end_date.strip()
+        # A date on its own takes in the whole day
+        if len(self.end_date) == 10:
+            self.end_date = self.end_date + " 23:59:59"
+        self.log(Level.INFO, "Sources ==> " + str(self.plaso_sources) + " Start Date ==> " + self.start_date + " End Date ==> " + self.end_date)
         
         # Create path to plaso storage file
         self.path_to_storage_file = self.local_settings.getSetting('Plaso_Storage_File')
@@ -161,6 +189,21 @@ class Plaso_ImportIngestModule(DataSourceIngestModule):
         # raise IngestModuleException(IngestModule(), "Oh No!")
         pass
 
+    # psort writes the log2timeline table without any indexes, so every query on it is a full table scan.
+    # Index the columns the import filters on once, straight after psort, and let SQLite gather statistics.
+    def index_psort_database(self, dbConn):
+        startTime = time.time()
+        try:
+            stmt = dbConn.createStatement()
+            stmt.execute("create index if not exists log2timeline_source on log2timeline (source)")
+            stmt.execute("create index if not exists log2timeline_datetime on log2timeline (datetime)")
+            stmt.execute("analyze log2timeline")
+            stmt.close()
+        except SQLException as e:
+            self.log(Level.INFO, "Could not index the log2timeline table (" + e.getMessage() + ")")
+            return
+        self.log(Level.INFO, "Indexed the log2timeline table in " + str(int(time.time() - startTime)) + " seconds")
+
     # Where the analysis is done.
     # The 'dataSource' object being passed in is of type org.sleuthkit.datamodel.Content.
     # See:x http://www.sleuthkit.org/sleuthkit/docs/jni-docs/interfaceorg_1_1sleuthkit_1_1datamodel_1_1_content.html
@@ -175,8 +218,16 @@ class Plaso_ImportIngestModule(DataSourceIngestModule):
         
        # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
-        fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, ".", "/")
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(Plaso_ImportIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(Plaso_ImportIngestModuleFactory.moduleName)
+
+        # The derived database hangs off the root directory, ask for just that entry instead of every
+        # directory in the data source
+        files = skCase.findAllFilesWhere("data_source_obj_id = " + str(dataSource.getId()) + " and name = '.' and parent_path = '/'")
         numFiles = len(files)
         #self.log(Level.INFO, "Number of files found " + str(numFiles) + " files")
         #self.log(Level.INFO, "found " + str(files) + " files")
@@ -203,9 +254,7 @@ class Plaso_ImportIngestModule(DataSourceIngestModule):
         plaso_db_file = Temp_Dir + "\Plaso_Import\Plaso_Import.db3"
         plaso_db_dir = Temp_Dir + "\Plaso_Import"
         self.log(Level.INFO, "Plaso DB File ==> " + plaso_db_file)
-        for file in files:
-            abstract_file_info = skCase.getAbstractFileById(file.getId())
-            #self.log(Level.INFO, "Abstract File Info ==> " + str(abstract_file_info))
+        abstract_file_info = files[len(files) - 1]
         
         # Add dervived file
         file = skCase.addDerivedFile("Plaso_Import.db3", plaso_db_file, os.path.getsize(plaso_db_file), + \
@@ -214,49 +263,21 @@ class Plaso_ImportIngestModule(DataSourceIngestModule):
         self.log(Level.INFO, "Derived File ==> " + str(file))
         
         # Create the Attributes for plaso
-        try:
-           attID_source = skCase.addArtifactAttributeType("TSK_PLASO_SOURCE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Source")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso Source ==> ")
-        try:
-           attID_sourcetype = skCase.addArtifactAttributeType("TSK_PLASO_SOURCE_TYPE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Source Type")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso Source Type ==> ")
-        try:
-           attID_type = skCase.addArtifactAttributeType("TSK_PLASO_TYPE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Type")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso Type ==> ")
-        try:
-           attID_desc = skCase.addArtifactAttributeType("TSK_PLASO_DESCRIPTION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Description")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso Description ==> ")
-        try:
-           attID_filename = skCase.addArtifactAttributeType("TSK_PLASO_FILENAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso File Name")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso File Name ==> ")
-        try:
-           attID_format = skCase.addArtifactAttributeType("TSK_PLASO_FORMAT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Format")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso Format ==> ")
-        try:
-           attID_extra = skCase.addArtifactAttributeType("TSK_PLASO_EXTRA", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Extra")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso Extra ==> ")
-        try:
-           attID_vss_num = skCase.addArtifactAttributeType("TSK_PLASO_VSS_STORE_NUM", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso VSS Store Num")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Plaso VSS Store Num ==> ")
-
-        # Get the artifact and attributes
-        attID_source = skCase.getAttributeType("TSK_PLASO_SOURCE")
-        artID_sourcetype = skCase.getAttributeType("TSK_PLASO_SOURCE_TYPE")
-        attID_type = skCase.getAttributeType("TSK_PLASO_TYPE")
-        attID_desc = skCase.getAttributeType("TSK_PLASO_DESCRIPTION")
-        self.log(Level.INFO, "Description Attribute ==> " + str(attID_desc))
-        attID_filename = skCase.getAttributeType("TSK_PLASO_FILENAME")
-        attID_format = skCase.getAttributeType("TSK_PLASO_FORMAT")
-        attID_extra = skCase.getAttributeType("TSK_PLASO_EXTRA")
-        attID_vss_num = skCase.getAttributeType("TSK_PLASO_VSS_STORE_NUM")
+        attID_source = registry.getOrAddAttributeType("TSK_PLASO_SOURCE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Source")
+        attID_sourcetype = registry.getOrAddAttributeType("TSK_PLASO_SOURCE_TYPE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Source Type")
+        attID_type = registry.getOrAddAttributeType("TSK_PLASO_TYPE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Type")
+        attID_desc = registry.getOrAddAttributeType("TSK_PLASO_DESCRIPTION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Description")
+        attID_filename = registry.getOrAddAttributeType("TSK_PLASO_FILENAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso File Name")
+        attID_format = registry.getOrAddAttributeType("TSK_PLASO_FORMAT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Format")
+        attID_extra = registry.getOrAddAttributeType("TSK_PLASO_EXTRA", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso Extra")
+        attID_vss_num = registry.getOrAddAttributeType("TSK_PLASO_VSS_STORE_NUM", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Plaso VSS Store Num")
+
+        # Attribute type and column number for each string column, worked out once instead of for every row
+        moduleName = Plaso_ImportIngestModuleFactory.moduleName
+        stringColumns = [(attID_source, 1), (attID_sourcetype, 2), (attID_type, 3), (attID_desc, 4), (attID_filename, 5), \
+                         (attID_format, 6), (attID_extra, 7), (attID_vss_num, 9)]
+        attID_datetime = BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME.getTypeID()
+        attID_url = BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID()
 
         # Open the DB using JDBC
         lclDbPath = os.path.join(plaso_db_dir, "Plaso_Import.db3")
@@ -267,78 +288,65 @@ class Plaso_ImportIngestModule(DataSourceIngestModule):
         except SQLException as e:
             self.log(Level.INFO, "Could not open database file (not SQLite) plaso_Import.db3 (" + e.getMessage() + ")")
             return IngestModule.ProcessResult.OK
+
+        self.index_psort_database(dbConn)
         
-        # Query the l2t_sources table to include or exclude FILES based on user response 
+        # One query for all the sources, the filters are done by SQLite instead of reading the rows first
+        log2timeline_sql = "select source, sourcetype, type, description, filename, format, extra, " + \
+                           " strftime('%s',datetime) 'datetime', vss_store_number, url from log2timeline where 1 = 1"
+        parameters = []
+        if self.exclude_file_sources:
+            log2timeline_sql = log2timeline_sql + " and source != 'FILE'"
+        if len(self.plaso_sources) > 0:
+            log2timeline_sql = log2timeline_sql + " and source in (" + ", ".join(["?"] * len(self.plaso_sources)) + ")"
+            parameters.extend(self.plaso_sources)
+        if self.start_date != "":
+            log2timeline_sql = log2timeline_sql + " and datetime >= ?"
+            parameters.append(self.start_date)
+        if self.end_date != "":
+            log2timeline_sql = log2timeline_sql + " and datetime <= ?"
+            parameters.append(self.end_date)
+        self.log(Level.INFO, log2timeline_sql + " " + str(parameters))
         try:
-           stmt = dbConn.createStatement()
-           l2t_sources_sql = "select sources from l2t_sources"
-           if self.exclude_file_sources:
-               l2t_sources_sql = l2t_sources_sql + " where sources != 'FILE'"
-           self.log(Level.INFO, l2t_sources_sql)
-           resultSet = stmt.executeQuery(l2t_sources_sql)
-           self.log(Level.INFO, "query l2t_sources table")
+            stmt = dbConn.prepareStatement(log2timeline_sql)
+            for index in range(len(parameters)):
+                stmt.setString(index + 1, parameters[index])
+            stmt.setFetchSize(FETCH_SIZE)
+            resultSet = stmt.executeQuery()
         except SQLException as e:
-           self.log(Level.INFO, "Error querying database for l2t_sources table (" + e.getMessage() + ")")
-           return IngestModule.ProcessResult.OK
-
-        # Cycle through each row and create artifacts
-        while resultSet.next(): 
-            # Create the safari last session artifact
-            try:
-                 self.log(Level.INFO, "Begin Create New Artifacts ==> " + resultSet.getString("sources"))
-                 artID_art = skCase.addArtifactType( "TSK_PLASO" + resultSet.getString("sources"), "Plaso Source " + \
-                                                    resultSet.getString("sources"))
-            except:		
-                 self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-            # Get the artifact and attributes
-            artID_art = skCase.getArtifactTypeID("TSK_PLASO" + resultSet.getString("sources"))
-            artID_art_evt = skCase.getArtifactType("TSK_PLASO" + resultSet.getString("sources"))
+            self.log(Level.INFO, "Error querying database for log2timeline table (" + e.getMessage() + ")")
+            return IngestModule.ProcessResult.OK
 
+        # Cycle through each row and create artifacts, one artifact type per source
+        artifactTypes = {}
+        numRows = 0
+        startTime = time.time()
+        while resultSet.next():
             try:
-               stmt = dbConn.createStatement()
-               log2timeline_sql = "select source, sourcetype, type, description, filename, format, extra, " + \
-                                  " strftime('%s',datetime) 'datetime', vss_store_number, url " + \
-                                  " from log2timeline where source = '" + resultSet.getString("sources") + "';"
-               self.log(Level.INFO, log2timeline_sql)
-               resultSet2 = stmt.executeQuery(log2timeline_sql)
-               self.log(Level.INFO, "query lastsession table")
+                source = resultSet.getString(1)
+                if source not in artifactTypes:
+                    artifactTypes[source] = registry.getOrAddArtifactType("TSK_PLASO" + source, "Plaso Source " + source).getTypeID()
+                attributes = [BlackboardAttribute(attID, moduleName, resultSet.getString(column)) for attID, column in stringColumns]
+                attributes.append(BlackboardAttribute(attID_datetime, moduleName, resultSet.getInt(8)))
+                attributes.append(BlackboardAttribute(attID_url, moduleName, resultSet.getString(10)))
+                poster.newArtifact(file, artifactTypes[source], attributes)
             except SQLException as e:
-               self.log(Level.INFO, "Error querying database for log2timeline table (" + e.getMessage() + ")")
-               return IngestModule.ProcessResult.OK
-
-           # Cycle through each row and create artifacts
-            while resultSet2.next():
-               try: 
-                   art = file.newArtifact(artID_art)
-                   #self.log(Level.INFO, "Inserting attribute source ==> 2")
-                   art.addAttribute(BlackboardAttribute(artID_sourcetype, Plaso_ImportIngestModuleFactory.moduleName, resultSet2.getString("source")))
-                   #self.log(Level.INFO, "Inserting attribute sourcetype")
-                   art.addAttribute(BlackboardAttribute(artID_sourcetype, Plaso_ImportIngestModuleFactory.moduleName, resultSet2.getString("sourcetype")))
-                   #self.log(Level.INFO, "Inserting attribute Type")
-                   art.addAttribute(BlackboardAttribute(attID_type, Plaso_ImportIngestModuleFactory.moduleName, resultSet2.getString("type")))
-                   #self.log(Level.INFO, "Inserting attribute description")
-                   art.addAttribute(BlackboardAttribute(attID_desc, Plaso_ImportIngestModuleFactory.moduleName, resultSet2.getString("description")))
-                   #self.log(Level.INFO, "Inserting attribute filename")
-                   art.addAttribute(BlackboardAttribute(attID_filename, Plaso_ImportIngestModuleFactory.moduleName, resultSet2.getString("filename")))
-                   #self.log(Level.INFO, "Inserting attribute format")
-                   art.addAttribute(BlackboardAttribute(attID_format, Plaso_ImportIngestModuleFactory.moduleName, resultSet2.getString("format")))
-                   #self.log(Level.INFO, "Inserting attribute extra")
-                   art.addAttribute(BlackboardAttribute(attID_extra, Plaso_ImportIngestModuleFactory.moduleName, resultSet2.getString("extra")))
-                   #self.log(Level.INFO, "Inserting attribute Date/Time")
-                   art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME.getTypeID(), Plaso_ImportIngestModuleFactory.moduleName, resultSet2.getInt("datetime")))
-                   #self.log(Level.INFO, "Inserting attribute vss_store_number")
-                   art.addAttribute(BlackboardAttribute(attID_vss_num, Plaso_ImportIngestModuleFactory.moduleName, resultSet2.getString("vss_store_number")))
-                   #self.log(Level.INFO, "Inserting attribute URL")
-                   art.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_URL.getTypeID(), Plaso_ImportIngestModuleFactory.moduleName, resultSet2.getString("URL")))
-
-               except SQLException as e:
-                   self.log(Level.INFO, "Error getting values from the Log2timeline table (" + e.getMessage() + ")")
-
-            IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(Plaso_ImportIngestModuleFactory.moduleName, artID_art_evt, None))
-
-        # stmt.close()
-        # dbConn.close()
+                self.log(Level.INFO, "Error getting values from the Log2timeline table (" + e.getMessage() + ")")
+
+            numRows = numRows + 1
+            if numRows % (FETCH_SIZE * 10) == 0:
+                if self.context.isJobCancelled():
+                    break
+                self.log(Level.INFO, "Imported " + str(numRows) + " rows, " + \
+                         str(int(numRows / max(time.time() - startTime, 0.001))) + " rows per second")
+                progressBar.progress("Imported " + str(numRows) + " rows")
+
+        poster.flush()
+        resultSet.close()
+        stmt.close()
+        dbConn.close()
+        self.log(Level.INFO, "Imported " + str(numRows) + " rows from " + str(len(artifactTypes)) + " sources in " + \
+                 str(int(time.time() - startTime)) + " seconds, " + str(int(numRows / max(time.time() - startTime, 0.001))) + " rows per second")
 
         # Clean up
         #os.remove(lclDbPath)
@@ -427,6 +435,15 @@ class Plaso_ImportSettingsWithUISettingsPanel(IngestModuleIngestJobSettingsPanel
            
     def setPlasoStorageFile(self, event):
         self.local_settings.setSetting('Plaso_Storage_File', self.Plaso_Storage_File_TF.getText()) 
+
+    def setPlasoSources(self, event):
+        self.local_settings.setSetting('Plaso_Sources', self.Plaso_Sources_TF.getText()) 
+
+    def setStartDate(self, event):
+        self.local_settings.setSetting('Start_Date', self.Start_Date_TF.getText()) 
+
+    def setEndDate(self, event):
+        self.local_settings.setSetting('End_Date', self.End_Date_TF.getText()) 
            
     # Create the initial data fields/layout in the UI
     def initComponents(self):
@@ -568,10 +585,101 @@ class Plaso_ImportSettingsWithUISettingsPanel(IngestModuleIngestJobSettingsPanel
         self.gbPanel0.setConstraints( self.Blank_4, self.gbcPanel0 ) 
         self.panel0.add( self.Blank_4 ) 
 
+        self.Label_4 = JLabel("Only These Sources (comma separated, blank for all)")
+        self.Label_4.setEnabled(True)
+        self.gbcPanel0.gridx = 2 
+        self.gbcPanel0.gridy = 19
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints( self.Label_4, self.gbcPanel0 ) 
+        self.panel0.add( self.Label_4 ) 
+
+        self.Plaso_Sources_TF = JTextField(20, focusLost=self.setPlasoSources) 
+        self.Plaso_Sources_TF.setEnabled(True)
+        self.gbcPanel0.gridx = 2 
+        self.gbcPanel0.gridy = 21
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints( self.Plaso_Sources_TF, self.gbcPanel0 ) 
+        self.panel0.add( self.Plaso_Sources_TF ) 
+
+        self.Label_5 = JLabel("Start Date (YYYY-MM-DD [HH:MM:SS], blank for no start)")
+        self.Label_5.setEnabled(True)
+        self.gbcPanel0.gridx = 2 
+        self.gbcPanel0.gridy = 23
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints( self.Label_5, self.gbcPanel0 ) 
+        self.panel0.add( self.Label_5 ) 
+
+        self.Start_Date_TF = JTextField(20, focusLost=self.setStartDate) 
+        self.Start_Date_TF.setEnabled(True)
+        self.gbcPanel0.gridx = 2 
+        self.gbcPanel0.gridy = 25
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints( self.Start_Date_TF, self.gbcPanel0 ) 
+        self.panel0.add( self.Start_Date_TF ) 
+
+        self.Label_6 = JLabel("End Date (YYYY-MM-DD [HH:MM:SS], blank for no end)")
+        self.Label_6.setEnabled(True)
+        self.gbcPanel0.gridx = 2 
+        self.gbcPanel0.gridy = 27
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints( self.Label_6, self.gbcPanel0 ) 
+        self.panel0.add( self.Label_6 ) 
+
+        self.End_Date_TF = JTextField(20, focusLost=self.setEndDate) 
+        self.End_Date_TF.setEnabled(True)
+        self.gbcPanel0.gridx = 2 
+        self.gbcPanel0.gridy = 29
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints( self.End_Date_TF, self.gbcPanel0 ) 
+        self.panel0.add( self.End_Date_TF ) 
+
+        self.Blank_5 = JLabel( " ") 
+        self.Blank_5.setEnabled(True)
+        self.gbcPanel0.gridx = 2 
+        self.gbcPanel0.gridy = 31
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints( self.Blank_5, self.gbcPanel0 ) 
+        self.panel0.add( self.Blank_5 ) 
+
         self.Label_3 = JLabel( "Message:") 
         self.Label_3.setEnabled(True)
         self.gbcPanel0.gridx = 2 
-        self.gbcPanel0.gridy = 19
+        self.gbcPanel0.gridy = 33
         self.gbcPanel0.gridwidth = 1 
         self.gbcPanel0.gridheight = 1 
         self.gbcPanel0.fill = GridBagConstraints.BOTH 
@@ -584,7 +692,7 @@ class Plaso_ImportSettingsWithUISettingsPanel(IngestModuleIngestJobSettingsPanel
         self.Error_Message = JLabel( "") 
         self.Error_Message.setEnabled(True)
         self.gbcPanel0.gridx = 2
-        self.gbcPanel0.gridy = 23
+        self.gbcPanel0.gridy = 37
         self.gbcPanel0.gridwidth = 1 
         self.gbcPanel0.gridheight = 1 
         self.gbcPanel0.fill = GridBagConstraints.BOTH 
@@ -601,6 +709,9 @@ class Plaso_ImportSettingsWithUISettingsPanel(IngestModuleIngestJobSettingsPanel
         self.Exclude_File_Sources_CB.setSelected(self.local_settings.getSetting('Exclude_File_Sources') == 'true')
         self.Program_Executable_TF.setText(self.local_settings.getSetting('Plaso_Directory'))
         self.Plaso_Storage_File_TF.setText(self.local_settings.getSetting('Plaso_Storage_File'))
+        self.Plaso_Sources_TF.setText(self.local_settings.getSetting('Plaso_Sources'))
+        self.Start_Date_TF.setText(self.local_settings.getSetting('Start_Date'))
+        self.End_Date_TF.setText(self.local_settings.getSetting('End_Date'))
 
     # Return the settings used
     def getSettings(self):
@@ -0,0 +1,99 @@
+# Type_Registry.py = Jython helper that resolves blackboard artifact and attribute types once per job
+#
+# Contact: Mark McKinnon [Mark [dot] McKinnon <at> Davenport [dot] edu]
+#
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+# Copied next to each module that creates artifacts, same as Blackboard_Poster.py.
+#
+# Comments
+#   Version 1.0 - Initial version - October 2026
+#
+# Usage:
+#   registry = TypeRegistry(SomeIngestModuleFactory.moduleName)
+#   artID = registry.getOrAddArtifactType("TSK_SOME_ARTIFACT", "Some Artifact").getTypeID()
+#   attID = registry.getOrAddAttributeType("TSK_SOME_ATTRIBUTE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Some Attribute")
+#   attID = registry.getAttributeType("TSK_SOME_ATTRIBUTE")
+#
+# Each type is looked up (or created) in the case database the first time it is asked for,
+# after that it comes out of a dictionary so row loops can ask for types as often as they
+# like without going back to the case database.
+
+from java.util.logging import Level
+from org.sleuthkit.datamodel import Blackboard
+from org.sleuthkit.autopsy.casemodule import Case
+from org.sleuthkit.autopsy.coreutils import Logger
+
+class TypeRegistry(object):
+
+    def __init__(self, module_name):
+        self.skCase = Case.getCurrentCase().getSleuthkitCase()
+        self.blackboard = self.skCase.getBlackboard()
+        self._logger = Logger.getLogger(module_name)
+        self._artifact_types = {}
+        self._attribute_types = {}
+
+    def getOrAddArtifactType(self, type_name, display_name):
+        # Returns the BlackboardArtifact.Type, creating the artifact type if it does not exist.
+        if type_name not in self._artifact_types:
+            try:
+                self._artifact_types[type_name] = self.blackboard.getOrAddArtifactType(type_name, display_name)
+            except Blackboard.BlackboardException as e:
+                self._logger.log(Level.SEVERE, "Error creating artifact type " + type_name, e)
+                return self.getArtifactType(type_name)
+        return self._artifact_types[type_name]
+
+    def getOrAddAttributeType(self, type_name, value_type, display_name):
+        # Returns the BlackboardAttribute.Type, creating the attribute type if it does not exist.
+        if type_name not in self._attribute_types:
+            try:
+                self._attribute_types[type_name] = self.blackboard.getOrAddAttributeType(type_name, value_type, display_name)
+            except Blackboard.BlackboardException as e:
+                self._logger.log(Level.SEVERE, "Error creating attribute type " + type_name, e)
+                return self.getAttributeType(type_name)
+        return self._attribute_types[type_name]
+
+    def getArtifactType(self, type_name):
+        # Looks up an artifact type that was created somewhere else, None if it does not exist.
+        if type_name not in self._artifact_types:
+            artifact_type = self.skCase.getArtifactType(type_name)
+            if artifact_type is None:
+                return None
+            self._artifact_types[type_name] = artifact_type
+        return self._artifact_types[type_name]
+
+    def getArtifactTypeID(self, type_name):
+        artifact_type = self.getArtifactType(type_name)
+        if artifact_type is None:
+            return -1
+        return artifact_type.getTypeID()
+
+    def getAttributeType(self, type_name):
+        # Looks up an attribute type that was created somewhere else, None if it does not exist.
+        if type_name not in self._attribute_types:
+            attribute_type = self.skCase.getAttributeType(type_name)
+            if attribute_type is None:
+                return None
+            self._attribute_types[type_name] = attribute_type
+        return self._attribute_types[type_name]
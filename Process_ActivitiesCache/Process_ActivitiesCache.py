@@ -69,6 +69,11 @@ from org.sleuthkit.datamodel import CommunicationsManager
 from org.sleuthkit.datamodel import Relationship
 from org.sleuthkit.datamodel import Account
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 
 # Factory that defines the name and details of the module and allows Autopsy
@@ -124,6 +129,8 @@ class ProcessActivitiesCacheIngestModule(DataSourceIngestModule):
                            
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ProcessActivitiesCacheIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ProcessActivitiesCacheIngestModuleFactory.moduleName, ProcessActivitiesCacheIngestModuleFactory().getModuleVersionNumber())
         pass
         
     # Where the analysis is done.
@@ -134,8 +141,15 @@ class ProcessActivitiesCacheIngestModule(DataSourceIngestModule):
         
         # get current case and the ActivitiesCache abstract file information
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(ProcessActivitiesCacheIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ProcessActivitiesCacheIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "ActivitiesCache%")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "ActivitiesCache%"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -160,26 +174,12 @@ class ProcessActivitiesCacheIngestModule(DataSourceIngestModule):
             
         if numFiles > 0:
             for artifact in self.stringColumns:
-                try:
-                    attID = skCase.addArtifactAttributeType(artifact[0], BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, artifact[1])
-                    #self.log(Level.INFO, "attribute id for " + artifact[0] + " == " + str(attID))
-                except:		
-                    self.log(Level.INFO, "Attributes Creation Error, " + artifact[0] + " ==> ")
+                attID = registry.getOrAddAttributeType(artifact[0], BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, artifact[1])
+                #self.log(Level.INFO, "attribute id for " + artifact[0] + " == " + str(attID))
             for artifact in self.dateColumns:
-                try:
-                    attID = skCase.addArtifactAttributeType(artifact[0], BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, artifact[1])
-                    #self.log(Level.INFO, "attribute id for " + artifact[0] + " == " + str(attID))
-                except:		
-                    self.log(Level.INFO, "Attributes Creation Error, " + artifact[0] + " ==> ")
-            try:
-                #self.log(Level.INFO, "Begin Create New Artifacts ==> TSK_ACTCACHE_DB")
-                artID_art = skCase.addArtifactType("TSK_ACTCACHE_DB", "Activities Cache Timeline DB")
-            except:		
-                self.log(Level.INFO, "Artifacts Creation Error, artifact TSK_ACTCACHE_DB exists. ==> ")
-
-                    
-                    
-        # Write out each users store.vol file and process it.
+                attID = registry.getOrAddAttributeType(artifact[0], BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, artifact[1])
+                #self.log(Level.INFO, "attribute id for " + artifact[0] + " == " + str(attID))
+            artID_art = registry.getOrAddArtifactType("TSK_ACTCACHE_DB", "Activities Cache Timeline DB").getTypeID()
         for file in files:
             
             # Check if the user pressed cancel while we were busy
@@ -193,7 +193,7 @@ class ProcessActivitiesCacheIngestModule(DataSourceIngestModule):
             fileId = filePathId[file.getParentPath()]
             extractedFile = os.path.join(temporaryDirectory, str(fileId) + "-" + file.getName())
             
-            ContentUtils.writeToFile(file, File(extractedFile))
+            self.extractionCache.copyTo(file, extractedFile)
 
             userpath = file.getParentPath()
             username = userpath.split('/')
@@ -204,9 +204,8 @@ class ProcessActivitiesCacheIngestModule(DataSourceIngestModule):
             if fileName.endswith(".db"):
                 extractedFile = os.path.join(temporaryDirectory, str(filePathId[file.getParentPath()]) + "-" + file.getName())
 
-                artActCacheId = skCase.getArtifactTypeID("TSK_ACTCACHE_DB")
+                artActCacheId = registry.getArtifactTypeID("TSK_ACTCACHE_DB")
                 self.log(Level.INFO, "Artifact id ==> " + str(artActCacheId))
-                artActCache = skCase.getArtifactType("TSK_ACTCACHE_DB")
 
                 moduleName = ProcessActivitiesCacheIngestModuleFactory.moduleName
                 
@@ -248,29 +247,22 @@ class ProcessActivitiesCacheIngestModule(DataSourceIngestModule):
                 self.log(Level.INFO, "Start PRocessing")
                 while resultSet.next():
                     try:
-                        artifact = file.newArtifact(artActCacheId)
                         attributes = ArrayList()
                         attributes.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), moduleName, username[2]))
                         for x in range(0, columnCount):
                             if columnNames[x] in self.dateColumn:
                                 #self.log(Level.INFO, "Date ColumnName ==> " + columnNames[x])
-                                attributes.add(BlackboardAttribute(skCase.getAttributeType(columnNames[x]), moduleName, resultSet.getInt(columnNames[x])))
+                                attributes.add(BlackboardAttribute(registry.getAttributeType(columnNames[x]), moduleName, resultSet.getInt(columnNames[x])))
                             else:
                                 if columnNames[x] == "TSK_ACTCACHE_ID":
                                    #self.log(Level.INFO, "ColumnName ==> " + columnNames[x])
-                                   attributes.add(BlackboardAttribute(skCase.getAttributeType(columnNames[x]), moduleName, resultSet.getString(columnNames[x])))
+                                   attributes.add(BlackboardAttribute(registry.getAttributeType(columnNames[x]), moduleName, resultSet.getString(columnNames[x])))
                                 else:
-                                   attributes.add(BlackboardAttribute(skCase.getAttributeType(columnNames[x]), moduleName, resultSet.getString(columnNames[x])))
+                                   attributes.add(BlackboardAttribute(registry.getAttributeType(columnNames[x]), moduleName, resultSet.getString(columnNames[x])))
                             
                             #self.log(Level.INFO, "Column Count ==> " + str(x))
                             
-                        artifact.addAttributes(attributes)
-
-                        # index the artifact for keyword search
-                        try:
-                            blackboard.indexArtifact(artifact)
-                        except:
-                            pass
+                        poster.newArtifact(file, artActCacheId, attributes)
                     except SQLException as e:
                         self.log(Level.INFO, "Error getting values from smartlookup table (" + e.getMessage() + ")")
 
@@ -282,10 +274,15 @@ class ProcessActivitiesCacheIngestModule(DataSourceIngestModule):
                     pass                    
 			
 
+        poster.flush()
+
         # After all databases, post a message to the ingest messages in box.
         message = IngestMessage.createMessage(IngestMessage.MessageType.DATA,
             "ActivitiesCache", " ActivitiesCache's Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
       
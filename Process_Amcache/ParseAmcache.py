@@ -84,6 +84,15 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Column_Plan import ColumnPlan, STRING, LONG, stringValue, longValue
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
+AMCACHE_COLUMN_TYPES = {"TEXT": (STRING, stringValue), "": (STRING, stringValue)}
+AMCACHE_DEFAULT_COLUMN = (LONG, longValue)
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -141,6 +150,9 @@ class ParseAmcacheIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ParseAmcacheIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ParseAmcacheIngestModuleFactory.moduleName, ParseAmcacheIngestModuleFactory().getModuleVersionNumber(), \
+                                   self.local_settings, ['associateFileEntries', 'programEntries', 'unassociatePrograms'])
 
         # Get path to EXE based on where this script is run from.
         # Assumes EXE is in same folder as script
@@ -186,8 +198,15 @@ class ParseAmcacheIngestModule(DataSourceIngestModule):
         
        # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(ParseAmcacheIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ParseAmcacheIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "Amcache.hve")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "Amcache.hve"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -214,7 +233,7 @@ class ParseAmcacheIngestModule(DataSourceIngestModule):
 
             # Save the DB locally in the temp folder. use file id as name to reduce collisions
             lclDbPath = os.path.join(temp_dir, file.getName())
-            ContentUtils.writeToFile(file, File(lclDbPath))
+            self.extractionCache.linkTo(file, lclDbPath)
                         
 
         # Example has only a Windows EXE, so bail if we aren't on Windows
@@ -252,77 +271,17 @@ class ParseAmcacheIngestModule(DataSourceIngestModule):
                        table_name = resultSet.getString("tbl_name")
                        #self.log(Level.INFO, "Result get information from table " + resultSet.getString("tbl_name") + " ")
                        SQL_String_1 = "Select * from " + table_name + ";"
-                       SQL_String_2 = "PRAGMA table_info('" + table_name + "')"
                        artifact_name = "TSK_" + table_name.upper()
                        artifact_desc = "Amcache " + table_name.upper()
                        #self.log(Level.INFO, SQL_String_1)
                        #self.log(Level.INFO, "Artifact_Name ==> " + artifact_name)
                        #self.log(Level.INFO, "Artifact_desc ==> " + artifact_desc)
-                       #self.log(Level.INFO, SQL_String_2)
-                       try:
-                            self.log(Level.INFO, "Begin Create New Artifacts")
-                            artID_amc = skCase.addArtifactType( artifact_name, artifact_desc)
-                       except:		
-                            self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-                       artID_amc = skCase.getArtifactTypeID(artifact_name)
-                       artID_amc_evt = skCase.getArtifactType(artifact_name)
+                       artID_amc = registry.getOrAddArtifactType( artifact_name, artifact_desc).getTypeID()
                        
-                       Column_Names = []
-                       Column_Types = []
-                       resultSet2  = stmt.executeQuery(SQL_String_2)
-                       while resultSet2.next(): 
-                          Column_Names.append(resultSet2.getString("name").upper())
-                          Column_Types.append(resultSet2.getString("type").upper())
-                          #self.log(Level.INFO, "Add Attribute TSK_" + resultSet2.getString("name").upper() + " ==> " + resultSet2.getString("type"))
-                          #self.log(Level.INFO, "Add Attribute TSK_" + resultSet2.getString("name").upper() + " ==> " + resultSet2.getString("name"))
-                          #attID_ex1 = skCase.addAttrType("TSK_" + resultSet2.getString("name").upper(), resultSet2.getString("name"))
-                          #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                          if resultSet2.getString("type").upper() == "TEXT":
-                              try:
-                                  attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                                  #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                              except:		
-                                  self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
-                          elif resultSet2.getString("type").upper() == "":
-                              try:
-                                  attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                                  #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                              except:		
-                                  self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
-                          else:
-                              try:
-                                  attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
-                                  #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                              except:		
-                                  self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
-
-                                             
-                       resultSet3 = stmt.executeQuery(SQL_String_1)
-                       while resultSet3.next():
-                          art = file.newArtifact(artID_amc)
-                          Column_Number = 1
-                          for col_name in Column_Names:
-                             #self.log(Level.INFO, "Result get information for column " + Column_Names[Column_Number - 1] + " ")
-                             #self.log(Level.INFO, "Result get information for column_number " + str(Column_Number) + " ")
-                             #self.log(Level.INFO, "Result get information for column type " + Column_Types[Column_Number - 1] + " <== ")
-                             c_name = "TSK_" + col_name
-                             #self.log(Level.INFO, "Attribute Name is " + c_name + " ")
-                             attID_ex1 = skCase.getAttributeType(c_name)
-                             if Column_Types[Column_Number - 1] == "TEXT":
-                                 art.addAttribute(BlackboardAttribute(attID_ex1, ParseAmcacheIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
-#                                 art.addAttribute(BlackboardAttribute(attID_ex1, ParseAmcacheIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
-                             elif Column_Types[Column_Number - 1] == "":
-                                  art.addAttribute(BlackboardAttribute(attID_ex1, ParseAmcacheIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
-#                             elif Column_Types[Column_Number - 1] == "BLOB":
-#                                 art.addAttribute(BlackboardAttribute(attID_ex1, ParseAmcacheIngestModuleFactory.moduleName, "BLOBS Not Supported"))
-#                             elif Column_Types[Column_Number - 1] == "REAL":
-#                                 art.addAttribute(BlackboardAttribute(attID_ex1, ParseAmcacheIngestModuleFactory.moduleName, resultSet3.getFloat(Column_Number)))
-                             else:
-                                 #self.log(Level.INFO, "Value for column type ==> " + str(resultSet3.getInt(Column_Number)) + " <== ")
-                                 art.addAttribute(BlackboardAttribute(attID_ex1, ParseAmcacheIngestModuleFactory.moduleName, long(resultSet3.getInt(Column_Number))))
-                             Column_Number = Column_Number + 1
-                       IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(ParseAmcacheIngestModuleFactory.moduleName, artID_amc_evt, None))
+                       plan = ColumnPlan(registry, ParseAmcacheIngestModuleFactory.moduleName, stmt, table_name, "TSK_", \
+                                         AMCACHE_COLUMN_TYPES, AMCACHE_DEFAULT_COLUMN)
+                       plan.postRows(poster, file, artID_amc, stmt.executeQuery(SQL_String_1))
+                       poster.flush()
                             
                    except SQLException as e:
                        self.log(Level.INFO, "Error getting values from contacts table (" + e.getMessage() + ")")
@@ -348,6 +307,9 @@ class ParseAmcacheIngestModule(DataSourceIngestModule):
             "Amcache Parser", " Amcache Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
 class Process_AmcacheWithUISettingsPanel(IngestModuleIngestJobSettingsPanel):
@@ -68,6 +68,10 @@ from org.sleuthkit.datamodel import CommunicationsManager
 from org.sleuthkit.datamodel import Relationship
 from org.sleuthkit.datamodel import Account
 
+from Blackboard_Poster import BlackboardPoster
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 
 # Factory that defines the name and details of the module and allows Autopsy
@@ -111,6 +115,8 @@ class ProcessAppxProgramsIngestModule(DataSourceIngestModule):
 
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ProcessAppxProgramsIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ProcessAppxProgramsIngestModuleFactory.moduleName, ProcessAppxProgramsIngestModuleFactory().getModuleVersionNumber())
         pass
         
     # Where the analysis is done.
@@ -121,8 +127,12 @@ class ProcessAppxProgramsIngestModule(DataSourceIngestModule):
         
         # get current case and the store.vol abstract file information
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ProcessAppxProgramsIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "staterepository-machine%")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "staterepository-machine%"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -149,7 +159,7 @@ class ProcessAppxProgramsIngestModule(DataSourceIngestModule):
 
             # Save the file locally. Use file id as name to reduce collisions
             extractedFile = os.path.join(temporaryDirectory, file.getName())
-            ContentUtils.writeToFile(file, File(extractedFile))
+            self.extractionCache.copyTo(file, extractedFile)
             #os.remove(extractedFile)
 
         for file in files:	
@@ -158,7 +168,6 @@ class ProcessAppxProgramsIngestModule(DataSourceIngestModule):
                 extractedFile = os.path.join(temporaryDirectory, file.getName())
 
                 artIdInsProg = skCase.getArtifactTypeID("TSK_INSTALLED_PROG")
-                artIdInsProgType = skCase.getArtifactType("TSK_INSTALLED_PROG")
 
                 moduleName = ProcessAppxProgramsIngestModuleFactory.moduleName
                 
@@ -190,18 +199,11 @@ class ProcessAppxProgramsIngestModule(DataSourceIngestModule):
                 # Cycle through each row and get the installed programs and install time
                 while resultSet.next():
                     try: 
-                        artInsProg = file.newArtifact(artIdInsProg)
                         attributes = ArrayList()
                         attributes.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PROG_NAME, moduleName, resultSet.getString("name")))
                         attributes.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME.getTypeID(), moduleName, resultSet.getInt("InstallTime")))
                
-                        artInsProg.addAttributes(attributes)
-
-                        # index the artifact for keyword search
-                        try:
-                            blackboard.indexArtifact(artInsProg)
-                        except:
-                            pass
+                        poster.newArtifact(file, artIdInsProg, attributes)
                     except SQLException as e:
                         self.log(Level.INFO, "Error getting values from Appx tables (" + e.getMessage() + ")")
 
@@ -213,10 +215,15 @@ class ProcessAppxProgramsIngestModule(DataSourceIngestModule):
                     pass                    
 			
 
+        poster.flush()
+
         # After all databases, post a message to the ingest messages in box.
         message = IngestMessage.createMessage(IngestMessage.MessageType.DATA,
             "Appx Installed Programs", " Appx Installed Programs Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
       
@@ -69,6 +69,10 @@ from org.sleuthkit.datamodel import CommunicationsManager
 from org.sleuthkit.datamodel import Relationship
 from org.sleuthkit.datamodel import Account
 
+from Blackboard_Poster import BlackboardPoster
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 
 # Factory that defines the name and details of the module and allows Autopsy
@@ -112,6 +116,8 @@ class ProcessAppxregProgramsIngestModule(DataSourceIngestModule):
 
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ProcessAppxregProgramsIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ProcessAppxregProgramsIngestModuleFactory.moduleName, ProcessAppxregProgramsIngestModuleFactory().getModuleVersionNumber())
         if PlatformUtil.isWindowsOS():
             self.path_to_exe = os.path.join(os.path.dirname(os.path.abspath(__file__)), "appxreg.exe")
             if not os.path.exists(self.path_to_exe):
@@ -130,8 +136,12 @@ class ProcessAppxregProgramsIngestModule(DataSourceIngestModule):
         
         # get current case and the store.vol abstract file information
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ProcessAppxregProgramsIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "usrclass.dat")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "usrclass.dat"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -158,7 +168,7 @@ class ProcessAppxregProgramsIngestModule(DataSourceIngestModule):
 
             # Save the file locally. Use file id as name to reduce collisions
             extractedFile = os.path.join(temporaryDirectory, str(file.getId()) + "-" + file.getName())
-            ContentUtils.writeToFile(file, File(extractedFile))
+            self.extractionCache.linkTo(file, extractedFile)
             #os.remove(extractedFile)
 
         for file in files:	
@@ -173,7 +183,6 @@ class ProcessAppxregProgramsIngestModule(DataSourceIngestModule):
         
         
             artIdInsProg = skCase.getArtifactTypeID("TSK_INSTALLED_PROG")
-            artIdInsProgType = skCase.getArtifactType("TSK_INSTALLED_PROG")
 
             moduleName = ProcessAppxregProgramsIngestModuleFactory.moduleName
             
@@ -195,18 +204,11 @@ class ProcessAppxregProgramsIngestModule(DataSourceIngestModule):
             # Cycle through each row and get the installed programs and install time
             while resultSet.next():
                 try: 
-                    artInsProg = file.newArtifact(artIdInsProg)
                     attributes = ArrayList()
                     attributes.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PROG_NAME, moduleName, resultSet.getString("package_name")))
                     attributes.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME.getTypeID(), moduleName, resultSet.getInt("Installed_DTTM")))
            
-                    artInsProg.addAttributes(attributes)
-
-                    # index the artifact for keyword search
-                    try:
-                        blackboard.indexArtifact(artInsProg)
-                    except:
-                        pass
+                    poster.newArtifact(file, artIdInsProg, attributes)
                 except SQLException as e:
                     self.log(Level.INFO, "Error getting values from Appx tables (" + e.getMessage() + ")")
 
@@ -218,10 +220,15 @@ class ProcessAppxregProgramsIngestModule(DataSourceIngestModule):
                 pass                    
 			
 
+        poster.flush()
+
         # After all databases, post a message to the ingest messages in box.
         message = IngestMessage.createMessage(IngestMessage.MessageType.DATA,
             "Appxreg Installed Programs", " Appxreg Installed Programs Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
       
@@ -40,6 +40,7 @@
 #   Version 1.5 - FIx option Panel
 #   Version 1.6 - Added split by comma delimeter for "Other" EventLogs
 #   Version 1.7 - Fix hanging Autopsy and NPE, cleanup code and use newer Autopsy methods
+#   Version 1.8 - Pass number of worker processes to Export_EVTX
 
 import jarray
 import inspect
@@ -59,11 +60,13 @@ from javax.swing import JFrame
 from javax.swing import JScrollPane
 from javax.swing import JComponent
 from javax.swing import JLabel
+from javax.swing import JTextField
 from java.awt.event import KeyListener
 
 
 from java.lang import Class
 from java.lang import System
+from java.lang import Runtime
 from java.sql  import DriverManager, SQLException
 from java.util.logging import Level
 from java.io import File
@@ -89,6 +92,10 @@ from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.casemodule.services import Blackboard
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -146,6 +153,9 @@ class ParseEvtxDbIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ParseEvtxDbIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ParseEvtxDbIngestModuleFactory.moduleName, ParseEvtxDbIngestModuleFactory().getModuleVersionNumber(), \
+                                   self.local_settings, ['All', 'Application', 'Security', 'System', 'Other', 'EventLogs'])
         self.job_id = context.getJobId()
         
         # Get path to EXE based on where this script is run from.
@@ -159,6 +169,11 @@ class ParseEvtxDbIngestModule(DataSourceIngestModule):
             self.path_to_exe = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Export_EVTX")
             if not os.path.exists(self.path_to_exe):
                 raise IngestModuleException("Linux executable was not found in module folder")
+
+        # Number of worker processes Export_EVTX parses the event logs with, default is one per processor
+        self.Number_Of_Workers = Runtime.getRuntime().availableProcessors()
+        if self.local_settings.getSetting('Workers') != None and self.local_settings.getSetting('Workers').strip().isdigit():
+            self.Number_Of_Workers = int(self.local_settings.getSetting('Workers').strip())
  
         
         if self.local_settings.getSetting('All') == 'true':
@@ -198,6 +213,10 @@ class ParseEvtxDbIngestModule(DataSourceIngestModule):
             # exist and if not then create them
             skCase = Case.getCurrentCase().getSleuthkitCase();
             blkBrd = skCase.getBlackboard()
+
+            # Post the artifacts to the blackboard in batches for keyword search
+            poster = BlackboardPoster(ParseEvtxDbIngestModuleFactory.moduleName)
+
             try:
                 #self.log(Level.INFO, "Begin Create New Artifacts")
                 artID_evtx = blkBrd.getOrAddArtifactType( "TSK_EVTX_LOGS", "Windows Event Logs")
@@ -237,6 +256,7 @@ class ParseEvtxDbIngestModule(DataSourceIngestModule):
                    file_name = fileManager.findFiles(dataSource, eventlog)
                    files.extend(file_name)
    
+            files = self.ledger.unprocessed(files)
             numFiles = len(files)
             
             # If no files to process then we can exit the program.
@@ -268,11 +288,11 @@ class ParseEvtxDbIngestModule(DataSourceIngestModule):
 
                 # Save the DB locally in the temp folder. 
                 lclDbPath = os.path.join(temp_dir, file.getName())
-                ContentUtils.writeToFile(file, File(lclDbPath))
+                self.extractionCache.linkTo(file, lclDbPath)
                             
             # Run the EXE, saving output to a sqlite database
             #self.log(Level.INFO, "Running program on data source " + self.path_to_exe + " parm 1 ==> " + temp_dir + "  Parm 2 ==> " + os.path.join(temp_dir, "EventLogs.db3"))
-            subprocess.Popen([self.path_to_exe, temp_dir, os.path.join(Temp_Dir, "EventLogs.db3")]).communicate()[0]   
+            subprocess.Popen([self.path_to_exe, temp_dir, os.path.join(Temp_Dir, "EventLogs.db3"), "--workers", str(self.Number_Of_Workers)]).communicate()[0]   
                 
             # Set the database to read to the one created by the Event_EVTX program
             lclDbPath = os.path.join(Case.getCurrentCase().getTempDirectory(), "EventLogs.db3")
@@ -300,7 +320,7 @@ class ParseEvtxDbIngestModule(DataSourceIngestModule):
                     SQL_Statement = "SELECT File_Name, Recovered_Record, Computer_name, Event_Identifier, " + \
                                     " Event_Identifier_Qualifiers, Event_Level, Event_offset, Identifier, " + \
                                     " Event_source_Name, Event_User_Security_Identifier, Event_Time, " + \
-                                    " Event_Time_Epoch, Event_Detail_Text FROM Event_Logs where upper(File_Name) = upper('" + file_name + "')"
+                                    " Event_Time_Epoch, Event_Detail_Text FROM Event_Logs where File_Name_Key = '" + file_name.upper() + "'"
                     #self.log(Level.INFO, "SQL Statement " + SQL_Statement + "  <<=====")
                     resultSet = stmt.executeQuery(SQL_Statement)
                 except SQLException as e:
@@ -308,7 +328,6 @@ class ParseEvtxDbIngestModule(DataSourceIngestModule):
                     return IngestModule.ProcessResult.Error
 
                 # Cycle through each row and create artifacts
-                art_list = []
                 while resultSet.next():
                     try: 
                         Computer_Name = resultSet.getString("Computer_Name")
@@ -322,8 +341,6 @@ class ParseEvtxDbIngestModule(DataSourceIngestModule):
                         self.log(Level.WARNING, "Error getting values from Event_Logs table (" + e.getMessage() + ")")
             
                     # Make artifact for TSK_EVTX_LOGS
-                    art = file.newArtifact(artID_evtx)
-
                     attribute_List =  []
                     attribute_List.append(BlackboardAttribute(attID_ev_cn,    
                                           ParseEvtxDbIngestModuleFactory.moduleName, Computer_Name))
@@ -339,21 +356,13 @@ class ParseEvtxDbIngestModule(DataSourceIngestModule):
                                           ParseEvtxDbIngestModuleFactory.moduleName, Event_Time))
                     attribute_List.append(BlackboardAttribute(attID_ev_dt, 
                                           ParseEvtxDbIngestModuleFactory.moduleName, Event_Detail_Text))
-                    art.addAttributes(attribute_List)
-                    art_list.append(art)
+                    poster.newArtifact(file, artID_evtx, attribute_List)
                     
-                # Post the artifacts to blackboard                
-                try:
-                    blkBrd.postArtifacts(art_list, ParseEvtxDbIngestModuleFactory.moduleName)
-                except Blackboard.BlackboardException as e:
-                    self.log(Level.SEVERE, "Error indexing artifact " + art.getDisplayName())
-
-                art_list = []
                 try:
                     stmt_1 = dbConn.createStatement()
-                    SQL_Statement_1 = "select event_identifier, file_name, count(*) 'Number_Of_Events'  " + \
-                                    " FROM Event_Logs where upper(File_Name) = upper('" + file_name + "')" + \
-                                    " group by event_identifier, file_name order by 3;"
+                    SQL_Statement_1 = "select event_identifier, file_name, Number_Of_Events " + \
+                                    " FROM Event_Id_Counts where File_Name_Key = '" + file_name.upper() + "'" + \
+                                    " order by 3;"
                     #self.log(Level.INFO, "SQL Statement " + SQL_Statement_1 + "  <<=====")
                     resultSet_1 = stmt_1.executeQuery(SQL_Statement_1)
                 except SQLException as e:
@@ -369,28 +378,25 @@ class ParseEvtxDbIngestModule(DataSourceIngestModule):
                         self.log(Level.INFO, "Error getting values from Event_Logs table (" + e.getMessage() + ")")
             
                     # Make artifact for TSK_EVTX_LOGS_LONG
-                    art_1 = file.newArtifact(artID_evtx_Long)
-                    
                     attribute_List = []
                     attribute_List.append(BlackboardAttribute(attID_ev_dt, 
                                           ParseEvtxDbIngestModuleFactory.moduleName, Event_Detail_Text))
                     attribute_List.append(BlackboardAttribute(attID_ev_cnt, 
                                           ParseEvtxDbIngestModuleFactory.moduleName, Event_ID_Count))
                     
-                    art_1.addAttributes(attribute_List)
-                    
-                    art_list.append(art)
+                    poster.newArtifact(file, artID_evtx_Long, attribute_List)
                     
-                try:
-                    blkBrd.postArtifacts(art_list, ParseEvtxDbIngestModuleFactory.moduleName)
-                except Blackboard.BlackboardException as e:
-                    self.log(Level.SEVERE, "Error indexing artifact " + art.getDisplayName())
+                # Post whatever is left for this event log
+                poster.flush()
 
             # After all databases, post a message to the ingest messages in box.
             message = IngestMessage.createMessage(IngestMessage.MessageType.DATA,
                 "ParseEvtx", " Event Logs have been parsed " )
             IngestServices.getInstance().postMessage(message)
             
+            # Remember what was processed so the next run skips it
+            self.ledger.commit()
+
             return IngestModule.ProcessResult.OK
 		
 # UI that is shown to user for each ingest job so they can configure the job.
@@ -449,6 +455,14 @@ class Process_EVTX1WithUISettingsPanel(IngestModuleIngestJobSettingsPanel):
         self.panel1.add(self.checkbox4)
         self.panel1.add(self.text1)
         self.add(self.panel1)
+
+        self.panel2 = JPanel()
+        self.panel2.setAlignmentX(JComponent.LEFT_ALIGNMENT)
+        self.text_workers = JLabel("Number of worker processes (blank for one per processor)")
+        self.workers = JTextField(5)
+        self.panel2.add(self.text_workers)
+        self.panel2.add(self.workers)
+        self.add(self.panel2)
 		
         self.area = JTextArea(5,25)
         #self.area.addKeyListener(self)
@@ -466,9 +480,11 @@ class Process_EVTX1WithUISettingsPanel(IngestModuleIngestJobSettingsPanel):
         self.checkbox3.setSelected(self.local_settings.getSetting('System') == 'true')
         self.checkbox4.setSelected(self.local_settings.getSetting('Other') == 'true')
         self.area.setText(self.local_settings.getSetting('EventLogs'))
+        self.workers.setText(self.local_settings.getSetting('Workers'))
 
     # Return the settings used
     def getSettings(self):
+        self.local_settings.setSetting('Workers', self.workers.getText())
         return self.local_settings
 
  
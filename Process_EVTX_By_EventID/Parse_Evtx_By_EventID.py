@@ -38,10 +38,15 @@
 #   Version 1.0 - Initial version - July 2017
 #   Version 1.1 - Add Linux support
 #   Version 1.2 - Fix option panels
+#   Version 1.3 - Pass number of worker processes to Export_EVTX
+#   Version 1.4 - Pass selected event ids to Export_EVTX so other records are never exported
+#   Version 1.5 - Skip event ids that are not numbers before passing them on
+#   Version 1.6 - Do not export or query anything when none of the Other event ids is a number
 
 import jarray
 import inspect
 import os
+import re
 import subprocess
 
 from javax.swing import JCheckBox
@@ -57,10 +62,12 @@ from javax.swing import JFrame
 from javax.swing import JScrollPane
 from javax.swing import JComponent
 from javax.swing import JLabel
+from javax.swing import JTextField
 from java.awt.event import KeyListener
 
 from java.lang import Class
 from java.lang import System
+from java.lang import Runtime
 from java.sql  import DriverManager, SQLException
 from java.util.logging import Level
 from java.io import File
@@ -85,6 +92,11 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -136,12 +148,16 @@ class ParseEvtxByEventIDIngestModule(DataSourceIngestModule):
         self.local_settings = settings
         self.List_Of_Events = []
         self.Event_Id_List = ''
+        self.Export_Event_Ids = ''
 
     # Where any setup and configuration is done
     # 'context' is an instance of org.sleuthkit.autopsy.ingest.IngestJobContext.
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ParseEvtxByEventIDIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ParseEvtxByEventIDIngestModuleFactory.moduleName, ParseEvtxByEventIDIngestModuleFactory().getModuleVersionNumber(), \
+                                   self.local_settings, ['All', 'Other', 'Eventids'])
 
         # Get path to EXE based on where this script is run from.
         # Assumes EXE is in same folder as script
@@ -154,6 +170,11 @@ class ParseEvtxByEventIDIngestModule(DataSourceIngestModule):
             self.path_to_exe = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Export_EVTX")
             if not os.path.exists(self.path_to_exe):
                 raise IngestModuleException("Linux executable was not found in module folder")
+
+        # Number of worker processes Export_EVTX parses the event logs with, default is one per processor
+        self.Number_Of_Workers = Runtime.getRuntime().availableProcessors()
+        if self.local_settings.getSetting('Workers') != None and self.local_settings.getSetting('Workers').strip().isdigit():
+            self.Number_Of_Workers = int(self.local_settings.getSetting('Workers').strip())
         
         if self.local_settings.getSetting('All') == 'true':
             self.List_Of_Events.append('ALL')
@@ -165,9 +186,18 @@ class ParseEvtxByEventIDIngestModule(DataSourceIngestModule):
                 self.log(Level.INFO, "Event List ==> " + str(Event_List))
                 for evt in Event_List:
                    self.List_Of_Events.append(str(evt))
-                #self.Event_Id_List = "','".join(self.List_Of_Events)
-                self.Event_Id_List = self.local_settings.getSetting('Eventids').replace(',','\',\'')
-                self.Event_Id_List.replace(',','\',\'')
+                # Only numeric event ids are passed on, anything else the user typed is logged and skipped
+                Event_Ids = []
+                for evt in re.split('[,\s]+', self.local_settings.getSetting('Eventids')):
+                    if evt.isdigit():
+                        Event_Ids.append(evt)
+                    elif evt != '':
+                        self.log(Level.WARNING, "Skipping event id that is not a number ==> " + evt)
+                self.Event_Id_List = "','".join(Event_Ids)
+                self.Export_Event_Ids = ','.join(Event_Ids)
+                if len(Event_Ids) == 0:
+                    self.log(Level.WARNING, "None of the event ids ==> " + self.local_settings.getSetting('Eventids') + \
+                             " is a number, no event logs will be parsed")
              
         
         # Throw an IngestModule.IngestModuleException exception if there was a problem setting up
@@ -187,103 +217,59 @@ class ParseEvtxByEventIDIngestModule(DataSourceIngestModule):
             message = IngestMessage.createMessage(IngestMessage.MessageType.DATA, "ParseEvtx", " No Event Logs Selected to Parse " )
             IngestServices.getInstance().postMessage(message)
             return IngestModule.ProcessResult.ERROR
+        elif self.List_Of_Events[0] != 'ALL' and self.Export_Event_Ids == '':
+            # Every event log would be exported only to query for no event ids
+            self.log(Level.WARNING, "No numeric event ids selected, skipping the export of the event logs")
+            message = IngestMessage.createMessage(IngestMessage.MessageType.DATA, "ParseEvtx", " No valid Event Ids Selected to Parse " )
+            IngestServices.getInstance().postMessage(message)
+            return IngestModule.ProcessResult.OK
         else:
             # Check to see if the artifacts exist and if not then create it, also check to see if the attributes
             # exist and if not then create them
             skCase = Case.getCurrentCase().getSleuthkitCase();
             skCase_Tran = skCase.beginTransaction()
-            try:
-                 self.log(Level.INFO, "Begin Create New Artifacts")
-                 artID_evtx = skCase.addArtifactType( "TSK_EVTX_LOGS", "Windows Event Logs")
-            except:		
-                 self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-                 artID_evtx = skCase.getArtifactTypeID("TSK_EVTX_LOGS")
-     
-            try:
-                 self.log(Level.INFO, "Begin Create New Artifacts")
-                 artID_evtx_Long = skCase.addArtifactType( "TSK_EVTX_LOGS_BY_ID", "Windows Event Logs By Event Id")
-            except:		
-                 self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-                 artID_evtx_Long = skCase.getArtifactTypeID("TSK_EVTX_LOGS_BY_ID")
 
-            try:
-                attID_ev_fn = skCase.addArtifactAttributeType("TSK_EVTX_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Event Log File Name")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Event Log File Name. ==> ")
-            try:
-                attID_ev_rc = skCase.addArtifactAttributeType("TSK_EVTX_RECOVERED_RECORD", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Recovered Record")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Recovered Record. ==> ")
-            try:
-                attID_ev_cn = skCase.addArtifactAttributeType("TSK_EVTX_COMPUTER_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Computer Name")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Computer Name. ==> ")
-            try:
-                attID_ev_ei = skCase.addArtifactAttributeType("TSK_EVTX_EVENT_IDENTIFIER", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "Event Identiifier")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Event Log File Name. ==> ")
-            try:
-                attID_ev_eiq = skCase.addArtifactAttributeType("TSK_EVTX_EVENT_IDENTIFIER_QUALIFERS", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Event Identifier Qualifiers")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Event Identifier Qualifiers. ==> ")
-            try:
-                attID_ev_el = skCase.addArtifactAttributeType("TSK_EVTX_EVENT_LEVEL", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Event Level")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Event Level. ==> ")
-            try:
-                attID_ev_oif = skCase.addArtifactAttributeType("TSK_EVTX_OFFSET_IN_FILE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Event Offset In File")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Event Offset In File. ==> ")
-            try:
-                attID_ev_id = skCase.addArtifactAttributeType("TSK_EVTX_IDENTIFIER", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Identifier")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Identifier. ==> ")
-            try:
-                attID_ev_sn = skCase.addArtifactAttributeType("TSK_EVTX_SOURCE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Source Name")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Source Name. ==> ")
-            try:
-                attID_ev_usi = skCase.addArtifactAttributeType("TSK_EVTX_USER_SECURITY_ID", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "User Security ID")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, User Security ID. ==> ")
-            try:
-                attID_ev_et = skCase.addArtifactAttributeType("TSK_EVTX_EVENT_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Event Time")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Event Time. ==> ")
-            try:
-                attID_ev_ete = skCase.addArtifactAttributeType("TSK_EVTX_EVENT_TIME_EPOCH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Event Time Epoch")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Identifier. ==> ")
-            try:
-                attID_ev_dt = skCase.addArtifactAttributeType("TSK_EVTX_EVENT_DETAIL_TEXT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Event Detail")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Event Detail. ==> ")
+            # Look up the artifact and attribute types once for the whole job
+            registry = TypeRegistry(ParseEvtxByEventIDIngestModuleFactory.moduleName)
 
-            try:
-                attID_ev_cnt = skCase.addArtifactAttributeType("TSK_EVTX_EVENT_ID_COUNT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "Event Id Count")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Event ID Count. ==> ")
-                 
-            #self.log(Level.INFO, "Get Artifacts after they were created.")
-            # Get the new artifacts and attributes that were just created
-            artID_evtx = skCase.getArtifactTypeID("TSK_EVTX_LOGS")
-            artID_evtx_evt = skCase.getArtifactType("TSK_EVTX_LOGS")
-            artID_evtx_Long = skCase.getArtifactTypeID("TSK_EVTX_LOGS_BY_ID")
-            artID_evtx_Long_evt = skCase.getArtifactType("TSK_EVTX_LOGS_BY_ID")
-            attID_ev_fn = skCase.getAttributeType("TSK_EVTX_FILE_NAME")
-            attID_ev_rc = skCase.getAttributeType("TSK_EVTX_RECOVERED_RECORD")			 
-            attID_ev_cn = skCase.getAttributeType("TSK_EVTX_COMPUTER_NAME")			 
-            attID_ev_ei = skCase.getAttributeType("TSK_EVTX_EVENT_IDENTIFIER")
-            attID_ev_eiq = skCase.getAttributeType("TSK_EVTX_EVENT_IDENTIFIER_QUALIFERS")
-            attID_ev_el = skCase.getAttributeType("TSK_EVTX_EVENT_LEVEL")
-            attID_ev_oif = skCase.getAttributeType("TSK_EVTX_OFFSET_IN_FILE")
-            attID_ev_id = skCase.getAttributeType("TSK_EVTX_IDENTIFIER")
-            attID_ev_sn = skCase.getAttributeType("TSK_EVTX_SOURCE_NAME")
-            attID_ev_usi = skCase.getAttributeType("TSK_EVTX_USER_SECURITY_ID")
-            attID_ev_et = skCase.getAttributeType("TSK_EVTX_EVENT_TIME")
-            attID_ev_ete = skCase.getAttributeType("TSK_EVTX_EVENT_TIME_EPOCH")
-            attID_ev_dt = skCase.getAttributeType("TSK_EVTX_EVENT_DETAIL_TEXT")
-            attID_ev_cnt = skCase.getAttributeType("TSK_EVTX_EVENT_ID_COUNT")
+            # Post the artifacts to the blackboard in batches for keyword search
+            poster = BlackboardPoster(ParseEvtxByEventIDIngestModuleFactory.moduleName)
+
+            artID_evtx = registry.getOrAddArtifactType( "TSK_EVTX_LOGS", "Windows Event Logs").getTypeID()
+     
+            artID_evtx_Long = registry.getOrAddArtifactType( "TSK_EVTX_LOGS_BY_ID", "Windows Event Logs By Event Id").getTypeID()
+
+            attID_ev_fn = registry.getOrAddAttributeType("TSK_EVTX_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Event Log File Name")
+            attID_ev_rc = registry.getOrAddAttributeType("TSK_EVTX_RECOVERED_RECORD", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Recovered Record")
+            attID_ev_cn = registry.getOrAddAttributeType("TSK_EVTX_COMPUTER_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Computer Name")
+            attID_ev_ei = registry.getOrAddAttributeType("TSK_EVTX_EVENT_IDENTIFIER", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "Event Identiifier")
+            attID_ev_eiq = registry.getOrAddAttributeType("TSK_EVTX_EVENT_IDENTIFIER_QUALIFERS", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Event Identifier Qualifiers")
+            attID_ev_el = registry.getOrAddAttributeType("TSK_EVTX_EVENT_LEVEL", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Event Level")
+            attID_ev_oif = registry.getOrAddAttributeType("TSK_EVTX_OFFSET_IN_FILE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Event Offset In File")
+            attID_ev_id = registry.getOrAddAttributeType("TSK_EVTX_IDENTIFIER", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Identifier")
+            attID_ev_sn = registry.getOrAddAttributeType("TSK_EVTX_SOURCE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Source Name")
+            attID_ev_usi = registry.getOrAddAttributeType("TSK_EVTX_USER_SECURITY_ID", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "User Security ID")
+            attID_ev_et = registry.getOrAddAttributeType("TSK_EVTX_EVENT_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Event Time")
+            attID_ev_ete = registry.getOrAddAttributeType("TSK_EVTX_EVENT_TIME_EPOCH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Event Time Epoch")
+            attID_ev_dt = registry.getOrAddAttributeType("TSK_EVTX_EVENT_DETAIL_TEXT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Event Detail")
+
+            attID_ev_cnt = registry.getOrAddAttributeType("TSK_EVTX_EVENT_ID_COUNT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "Event Id Count")
+            artID_evtx = registry.getArtifactTypeID("TSK_EVTX_LOGS")
+            artID_evtx_Long = registry.getArtifactTypeID("TSK_EVTX_LOGS_BY_ID")
+            attID_ev_fn = registry.getAttributeType("TSK_EVTX_FILE_NAME")
+            attID_ev_rc = registry.getAttributeType("TSK_EVTX_RECOVERED_RECORD")			 
+            attID_ev_cn = registry.getAttributeType("TSK_EVTX_COMPUTER_NAME")			 
+            attID_ev_ei = registry.getAttributeType("TSK_EVTX_EVENT_IDENTIFIER")
+            attID_ev_eiq = registry.getAttributeType("TSK_EVTX_EVENT_IDENTIFIER_QUALIFERS")
+            attID_ev_el = registry.getAttributeType("TSK_EVTX_EVENT_LEVEL")
+            attID_ev_oif = registry.getAttributeType("TSK_EVTX_OFFSET_IN_FILE")
+            attID_ev_id = registry.getAttributeType("TSK_EVTX_IDENTIFIER")
+            attID_ev_sn = registry.getAttributeType("TSK_EVTX_SOURCE_NAME")
+            attID_ev_usi = registry.getAttributeType("TSK_EVTX_USER_SECURITY_ID")
+            attID_ev_et = registry.getAttributeType("TSK_EVTX_EVENT_TIME")
+            attID_ev_ete = registry.getAttributeType("TSK_EVTX_EVENT_TIME_EPOCH")
+            attID_ev_dt = registry.getAttributeType("TSK_EVTX_EVENT_DETAIL_TEXT")
+            attID_ev_cnt = registry.getAttributeType("TSK_EVTX_EVENT_ID_COUNT")
             
 
             # we don't know how much work there is yet
@@ -292,7 +278,7 @@ class ParseEvtxByEventIDIngestModule(DataSourceIngestModule):
             # Find the Windows Event Log Files
             files = []		
             fileManager = Case.getCurrentCase().getServices().getFileManager()
-            files = fileManager.findFiles(dataSource, "%.evtx")
+            files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "%.evtx"))
 
             # if self.List_Of_Events[0] == 'ALL':
                # files = fileManager.findFiles(dataSource, "%.evtx")
@@ -330,11 +316,15 @@ class ParseEvtxByEventIDIngestModule(DataSourceIngestModule):
 
                 # Save the DB locally in the temp folder. use file id as name to reduce collisions
                 lclDbPath = os.path.join(temp_dir, file.getName())
-                ContentUtils.writeToFile(file, File(lclDbPath))
+                self.extractionCache.linkTo(file, lclDbPath)
                             
             # Run the EXE, saving output to a sqlite database
             self.log(Level.INFO, "Running program on data source " + self.path_to_exe + " parm 1 ==> " + temp_dir + "  Parm 2 ==> " + os.path.join(Temp_Dir,"\EventLogs.db3"))
-            subprocess.Popen([self.path_to_exe, temp_dir, os.path.join(Temp_Dir, "EventLogs.db3")]).communicate()[0]   
+            # When event ids were picked only those records are exported, the long tail view needs every record
+            export_command = [self.path_to_exe, temp_dir, os.path.join(Temp_Dir, "EventLogs.db3"), "--workers", str(self.Number_Of_Workers)]
+            if self.List_Of_Events[0] != 'ALL':
+                export_command.extend(["--event-ids", self.Export_Event_Ids])
+            subprocess.Popen(export_command).communicate()[0]   
                 
             # Set the database to be read to the one created by the Event_EVTX program
             lclDbPath = os.path.join(Case.getCurrentCase().getTempDirectory(), "EventLogs.db3")
@@ -367,7 +357,7 @@ class ParseEvtxByEventIDIngestModule(DataSourceIngestModule):
                         SQL_Statement = "SELECT File_Name, Recovered_Record, Computer_name, Event_Identifier, " + \
                                         " Event_Identifier_Qualifiers, Event_Level, Event_offset, Identifier, " + \
                                         " Event_source_Name, Event_User_Security_Identifier, Event_Time, " + \
-                                        " Event_Time_Epoch, Event_Detail_Text FROM Event_Logs where upper(File_Name) = upper('" + file_name + "')" + \
+                                        " Event_Time_Epoch, Event_Detail_Text FROM Event_Logs where File_Name_Key = '" + file_name.upper() + "'" + \
                                         " and Event_Identifier in ('" + self.Event_Id_List + "');"
                         self.log(Level.INFO, "SQL Statement " + SQL_Statement + "  <<=====")
                         resultSet = stmt.executeQuery(SQL_Statement)
@@ -396,9 +386,7 @@ class ParseEvtxByEventIDIngestModule(DataSourceIngestModule):
                 
                         # Make an artifact on the blackboard, TSK_PROG_RUN and give it attributes for each of the fields
                         # Make artifact for TSK_EVTX_LOGS
-                        art = file.newArtifact(artID_evtx)
-
-                        art.addAttributes(((BlackboardAttribute(attID_ev_cn, ParseEvtxByEventIDIngestModuleFactory.moduleName, Computer_Name)), \
+                        poster.newArtifact(file, artID_evtx, ((BlackboardAttribute(attID_ev_cn, ParseEvtxByEventIDIngestModuleFactory.moduleName, Computer_Name)), \
                                            (BlackboardAttribute(attID_ev_ei, ParseEvtxByEventIDIngestModuleFactory.moduleName, Event_Identifier)), \
                                            (BlackboardAttribute(attID_ev_el, ParseEvtxByEventIDIngestModuleFactory.moduleName, Event_Level)), \
                                            (BlackboardAttribute(attID_ev_sn, ParseEvtxByEventIDIngestModuleFactory.moduleName, Event_Source_Name)), \
@@ -415,9 +403,9 @@ class ParseEvtxByEventIDIngestModule(DataSourceIngestModule):
                 else:
                     try:
                         stmt_1 = dbConn.createStatement()
-                        SQL_Statement_1 = "select event_identifier, file_name, count(*) 'Number_Of_Events'  " + \
-                                        " FROM Event_Logs where upper(File_Name) = upper('" + file_name + "')" + \
-                                        " group by event_identifier, file_name order by 3;"
+                        SQL_Statement_1 = "select event_identifier, file_name, Number_Of_Events " + \
+                                        " FROM Event_Id_Counts where File_Name_Key = '" + file_name.upper() + "'" + \
+                                        " order by 3;"
                         self.log(Level.INFO, "SQL Statement " + SQL_Statement_1 + "  <<=====")
                         resultSet_1 = stmt_1.executeQuery(SQL_Statement_1)
                     except SQLException as e:
@@ -439,18 +427,13 @@ class ParseEvtxByEventIDIngestModule(DataSourceIngestModule):
 
                         # Make an artifact on the blackboard, TSK_PROG_RUN and give it attributes for each of the fields
                         # Make artifact for TSK_EVTX_LOGS
-                        art_1 = file.newArtifact(artID_evtx_Long)
-                        
                         self.log(Level.INFO, "Type of Object is ==> " + str(type(Event_ID_Count)))
 
-                        art_1.addAttributes(((BlackboardAttribute(attID_ev_ei, ParseEvtxByEventIDIngestModuleFactory.moduleName, Event_Identifier)), \
+                        poster.newArtifact(file, artID_evtx_Long, ((BlackboardAttribute(attID_ev_ei, ParseEvtxByEventIDIngestModuleFactory.moduleName, Event_Identifier)), \
                                            (BlackboardAttribute(attID_ev_cnt, ParseEvtxByEventIDIngestModuleFactory.moduleName, Event_ID_Count))))
                 
-            # Fire an event to notify the UI and others that there are new artifacts  
-            IngestServices.getInstance().fireModuleDataEvent(
-                ModuleDataEvent(ParseEvtxByEventIDIngestModuleFactory.moduleName, artID_evtx_evt, None))
-            IngestServices.getInstance().fireModuleDataEvent(
-                ModuleDataEvent(ParseEvtxByEventIDIngestModuleFactory.moduleName, artID_evtx_Long_evt, None))
+            # Post the last batch and notify the UI and others that there are new artifacts
+            poster.flush()
                     
             # Clean up
             try:
@@ -474,19 +457,14 @@ class ParseEvtxByEventIDIngestModule(DataSourceIngestModule):
             except:
                  self.log(Level.INFO, "removal of Event Logs directory failed " + Temp_Dir)
      
-            # Fire an event to notify the UI and others that there are new artifacts  
-            IngestServices.getInstance().fireModuleDataEvent(
-                ModuleDataEvent(ParseEvtxByEventIDIngestModuleFactory.moduleName, artID_evtx_evt, None))
-                 
             # After all databases, post a message to the ingest messages in box.
             message = IngestMessage.createMessage(IngestMessage.MessageType.DATA,
                 "ParseEvtx", " Event Logs have been parsed " )
             IngestServices.getInstance().postMessage(message)
 
-            # Fire an event to notify the UI and others that there are new artifacts  
-            IngestServices.getInstance().fireModuleDataEvent(
-                ModuleDataEvent(ParseEvtxByEventIDIngestModuleFactory.moduleName, artID_evtx_evt, None))
-            
+            # Remember what was processed so the next run skips it
+            self.ledger.commit()
+
             return IngestModule.ProcessResult.OK
 		
 class Process_EVTX1WithUISettingsPanel(IngestModuleIngestJobSettingsPanel):
@@ -543,6 +521,14 @@ class Process_EVTX1WithUISettingsPanel(IngestModuleIngestJobSettingsPanel):
         self.panel1.add(self.checkbox4)
         self.panel1.add(self.text3)
         self.add(self.panel1)
+
+        self.panel2 = JPanel()
+        self.panel2.setAlignmentX(JComponent.LEFT_ALIGNMENT)
+        self.text_workers = JLabel("Number of worker processes (blank for one per processor)")
+        self.workers = JTextField(5)
+        self.panel2.add(self.text_workers)
+        self.panel2.add(self.workers)
+        self.add(self.panel2)
 		
         self.area = JTextArea(5,25)
         #self.area.addKeyListener(self)
@@ -558,9 +544,11 @@ class Process_EVTX1WithUISettingsPanel(IngestModuleIngestJobSettingsPanel):
         self.checkbox.setSelected(self.local_settings.getSetting('All') == 'true')
         self.checkbox4.setSelected(self.local_settings.getSetting('Other') == 'true')
         self.area.setText(self.local_settings.getSetting('Eventids'))
+        self.workers.setText(self.local_settings.getSetting('Workers'))
 
     # Return the settings used
     def getSettings(self):
+        self.local_settings.setSetting('Workers', self.workers.getText())
         return self.local_settings
 
  
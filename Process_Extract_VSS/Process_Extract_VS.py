@@ -72,6 +72,9 @@ from org.sleuthkit.autopsy.casemodule import AddLocalFilesTask
 from org.sleuthkit.autopsy.casemodule.services.FileManager import FileAddProgressUpdater
 from org.sleuthkit.autopsy.ingest import ModuleContentEvent;
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
 class ProgressUpdater(FileAddProgressUpdater):
@@ -153,6 +156,10 @@ class VSSIngesttModule(DataSourceIngestModule):
         progressBar.switchToIndeterminate()
         
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(VSSIngesttModuleFactory.moduleName)
+
         
         self.log(Level.INFO, "Starting Processing of Image")
 
@@ -180,18 +187,9 @@ class VSSIngesttModule(DataSourceIngestModule):
         out_text = pipe.communicate()[0]
         self.log(Level.INFO, "Output from run is ==> " + out_text)               
 
-        try:
-            attID_vs_fn = skCase.addArtifactAttributeType("TSK_VSS_MFT_NUMBER", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "MFT Number")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, MFT Number. ==> ")
-        try:
-            attID_vs_ct = skCase.addArtifactAttributeType("TSK_VSS_DATETIME_CHANGED", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Recovered Record")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, changed time. ==> ")
-        try:
-            attID_vs_sz = skCase.addArtifactAttributeType("TSK_VSS_FILE_SIZE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "File Size")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Computer Name. ==> ")
+        attID_vs_fn = registry.getOrAddAttributeType("TSK_VSS_MFT_NUMBER", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "MFT Number")
+        attID_vs_ct = registry.getOrAddAttributeType("TSK_VSS_DATETIME_CHANGED", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Recovered Record")
+        attID_vs_sz = registry.getOrAddAttributeType("TSK_VSS_FILE_SIZE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "File Size")
 
       
         try: 
@@ -259,23 +257,19 @@ class VSSIngesttModule(DataSourceIngestModule):
             for vs in vss_files:
                  if vs.getName() in "-slack":
                      pass            
-            try:
-                 self.log(Level.INFO, "Begin Create New Artifacts")
-                 artID_vss = skCase.addArtifactType( "TSK_VS_VOLUME_" + str(vss_num), "vss" + str(vss_num) + resultSet.getString("VOL_NAME") + " Files")
-            except:		
-                 self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-                 artID_vss = skCase.getArtifactTypeID("TSK_VS_VOLUME_" + str(vss_num))
-
-            artID_vss = skCase.getArtifactTypeID("TSK_VS_VOLUME_" + str(vss_num))
-            artID_vss_evt = skCase.getArtifactType("TSK_VS_VOLUME_" + str(vss_num))
-            attID_vs_fn = skCase.getAttributeType("TSK_VSS_MFT_NUMBER")
-            attID_vs_ct = skCase.getAttributeType("TSK_VSS_DATETIME_CHANGED")			 
-            attID_vs_sz = skCase.getAttributeType("TSK_VSS_FILE_SIZE")			 
-            attID_vs_nm = skCase.getAttributeType("TSK_NAME")
-            attID_vs_pa = skCase.getAttributeType("TSK_PATH")
-            attID_vs_md = skCase.getAttributeType("TSK_DATETIME_MODIFIED")
-            attID_vs_ad = skCase.getAttributeType("TSK_DATETIME_ACCESSED")
-            attID_vs_cr = skCase.getAttributeType("TSK_DATETIME_CREATED")
+            artID_vss = registry.getOrAddArtifactType( "TSK_VS_VOLUME_" + str(vss_num), "vss" + str(vss_num) + resultSet.getString("VOL_NAME") + " Files").getTypeID()
+
+            attID_vs_fn = registry.getAttributeType("TSK_VSS_MFT_NUMBER")
+            attID_vs_ct = registry.getAttributeType("TSK_VSS_DATETIME_CHANGED")			 
+            attID_vs_sz = registry.getAttributeType("TSK_VSS_FILE_SIZE")			 
+            attID_vs_nm = registry.getAttributeType("TSK_NAME")
+            attID_vs_pa = registry.getAttributeType("TSK_PATH")
+            attID_vs_md = registry.getAttributeType("TSK_DATETIME_MODIFIED")
+            attID_vs_ad = registry.getAttributeType("TSK_DATETIME_ACCESSED")
+            attID_vs_cr = registry.getAttributeType("TSK_DATETIME_CREATED")
+
+            # Post the artifacts to the blackboard in batches for keyword search
+            poster = BlackboardPoster(VSSIngesttModuleFactory.moduleName)
             
             for vs_file in vss_files:
                 if "-slack" in vs_file.getName():
@@ -319,10 +313,10 @@ class VSSIngesttModule(DataSourceIngestModule):
                                            (BlackboardAttribute(attID_vs_ad, VSSIngesttModuleFactory.moduleName, Atime)), \
                                            (BlackboardAttribute(attID_vs_ct, VSSIngesttModuleFactory.moduleName, Ctime)),
                                            (BlackboardAttribute(attID_vs_sz, VSSIngesttModuleFactory.moduleName, File_Size))))
+                        poster.postArtifact(art)
                         
                     # Fire an event to notify the UI and others that there are new artifacts  
-                    IngestServices.getInstance().fireModuleDataEvent(
-                        ModuleDataEvent(VSSIngesttModuleFactory.moduleName, artID_vss_evt, None))
+                    poster.flush()
 
         message = IngestMessage.createMessage(IngestMessage.MessageType.DATA,
             "Process/Extract VS", " Volume Shadow has been analyzed " )
@@ -67,6 +67,10 @@ from org.sleuthkit.datamodel import CommunicationsManager
 from org.sleuthkit.datamodel import Relationship
 from org.sleuthkit.datamodel import Account
 
+from Blackboard_Poster import BlackboardPoster
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 
 # Factory that defines the name and details of the module and allows Autopsy
@@ -113,6 +117,8 @@ class ProcessFacebookChatIngestModule(DataSourceIngestModule):
 
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ProcessFacebookChatIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ProcessFacebookChatIngestModuleFactory.moduleName, ProcessFacebookChatIngestModuleFactory().getModuleVersionNumber())
         if PlatformUtil.isWindowsOS(): 
            self.pathToExe = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fb_chat.exe")
            if not os.path.exists(self.pathToExe):
@@ -131,7 +137,7 @@ class ProcessFacebookChatIngestModule(DataSourceIngestModule):
         # get current case and the store.vol abstract file information
         skCase = Case.getCurrentCase().getSleuthkitCase();
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "fbsyncstore.db")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "fbsyncstore.db"))
         numFiles = len(files)
         #self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -158,11 +164,11 @@ class ProcessFacebookChatIngestModule(DataSourceIngestModule):
 
             # Save the file locally. Use file id as name to reduce collisions
             extractedFile = os.path.join(temporaryDirectory, str(file.getId()) + "-" + file.getName())
-            ContentUtils.writeToFile(file, File(extractedFile))
+            self.extractionCache.copyTo(file, extractedFile)
             #os.remove(extractedFile)
 
         # Get and process chats            
-        files = fileManager.findFiles(dataSource, "orca2.db")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "orca2.db"))
         numFiles = len(files)
         #self.log(Level.INFO, "found " + str(numFiles) + " files")
 
@@ -176,7 +182,7 @@ class ProcessFacebookChatIngestModule(DataSourceIngestModule):
 
             # Save the file locally. Use file id as name to reduce collisions
             extractedFile = os.path.join(temporaryDirectory, str(file.getId()) + "-" + file.getName())
-            ContentUtils.writeToFile(file, File(extractedFile))
+            self.extractionCache.copyTo(file, extractedFile)
             self.log(Level.INFO, str(self.pathToExe) + " " + str(extractedFile) + " " + str(temporaryDirectory) + " " + str(databaseFile))
             pipe = Popen([self.pathToExe, extractedFile, temporaryDirectory, databaseFile], stdout=PIPE, stderr=PIPE)
             outputFromRun = pipe.communicate()[0]
@@ -192,6 +198,9 @@ class ProcessFacebookChatIngestModule(DataSourceIngestModule):
             "Facebook Chat", " Facebook Chat Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
     def getFBOwner(self, dbConn):
@@ -277,9 +286,12 @@ class ProcessFacebookChatIngestModule(DataSourceIngestModule):
     def processChats(self, skCase, file):
     
        artIdChat = skCase.getArtifactTypeID("TSK_MESSAGE")
-       artIdChatType = skCase.getArtifactType("TSK_MESSAGE")
          
        moduleName = ProcessFacebookChatIngestModuleFactory.moduleName
+
+       # Post the artifacts to the blackboard in batches for keyword search
+       poster = BlackboardPoster(moduleName)
+
        #chatMessage list
        # message_id, user_id, sender_id, Message, attachment_description, attachment_href, sender_name, receiver_name, Recvd Dttm
        # message_id, user_id, sender_id, Message||' '||attachment_description||' '||attachment_href, sender_name, receiver_name, Recvd Dttm
@@ -291,7 +303,6 @@ class ProcessFacebookChatIngestModule(DataSourceIngestModule):
                receiverAccount.append(self.getAccountInstance(skCase, chatMessage[5], file))
                textMessage = chatMessage[3]
                #self.log(Level.INFO, "Result (" + resultSet.getString("recipients") + ")")
-               artChat = file.newArtifact(artIdChat)
                attributes = ArrayList()
                if chatMessage[4] <> self.fbOwnerId:
                     attributes.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DIRECTION, moduleName, "Incoming"))
@@ -309,16 +320,10 @@ class ProcessFacebookChatIngestModule(DataSourceIngestModule):
                attributes.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME.getTypeID(), moduleName, chatMessage[6]))
                attributes.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_MESSAGE_TYPE, moduleName, "SMS Message"))
                
-               artChat.addAttributes(attributes)
+               artChat = poster.newArtifact(file, artIdChat, attributes)
                skCase.getCommunicationsManager().addRelationships(senderAccount, receiverAccount, artChat,Relationship.Type.MESSAGE, chatMessage[6]);
 
-               # index the artifact for keyword search
-               try:
-                   blackboard.indexArtifact(artChat)
-               except:
-                   pass
-#                   self._logger.log(Level.SEVERE, "Error indexing artifact " + artChat.getDisplayName())
-
            except SQLException as e:
                self.log(Level.INFO, "Error getting values from message table (" + e.getMessage() + ")")
- 
\ No newline at end of file
+
+       poster.flush()
@@ -66,6 +66,11 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -105,6 +110,8 @@ class ParsePrefetchDbIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ParsePrefetchDbIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ParsePrefetchDbIngestModuleFactory.moduleName, ParsePrefetchDbIngestModuleFactory().getModuleVersionNumber())
 
         # Get path to EXE based on where this script is run from.
         # Assumes EXE is in same folder as script
@@ -131,84 +138,50 @@ class ParsePrefetchDbIngestModule(DataSourceIngestModule):
         # Check to see if the artifacts exist and if not then create it, also check to see if the attributes
 		# exist and if not then create them
         skCase = Case.getCurrentCase().getSleuthkitCase();
-        try:
-             self.log(Level.INFO, "Begin Create New Artifacts")
-             artID_pf = skCase.addArtifactType( "TSK_PREFETCH", "Windows Prefetch")
-        except:		
-             self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-             artID_pf = skCase.getArtifactTypeID("TSK_PREFETCH")
-             
-        # Create the attribute type, if it exists then catch the error
-        try:
-            attID_pf_fn = skCase.addArtifactAttributeType("TSK_PREFETCH_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Prefetch File Name")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Prefetch File Name. ==> ")
 
-        try:
-            attID_pf_an = skCase.addArtifactAttributeType("TSK_PREFETCH_ACTUAL_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Actual File Name")			 
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Actual File Name. ==> ")
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(ParsePrefetchDbIngestModuleFactory.moduleName)
 
-        try:
-            attID_nr = skCase.addArtifactAttributeType("TSK_PF_RUN_COUNT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Program Number Runs")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Program Number Runs. ==> ")
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ParsePrefetchDbIngestModuleFactory.moduleName)
 
-        try:
-            attID_ex1 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_1", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 1")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 1. ==> ")
+        artID_pf = registry.getOrAddArtifactType( "TSK_PREFETCH", "Windows Prefetch").getTypeID()
+        attID_pf_fn = registry.getOrAddAttributeType("TSK_PREFETCH_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Prefetch File Name")
 
-        try:
-            attID_ex2 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_2", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 2")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 2. ==> ")
+        attID_pf_an = registry.getOrAddAttributeType("TSK_PREFETCH_ACTUAL_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Actual File Name")
 
-        try:
-            attID_ex3 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_3", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 3")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 3. ==> ")
+        attID_nr = registry.getOrAddAttributeType("TSK_PF_RUN_COUNT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Program Number Runs")
 
-        try:
-            attID_ex4 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_4", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 4")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 4 ==> ")
+        attID_ex1 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_1", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 1")
 
-        try:
-            attID_ex5 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_5", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 5")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 5. ==> ")
+        attID_ex2 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_2", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 2")
 
-        try:
-            attID_ex6 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_6", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 6")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 6. ==> ")
+        attID_ex3 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_3", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 3")
 
-        try:
-            attID_ex7 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_7", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 7")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 7. ==> ")
+        attID_ex4 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_4", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 4")
 
-        try:
-            attID_ex8 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_8", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 8")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 8 ==> ")
+        attID_ex5 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_5", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 5")
+
+        attID_ex6 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_6", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 6")
+
+        attID_ex7 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_7", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 7")
+
+        attID_ex8 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_8", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 8")
 
         self.log(Level.INFO, "Get Artifacts after they were created.")
         # Get the new artifacts and attributes that were just created
-        artID_pf = skCase.getArtifactTypeID("TSK_PREFETCH")
-        artID_pf_evt = skCase.getArtifactType("TSK_PREFETCH")
-        attID_pf_fn = skCase.getAttributeType("TSK_PREFETCH_FILE_NAME")
-        attID_pf_an = skCase.getAttributeType("TSK_PREFETCH_ACTUAL_FILE_NAME")
-        attID_nr = skCase.getAttributeType("TSK_PF_RUN_COUNT")
-        attID_ex1 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_1")
-        attID_ex2 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_2")
-        attID_ex3 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_3")
-        attID_ex4 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_4")
-        attID_ex5 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_5")
-        attID_ex6 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_6")
-        attID_ex7 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_7")
-        attID_ex8 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_8")
+        artID_pf = registry.getArtifactTypeID("TSK_PREFETCH")
+        attID_pf_fn = registry.getAttributeType("TSK_PREFETCH_FILE_NAME")
+        attID_pf_an = registry.getAttributeType("TSK_PREFETCH_ACTUAL_FILE_NAME")
+        attID_nr = registry.getAttributeType("TSK_PF_RUN_COUNT")
+        attID_ex1 = registry.getAttributeType("TSK_PF_EXEC_DTTM_1")
+        attID_ex2 = registry.getAttributeType("TSK_PF_EXEC_DTTM_2")
+        attID_ex3 = registry.getAttributeType("TSK_PF_EXEC_DTTM_3")
+        attID_ex4 = registry.getAttributeType("TSK_PF_EXEC_DTTM_4")
+        attID_ex5 = registry.getAttributeType("TSK_PF_EXEC_DTTM_5")
+        attID_ex6 = registry.getAttributeType("TSK_PF_EXEC_DTTM_6")
+        attID_ex7 = registry.getAttributeType("TSK_PF_EXEC_DTTM_7")
+        attID_ex8 = registry.getAttributeType("TSK_PF_EXEC_DTTM_8")
 
         # Used to crossref ADS prefetch files
         prefetchFileName = {}
@@ -218,7 +191,7 @@ class ParsePrefetchDbIngestModule(DataSourceIngestModule):
         
         # Find the prefetch files and the layout.ini file from the /windows/prefetch folder
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "%.pf")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "%.pf"))
         
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
@@ -251,7 +224,7 @@ class ParsePrefetchDbIngestModule(DataSourceIngestModule):
             else:
                 prefetchFileName[fileName] = file
             lclDbPath = os.path.join(Temp_Dir, fileName)
-            ContentUtils.writeToFile(file, File(lclDbPath))
+            self.extractionCache.linkTo(file, lclDbPath)
                         
 
         # Run the EXE, saving output to a sqlite database
@@ -325,8 +298,7 @@ class ParsePrefetchDbIngestModule(DataSourceIngestModule):
                               (BlackboardAttribute(attID_ex8, ParsePrefetchDbIngestModuleFactory.moduleName, Time_8))))
 			
         # Fire an event to notify the UI and others that there are new artifacts  
-        IngestServices.getInstance().fireModuleDataEvent(
-            ModuleDataEvent(ParsePrefetchDbIngestModuleFactory.moduleName, artID_pf_evt, None))
+        poster.flush()
                 
         # Clean up
         try:
@@ -353,7 +325,9 @@ class ParsePrefetchDbIngestModule(DataSourceIngestModule):
         IngestServices.getInstance().postMessage(message)
 
         # Fire an event to notify the UI and others that there are new artifacts  
-        IngestServices.getInstance().fireModuleDataEvent(
-            ModuleDataEvent(ParsePrefetchDbIngestModuleFactory.moduleName, artID_pf_evt, None))
+        poster.flush()
         
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK
@@ -84,6 +84,15 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Column_Plan import ColumnPlan, STRING, LONG, stringValue, longValue
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
+SRUDB_COLUMN_TYPES = {"TEXT": (STRING, stringValue), "": (STRING, stringValue)}
+SRUDB_DEFAULT_COLUMN = (LONG, longValue)
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -141,6 +150,9 @@ class ParseSRUDBIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ParseSRUDBIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ParseSRUDBIngestModuleFactory.moduleName, ParseSRUDBIngestModuleFactory().getModuleVersionNumber(), \
+                                   self.local_settings, ['all', 'application_resource_usage', 'energy_estimation_provider', 'energy_usage_data', 'network_connectivity', 'network_usage', 'windows_push_notification'])
 
         # Get path to EXE based on where this script is run from.
         # Assumes EXE is in same folder as script
@@ -192,8 +204,15 @@ class ParseSRUDBIngestModule(DataSourceIngestModule):
         
        # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(ParseSRUDBIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ParseSRUDBIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "SRUDB.DAT")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "SRUDB.DAT"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -219,10 +238,8 @@ class ParseSRUDBIngestModule(DataSourceIngestModule):
             #self.log(Level.INFO, "Processing file: " + file.getName())
             fileCount += 1
 
-            # Save the DB locally in the temp folder. use file id as name to reduce collisions
-            lclDbPath = os.path.join(temp_dir, file.getName())
-            ContentUtils.writeToFile(file, File(lclDbPath))
-            temp_file = lclDbPath
+            # The program only reads the ESE database, so it reads the extraction cache copy
+            temp_file = self.extractionCache.getLocalPath(file)
 
         # Run the executable, saving output to a sqlite database
         
@@ -260,70 +277,16 @@ class ParseSRUDBIngestModule(DataSourceIngestModule):
                        table_name = resultSet.getString("tbl_name")
                        self.log(Level.INFO, "Result get information from table " + resultSet.getString("tbl_name") + " ")
                        SQL_String_1 = "Select * from " + table_name + ";"
-                       SQL_String_2 = "PRAGMA table_info('" + table_name + "')"
                        #self.log(Level.INFO, SQL_String_1)
-                       #self.log(Level.INFO, SQL_String_2)
                        artifact_name = "TSK_" + table_name.upper()
                        artifact_desc = "System Resource Usage " + table_name.upper()
-                       try:
-                            self.log(Level.INFO, "Begin Create New Artifacts")
-                            artID_amc = skCase.addArtifactType( artifact_name, artifact_desc)
-                       except:		
-                            self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-                       artID_sru = skCase.getArtifactTypeID(artifact_name)
-                       artID_sru_evt = skCase.getArtifactType(artifact_name)
+                       artID_sru = registry.getOrAddArtifactType( artifact_name, artifact_desc).getTypeID()
                        
-                       Column_Names = []
-                       Column_Types = []
-                       resultSet2  = stmt.executeQuery(SQL_String_2)
-                       while resultSet2.next(): 
-                          Column_Names.append(resultSet2.getString("name").upper())
-                          Column_Types.append(resultSet2.getString("type").upper())
-                          #attID_ex1 = skCase.addAttrType("TSK_" + resultSet2.getString("name").upper(), resultSet2.getString("name"))
-                          #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                          if resultSet2.getString("type").upper() == "TEXT":
-                              try:
-                                  attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                                  #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                              except:		
-                                  self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
-                          elif resultSet2.getString("type").upper() == "":
-                              try:
-                                  attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                                  #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                              except:		
-                                  self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
-                          else:
-                              try:
-                                  attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
-                                  #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                              except:		
-                                  self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
-
-
-                                             
-                       resultSet3 = stmt.executeQuery(SQL_String_1)
-                       while resultSet3.next():
-                          art = file.newArtifact(artID_sru)
-                          Column_Number = 1
-                          for col_name in Column_Names:
-                             self.log(Level.INFO, "Result get information for column " + Column_Names[Column_Number - 1] + " ")
-                             self.log(Level.INFO, "Result get information for column_number " + str(Column_Number) + " ")
-                             c_name = "TSK_" + col_name
-                             self.log(Level.INFO, "Attribute Name is " + c_name + " ")
-                             attID_ex1 = skCase.getAttributeType(c_name)
-                             if Column_Types[Column_Number - 1] == "TEXT":
-                                 art.addAttribute(BlackboardAttribute(attID_ex1, ParseSRUDBIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
-                             elif Column_Types[Column_Number - 1] == "":
-                                  art.addAttribute(BlackboardAttribute(attID_ex1, ParseSRUDBIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
-                             else:
-                                 #self.log(Level.INFO, "Value for column type ==> " + str(resultSet3.getInt(Column_Number)) + " <== ")
-                                 art.addAttribute(BlackboardAttribute(attID_ex1, ParseSRUDBIngestModuleFactory.moduleName, long(resultSet3.getInt(Column_Number))))
-                             Column_Number = Column_Number + 1
-
-                       IngestServices.getInstance().fireModuleDataEvent(
-                             ModuleDataEvent(ParseSRUDBIngestModuleFactory.moduleName, artID_sru_evt, None))
+                       plan = ColumnPlan(registry, ParseSRUDBIngestModuleFactory.moduleName, stmt, table_name, "TSK_", \
+                                         SRUDB_COLUMN_TYPES, SRUDB_DEFAULT_COLUMN)
+                       plan.postRows(poster, file, artID_sru, stmt.executeQuery(SQL_String_1))
+
+                       poster.flush()
                    except SQLException as e:
                        self.log(Level.INFO, "Error getting values from contacts table (" + e.getMessage() + ")")
 
@@ -334,11 +297,6 @@ class ParseSRUDBIngestModule(DataSourceIngestModule):
             self.log(Level.INFO, "removal of " + lclDbPath + " Failed")
         			
 		#Clean up EventLog directory and files
-        for file in files:
-            try:
-			    os.remove(temp_file)
-            except:
-			    self.log(Level.INFO, "removal of SRUDB file failed " + Temp_Dir + "\\" + file.getName())
         try:
              os.rmdir(temp_dir)		
         except:
@@ -349,6 +307,9 @@ class ParseSRUDBIngestModule(DataSourceIngestModule):
             "System Resourse Usage DB", " SRUDB Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
 # Stores the settings that can be changed for each ingest job
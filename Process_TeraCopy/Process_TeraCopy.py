@@ -72,6 +72,11 @@ from org.sleuthkit.datamodel import CommunicationsManager
 from org.sleuthkit.datamodel import Relationship
 from org.sleuthkit.datamodel import Account
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 
 # Factory that defines the name and details of the module and allows Autopsy
@@ -126,6 +131,8 @@ class ProcessTeraCopyDbIngestModule(DataSourceIngestModule):
                            
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ProcessTeraCopyDbIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ProcessTeraCopyDbIngestModuleFactory.moduleName, ProcessTeraCopyDbIngestModuleFactory().getModuleVersionNumber())
         pass
         
     # Where the analysis is done.
@@ -136,8 +143,12 @@ class ProcessTeraCopyDbIngestModule(DataSourceIngestModule):
         
         # get current case and the TeraCopy main.db abstract file information
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(ProcessTeraCopyDbIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "main.db", "%TeraCopy%")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "main.db", "%TeraCopy%"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -162,28 +173,19 @@ class ProcessTeraCopyDbIngestModule(DataSourceIngestModule):
             
         if numFiles > 0:
             for artifact in self.stringColumns:
-                try:
-                    attID = skCase.addArtifactAttributeType(artifact[0], BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, artifact[1])
-                    #self.log(Level.INFO, "attribute id for " + artifact[0] + " == " + str(attID))
-                except:		
-                    self.log(Level.INFO, "Attributes Creation Error, " + artifact[0] + " ==> ")
+                attID = registry.getOrAddAttributeType(artifact[0], BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, artifact[1])
+                #self.log(Level.INFO, "attribute id for " + artifact[0] + " == " + str(attID))
             for artifact in self.dateColumns:
-                try:
-                    attID = skCase.addArtifactAttributeType(artifact[0], BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, artifact[1])
-                    #self.log(Level.INFO, "attribute id for " + artifact[0] + " == " + str(attID))
-                except:		
-                    self.log(Level.INFO, "Attributes Creation Error, " + artifact[0] + " ==> ")
-            try:
-                #self.log(Level.INFO, "Begin Create New Artifacts ==> TSK_TERACOPY_DB")
-                artID_art = skCase.addArtifactType("TSK_TERACOPY_DB", "Teracopy History DB")
-            except:		
-                self.log(Level.INFO, "Artifacts Creation Error, artifact TSK_TERACOPY_DB exists. ==> ")
+                attID = registry.getOrAddAttributeType(artifact[0], BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, artifact[1])
+                #self.log(Level.INFO, "attribute id for " + artifact[0] + " == " + str(attID))
+            artTeraCopyId = registry.getOrAddArtifactType("TSK_TERACOPY_DB", "Teracopy History DB").getTypeID()
 
-        artTeraCopyId = skCase.getArtifactTypeID("TSK_TERACOPY_DB")
         #self.log(Level.INFO, "Artifact id ==> " + str(artTeraCopyId))
-        artTeraCopy = skCase.getArtifactType("TSK_TERACOPY_DB")
 
         moduleName = ProcessTeraCopyDbIngestModuleFactory.moduleName
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(moduleName)
                     
                     
         # Write out each users store.vol file and process it.
@@ -200,7 +202,7 @@ class ProcessTeraCopyDbIngestModule(DataSourceIngestModule):
             fileId = filePathId[file.getParentPath()]
             extractedFile = os.path.join(temporaryDirectory, str(fileId) + "-" + file.getName())
             
-            ContentUtils.writeToFile(file, File(extractedFile))
+            self.extractionCache.copyTo(file, extractedFile)
 
             userpath = file.getParentPath()
             username = userpath.split('/')
@@ -239,7 +241,7 @@ class ProcessTeraCopyDbIngestModule(DataSourceIngestModule):
                 for histFile in histFiles:
                     extractedHistFile = os.path.join(temporaryDirectory, str(histFile.getId()) + "-" + historyFile)
                     #self.log(Level.INFO, "History File ==> " + extractedHistFile)
-                    ContentUtils.writeToFile(histFile, File(extractedHistFile))
+                    self.extractionCache.copyTo(histFile, extractedHistFile)
 
                     try: 
 #                        Class.forName("org.sqlite.JDBC").newInstance()
@@ -280,31 +282,24 @@ class ProcessTeraCopyDbIngestModule(DataSourceIngestModule):
             ##            self.log(Level.INFO, "Start PRocessing")
                         # while resultSet.next():
                         try:
-                            artifact = file.newArtifact(artTeraCopyId)
                             attributes = ArrayList()
-                            attributes.add(BlackboardAttribute(skCase.getAttributeType('TSK_HISTORY_FILE'), moduleName, historyFile))
-                            attributes.add(BlackboardAttribute(skCase.getAttributeType('TSK_SOURCE_LOCATION'), moduleName, sourceLocation))
-                            attributes.add(BlackboardAttribute(skCase.getAttributeType('TSK_TARGET_LOCATION'), moduleName, targetLocation))
-                            attributes.add(BlackboardAttribute(skCase.getAttributeType('TSK_OPERATION_TYPE'), moduleName, operationType))
-                            attributes.add(BlackboardAttribute(skCase.getAttributeType('TSK_DATETIME_START'), moduleName, startTime))
-                            attributes.add(BlackboardAttribute(skCase.getAttributeType('TSK_DATETIME_END'), moduleName, endTime))
+                            attributes.add(BlackboardAttribute(registry.getAttributeType('TSK_HISTORY_FILE'), moduleName, historyFile))
+                            attributes.add(BlackboardAttribute(registry.getAttributeType('TSK_SOURCE_LOCATION'), moduleName, sourceLocation))
+                            attributes.add(BlackboardAttribute(registry.getAttributeType('TSK_TARGET_LOCATION'), moduleName, targetLocation))
+                            attributes.add(BlackboardAttribute(registry.getAttributeType('TSK_OPERATION_TYPE'), moduleName, operationType))
+                            attributes.add(BlackboardAttribute(registry.getAttributeType('TSK_DATETIME_START'), moduleName, startTime))
+                            attributes.add(BlackboardAttribute(registry.getAttributeType('TSK_DATETIME_END'), moduleName, endTime))
                             for x in range(0, columnCount):
                                 if columnNames[x] in self.dateColumn:
         #                            self.log(Level.INFO, "Date ColumnName ==> " + columnNames[x])
-                                    attributes.add(BlackboardAttribute(skCase.getAttributeType(columnNames[x]), moduleName, resultSetHist.getInt(columnNames[x])))
+                                    attributes.add(BlackboardAttribute(registry.getAttributeType(columnNames[x]), moduleName, resultSetHist.getInt(columnNames[x])))
                                 else:
         #                            self.log(Level.INFO, "ColumnName ==> " + columnNames[x])
-                                    attributes.add(BlackboardAttribute(skCase.getAttributeType(columnNames[x]), moduleName, resultSetHist.getString(columnNames[x])))
+                                    attributes.add(BlackboardAttribute(registry.getAttributeType(columnNames[x]), moduleName, resultSetHist.getString(columnNames[x])))
                                 
         #                        self.log(Level.INFO, "Column Count ==> " + str(x))
                                 
-                            artifact.addAttributes(attributes)
-
-                            # index the artifact for keyword search
-                            try:
-                                blackboard.indexArtifact(artifact)
-                            except:
-                                pass
+                            poster.newArtifact(file, artTeraCopyId, attributes)
                         except SQLException as e:
                             self.log(Level.INFO, "Error getting values from files table (" + e.getMessage() + ")")
 
@@ -320,11 +315,15 @@ class ProcessTeraCopyDbIngestModule(DataSourceIngestModule):
             except:
                 pass                    
                 
+        poster.flush()
 
         # After all databases, post a message to the ingest messages in box.
         message = IngestMessage.createMessage(IngestMessage.MessageType.DATA,
             "TeraCopy DB", " TeraCopy DB Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
       
@@ -70,6 +70,11 @@ from org.sleuthkit.datamodel import CommunicationsManager
 from org.sleuthkit.datamodel import Relationship
 from org.sleuthkit.datamodel import Account
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 
 # Factory that defines the name and details of the module and allows Autopsy
@@ -113,6 +118,8 @@ class ProcessWinMailIngestModule(DataSourceIngestModule):
 
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ProcessWinMailIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ProcessWinMailIngestModuleFactory.moduleName, ProcessWinMailIngestModuleFactory().getModuleVersionNumber())
 
         # Get path to executable based on where this script is run from.
         # Assumes executable is in same folder as script
@@ -140,7 +147,10 @@ class ProcessWinMailIngestModule(DataSourceIngestModule):
         # get current case and the store.vol abstract file information
         skCase = Case.getCurrentCase().getSleuthkitCase();
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "store.vol", "UnistoreDB")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "store.vol", "UnistoreDB"))
+        # Look up the artifact and attribute types once for the whole job
+        self.registry = TypeRegistry(ProcessWinMailIngestModuleFactory.moduleName)
+        self.poster = BlackboardPoster(ProcessWinMailIngestModuleFactory.moduleName)
         numFiles = len(files)
         #self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -171,9 +181,8 @@ class ProcessWinMailIngestModule(DataSourceIngestModule):
             #self.log(Level.INFO, "Processing file: " + file.getName())
             fileCount += 1
 
-            # Save the file locally. Use file id as name to reduce collisions
-            extractedFile = os.path.join(temporaryDirectory, str(file.getId()) + "-" + file.getName())
-            ContentUtils.writeToFile(file, File(extractedFile))
+            # The program only reads the ESE database, so it reads the extraction cache copy
+            extractedFile = self.extractionCache.getLocalPath(file)
             self.processEsedbFile(extractedFile, os.path.join(moduleDirectory, str(file.getId()) + "-" + file.getName() + ".db3"))
 
         for file in files:	
@@ -189,6 +198,7 @@ class ProcessWinMailIngestModule(DataSourceIngestModule):
  
            #self.processRecipients(dbConn, skCase, file)
            self.processEmails(dbConn, skCase, file)
+           self.poster.flush()
 
            # Clean up
            dbConn.close()
@@ -202,6 +212,9 @@ class ProcessWinMailIngestModule(DataSourceIngestModule):
             "WinMail Processor", " Windows Mail Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
     def processEsedbFile(self, extractedFile, databaseFile):
@@ -227,16 +240,15 @@ class ProcessWinMailIngestModule(DataSourceIngestModule):
            return IngestModule.ProcessResult.OK
 
 
-       artIdEmail = skCase.getArtifactTypeID("TSK_ACCOUNT")
-       artIdEmailType = skCase.getArtifactType("TSK_ACCOUNT")
+       artIdEmail = self.registry.getArtifactTypeID("TSK_ACCOUNT")
          
        # Cycle through each row and create artifacts
        while resultSet.next():
            try: 
                #self.log(Level.INFO, "Result (" + resultSet.getString("recipients") + ")")
-               artEmail = file.newArtifact(artIdEmail)
-               artEmail.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_ACCOUNT_TYPE.getTypeID(), ProcessWinMailIngestModuleFactory.moduleName, "EMAIL"))
-               artEmail.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_ID.getTypeID(), ProcessWinMailIngestModuleFactory.moduleName, resultSet.getString("recipients")))
+               self.poster.newArtifact(file, artIdEmail, \
+                                  ((BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_ACCOUNT_TYPE.getTypeID(), ProcessWinMailIngestModuleFactory.moduleName, "EMAIL")), \
+                                  (BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_ID.getTypeID(), ProcessWinMailIngestModuleFactory.moduleName, resultSet.getString("recipients")))))
            except SQLException as e:
                pass
                #self.log(Level.INFO, "Error getting values from recipent table (" + e.getMessage() + ")")
@@ -326,8 +338,7 @@ class ProcessWinMailIngestModule(DataSourceIngestModule):
            return IngestModule.ProcessResult.OK
 
 
-       artIdEmail = skCase.getArtifactTypeID("TSK_EMAIL_MSG")
-       artIdEmailType = skCase.getArtifactType("TSK_EMAIL_MSG")
+       artIdEmail = self.registry.getArtifactTypeID("TSK_EMAIL_MSG")
          
        # Cycle through each row and create artifacts
        while resultSet.next():
@@ -335,8 +346,8 @@ class ProcessWinMailIngestModule(DataSourceIngestModule):
                senderAccount = self.getSenderAccount(dbConn, skCase, file, resultSet.getString("INTERNAL_ID"))
                otherAccounts = self.getOtherAccounts(dbConn, skCase, file, resultSet.getString("INTERNAL_ID"))
                #self.log(Level.INFO, "Result (" + resultSet.getString("recipients") + ")")
-               artEmail = file.newArtifact(artIdEmail)
-               artEmail.addAttributes(((BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PATH.getTypeID(), ProcessWinMailIngestModuleFactory.moduleName, resultSet.getString("TSK_PATH"))), \
+               artEmail = self.poster.newArtifact(file, artIdEmail, \
+                                  ((BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PATH.getTypeID(), ProcessWinMailIngestModuleFactory.moduleName, resultSet.getString("TSK_PATH"))), \
                                   (BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_EMAIL_TO.getTypeID(), ProcessWinMailIngestModuleFactory.moduleName, resultSet.getString("TSK_EMAIL_TO"))), \
                                   (BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_EMAIL_FROM.getTypeID(), ProcessWinMailIngestModuleFactory.moduleName, resultSet.getString("TSK_EMAIL_FROM"))), \
                                   (BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_EMAIL_CONTENT_PLAIN.getTypeID(), ProcessWinMailIngestModuleFactory.moduleName, resultSet.getString("TSK_EMAIL_CONTENT_PLAIN"))), \
@@ -345,19 +356,8 @@ class ProcessWinMailIngestModule(DataSourceIngestModule):
                                   (BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_SUBJECT.getTypeID(), ProcessWinMailIngestModuleFactory.moduleName, resultSet.getString("TSK_SUBJECT")))))
                skCase.getCommunicationsManager().addRelationships(senderAccount, otherAccounts, artEmail,Relationship.Type.MESSAGE, resultSet.getInt("TSK_DATETIME_SENT"));
 
-               # index the artifact for keyword search
-               try:
-                   blackboard.indexArtifact(artEmail)
-               except:
-                   pass
-#                   self._logger.log(Level.SEVERE, "Error indexing artifact " + artEmail.getDisplayName())
-
            except SQLException as e:
                self.log(Level.INFO, "Error getting values from message table (" + e.getMessage() + ")")
 
        # Close the database statement
        stmt.close()
-       
-       # fire event to let the system know new data was added
-       #IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(ProcessWinMailIngestModuleFactory.moduleName, \
-       #                                 artIdEmailType, None))
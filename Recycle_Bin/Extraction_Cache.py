@@ -0,0 +1,257 @@
+# Extraction_Cache.py = Jython helper that keeps one local copy of each file extracted from a case
+#
+# Contact: Mark McKinnon [Mark [dot] McKinnon <at> Davenport [dot] edu]
+#
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+# Copied next to each module that extracts files from the image, same as Blackboard_Poster.py.
+#
+# Comments
+#   Version 1.0 - Initial version - October 2026
+#   Version 1.1 - Add linkTo, copyTo no longer fills the cache, copies handed out in the running
+#                 ingest job are never evicted
+#   Version 1.2 - When a stale copy cannot be replaced because a program still has it open, hand out
+#                 a private copy for that call instead of failing, never leave a .part file behind
+#
+# Usage:
+#   self.extractionCache = ExtractionCache(SomeIngestModuleFactory.moduleName, self.context)
+#   lclDbPath = self.extractionCache.getLocalPath(file)   # the module only reads the file
+#   self.extractionCache.linkTo(file, lclDbPath)          # only reads it, but needs it under its own name or directory
+#   self.extractionCache.copyTo(file, lclDbPath)          # the module changes the file (SQLite databases)
+#
+# The first module that reads a file extracts it out of the image into <case temp>/Extraction_Cache,
+# named by the file's obj_id.  An index database in the same directory records the size, MD5 and
+# modified time the copy was made from, a copy is only handed out again while they still match.
+# Every module that reads the file after that opens the same copy, nothing is written again.
+# linkTo gives that copy another name with a hard link, so an external program that works on a
+# directory of files still reads the cached copy.  The copy must not be changed through the link.
+# copyTo gives the module its own copy, made from the cached one when there is one and straight
+# from the image when there is not.
+#
+# The cache is kept under a disk budget (MB), set with the DiskBudgetMB setting of the
+# Extraction_Cache module settings, the least recently used copies are removed first.  A copy
+# handed out in the running ingest job is left alone, another module may still be reading it.
+#
+# On Windows a copy that an external program still has open cannot be replaced.  A newer version
+# of that file is then handed out from <case temp>/Extraction_Cache/Private for that call only, the
+# private copies of earlier ingest jobs are removed when the next job starts.
+
+import os
+
+from java.io import File
+from java.lang import Class
+from java.lang import System
+from java.lang import Thread
+from java.lang import UnsupportedOperationException
+from java.nio.file import Files
+from java.nio.file import FileSystemException
+from java.nio.file import Paths
+from java.nio.file import StandardCopyOption
+from java.sql import DriverManager
+from java.util.logging import Level
+from org.sleuthkit.autopsy.casemodule import Case
+from org.sleuthkit.autopsy.coreutils import Logger
+from org.sleuthkit.autopsy.coreutils import ModuleSettings
+from org.sleuthkit.autopsy.datamodel import ContentUtils
+
+DEFAULT_DISK_BUDGET_MB = 4096
+
+class ExtractionCache(object):
+
+    def __init__(self, module_name, context=None, disk_budget_mb=None):
+        self._logger = Logger.getLogger(module_name)
+        # Copies handed out under this ingest job id are pinned, 0 when there is no job
+        self.job_id = 0
+        if context != None:
+            self.job_id = context.getJobId()
+        self.cache_dir = os.path.join(Case.getCurrentCase().getTempDirectory(), "Extraction_Cache")
+        try:
+            os.mkdir(self.cache_dir)
+        except:
+            pass
+        self.private_dir = os.path.join(self.cache_dir, "Private")
+        try:
+            os.mkdir(self.private_dir)
+        except:
+            pass
+        self._removePrivateCopies()
+        if disk_budget_mb == None:
+            disk_budget_mb = ModuleSettings.getConfigSetting("Extraction_Cache", "DiskBudgetMB")
+        try:
+            self.disk_budget = long(disk_budget_mb) * 1024 * 1024
+        except:
+            self.disk_budget = long(DEFAULT_DISK_BUDGET_MB) * 1024 * 1024
+
+    def getLocalPath(self, file):
+        # Returns the path of a local copy of the file, extracting it from the image if there
+        # is no copy or the copy was made from a different version of the file.  The copy is
+        # shared with other modules so it must not be changed or deleted.
+        local_path = os.path.join(self.cache_dir, str(file.getId()))
+        dbConn = self._connect()
+        try:
+            if self._isCached(dbConn, file, local_path):
+                self._touch(dbConn, file.getId())
+                return local_path
+
+            # Extract to a private name first so a module reading the old copy is not cut off
+            part_path = local_path + "." + str(Thread.currentThread().getId()) + ".part"
+            try:
+                ContentUtils.writeToFile(file, File(part_path))
+                try:
+                    Files.move(Paths.get(part_path), Paths.get(local_path), StandardCopyOption.REPLACE_EXISTING)
+                except FileSystemException:
+                    # The old copy is still open (Windows), leave it and the index as they are and
+                    # give this call a copy of its own
+                    private_path = os.path.join(self.private_dir, str(file.getId()) + "." + str(self.job_id) + "." + \
+                                                str(Thread.currentThread().getId()) + "." + str(System.nanoTime()))
+                    self._logger.log(Level.WARNING, "Extraction cache copy of " + file.getName() + " is in use, using " + private_path)
+                    Files.move(Paths.get(part_path), Paths.get(private_path))
+                    return private_path
+            finally:
+                try:
+                    self._remove(part_path)
+                except:
+                    self._logger.log(Level.WARNING, "Extraction cache could not remove " + part_path)
+
+            stmt = dbConn.prepareStatement("insert or replace into extracted_files (obj_id, size, md5, mtime, last_used, job_id) values (?, ?, ?, ?, ?, ?)")
+            stmt.setLong(1, file.getId())
+            stmt.setLong(2, file.getSize())
+            stmt.setString(3, file.getMd5Hash())
+            stmt.setLong(4, file.getMtime())
+            stmt.setLong(5, System.currentTimeMillis())
+            stmt.setLong(6, self.job_id)
+            stmt.executeUpdate()
+            stmt.close()
+            self._evict(dbConn, file.getId())
+            return local_path
+        finally:
+            dbConn.close()
+
+    def linkTo(self, file, path):
+        # Puts the cached copy at path as well, for a program that needs the file under its own name or
+        # next to other files.  The file at path is the cached copy, it must only be read.
+        local_path = self.getLocalPath(file)
+        self._remove(path)
+        try:
+            Files.createLink(Paths.get(path), Paths.get(local_path))
+        except (FileSystemException, UnsupportedOperationException):
+            # No hard links on this file system, fall back to a copy of the cached one
+            Files.copy(Paths.get(local_path), Paths.get(path), StandardCopyOption.REPLACE_EXISTING)
+
+    def copyTo(self, file, path):
+        # Drop in for ContentUtils.writeToFile(file, File(path)), the copy at path belongs to the caller.
+        # It is made from the cached copy when there is one, otherwise straight from the image so the
+        # file is only written once.
+        local_path = os.path.join(self.cache_dir, str(file.getId()))
+        # Whatever is at path may be a link to a cached copy, writing through it would change that copy
+        self._remove(path)
+        dbConn = self._connect()
+        try:
+            if self._isCached(dbConn, file, local_path):
+                self._touch(dbConn, file.getId())
+                try:
+                    Files.copy(Paths.get(local_path), Paths.get(path), StandardCopyOption.REPLACE_EXISTING)
+                    return
+                except:
+                    self._logger.log(Level.WARNING, "Extraction cache copy failed for " + file.getName() + ", extracting it directly")
+        finally:
+            dbConn.close()
+        ContentUtils.writeToFile(file, File(path))
+
+    def _isCached(self, dbConn, file, local_path):
+        # True when the cached copy was made from this version of the file
+        stmt = dbConn.prepareStatement("select size, md5, mtime from extracted_files where obj_id = ?")
+        stmt.setLong(1, file.getId())
+        resultSet = stmt.executeQuery()
+        cached = resultSet.next() and resultSet.getLong("size") == file.getSize() and \
+                 resultSet.getString("md5") == file.getMd5Hash() and resultSet.getLong("mtime") == file.getMtime() and \
+                 os.path.exists(local_path) and os.path.getsize(local_path) == file.getSize()
+        resultSet.close()
+        stmt.close()
+        return cached
+
+    def _remove(self, path):
+        if os.path.lexists(path):
+            os.remove(path)
+
+    def _removePrivateCopies(self):
+        # Private copies are named <obj_id>.<job id>.<thread id>.<time>, the ones from other jobs are done with
+        for name in os.listdir(self.private_dir):
+            if name.split(".")[1:2] != [str(self.job_id)]:
+                try:
+                    os.remove(os.path.join(self.private_dir, name))
+                except:
+                    pass
+
+    def _connect(self):
+        Class.forName("org.sqlite.JDBC").newInstance()
+        dbConn = DriverManager.getConnection("jdbc:sqlite:%s" % os.path.join(self.cache_dir, "Extraction_Cache.db3"))
+        stmt = dbConn.createStatement()
+        # Other modules (and threads) use the same index
+        stmt.execute("PRAGMA busy_timeout = 30000")
+        stmt.execute("create table if not exists extracted_files (obj_id integer primary key, size integer, md5 text, mtime integer, last_used integer, job_id integer)")
+        try:
+            # Index made by version 1.0
+            stmt.execute("alter table extracted_files add column job_id integer")
+        except:
+            pass
+        stmt.close()
+        return dbConn
+
+    def _touch(self, dbConn, obj_id):
+        stmt = dbConn.prepareStatement("update extracted_files set last_used = ?, job_id = ? where obj_id = ?")
+        stmt.setLong(1, System.currentTimeMillis())
+        stmt.setLong(2, self.job_id)
+        stmt.setLong(3, obj_id)
+        stmt.executeUpdate()
+        stmt.close()
+
+    def _evict(self, dbConn, keep_obj_id):
+        # Walk the copies newest first, everything past the budget goes except the copies handed out in
+        # this ingest job, another module or thread may have been given one and not opened it yet
+        stmt = dbConn.createStatement()
+        resultSet = stmt.executeQuery("select obj_id, size, job_id from extracted_files order by last_used desc")
+        total = 0
+        evict = []
+        while resultSet.next():
+            total = total + resultSet.getLong("size")
+            pinned = resultSet.getLong("obj_id") == keep_obj_id or (self.job_id != 0 and resultSet.getLong("job_id") == self.job_id)
+            if total > self.disk_budget and not pinned:
+                evict.append(resultSet.getLong("obj_id"))
+        resultSet.close()
+        stmt.close()
+
+        for obj_id in evict:
+            local_path = os.path.join(self.cache_dir, str(obj_id))
+            if os.path.exists(local_path):
+                try:
+                    os.remove(local_path)
+                except:
+                    # Still open somewhere, try again next time
+                    self._logger.log(Level.INFO, "Could not remove cached copy of obj_id " + str(obj_id))
+                    continue
+            stmt = dbConn.prepareStatement("delete from extracted_files where obj_id = ?")
+            stmt.setLong(1, obj_id)
+            stmt.executeUpdate()
+            stmt.close()
@@ -71,6 +71,11 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -113,6 +118,8 @@ class RecBin2IngestModule(DataSourceIngestModule):
     # Where any setup and configuration is done
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(RecBin2IngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(RecBin2IngestModuleFactory.moduleName, RecBin2IngestModuleFactory().getModuleVersionNumber())
         self.registryKeyToFind = 'SAM/Domains/Account/Users'
         
     # Where the analysis is done.
@@ -122,6 +129,13 @@ class RecBin2IngestModule(DataSourceIngestModule):
         progressBar.switchToIndeterminate()
         
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(RecBin2IngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(RecBin2IngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
 
         # Create Recyclebin directory in temp directory, if it exists then continue on processing		
@@ -149,38 +163,25 @@ class RecBin2IngestModule(DataSourceIngestModule):
             
             #self.log(Level.INFO, "Parent Path ==> " + str(file.getParentPath()))
             if file.getParentPath() == '/Windows/System32/Config/':    
-                # Save the DB locally in the temp folder. use file id as name to reduce collisions
-                lclDbPath = os.path.join(temp_dir, file.getName())
-                ContentUtils.writeToFile(file, File(lclDbPath))
+                # The hive is only read, so read the extraction cache copy
+                lclDbPath = self.extractionCache.getLocalPath(file)
                 # Process the SAM Registry File getting the Username and RID
                 userRids = self.processSAMFile(lclDbPath)
             else:
                 self.log(Level.INFO, "Skipping File " + file.getName() + " In Path " + file.getParentPath())
 
         # Setup Artifact and Attributes
-        try:
-            self.log(Level.INFO, "Begin Create New Artifacts")
-            artID_ls = skCase.addArtifactType( "TSK_RECYCLE_BIN", "Recycle Bin")
-        except:		
-            self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
+        artID_ls = registry.getOrAddArtifactType( "TSK_RECYCLE_BIN", "Recycle Bin").getTypeID()
         
-        try:
-            attIdFilePath = skCase.addArtifactAttributeType("TSK_FILE_NAME_PATH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Path File Name")
-        except:
-            attIdFilePath = skCase.getAttributeType("TSK_FILE_NAME_PATH")		
-            self.log(Level.INFO, "Attributes Creation Error, TSK_FILE_NAME_PATH ==> ")
+        attIdFilePath = registry.getOrAddAttributeType("TSK_FILE_NAME_PATH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Path File Name")
         
-        try:
-            attIdDelTime = skCase.addArtifactAttributeType("TSK_FILE_DEL_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "File Deletion Time")
-        except:
-            attIdDelTime = skCase.getAttributeType("TSK_FILE_DEL_TIME")		
-            self.log(Level.INFO, "Attributes Creation Error, TSK_FILE_DEL_TIME ==> ")
+        attIdDelTime = registry.getOrAddAttributeType("TSK_FILE_DEL_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "File Deletion Time")
 
         artifactName = "TSK_RECYCLE_BIN"
-        artId = skCase.getArtifactTypeID(artifactName)
-        attIdUserName = skCase.getAttributeType("TSK_USER_NAME")
+        artId = registry.getArtifactTypeID(artifactName)
+        attIdUserName = registry.getAttributeType("TSK_USER_NAME")
 
-        iFiles = fileManager.findFiles(dataSource, "$I%")
+        iFiles = self.ledger.unprocessed(fileManager.findFiles(dataSource, "$I%"))
         numFiles = len(files)
         self.log(Level.INFO, "Number of $I Files found ==> " + str(numFiles))
             
@@ -190,9 +191,8 @@ class RecBin2IngestModule(DataSourceIngestModule):
             if self.context.isJobCancelled():
                 return IngestModule.ProcessResult.OK
 
-            # Save the $I locally in the temp folder. use file id as name to reduce collisions
-            lclDbPath = os.path.join(temp_dir, iFile.getName())
-            ContentUtils.writeToFile(iFile, File(lclDbPath))
+            # The $I is only read, so read the extraction cache copy
+            lclDbPath = self.extractionCache.getLocalPath(iFile)
             self.log(Level.INFO, "Getting File " + iFile.getName() + " In Path " + iFile.getParentPath())
 
             rFileName = iFile.getName().replace("$I", "$R")
@@ -201,16 +201,19 @@ class RecBin2IngestModule(DataSourceIngestModule):
             self.log(Level.INFO, "Number of $R Files found ==> " + str(numRFiles))
             for rFile in rFiles:
                 if (rFile.getParentPath() == iFile.getParentPath()):
-                    fileNamePath, deletedTimeStamp = self.getFileMetadata(os.path.join(temp_dir, iFile.getName()))
+                    fileNamePath, deletedTimeStamp = self.getFileMetadata(lclDbPath)
                     if fileNamePath != None:
-                        art = rFile.newArtifact(artId)
+                        attributes = []
                         self.log(Level.INFO, "Parent Path ==> " + iFile.getParentPath())
                         startSearch = iFile.getParentPath().rfind("-")
                         userRid = iFile.getParentPath()[startSearch + 1:].replace('/','')
-                        art.addAttribute(BlackboardAttribute(attIdUserName, RecBin2IngestModuleFactory.moduleName, userRids.get(userRid, "Not Found!")))
-                        art.addAttribute(BlackboardAttribute(attIdFilePath, RecBin2IngestModuleFactory.moduleName, fileNamePath))
-                        art.addAttribute(BlackboardAttribute(attIdDelTime, RecBin2IngestModuleFactory.moduleName, deletedTimeStamp))
+                        attributes.append(BlackboardAttribute(attIdUserName, RecBin2IngestModuleFactory.moduleName, userRids.get(userRid, "Not Found!")))
+                        attributes.append(BlackboardAttribute(attIdFilePath, RecBin2IngestModuleFactory.moduleName, fileNamePath))
+                        attributes.append(BlackboardAttribute(attIdDelTime, RecBin2IngestModuleFactory.moduleName, deletedTimeStamp))
+                        poster.newArtifact(rFile, artId, attributes)
         
+        poster.flush()
+
 		#Clean up recyclebin directory and files
         try:
              shutil.rmtree(temp_dir)		
@@ -222,6 +225,9 @@ class RecBin2IngestModule(DataSourceIngestModule):
             "RecycleBin", " Recycle Bin Files Have Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 
     def getFileMetadata(self, fileName):
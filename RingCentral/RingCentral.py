@@ -69,6 +69,11 @@ from org.sleuthkit.datamodel import CommunicationsManager
 from org.sleuthkit.datamodel import Relationship
 from org.sleuthkit.datamodel import Account
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 
 # Factory that defines the name and details of the module and allows Autopsy
@@ -115,6 +120,8 @@ class RingCentralIngestModule(DataSourceIngestModule):
 
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(RingCentralIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(RingCentralIngestModuleFactory.moduleName, RingCentralIngestModuleFactory().getModuleVersionNumber())
         pass
         
     # Where the analysis is done.
@@ -125,8 +132,15 @@ class RingCentralIngestModule(DataSourceIngestModule):
         
         # get current case and the store.vol abstract file information
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        self.registry = TypeRegistry(RingCentralIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        self.poster = BlackboardPoster(RingCentralIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        chatFiles = fileManager.findFiles(dataSource, "%.txt", "/Documents/RingCentral/Meetings")
+        chatFiles = self.ledger.unprocessed(fileManager.findFiles(dataSource, "%.txt", "/Documents/RingCentral/Meetings"))
         numFiles = len(chatFiles)
         progressBar.switchToDeterminate(numFiles)
         fileCount = 0;
@@ -147,15 +161,11 @@ class RingCentralIngestModule(DataSourceIngestModule):
 
                 fileCount += 1
 
-                # Save the file locally. Use file id as name to reduce collisions
-                extractedFile = os.path.join(temporaryDirectory, str(file.getId()) + "-" + file.getName())
-                ContentUtils.writeToFile(file, File(extractedFile))
+                # The log is only read, so read the extraction cache copy
+                extractedFile = self.extractionCache.getLocalPath(file)
                 self.chatMeetingLogs(extractedFile, file)
-                try:
-                    os.remove(extractedFile)
-                except:
-                    self.log(Level.INFO, "Failed to remove file " + extractedFile)
 
+        self.poster.flush()
 
 #        try:
 #           shutil.rmtree(temporaryDirectory)		
@@ -167,6 +177,9 @@ class RingCentralIngestModule(DataSourceIngestModule):
             "CentralRing", " CentralRing Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
     def chatMeetingLogs(self, chatFile, abstractFile):
@@ -190,7 +203,6 @@ class RingCentralIngestModule(DataSourceIngestModule):
        try:
            artId = self.createArtifact("TSK_RINGCENTRAL_MEETING", "RingCentral Meeting Chat(s)")
            for chatLogMessage in chatLogList:
-              artifact = abstractFile.newArtifact(artId)
               attributes = ArrayList()
               attId = self.createAttribute("TSK_MEETING_DATETIME", "datetime", "Meeting Date/Time")
               attributes.add(BlackboardAttribute(attId, moduleName, directoryNameList[0]))
@@ -212,13 +224,9 @@ class RingCentralIngestModule(DataSourceIngestModule):
                   attributes.add(BlackboardAttribute(attId, moduleName, chatLogMessage[2]))
               
               try:
-                  artifact.addAttributes(attributes)
+                  self.poster.newArtifact(abstractFile, artId, attributes)
               except:
                   self.log(Level.INFO, "Error adding attribute to artifact")
-              try:
-                  self.indexArtifact(artifact)
-              except:
-                  self.log(Level.INFO, "Error indexing artifact")
        except:
            self.log(Level.INFO, "Error adding attribute")
 
@@ -258,50 +266,16 @@ class RingCentralIngestModule(DataSourceIngestModule):
     
     def createAttribute(self, attributeName, attributeType, attributeDescription):
         
-        skCase = Case.getCurrentCase().getSleuthkitCase()
-        
-        try:
-            if "string" == attributeType:
-                attributeId = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, attributeDescription)
-                return skCase.getAttributeType(attributeName)
-            elif "datetime" == attributeType:
-                attributeId = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, attributeDescription)
-                return skCase.getAttributeType(attributeName)
-            elif "integer" == attributeType:
-                attributeId = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.INTEGER, attributeDescription)
-                return skCase.getAttributeType(attributeName)
-            elif "long" == attributeType:
-                attributeId = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, attributeDescription)
-                return skCase.getAttributeType(attributeName)
-            elif "double" == attributeType:
-                attributeId = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DOUBLE, attributeDescription)
-                return skCase.getAttributeType(attributeName)
-            elif "byte" == attributeType:
-                attributeId = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.BYTE, attributeDescription)
-                return skCase.getAttributeType(attributeName)
-            else:
-                attributeId = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, attributeDescription)
-                return skCase.getAttributeType(attributeName)
-        except:		
-            self.log(Level.INFO, "Attributes Creation Error  ==> " + str(attributeName) + " <<>> " + str(attributeType) + " <<>> " + str(attributeDescription))
-            return skCase.getAttributeType(attributeName)
+        valueTypes = {"string": BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING,
+                      "datetime": BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME,
+                      "integer": BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.INTEGER,
+                      "long": BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG,
+                      "double": BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DOUBLE,
+                      "byte": BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.BYTE}
+        valueType = valueTypes.get(attributeType, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING)
+        return self.registry.getOrAddAttributeType(attributeName, valueType, attributeDescription)
 
     def createArtifact(self, artifactName, artifactDescription):
     
-        skCase = Case.getCurrentCase().getSleuthkitCase();
-                
-        try:
-             artId = skCase.addArtifactType(artifactName, artifactDescription)
-             return skCase.getArtifactTypeID(artifactName)
-        except:		
-             #self.log(Level.INFO, "Artifacts Creation Error for artifact ==> " + str(artifactName) + " <<>> " + artifactDescription)
-             return skCase.getArtifactTypeID(artifactName)
-
-    def indexArtifact(self, artifact):
-        blackboard = Case.getCurrentCase().getServices().getBlackboard()
-
-        try:
-            blackboard.indexArtifact(artChat)
-        except:
-            pass
+        return self.registry.getOrAddArtifactType(artifactName, artifactDescription).getTypeID()
     
@@ -69,6 +69,15 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Column_Plan import ColumnPlan, STRING, DATETIME, stringValue, longValue
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
+SHIMCACHE_COLUMN_TYPES = {"TEXT": (STRING, stringValue)}
+SHIMCACHE_DEFAULT_COLUMN = (DATETIME, longValue)
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -112,6 +121,8 @@ class ParseShimcacheIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ParseShimcacheIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ParseShimcacheIngestModuleFactory.moduleName, ParseShimcacheIngestModuleFactory().getModuleVersionNumber())
 
         # Get path to EXE based on where this script is run from.
         # Assumes EXE is in same folder as script
@@ -141,8 +152,15 @@ class ParseShimcacheIngestModule(DataSourceIngestModule):
         
        # Set the database to be read to the once created by the SAM parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(ParseShimcacheIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ParseShimcacheIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "SYSTEM", "config")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "SYSTEM", "config"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -165,9 +183,8 @@ class ParseShimcacheIngestModule(DataSourceIngestModule):
            #self.log(Level.INFO, "Processing file: " + file.getName())
            fileCount += 1
 
-           # Save the DB locally in the temp folder. use file id as name to reduce collisions
-           lclDbPath = os.path.join(temp_dir, file.getName())
-           ContentUtils.writeToFile(file, File(lclDbPath))
+           # The program only reads the hive, so it reads the extraction cache copy
+           lclDbPath = self.extractionCache.getLocalPath(file)
            self.log(Level.INFO, "Saved File ==> " + lclDbPath)
 
            # Run the EXE, saving output to a sqlite database
@@ -176,9 +193,9 @@ class ParseShimcacheIngestModule(DataSourceIngestModule):
 #                    file.getName() + " -o " + Temp_Dir + "\\Shimcache_db.db3")
 #           pipe = Popen([self.path_to_exe, "-i " + Temp_Dir + "\\Shimcache\\" + file.getName(), "-o " + Temp_Dir + \
 #                         "\\Shimcache_db.db3"], stdout=PIPE, stderr=PIPE)
-           self.log(Level.INFO, "Running program ==> " + self.path_to_exe + " " + Temp_Dir + "//Shimcache//" + \
-                    file.getName() + " " + Temp_Dir + "//Shimcache_db.db3")
-           pipe = Popen([self.path_to_exe, os.path.join(temp_dir, file.getName()), os.path.join(temp_dir, "Shimcache_db.db3")], stdout=PIPE, stderr=PIPE)
+           self.log(Level.INFO, "Running program ==> " + self.path_to_exe + " " + lclDbPath + \
+                    " " + Temp_Dir + "//Shimcache_db.db3")
+           pipe = Popen([self.path_to_exe, lclDbPath, os.path.join(temp_dir, "Shimcache_db.db3")], stdout=PIPE, stderr=PIPE)
            out_text = pipe.communicate()[0]
            self.log(Level.INFO, "Output from run is ==> " + out_text)               
            #except:
@@ -204,14 +221,7 @@ class ParseShimcacheIngestModule(DataSourceIngestModule):
                self.log(Level.INFO, "Error querying database for system table (" + e.getMessage() + ")")
                return IngestModule.ProcessResult.OK
 
-           try:
-                self.log(Level.INFO, "Begin Create New Artifacts")
-                artID_shim = skCase.addArtifactType("TSK_SHIMCACHE", "Shimcache")
-           except:		
-                self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-           artID_shim = skCase.getArtifactTypeID("TSK_SHIMCACHE")
-           artID_shim_evt = skCase.getArtifactType("TSK_SHIMCACHE")
+           artID_shim = registry.getOrAddArtifactType("TSK_SHIMCACHE", "Shimcache").getTypeID()
              
              
            # Cycle through each row and create artifacts
@@ -221,45 +231,11 @@ class ParseShimcacheIngestModule(DataSourceIngestModule):
                    table_name = resultSet.getString("tbl_name")
                    #self.log(Level.INFO, "Result get information from table " + resultSet.getString("tbl_name") + " ")
                    SQL_String_1 = "Select * from " + table_name + ";"
-                   SQL_String_2 = "PRAGMA table_info('" + table_name + "')"
                    #self.log(Level.INFO, SQL_String_1)
-                   #self.log(Level.INFO, SQL_String_2)
 				   
-                   Column_Names = []
-                   Column_Types = []
-                   resultSet2  = stmt.executeQuery(SQL_String_2)
-                   while resultSet2.next(): 
-                      Column_Names.append(resultSet2.getString("name").upper())
-                      Column_Types.append(resultSet2.getString("type"))
-                      if resultSet2.getString("type").upper() == "TEXT":
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_SHIMCACHE_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                              #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
-                      else:
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_SHIMCACHE_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, resultSet2.getString("name"))
-                              #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
-										 
-                   resultSet3 = stmt.executeQuery(SQL_String_1)
-                   while resultSet3.next():
-                      art = file.newArtifact(artID_shim)
-                      Column_Number = 1
-                      for col_name in Column_Names:
-                         #self.log(Level.INFO, "Result get information for column " + Column_Names[Column_Number - 1] + " ")
-                         #self.log(Level.INFO, "Result get information for column " + Column_Types[Column_Number - 1] + " ")
-                         #self.log(Level.INFO, "Result get information for column_number " + str(Column_Number) + " ")
-                         c_name = "TSK_SHIMCACHE_" + col_name
-                         #self.log(Level.INFO, "Attribute Name is " + c_name + " Atribute Type is " + str(Column_Types[Column_Number - 1]))
-                         attID_ex1 = skCase.getAttributeType(c_name)
-                         if Column_Types[Column_Number - 1] == "TEXT":
-                             art.addAttribute(BlackboardAttribute(attID_ex1, ParseShimcacheIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
-                         else:
-                             art.addAttribute(BlackboardAttribute(attID_ex1, ParseShimcacheIngestModuleFactory.moduleName, resultSet3.getInt(Column_Number)))
-                         Column_Number = Column_Number + 1
+                   plan = ColumnPlan(registry, ParseShimcacheIngestModuleFactory.moduleName, stmt, table_name, "TSK_SHIMCACHE_", \
+                                     SHIMCACHE_COLUMN_TYPES, SHIMCACHE_DEFAULT_COLUMN)
+                   plan.postRows(poster, file, artID_shim, stmt.executeQuery(SQL_String_1))
 						
                except SQLException as e:
                    self.log(Level.INFO, "Error getting values from Shimcache table (" + e.getMessage() + ")")
@@ -268,8 +244,7 @@ class ParseShimcacheIngestModule(DataSourceIngestModule):
            stmt.close()
            dbConn.close()
            # Fire an event to notify the UI and others that there are new artifacts  
-           IngestServices.getInstance().fireModuleDataEvent(
-               ModuleDataEvent(ParseShimcacheIngestModuleFactory.moduleName, artID_shim_evt, None))
+           poster.flush()
 
 		#Clean up EventLog directory and files
            try:
@@ -277,11 +252,6 @@ class ParseShimcacheIngestModule(DataSourceIngestModule):
            except:
                self.log(Level.INFO, "removal of Shimcache tempdb failed " + lclDbPath)
                     
-        for file in files:
-           try:
-              os.remove(os.path.join(temp_dir, file.getName()))
-           except:
-			  self.log(Level.INFO, "removal of Shimcache file failed " + Temp_Dir + "\\" + file.getName())
         try:
            os.rmdir(temp_dir)		
         except:
@@ -292,5 +262,8 @@ class ParseShimcacheIngestModule(DataSourceIngestModule):
             "Shimcache Parser", " Shimcache Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
  
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
@@ -70,6 +70,11 @@ from org.sleuthkit.datamodel import CommunicationsManager
 from org.sleuthkit.datamodel import Relationship
 from org.sleuthkit.datamodel import Account
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 
 # Factory that defines the name and details of the module and allows Autopsy
@@ -113,6 +118,8 @@ class ProcessSpotlightIngestModule(DataSourceIngestModule):
 
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ProcessSpotlightIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ProcessSpotlightIngestModuleFactory.moduleName, ProcessSpotlightIngestModuleFactory().getModuleVersionNumber())
 
         # Get path to executable based on where this script is run from.
         # Assumes executable is in same folder as script
@@ -135,7 +142,7 @@ class ProcessSpotlightIngestModule(DataSourceIngestModule):
         # get current case and the store.vol abstract file information
         skCase = Case.getCurrentCase().getSleuthkitCase()
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "store.db", "Store-V2")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "store.db", "Store-V2"))
         numFiles = len(files)
         #self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -166,9 +173,8 @@ class ProcessSpotlightIngestModule(DataSourceIngestModule):
             #self.log(Level.INFO, "Processing file: " + file.getName())
             fileCount += 1
 
-            # Save the file locally. Use file id as name to reduce collisions
-            extractedFile = os.path.join(temporaryDirectory, str(file.getId()) + "-" + file.getName())
-            ContentUtils.writeToFile(file, File(extractedFile))
+            # The program only reads the store, so it reads the extraction cache copy
+            extractedFile = self.extractionCache.getLocalPath(file)
             self.processSpotlightFile(extractedFile, moduleDirectory)
 
         for file in files:	
@@ -197,6 +203,9 @@ class ProcessSpotlightIngestModule(DataSourceIngestModule):
             "Spotlight Parser", " Spotlight Db Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
     def processSpotlightFile(self, extractedFile, moduleDirectory):
@@ -209,12 +218,14 @@ class ProcessSpotlightIngestModule(DataSourceIngestModule):
     def processSpotlightDb(self, dbConn, file):
 
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(ProcessSpotlightIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ProcessSpotlightIngestModuleFactory.moduleName)
         
-        try:
-            self.log(Level.INFO, "Begin Create New Artifacts")
-            artID = skCase.addArtifactType("TSK_SPOTLIGHT", "Mac OS Spotlight Data")
-        except:		
-            self.log(Level.INFO, "Artifacts Creation Error, TSK_SPOTLIGHT some artifacts may not exist now. ==> ")
+        artID = registry.getOrAddArtifactType("TSK_SPOTLIGHT", "Mac OS Spotlight Data").getTypeID()
  
         columnDefs = []
 
@@ -233,18 +244,12 @@ class ProcessSpotlightIngestModule(DataSourceIngestModule):
             columnDef.append(columnName)
             columnDef.append(resultSetPragma.getString("type").upper())
             if resultSetPragma.getString("type").upper() == "TEXT":
-                try:
-                    attID_ex1 = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, columnName)
-                except:		
-                    self.log(Level.INFO, "Attributes Creation Error, " + attributeName + " ==> ")
+                attID_ex1 = registry.getOrAddAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, columnName)
             else:
-                try:
-                    attID_ex1 = skCase.addArtifactAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, columnName)
-                except:		
-                    self.log(Level.INFO, "Attributes Creation Error, " + attributeName + " ==> ")
+                attID_ex1 = registry.getOrAddAttributeType(attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, columnName)
             
             columnDef.append(attributeName)
-            columnDef.append(skCase.getAttributeType(attributeName))
+            columnDef.append(registry.getAttributeType(attributeName))
             columnDefs.append(columnDef)
             
  
@@ -262,8 +267,7 @@ class ProcessSpotlightIngestModule(DataSourceIngestModule):
             return IngestModule.ProcessResult.OK
 
 
-        artIdSpotlight = skCase.getArtifactTypeID("TSK_SPOTLIGHT")
-        artIdSpotlightType = skCase.getArtifactType("TSK_SPOTLIGHT")
+        artIdSpotlight = registry.getArtifactTypeID("TSK_SPOTLIGHT")
         
         moduleName = ProcessSpotlightIngestModuleFactory.moduleName
          
@@ -275,23 +279,16 @@ class ProcessSpotlightIngestModule(DataSourceIngestModule):
                 return IngestModule.ProcessResult.OK
 
             try: 
-                artSpotlight = file.newArtifact(artIdSpotlight)
                 attributes = ArrayList()
                 for columnName in columnDefs:
                     self.log(Level.INFO, "Column Info ==> " + str(columnName[0]) + "    " + str(columnName[1]) + "     " + str(columnName[2]) + "    " + str(columnName[3]))
-                    attId = skCase.getAttributeType(columnName[2])
+                    attId = registry.getAttributeType(columnName[2])
                     self.log(Level.INFO, "Column Info ==> " + str(attId))                    
                     if columnName[1] == "TEXT":
                         attributes.add(BlackboardAttribute(attId, moduleName, resultSet.getString(columnName[0])))
                     else:
                         attributes.add(BlackboardAttribute(attId, moduleName, long(resultSet.getInt(columnName[0]))))
-                artSpotlight.addAttributes(attributes)        
-                    
-                try:
-                    blackboard.indexArtifact(artSpotlight)
-                except:
-                    pass
-#                    self._logger.log(Level.SEVERE, "Error indexing artifact " + artEmail.getDisplayName())
+                poster.newArtifact(file, artIdSpotlight, attributes)
 
             except SQLException as e:
                 self.log(Level.INFO, "Error getting values from message table (" + e.getMessage() + ")")
@@ -300,8 +297,7 @@ class ProcessSpotlightIngestModule(DataSourceIngestModule):
         sqlStmt.close()
         sqlStmtPragma.close()
        
-        # fire event to let the system know new data was added
-        #IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(ProcessSpotlightIngestModuleFactory.moduleName, \
-        #                                 artIdEmailType, None))
+        # post whatever is left and let the system know new data was added
+        poster.flush()
 
        
@@ -69,6 +69,9 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -113,6 +116,8 @@ class ThumbsIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ThumbsIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ThumbsIngestModuleFactory.moduleName, ThumbsIngestModuleFactory().getModuleVersionNumber())
 
         #Show parameters that are passed in
         self.path_to_exe_thumbs = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thumbs_viewer.exe")
@@ -137,7 +142,7 @@ class ThumbsIngestModule(DataSourceIngestModule):
        # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase()
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        thumb_files = fileManager.findFiles(dataSource, "thumbs.db", "")
+        thumb_files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "thumbs.db", ""))
         numFiles = len(thumb_files)
         self.log(Level.INFO, "Number of Thumbs.db files found ==> " + str(numFiles))
         
@@ -166,7 +171,7 @@ class ThumbsIngestModule(DataSourceIngestModule):
 
             # Save the thumbs.DB locally in the ModuleOutput folder. use file id as name to reduce collisions
             lclDbPath = os.path.join(tmp_dir, str(thumb_file.getId()) + "-" + thumb_file.getName())
-            ContentUtils.writeToFile(thumb_file, File(lclDbPath))
+            self.extractionCache.linkTo(thumb_file, lclDbPath)
 
             # Run thumbs_viewer against the selected Database
             self.log(Level.INFO, "Running prog ==> " + self.path_to_exe_thumbs + " -O " + out_dir + " " + lclDbPath)
@@ -210,6 +215,9 @@ class ThumbsIngestModule(DataSourceIngestModule):
             "Thumbs.db", " Thumbs.db Files Have Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
          
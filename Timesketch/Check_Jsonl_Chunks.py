@@ -0,0 +1,143 @@
+# Check_Jsonl_Chunks.py = Python script to check the chunking and resume logic in Jsonl_Chunks.py
+#
+# Contact: Mark McKinnon [Mark [dot] McKinnon <at> Davenport [dot] edu]
+#
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+# Comments
+#   Version 1.0 - Initial version - October 2026
+#                 Checks the chunks are cut on line boundaries with the right line counts, sizes and
+#                 MD5s, the manifest survives a write and read, a run after a partial upload only
+#                 has the changed and unsent chunks left to upload, and a shorter export removes
+#                 the chunk files it no longer has
+#   Version 1.1 - Checks nothing counts as uploaded when the sketch, IP address or port changed
+#
+# Usage:
+#   python Check_Jsonl_Chunks.py          (Python 2.7, the same as the Jython Autopsy runs)
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from Jsonl_Chunks import JsonlChunks, read_manifest, write_manifest, resume_manifest
+
+failures = []
+
+def check(name, passed):
+    print (name + " ==> " + ("passed" if passed else "FAILED"))
+    if not passed:
+        failures.append(name)
+
+def export(chunk_dir, lines, chunk_size):
+    # Same as the module, every line goes through writeLine and the last chunk is closed at the end
+    jsonFile = JsonlChunks(chunk_dir, "Autopsy", chunk_size)
+    try:
+        for line in lines:
+            jsonFile.writeLine(line)
+    finally:
+        jsonFile.close()
+    return jsonFile
+
+def make_lines(number_of_lines, changed_line=None):
+    lines = []
+    for i in range(number_of_lines):
+        message = "event " + str(i)
+        if i == changed_line:
+            message = message + " changed"
+        lines.append(json.dumps({"message": message, "timestamp": 1500000000 + i, "datetime": "2017-07-14T02:40:00"}))
+    return lines
+
+# The sketch and server the checks upload to
+destination = ("Case_Sketch", "10.0.0.5", "5000")
+
+chunk_dir = tempfile.mkdtemp()
+try:
+    manifestPath = os.path.join(chunk_dir, "Autopsy_manifest.json")
+    lines = make_lines(1000)
+    chunk_size = 4096
+
+    # Chunks are cut on line boundaries and hold every line once, in order
+    jsonFile = export(chunk_dir, lines, chunk_size)
+    chunk_lines = []
+    chunk_ok = True
+    for chunk in jsonFile.chunks:
+        data = open(os.path.join(chunk_dir, chunk["file"]), 'r').read()
+        chunk_ok = chunk_ok and data.endswith("\n") and len(data) == chunk["size"] and \
+                   data.count("\n") == chunk["lines"] and hashlib.md5(data).hexdigest() == chunk["md5"]
+        chunk_ok = chunk_ok and chunk["size"] < chunk_size + max([len(line) + 1 for line in lines])
+        chunk_lines.extend(data.splitlines())
+    check("Chunks are cut on line boundaries", len(jsonFile.chunks) > 1 and chunk_ok)
+    check("Chunks hold every line in order", chunk_lines == lines)
+    check("Chunk names", [chunk["file"] for chunk in jsonFile.chunks][:2] == ["Autopsy_00001.jsonl", "Autopsy_00002.jsonl"])
+
+    # The manifest is read back the same, a missing manifest reads as an empty one
+    check("Missing manifest is empty", read_manifest(manifestPath)["chunks"] == [])
+    manifest = resume_manifest(read_manifest(manifestPath), jsonFile, chunk_dir, *destination)
+    write_manifest(manifestPath, manifest)
+    check("Manifest write and read", read_manifest(manifestPath) == manifest and not os.path.exists(manifestPath + ".tmp"))
+    check("Nothing uploaded on the first run", len([chunk for chunk in manifest["chunks"] if chunk["uploaded"]]) == 0)
+
+    # The first half of the chunks were acknowledged, then the upload stopped
+    number_sent = len(manifest["chunks"]) // 2
+    for chunk in manifest["chunks"][:number_sent]:
+        chunk["uploaded"] = True
+    write_manifest(manifestPath, manifest)
+
+    # The next run exports the same lines with one line in the first chunk changed, so the first chunk and
+    # the unsent chunks are left to upload
+    jsonFile = export(chunk_dir, make_lines(1000, changed_line=3), chunk_size)
+    manifest = resume_manifest(read_manifest(manifestPath), jsonFile, chunk_dir, *destination)
+    left_to_upload = [number for number in range(len(manifest["chunks"])) if not manifest["chunks"][number]["uploaded"]]
+    check("Resume uploads the changed and unsent chunks", left_to_upload == [0] + list(range(number_sent, len(manifest["chunks"]))))
+    write_manifest(manifestPath, manifest)
+
+    # The same export to another sketch, another server or another port sends every chunk again
+    for changed in [("Other_Sketch", "10.0.0.5", "5000"), ("Case_Sketch", "10.0.0.6", "5000"), ("Case_Sketch", "10.0.0.5", "5001")]:
+        jsonFile = export(chunk_dir, make_lines(1000, changed_line=3), chunk_size)
+        other = resume_manifest(read_manifest(manifestPath), jsonFile, chunk_dir, *changed)
+        check("New destination " + " ".join(changed) + " uploads every chunk", \
+              len(other["chunks"]) > 0 and len([chunk for chunk in other["chunks"] if chunk["uploaded"]]) == 0)
+
+    # and going back to the first destination still resumes from its manifest
+    jsonFile = export(chunk_dir, make_lines(1000, changed_line=3), chunk_size)
+    manifest = resume_manifest(read_manifest(manifestPath), jsonFile, chunk_dir, *destination)
+    check("Same destination resumes", [number for number in range(len(manifest["chunks"])) if not manifest["chunks"][number]["uploaded"]] == left_to_upload)
+    check("Manifest records the destination", (read_manifest(manifestPath)["sketch_name"], read_manifest(manifestPath)["ip_address"], \
+          read_manifest(manifestPath)["port_number"]) == destination)
+
+    # A shorter export removes the chunk files past its end
+    old_files = [chunk["file"] for chunk in manifest["chunks"]]
+    jsonFile = export(chunk_dir, make_lines(300), chunk_size)
+    manifest = resume_manifest(read_manifest(manifestPath), jsonFile, chunk_dir, *destination)
+    check("Shorter export removes the old chunks", \
+          [name for name in old_files if os.path.exists(os.path.join(chunk_dir, name))] == [chunk["file"] for chunk in manifest["chunks"]])
+finally:
+    shutil.rmtree(chunk_dir)
+
+if len(failures) > 0:
+    print (str(len(failures)) + " checks failed")
+    sys.exit(1)
+print ("All checks passed")
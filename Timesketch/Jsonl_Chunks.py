@@ -0,0 +1,127 @@
+# Jsonl_Chunks.py = Jython helper that writes the Timesketch json_line export as chunks listed in a manifest
+#
+# Contact: Mark McKinnon [Mark [dot] McKinnon <at> Davenport [dot] edu]
+#
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+# Taken out of timesketch.py so it can be checked without Autopsy, see Check_Jsonl_Chunks.py.
+#
+# Comments
+#   Version 1.0 - Initial version - October 2026
+#   Version 1.1 - The manifest records the sketch and server the chunks were sent to
+#
+# Usage:
+#   oldManifest = read_manifest(manifestPath)
+#   jsonFile = JsonlChunks(tempDir, "Autopsy")
+#   jsonFile.writeLine(json.dumps(lineDict))
+#   jsonFile.close()
+#   manifest = resume_manifest(oldManifest, jsonFile, tempDir, sketchName, IP_Address, Port_Number)
+#   write_manifest(manifestPath, manifest)
+#
+# The export is in a fixed order, so a chunk that has not changed since an earlier run has the
+# same MD5.  resume_manifest marks those chunks as uploaded so only the new or changed chunks
+# are sent again, as long as the run goes to the same sketch on the same server as the last one.
+
+import hashlib
+import json
+import os
+
+# Size a chunk of the json_line export can grow to before the next chunk is started
+CHUNK_SIZE = 64 * 1024 * 1024
+
+# Writes the json_line export as a run of chunk files (Autopsy_00001.jsonl, ...) cut on line
+# boundaries, keeping the name, line count, size and MD5 of each chunk for the manifest.
+class JsonlChunks(object):
+
+    def __init__(self, chunk_dir, base_name, chunk_size=CHUNK_SIZE):
+        self.chunk_dir = chunk_dir
+        self.base_name = base_name
+        self.chunk_size = chunk_size
+        self.chunks = []
+        self._file = None
+
+    def writeLine(self, line):
+        if self._file == None or self._size >= self.chunk_size:
+            self._start_chunk()
+        line = line + "\n"
+        self._file.write(line)
+        self._md5.update(line)
+        self._size = self._size + len(line)
+        self._lines = self._lines + 1
+
+    def close(self):
+        if self._file != None:
+            self._file.close()
+            self.chunks.append({"file": self._name, "lines": self._lines, "size": self._size, \
+                                "md5": self._md5.hexdigest(), "uploaded": False})
+            self._file = None
+
+    def _start_chunk(self):
+        self.close()
+        self._name = self.base_name + "_%05d.jsonl" % (len(self.chunks) + 1)
+        self._file = open(os.path.join(self.chunk_dir, self._name), 'w')
+        self._md5 = hashlib.md5()
+        self._size = 0
+        self._lines = 0
+
+# The manifest of the last run, an empty one if there is none or it cannot be read
+def read_manifest(manifestPath):
+    try:
+        manifestFile = open(manifestPath, 'r')
+        try:
+            return json.load(manifestFile)
+        finally:
+            manifestFile.close()
+    except:
+        return {"chunk_size": CHUNK_SIZE, "chunks": []}
+
+def write_manifest(manifestPath, manifest):
+    # Write to a new file and rename it so a cancelled run never leaves half a manifest
+    manifestFile = open(manifestPath + ".tmp", 'w')
+    try:
+        json.dump(manifest, manifestFile, indent=1)
+    finally:
+        manifestFile.close()
+    if os.path.exists(manifestPath):
+        os.remove(manifestPath)
+    os.rename(manifestPath + ".tmp", manifestPath)
+
+# Manifest for the chunks just written.  A chunk is already uploaded when a chunk with the same MD5
+# was acknowledged on an earlier run to the same sketch, IP address and port, the chunk files past
+# the end of this export are removed.
+def resume_manifest(oldManifest, jsonFile, chunk_dir, sketchName, IP_Address, Port_Number):
+    manifest = {"chunk_size": jsonFile.chunk_size, "sketch_name": sketchName, "ip_address": IP_Address, \
+                "port_number": Port_Number, "chunks": jsonFile.chunks}
+    uploadedMd5s = set()
+    if oldManifest.get("sketch_name") == sketchName and oldManifest.get("ip_address") == IP_Address and \
+       oldManifest.get("port_number") == Port_Number:
+        uploadedMd5s = set([chunk["md5"] for chunk in oldManifest["chunks"] if chunk["uploaded"]])
+    for chunk in manifest["chunks"]:
+        chunk["uploaded"] = chunk["md5"] in uploadedMd5s
+    for chunk in oldManifest["chunks"][len(manifest["chunks"]):]:
+        try:
+            os.remove(os.path.join(chunk_dir, chunk["file"]))
+        except:
+            pass
+    return manifest
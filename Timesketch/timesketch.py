@@ -31,13 +31,22 @@
 # 
 # Comments 
 #   Version 1.0 - Initial version - October 2018
+#   Version 1.1 - Export with two queries streamed straight to the json_line file instead of
+#                 a query per artifact, attribute and file time
+#   Version 1.2 - Split the export into chunks listed in a manifest and upload each chunk on its own,
+#                 a failed upload starts again from the first chunk that was not acknowledged
+#   Version 1.3 - Do not log the password, chunk and manifest code moved to Jsonl_Chunks.py
+#   Version 1.4 - Chunks only count as uploaded to the sketch and server they were sent to, every chunk
+#                 is handed to the uploader under the same timeline file name
 # 
 
 import jarray
 import inspect
 import os
+import re
 from subprocess import Popen, PIPE
 import json
+import time
 
 from javax.swing import JCheckBox
 from javax.swing import JButton
@@ -82,6 +91,8 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Jsonl_Chunks import JsonlChunks, read_manifest, write_manifest, resume_manifest
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -145,7 +156,6 @@ class TimesketchIngestModule(DataSourceIngestModule):
 
         #Show parameters that are passed in
         self.log(Level.INFO, "Username  =====>" + str(self.userName))
-        self.log(Level.INFO, "password  =====>" + str(self.password))
         self.log(Level.INFO, "IP Address  =====>" + str(self.IP_Address))
         self.log(Level.INFO, "Port_Number  =====>" + str(self.Port_Number))
         self.log(Level.INFO, "Sketch Name =====> " + str(self.sketchName))
@@ -166,29 +176,188 @@ class TimesketchIngestModule(DataSourceIngestModule):
         # raise IngestModuleException(IngestModule(), "Oh No!")
         pass
 
+    def write_line(self, jsonFile, lineDict):
+        jsonFile.writeLine(json.dumps(lineDict))
+
+    # One line per artifact that has a date attribute.  All the attributes of those artifacts come back
+    # in one query ordered by artifact, so each line is written as soon as the next artifact starts.
+    def export_artifacts(self, skCase, jsonFile, progressBar):
+        artifactSQL = 'select art.artifact_id, art_type.type_name, art_type.display_name art_display_name, img_name.obj_id datasource_obj_id, ' + \
+              ' img_name.name datasource_name, att_type.display_name att_name, att.value_type, case att.value_type when 0 then att.value_text ' + \
+              ' when 1 then att.value_int32 when 2 then att.value_int64 when 3 then att.value_double when 4 then att.value_byte ' + \
+              ' when 5 then att.value_int64 end att_value from blackboard_artifacts art, blackboard_artifact_types art_type, ' + \
+              ' tsk_image_names img_name, blackboard_attributes att, blackboard_attribute_types att_type ' + \
+              ' where art.artifact_type_id = art_type.artifact_type_id and img_name.obj_id = art.data_source_obj_id ' + \
+              ' and img_name.sequence = 0 and att.artifact_id = art.artifact_id and att_type.attribute_type_id = att.attribute_type_id ' + \
+              ' and art.artifact_id in (select artifact_id from blackboard_attributes where value_type = 5) ' + \
+              ' order by art.artifact_id'
+        numArtifacts = 0
+        artifactId = None
+        artifactDict = None
+        dbquery = skCase.executeQuery(artifactSQL)
+        try:
+            resultSet = dbquery.getResultSet()
+            while resultSet.next():
+                if resultSet.getLong("artifact_id") != artifactId:
+                    if artifactDict != None:
+                        self.write_line(jsonFile, artifactDict)
+                        numArtifacts = numArtifacts + 1
+                        if numArtifacts % 10000 == 0:
+                            progressBar.progress("Exported " + str(numArtifacts) + " artifacts")
+                    artifactId = resultSet.getLong("artifact_id")
+                    artifactDict = {}
+                    artifactDict["artifact_type_name:"] = resultSet.getString("type_name")
+                    artifactDict["artifact_display_name:"] = resultSet.getString("art_display_name")
+                    artifactDict["datasource_obj_id:"] = resultSet.getString("datasource_obj_id")
+                    artifactDict["datasource_name:"] = resultSet.getString("datasource_name")
+                    artifactDict["message"] = resultSet.getString("type_name")
+                artName = resultSet.getString("att_name")
+                artValue = resultSet.getString("att_value")
+                if resultSet.getInt("value_type") == 5:
+                    artifactDict[artName] = artValue
+                    artifactDict["timestamp_desc"] = artName
+                    artifactDict["timestamp"] = artValue
+                elif isinstance(artValue, unicode):
+                    artifactDict[artName] = artValue.translate({0x2014: None})
+                else:
+                    artifactDict[artName] = artValue
+            if artifactDict != None:
+                self.write_line(jsonFile, artifactDict)
+                numArtifacts = numArtifacts + 1
+        finally:
+            dbquery.close()
+        return numArtifacts
+
+    # One line per file for each of its times, from a single pass over tsk_files.  Which columns are
+    # times and which are copied to every line is worked out once from the result set metadata.
+    def export_file_times(self, skCase, jsonFile, progressBar):
+        timeColumnNames = ["ctime", "crtime", "atime", "mtime"]
+        numLines = 0
+        dbquery = skCase.executeQuery("Select * from tsk_files order by obj_id")
+        try:
+            resultSet = dbquery.getResultSet()
+            meta = resultSet.getMetaData()
+            timeColumns = {}
+            otherColumns = []
+            for x in range(1, meta.getColumnCount() + 1):
+                colHead = meta.getColumnLabel(x)
+                if colHead in timeColumnNames:
+                    timeColumns[colHead] = x
+                elif (('ctime' in colHead) or ('crtime' in colHead) or ('atime' in colHead) or ('mtime' in  colHead)):
+                    pass
+                else:
+                    otherColumns.append((x, colHead))
+            timeColumns = [(timeColumns[colHead], colHead) for colHead in timeColumnNames if colHead in timeColumns]
+
+            while resultSet.next():
+                fileInfo = {}
+                for x, colHead in otherColumns:
+                    if resultSet.getString(x) is None:
+                        fileInfo[colHead] = ""
+                    else:
+                        fileInfo[colHead] = resultSet.getString(x)
+                filePath = fileInfo.get("parent_path", "") + fileInfo.get("name", "")
+                for x, colHead in timeColumns:
+                    fileDict = dict(fileInfo)
+                    if resultSet.getString(x) is None:
+                        fileDict[colHead] = ""
+                        fileDict["message"] = "TSK : "
+                        fileDict["timestamp"] = 0
+                    else:
+                        fileDict[colHead] = resultSet.getString(x)
+                        fileDict["message"] = "TSK : " + filePath
+                        fileDict["timestamp"] = resultSet.getString(x)
+                    fileDict["timestamp_desc"] = colHead
+                    self.write_line(jsonFile, fileDict)
+                    numLines = numLines + 1
+                    if numLines % 10000 == 0:
+                        progressBar.progress("Exported " + str(numLines) + " file times")
+        finally:
+            dbquery.close()
+        return numLines
+
+    # Send each chunk that has not been acknowledged yet, recording it in the manifest as soon as it is,
+    # so a failure part way through only has to send the chunks that are left.  The uploader names the
+    # timeline after the file it is given, so each chunk is renamed to timelineName.jsonl while it is sent
+    # and every chunk goes to the same timeline name instead of one timeline per chunk file.
+    def upload_chunks(self, sketchName, timelineName, tempDir, manifestPath, manifest, progressBar):
+        # Check Messages
+        # TS001 - Invalid arguments
+        # TS002 - Sketch Created
+        # TS003 - Sketch Already Exists
+        # TS004 - Error Looking up Sketch
+        # TS005 - Timeline Added
+        # TS006 - Timeline Not Created
+        # Try each chunk 3 times in case you add a sketch but for some reason you fail to add a the timeline,
+        # you may be able to add the timeline on another run, no reason to make the user run this multple times
+        # when we can do that as well.
+        chunks = manifest["chunks"]
+        numChunks = len(chunks)
+        numUploaded = len([chunk for chunk in chunks if chunk["uploaded"]])
+        self.log(Level.INFO, "Chunks to upload ==> " + str(numChunks - numUploaded) + " of " + str(numChunks))
+        progressBar.switchToDeterminate(max(numChunks, 1))
+        progressBar.progress(numUploaded)
+
+        emessage = "Internal Error contact plugin maker"
+        if numUploaded == numChunks:
+            emessage = "Timeline already uploaded"
+        bytesSent = 0
+        startTime = time.time()
+        uploadPath = os.path.join(tempDir, re.sub(r'[\\/:*?"<>|]', '_', timelineName) + ".jsonl")
+        for chunk in chunks:
+            if chunk["uploaded"]:
+                continue
+            if self.context.isJobCancelled():
+                return "Upload cancelled, " + str(numUploaded) + " of " + str(numChunks) + " chunks uploaded"
+            chunkPath = os.path.join(tempDir, chunk["file"])
+            chunkStart = time.time()
+            if os.path.exists(uploadPath):
+                os.remove(uploadPath)
+            os.rename(chunkPath, uploadPath)
+            try:
+                for z in range(3):
+                    self.log(Level.INFO, "command ==> " + self.path_to_Timesketch_exe + " " + sketchName + " " + uploadPath + " (" + chunk["file"] + ") " + self.IP_Address + " " + self.Port_Number + " " + self.userName)
+                    pipe = Popen([self.path_to_Timesketch_exe, sketchName, uploadPath, self.IP_Address, self.Port_Number, self.userName, self.password], stdout=PIPE, stderr=PIPE)
+                    out_text = pipe.communicate()[0]
+                    self.log(Level.INFO, "Output from run is ==> " + out_text)
+                    if "TS005" in out_text:
+                        if "TS002" in out_text:
+                            emessage = "Sketch added, Timeline added"
+                        elif "TS003" in out_text and emessage != "Sketch added, Timeline added":
+                            emessage = "Sketch already exists, Timeline added"
+                        chunk["uploaded"] = True
+                        break
+                    elif "TS001" in out_text:
+                        return "invalid parameters passed in, missing parameters"
+                    elif "TS006" in out_text:
+                        if "TSK004" in out_text:
+                            emessage = "Error Looking up sketch, Timeline Not Created"
+            finally:
+                os.rename(uploadPath, chunkPath)
+            if not chunk["uploaded"]:
+                self.log(Level.INFO, "Chunk " + chunk["file"] + " was not acknowledged, stopping, the next run starts from it")
+                return emessage + ", " + str(numUploaded) + " of " + str(numChunks) + " chunks uploaded, run again to resume"
+
+            write_manifest(manifestPath, manifest)
+            numUploaded = numUploaded + 1
+            bytesSent = bytesSent + chunk["size"]
+            chunkSeconds = max(time.time() - chunkStart, 0.001)
+            totalSeconds = max(time.time() - startTime, 0.001)
+            self.log(Level.INFO, "Chunk " + chunk["file"] + " uploaded, " + str(chunk["lines"]) + " lines at " + \
+                     "%.2f" % (chunk["size"] / 1048576.0 / chunkSeconds) + " MB/s")
+            progressBar.progress("Uploaded " + str(numUploaded) + " of " + str(numChunks) + " chunks, " + \
+                                 "%.2f" % (bytesSent / 1048576.0 / totalSeconds) + " MB/s", numUploaded)
+        return emessage
+
     def process(self, dataSource, progressBar):
 
         self.log(Level.INFO, "Starting to process, Just before call to parse_safari_history")
 
-        # Setup SQL Statements and other variables
-        artifactSQL = 'select distinct "artifact_type_name:" a1, art_type.type_name a2, "artifact_display_name:" b1, art_type.display_name b2, ' + \
-              ' "datasource_obj_id:" c1, img_name.obj_id c2, "datasource_name:" d1, img_name.name d2, art_type.type_name e1 from blackboard_artifact_types art_type, ' + \
-              ' tsk_image_names img_name, blackboard_artifacts art, blackboard_attributes att where img_name.obj_id = art.data_source_obj_id ' + \
-              ' and img_name.sequence = 0 and art.artifact_type_id = art_type.artifact_type_id and att.artifact_id = art.artifact_id ' + \
-              ' and att.artifact_id = '
-        artifactSQL2 = 'select att_type.display_name date_type, case att.value_type when 0 then value_text when 1 then value_int32 when 2 then value_int64 ' +\
-               ' when 3 then value_double when 4 then value_byte when 5 then value_int64 end date_value from blackboard_attributes att, ' + \
-               ' blackboard_attribute_types att_type where att_type.attribute_type_id = att.attribute_type_id and att.value_type = 5 ' + \
-               ' and att.artifact_id = '
-        artifactSQL3 = 'select att_type.display_name name, case att.value_type when 0 then value_text when 1 then value_int32 when 2 then value_int64 ' +\
-               ' when 3 then value_double when 4 then value_byte when 5 then value_int64 end value from blackboard_attributes att, ' + \
-               ' blackboard_attribute_types att_type where att_type.attribute_type_id = att.attribute_type_id and att.value_type <> 5 ' + \
-               ' and att.artifact_id = '
+        # Setup variables
         sketchName = self.sketchName
         sketchDescription = self.sketchDescription
         timelineName = sketchName + "_Timeline"
-        timelineIndex = sketchName + "_Index"
-        jsonFileName = "Autopsy.jsonl"
+        jsonFileName = "Autopsy"
         skCase = Case.getCurrentCase().getSleuthkitCase()
 
         # we don't know how much work there is yet
@@ -204,133 +373,26 @@ class TimesketchIngestModule(DataSourceIngestModule):
         except:
             self.log(Level.INFO, "Timesketch directory already exists" + tempDir)
             
-        artList = []
-        dbquery = skCase.executeQuery("select distinct artifact_id from blackboard_attributes where value_type = 5;")
-        resultSet = dbquery.getResultSet()
-        while resultSet.next():
-            artifactDict = {}
-            dbquery2 = skCase.executeQuery(artifactSQL + resultSet.getString("artifact_id"))
-            resultSet2 = dbquery2.getResultSet()
-            while resultSet2.next():
-                artifactDict[resultSet2.getString("a1")] = resultSet2.getString("a2")
-                artifactDict[resultSet2.getString("b1")] = resultSet2.getString("b2")
-                artifactDict[resultSet2.getString("c1")] = resultSet2.getString("c2")
-                artifactDict[resultSet2.getString("d1")] = resultSet2.getString("d2")
-                dbquery3 = skCase.executeQuery(artifactSQL2 + resultSet.getString("artifact_id"))
-                resultSet3 = dbquery3.getResultSet()
-                while resultSet3.next():
-                   artifactDict[resultSet3.getString("date_type")] = resultSet3.getString("date_value")   
-                   artifactDict["message"] = resultSet2.getString("e1")
-                   artifactDict["timestamp_desc"] = resultSet3.getString("date_type")
-                   artifactDict["timestamp"] = resultSet3.getString("date_value")
-                   dbquery4 = skCase.executeQuery(artifactSQL3 + resultSet.getString("artifact_id"))
-                   resultSet4 = dbquery4.getResultSet()
-                   while resultSet4.next():
-                       artValue = resultSet4.getString("value")
-                       artName = resultSet4.getString("name")
-                       if isinstance(artValue, unicode):
-                          #print (artValue)
-                          artifactDict[artName] = artValue.translate({0x2014: None})
-                       else:
-                          artifactDict[artName] = artValue
-                   dbquery4.close()
-                dbquery3.close()
-            dbquery2.close()     
-
-            artList.append(artifactDict)
-        dbquery.close()
-
-        jsonFileNamePath = os.path.join(tempDir, jsonFileName)
-        
-        with open(jsonFileNamePath, 'a') as f:
-            for art in artList:
-                json.dump(art, f)
-                f.write("\n")
-        
-        # Get file Times
-        fileList = []
-        numFiles = 0
-        dbquery = skCase.executeQuery("Select obj_id from tsk_files")
-        resultSet = dbquery.getResultSet()
-        while resultSet.next():
-            dbquery2 = skCase.executeQuery("Select ctime, crtime, atime, mtime, parent_path||name from tsk_files where obj_id = " + \
-                                           resultSet.getString("obj_id"))
-            resultSet2 = dbquery2.getResultSet()
-            meta = resultSet2.getMetaData()
-            columnCount = meta.getColumnCount()
-            column_names = []  # ?? Do I need this
-            while resultSet2.next():
-                for i in range (1,int(columnCount)):
-                    fileDict = {}
-                    if resultSet2.getString(i) is None:
-                        fileDict[meta.getColumnLabel(i)] = ""
-                        fileDict["message"] = "TSK : "
-                        fileDict["timestamp"] = 0
-                    else:
-                        fileDict[meta.getColumnLabel(i)] = resultSet2.getString(i)
-                        fileDict["message"] = "TSK : " + resultSet2.getString(5)
-                        fileDict["timestamp"] = resultSet2.getString(i)
-                    fileDict["timestamp_desc"] = meta.getColumnLabel(i)
-                    dbquery3 = skCase.executeQuery("Select * from tsk_files where obj_id = " + resultSet.getString("obj_id"))
-                    resultSet3 = dbquery3.getResultSet()
-                    meta3 = resultSet3.getMetaData()
-                    columnCount3 = meta3.getColumnCount()
-                    while resultSet3.next():
-                        for x in range(1,int(columnCount3)):
-                            colHead = meta3.getColumnLabel(x)
-                            if (('ctime' in colHead) or ('crtime' in colHead) or ('atime' in colHead) or ('mtime' in  colHead)):
-                                #self.log(Level.INFO, "Heading ==> " + colHead )
-                                pass
-                            else:
-                                if resultSet3.getString(x) is  None:
-                                    fileDict[colHead] = ""
-                                else:
-                                    fileDict[colHead] = resultSet3.getString(x)
-                    dbquery3.close()
-                    fileList.append(fileDict)
-                    numFiles = numFiles + 1
-                    if numFiles > 1000:
-                        with open(jsonFileNamePath, 'a') as f:
-                            for file in fileList:
-                                json.dump(file, f)
-                                f.write("\n")
-                        numFiles = 0
-                        fileList = []
-                        
-            dbquery2.close()        
-        dbquery.close()
-        
-        # Check Messages
-        # TS001 - Invalid arguments
-        # TS002 - Sketch Created
-        # TS003 - Sketch Already Exists
-        # TS004 - Error Looking up Sketch
-        # TS005 - Timeline Added
-        # TS006 - Timeline Not Created
-        # Try to run this 3 times in case you add a sketch but for some reason you fail to add a the timeline,
-        # you may be able to add the timeline on another run, no reason to make the user run this multple times
-        # when we can do that as well.
+        # Chunks that were acknowledged on an earlier run, the export is in a fixed order so an unchanged
+        # chunk has the same MD5 and does not have to be sent again
+        manifestPath = os.path.join(tempDir, jsonFileName + "_manifest.json")
+        oldManifest = read_manifest(manifestPath)
 
-        emessage = "Internal Error contact plugin maker"
-        for z in range(3):
-            self.log(Level.INFO, "command ==> " + self.path_to_Timesketch_exe + " " + sketchName + " " + jsonFileNamePath + " " + self.IP_Address + " " + self.Port_Number + " " + self.userName + " " + self.password)
-            pipe = Popen([self.path_to_Timesketch_exe, sketchName, jsonFileNamePath, self.IP_Address, self.Port_Number, self.userName, self.password], stdout=PIPE, stderr=PIPE)
-            out_text = pipe.communicate()[0]
-            self.log(Level.INFO, "Output from run is ==> " + out_text)
-            if "TS005" in out_text:
-                if "TS002" in out_text:
-                    emessage = "Sketch added, Timeline added"
-                    break
-                elif "TS003" in out_text:
-                    emessage = "Sketch already exists, Timeline added"
-                    break
-            elif "TS001" in out_text:
-                emessage = "invalid parameters passed in, missing parameters"
-                break
-            elif "TS006" in out_text:
-                if "TSK004" in out_text:
-                    emessage = "Error Looking up sketch, Timeline Not Created"
-            
+        # Stream the artifacts and then the file times straight to the json_line chunks, one line at a time
+        jsonFile = JsonlChunks(tempDir, jsonFileName)
+        try:
+            numArtifacts = self.export_artifacts(skCase, jsonFile, progressBar)
+            self.log(Level.INFO, "Number of artifacts exported ==> " + str(numArtifacts))
+            numFileTimes = self.export_file_times(skCase, jsonFile, progressBar)
+            self.log(Level.INFO, "Number of file times exported ==> " + str(numFileTimes))
+        finally:
+            jsonFile.close()
+
+        # Only chunks sent to this sketch on this server count as uploaded
+        manifest = resume_manifest(oldManifest, jsonFile, tempDir, sketchName, self.IP_Address, self.Port_Number)
+        write_manifest(manifestPath, manifest)
+
+        emessage = self.upload_chunks(sketchName, timelineName, tempDir, manifestPath, manifest, progressBar)
 
         message = IngestMessage.createMessage(IngestMessage.MessageType.DATA, "Timesketch File Submit",  emessage )
         IngestServices.getInstance().postMessage(message)
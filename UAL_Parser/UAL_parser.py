@@ -72,6 +72,11 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
 class UalParserIngestModuleFactory(IngestModuleFactoryAdapter):
@@ -112,6 +117,8 @@ class UalParserIngestModule(DataSourceIngestModule):
 
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(UalParserIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(UalParserIngestModuleFactory.moduleName, UalParserIngestModuleFactory().getModuleVersionNumber())
         if PlatformUtil.isWindowsOS(): 
            self.pathToExe = os.path.join(os.path.dirname(os.path.abspath(__file__)), "export_ual.exe")
            if not os.path.exists(self.pathToExe):
@@ -128,52 +135,29 @@ class UalParserIngestModule(DataSourceIngestModule):
         # get current case and the store.vol abstract file information
         skCase = Case.getCurrentCase().getSleuthkitCase();
         
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(UalParserIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(UalParserIngestModuleFactory.moduleName)
+
         # Get the file manager
         fileManager = Case.getCurrentCase().getServices().getFileManager()
         
         # Find the files in the data source
-        files = fileManager.findFiles(dataSource, "current.mdb")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "current.mdb"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
         fileCount = 0;
 
         # Create Artifact
-        try:
-            self.log(Level.INFO, "Begin Create New Artifacts")
-            artID_Ual = skCase.addArtifactType( "UAL_LOGS", "User Access Logs")
-        except:		
-            self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-            artID_Ual = skCase.getArtifactTypeID("UAL_LOG")
-
-        # Create Custom Artifacts  
-        try:
-            attID_Ual_Role_Guid = skCase.addArtifactAttributeType("UAL_ROLE_GUID", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Role GUID")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, UAL_ROLE_GUID. ==> ")
-             attID_Ual_Role_Guid = skCase.getAttributeType("UAL_ROLE_GUID")
-        try:
-            attID_Ual_Guid_Desc = skCase.addArtifactAttributeType("UAL_GUID_DESC", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "GUID Description")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, UAL_GUID_DESC. ==> ")
-             attID_Ual_Guid_Desc = skCase.getAttributeType("UAL_GUID_DESC")
-        try:
-            attID_Ual_Total_Access = skCase.addArtifactAttributeType("UAL_TOTAL_ACCESS", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "Total Accesses")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, UAL_Total_Access. ==> ")
-             attID_Ual_Total_Access = skCase.getAttributeType("UAL_TOTAL_ACCESS")
-        try:
-            attID_Ual_Insert_Date = skCase.addArtifactAttributeType("UAL_INSERT_DATE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Insert Date")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, UAL_Insert_Date. ==> ")
-             attID_Ual_Insert_Date = skCase.getAttributeType("UAL_INSERT_DATE")
-        try:
-            attID_Ual_Lastaccess_Date = skCase.addArtifactAttributeType("UAL_LASTACCESS_DATE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Last Acess Date")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, UAL_Insert_Date. ==> ")
-             attID_Ual_Lastaccess_Date = skCase.getAttributeType("UAL_LASTACCESS_DATE")
-
-		# Create UAL Log directory in temp directory, if it exists then continue on processing		
+        artID_Ual = registry.getOrAddArtifactType( "UAL_LOGS", "User Access Logs").getTypeID()
+        attID_Ual_Role_Guid = registry.getOrAddAttributeType("UAL_ROLE_GUID", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Role GUID")
+        attID_Ual_Guid_Desc = registry.getOrAddAttributeType("UAL_GUID_DESC", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "GUID Description")
+        attID_Ual_Total_Access = registry.getOrAddAttributeType("UAL_TOTAL_ACCESS", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "Total Accesses")
+        attID_Ual_Insert_Date = registry.getOrAddAttributeType("UAL_INSERT_DATE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Insert Date")
+        attID_Ual_Lastaccess_Date = registry.getOrAddAttributeType("UAL_LASTACCESS_DATE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Last Acess Date")
         temporaryDirectory = os.path.join(Case.getCurrentCase().getTempDirectory(), "UAL")
         moduleDirectory = os.path.join(Case.getCurrentCase().getModuleDirectory(), "UAL")
         self.log(Level.INFO, "create Directory " + moduleDirectory)
@@ -196,8 +180,8 @@ class UalParserIngestModule(DataSourceIngestModule):
                 self.log(Level.INFO, "Processing Path: " + file.getParentPath())
                 fileCount += 1
 
-                extractedCurrentFile = os.path.join(temporaryDirectory, file.getName())
-                ContentUtils.writeToFile(file, File(extractedCurrentFile))
+                # The program only reads the database, so it reads the extraction cache copy
+                extractedCurrentFile = self.extractionCache.getLocalPath(file)
 
                 outFile = os.path.join(moduleDirectory, str(file.getName()))
                 # Command Line to Run is 
@@ -218,25 +202,24 @@ class UalParserIngestModule(DataSourceIngestModule):
                         if not heading_read:
                             heading_read = True
                         else:
-                            art = file.newArtifact(artID_Ual)
                             attributes = ArrayList()
                             for (data, head) in zip(row, attribute_names): 
                                 if head == "UAL_TOTAL_ACCESS":
-                                    attributes.add(BlackboardAttribute(skCase.getAttributeType(head), UalParserIngestModuleFactory.moduleName, int(data)))
+                                    attributes.add(BlackboardAttribute(registry.getAttributeType(head), UalParserIngestModuleFactory.moduleName, int(data)))
                                 else:
-                                    attributes.add(BlackboardAttribute(skCase.getAttributeType(head), UalParserIngestModuleFactory.moduleName, data))
-                            art.addAttributes(attributes)
+                                    attributes.add(BlackboardAttribute(registry.getAttributeType(head), UalParserIngestModuleFactory.moduleName, data))
+                            poster.newArtifact(file, artID_Ual, attributes)
 
-                            try:
-                                blackboard.postArtifact(art)
-                            except:
-                                pass
+        poster.flush()
 
         # After all processing complete, post a message to the ingest messages in box.
         message = IngestMessage.createMessage(IngestMessage.MessageType.DATA,
             "Ual Parser", " UAL Have Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
 
@@ -0,0 +1,130 @@
+# Profile_Cache.py = Jython helper that remembers the Volatility profile found for a memory image
+#
+# Contact: Mark McKinnon [Mark [dot] McKinnon <at> Davenport [dot] edu]
+#
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+# Shared by the Volatility modules in this directory.
+#
+# Comments
+#   Version 1.0 - Initial version - October 2026
+#
+# Usage:
+#   self.profileCache = ProfileCache(VolatilityIngestModuleFactory.moduleName)
+#   profile = self.profileCache.getProfile(image_file)      # None when imageinfo has to be run
+#   self.profileCache.putProfile(image_file, profile)
+#
+# imageinfo takes minutes on a large image, so the profile it suggests is kept in a database
+# in the Autopsy user config directory, which makes it available to every module and case.
+# An image is matched on its path, size and a MD5 of its first and last MB, so a different
+# image copied over the same path is not given the old profile.
+
+import hashlib
+import os
+
+from java.lang import Class
+from java.lang import System
+from java.sql import DriverManager
+from java.sql import SQLException
+from java.util.logging import Level
+from org.sleuthkit.autopsy.coreutils import Logger
+from org.sleuthkit.autopsy.coreutils import PlatformUtil
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+class ProfileCache(object):
+
+    def __init__(self, module_name):
+        self._logger = Logger.getLogger(module_name)
+        self.cache_file = os.path.join(PlatformUtil.getUserConfigDirectory(), "Volatility_Profile_Cache.db3")
+
+    def getProfile(self, image_file):
+        # Returns the profile found for this image before, None if there is not one
+        try:
+            image_size, head_tail_md5 = self._fingerprint(image_file)
+            dbConn = self._connect()
+        except (IOError, OSError, SQLException) as e:
+            self._logger.log(Level.INFO, "Profile cache not available for " + image_file + " (" + str(e) + ")")
+            return None
+        try:
+            stmt = dbConn.prepareStatement("select profile from profiles where image_path = ? and image_size = ? and head_tail_md5 = ?")
+            stmt.setString(1, image_file)
+            stmt.setLong(2, image_size)
+            stmt.setString(3, head_tail_md5)
+            resultSet = stmt.executeQuery()
+            profile = None
+            if resultSet.next():
+                profile = resultSet.getString("profile")
+                self._logger.log(Level.INFO, "Profile " + profile + " for " + image_file + " found in profile cache")
+            resultSet.close()
+            stmt.close()
+            return profile
+        finally:
+            dbConn.close()
+
+    def putProfile(self, image_file, profile):
+        try:
+            image_size, head_tail_md5 = self._fingerprint(image_file)
+            dbConn = self._connect()
+        except (IOError, OSError, SQLException) as e:
+            self._logger.log(Level.INFO, "Profile cache not available for " + image_file + " (" + str(e) + ")")
+            return
+        try:
+            stmt = dbConn.prepareStatement("insert or replace into profiles (image_path, image_size, head_tail_md5, profile, found_time) " + \
+                                           " values (?, ?, ?, ?, ?)")
+            stmt.setString(1, image_file)
+            stmt.setLong(2, image_size)
+            stmt.setString(3, head_tail_md5)
+            stmt.setString(4, profile)
+            stmt.setLong(5, System.currentTimeMillis())
+            stmt.executeUpdate()
+            stmt.close()
+        finally:
+            dbConn.close()
+
+    def _fingerprint(self, image_file):
+        # Size plus a hash of the first and last block, hashing the whole image would take
+        # as long as running imageinfo
+        image_size = os.path.getsize(image_file)
+        md5 = hashlib.md5()
+        image = open(image_file, "rb")
+        try:
+            md5.update(image.read(HASH_BLOCK_SIZE))
+            if image_size > HASH_BLOCK_SIZE:
+                image.seek(max(HASH_BLOCK_SIZE, image_size - HASH_BLOCK_SIZE))
+                md5.update(image.read(HASH_BLOCK_SIZE))
+        finally:
+            image.close()
+        return image_size, md5.hexdigest()
+
+    def _connect(self):
+        Class.forName("org.sqlite.JDBC").newInstance()
+        dbConn = DriverManager.getConnection("jdbc:sqlite:%s" % self.cache_file)
+        stmt = dbConn.createStatement()
+        # The Volatility modules can run at the same time
+        stmt.execute("PRAGMA busy_timeout = 30000")
+        stmt.execute("create table if not exists profiles (image_path text, image_size integer, head_tail_md5 text, profile text, " + \
+                     " found_time integer, primary key (image_path, image_size, head_tail_md5))")
+        stmt.close()
+        return dbConn
@@ -39,12 +39,18 @@
 #   Version 1.2 - Added code so if a plugin is rerun then do not add it back into Autopsy.  It will
 #                 create double entries in the SQLite database that Volatility creates/maintains.
 #   Version 1.3 - Added Linux Support
+#   Version 1.4 - Run the plugins side by side, each into its own database (shard) that is merged
+#                 into the image database once they are all done.  Number of plugins at once and
+#                 the memory to leave free are set in the UI.
+#                 Keep the profile imageinfo finds in a cache shared with Volatility_Dump.
+#   Version 1.5 - Only look at the local files in the data source for memory images
 # 
 
 import jarray
 import inspect
 import os
-from subprocess import Popen, PIPE
+import time
+from subprocess import Popen, PIPE, STDOUT
 
 from javax.swing import JCheckBox
 from javax.swing import JButton
@@ -63,7 +69,9 @@ from javax.swing.filechooser import FileNameExtensionFilter
 #from java.awt.event import KeyListener;
 
 from java.lang import Class
+from java.lang import Runtime
 from java.lang import System
+from java.lang.management import ManagementFactory
 from java.sql  import DriverManager, SQLException
 from java.util.logging import Level
 from java.io import File
@@ -89,6 +97,16 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Profile_Cache import ProfileCache
+from Column_Plan import ColumnPlan, hasRows, SQLITE_COLUMN_TYPES, STRING, LONG, blankStringValue, longStringValue
+
+# Volatility leaves some text columns null and writes its numbers as strings
+VOLATILITY_COLUMN_TYPES = dict(SQLITE_COLUMN_TYPES)
+VOLATILITY_COLUMN_TYPES["TEXT"] = (STRING, blankStringValue)
+VOLATILITY_DEFAULT_COLUMN = (LONG, longStringValue)
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -142,12 +160,15 @@ class VolatilityIngestModule(DataSourceIngestModule):
         self.isAutodetect = False
         self.Additional_Parms = ""
         self.Python_Program = False
+        self.Number_Of_Workers = 1
+        self.Free_Memory_MB = 0
 
     # Where any setup and configuration is done
     # 'context' is an instance of org.sleuthkit.autopsy.ingest.IngestJobContext.
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.profileCache = ProfileCache(VolatilityIngestModuleFactory.moduleName)
 
         #Show parameters that are passed in
         self.Volatility_Executable = self.local_settings.getSetting('Volatility_Directory')
@@ -173,11 +194,22 @@ class VolatilityIngestModule(DataSourceIngestModule):
             self.isAutodetect = True
         else:
             self.isAutodetect = False
+
+        # Number of plugins to run at the same time, default is one per processor
+        self.Number_Of_Workers = Runtime.getRuntime().availableProcessors()
+        if self.local_settings.getSetting('Workers') != None and self.local_settings.getSetting('Workers').strip().isdigit():
+            self.Number_Of_Workers = max(1, int(self.local_settings.getSetting('Workers').strip()))
+
+        # Do not start another plugin while less than this much memory is free, 0 for no limit
+        self.Free_Memory_MB = 0
+        if self.local_settings.getSetting('Free_Memory_MB') != None and self.local_settings.getSetting('Free_Memory_MB').strip().isdigit():
+            self.Free_Memory_MB = int(self.local_settings.getSetting('Free_Memory_MB').strip())
         
         self.log(Level.INFO, "Volatility Executable ==> " + self.local_settings.getSetting('Volatility_Directory'))
         self.log(Level.INFO, "Volatility Profile to use ==> " + self.Profile)
         self.log(Level.INFO, "Volatility Plugins to use ==> " + str(self.Plugins))
         self.log(Level.INFO, "Additional Parms ==> " + self.Additional_Parms)
+        self.log(Level.INFO, "Plugins at once ==> " + str(self.Number_Of_Workers) + " Free Memory MB ==> " + str(self.Free_Memory_MB))
         
         # Create path to plaso storage file
         
@@ -214,8 +246,17 @@ class VolatilityIngestModule(DataSourceIngestModule):
 
         # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
-        fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "%", "/")
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(VolatilityIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(VolatilityIngestModuleFactory.moduleName)
+
+        # Only the local files added to the data source have a path to hand to the program, ask
+        # for those instead of going through every file in the data source
+        files = skCase.findAllFilesWhere("data_source_obj_id = " + str(dataSource.getId()) + \
+                                         " and type = " + str(TskData.TSK_DB_FILES_TYPE_ENUM.LOCAL.getFileType()))
         numFiles = len(files)
         self.log(Level.INFO, "Number of files to process ==> " + str(numFiles))
         #file_name = os.path.basename(self.path_to_storage_file)
@@ -234,27 +275,27 @@ class VolatilityIngestModule(DataSourceIngestModule):
                 self.database_file = os.path.join(temp_dir, base_file_name + ".db3")
                 self.log(Level.INFO, "File Name ==> " + self.database_file)
                 if self.isAutodetect:
-                    self.find_profile(image_file)
+                    # imageinfo only has to run the first time an image is seen
+                    self.Profile = self.profileCache.getProfile(image_file)
+                    if self.Profile == None:
+                        self.Profile = 'Autodetect'
+                        self.find_profile(image_file)
+                        if self.Profile != None and self.Profile != 'Autodetect':
+                            self.profileCache.putProfile(image_file, self.Profile)
                 if self.Profile == None:
                     continue
-                for plugin_to_run in self.Plugins:
-                    if self.Python_Program:    
-                        self.log(Level.INFO, "Running program ==> " + self.Volatility_Executable + " -f " + file.getLocalAbsPath() + " " + \
-                                 "--profile=" + self.Profile + " --output=sqlite --output-file=" + self.database_file + " " + self.Additional_Parms + " " + plugin_to_run)
-                        if PlatformUtil.isWindowsOS():
-                            pipe = Popen(["Python.exe", self.Volatility_Executable, "-f", file.getLocalAbsPath(), "--profile=" + self.Profile, "--output=sqlite", \
-                                   "--output-file=" + self.database_file, self.Additional_Parms, plugin_to_run], stdout=PIPE, stderr=PIPE)
-                        else:
-                            pipe = Popen(["python", self.Volatility_Executable, "-f", file.getLocalAbsPath(), "--profile=" + self.Profile, "--output=sqlite", \
-                                   "--output-file=" + self.database_file, self.Additional_Parms, plugin_to_run], stdout=PIPE, stderr=PIPE)							
-                    else:
-                        self.log(Level.INFO, "Running program ==> " + self.Volatility_Executable + " -f " + file.getLocalAbsPath() + " " + \
-                                 "--profile=" + self.Profile + " --output=sqlite --output-file=" + self.database_file + " " + self.Additional_Parms + " " + plugin_to_run)
-                        pipe = Popen([self.Volatility_Executable, "-f", file.getLocalAbsPath(), "--profile=" + self.Profile, "--output=sqlite", \
-                               "--output-file=" + self.database_file, self.Additional_Parms, plugin_to_run], stdout=PIPE, stderr=PIPE)
-                    
-                    out_text = pipe.communicate()[0]
-                    self.log(Level.INFO, "Output from run is ==> " + out_text)               
+
+                # Each plugin writes its own shard in the temp directory, they are merged into
+                # the image database once all the plugins have finished
+                shard_dir = os.path.join(Case.getCurrentCase().getTempDirectory(), "Volatility", base_file_name)
+                try:
+                    os.makedirs(shard_dir)
+                except:
+                    self.log(Level.INFO, "Volatility shard directory already exists " + shard_dir)
+                shards = self.run_plugins(image_file, shard_dir, progressBar)
+                if self.context.isJobCancelled():
+                    return IngestModule.ProcessResult.OK
+                self.merge_shards(shards)
 
                 # Open the DB using JDBC
                 self.log(Level.INFO, "Path the volatility database file created ==> " + self.database_file)
@@ -281,97 +322,25 @@ class VolatilityIngestModule(DataSourceIngestModule):
                                                    " and upper(tbl_name) <> 'PLUGINS_LOADED_TO_AUTOPSY';")
                     # Cycle through each row and create artifacts
                     while resultSet1.next():
-                        try:
-                             self.log(Level.INFO, "Begin Create New Artifacts ==> " + resultSet1.getString("tbl_name"))
-                             artID_art = skCase.addArtifactType( "TSK_VOL_" + resultSet1.getString("tbl_name") + "_" + file_name, "Volatility " + \
-                                                                resultSet1.getString("tbl_name") + " " + file_name)
-                        except:		
-                             self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-                        # Get the artifact and attributes
-                        artID_art = skCase.getArtifactTypeID("TSK_VOL_" + resultSet1.getString("tbl_name") + "_" + file_name)
-                        artID_art_evt = skCase.getArtifactType("TSK_VOL_" + resultSet1.getString("tbl_name") + "_" + file_name)
+                        artID_art = registry.getOrAddArtifactType( "TSK_VOL_" + resultSet1.getString("tbl_name") + "_" + file_name, "Volatility " + \
+                                                           resultSet1.getString("tbl_name") + " " + file_name).getTypeID()
+                        artID_art = registry.getArtifactTypeID("TSK_VOL_" + resultSet1.getString("tbl_name") + "_" + file_name)
                         try: 
                            self.log(Level.INFO, "Result (" + resultSet1.getString("tbl_name") + ")")
                            table_name = resultSet1.getString("tbl_name")
-                           resultSet4  = stmt4.executeQuery("Select count(*) 'NumRows' from " + resultSet1.getString("tbl_name") + " ")
-                           row_count = resultSet4.getInt("NumRows")
-                           self.log(Level.INFO, " Number of Rows is " + str(row_count) + " ")                           
-                           if row_count >= 1:
+                           if hasRows(stmt4, table_name):
                                 SQL_String_1 = "Select * from " + table_name + ";"
-                                SQL_String_2 = "PRAGMA table_info('" + table_name + "')"
                                 self.log(Level.INFO, SQL_String_1)
-                                self.log(Level.INFO, SQL_String_2)
                                 artifact_name = "TSK_VOL_" + table_name.upper() + "_" + file_name
 
-                                artID_sql = skCase.getArtifactTypeID(artifact_name)
-                                artID_sql_evt = skCase.getArtifactType(artifact_name)
+                                artID_sql = registry.getArtifactTypeID(artifact_name)
                                                           
-                                Column_Names = []
-                                Column_Types = []
-                                resultSet2  = stmt2.executeQuery(SQL_String_2)
-                                while resultSet2.next(): 
-                                   Column_Names.append(resultSet2.getString("name").upper())
-                                   Column_Types.append(resultSet2.getString("type").upper())
-                                   attribute_name = "TSK_VOL_" + table_name + "_" + resultSet2.getString("name").upper()
-                                   if resultSet2.getString("type").upper() == "TEXT":
-                                       try:
-                                           attID_ex1 = skCase.addArtifactAttributeType(attribute_name, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                                       except:		
-                                           self.log(Level.INFO, "Attributes Creation Error, " + attribute_name + " ==> ")
-                                   elif resultSet2.getString("type").upper() == "LONGVARCHAR":
-                                       try:
-                                           attID_ex1 = skCase.addArtifactAttributeType(attribute_name, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                                       except:		
-                                              self.log(Level.INFO, "Attributes Creation Error, " + attribute_name + " ==> ")
-                                   elif resultSet2.getString("type").upper() == "":
-                                       try:
-                                           attID_ex1 = skCase.addArtifactAttributeType(attribute_name, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                                       except:		
-                                           self.log(Level.INFO, "Attributes Creation Error, " + attribute_name + " ==> ")
-                                   elif resultSet2.getString("type").upper() == "BLOB":
-                                       try:
-                                           attID_ex1 = skCase.addArtifactAttributeType(attribute_name, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                                       except:		
-                                           self.log(Level.INFO, "Attributes Creation Error, " + attribute_name + " ==> ")
-                                   elif resultSet2.getString("type").upper() == "REAL":
-                                       try:
-                                           attID_ex1 = skCase.addArtifactAttributeType(attribute_name, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
-                                       except:		
-                                           self.log(Level.INFO, "Attributes Creation Error, " + attribute_name + " ==> ")
-                                   else:
-                                       try:
-                                           attID_ex1 = skCase.addArtifactAttributeType(attribute_name, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
-                                       except:		
-                                           self.log(Level.INFO, "Attributes Creation Error, " + attribute_name + " ==> ")
-
-                                                         
-                                resultSet3 = stmt3.executeQuery(SQL_String_1)
-                                while resultSet3.next():
-                                   art = file.newArtifact(artID_sql)
-                                   Column_Number = 1
-                                   for col_name in Column_Names:
-                                      c_name = "TSK_VOL_" + table_name.upper() + "_" + Column_Names[Column_Number - 1]
-                                      attID_ex1 = skCase.getAttributeType(c_name)
-                                      if Column_Types[Column_Number - 1] == "TEXT":
-                                          if resultSet3.getString(Column_Number) == None:
-                                             art.addAttribute(BlackboardAttribute(attID_ex1, VolatilityIngestModuleFactory.moduleName, " "))
-                                          else:
-                                             art.addAttribute(BlackboardAttribute(attID_ex1, VolatilityIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
-                                      elif Column_Types[Column_Number - 1] == "":
-                                          art.addAttribute(BlackboardAttribute(attID_ex1, VolatilityIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
-                                      elif Column_Types[Column_Number - 1] == "LONGVARCHAR":
-                                          art.addAttribute(BlackboardAttribute(attID_ex1, VolatilityIngestModuleFactory.moduleName, "BLOBS Not Supported - Look at actual file"))
-                                      elif Column_Types[Column_Number - 1] == "BLOB":
-                                          art.addAttribute(BlackboardAttribute(attID_ex1, VolatilityIngestModuleFactory.moduleName, "BLOBS Not Supported - Look at actual file"))
-                                      elif Column_Types[Column_Number - 1] == "REAL":
-                                          art.addAttribute(BlackboardAttribute(attID_ex1, VolatilityIngestModuleFactory.moduleName, long(resultSet3.getFloat(Column_Number))))
-                                      else:
-                                          art.addAttribute(BlackboardAttribute(attID_ex1, VolatilityIngestModuleFactory.moduleName, long(resultSet3.getString(Column_Number))))
-                                      Column_Number = Column_Number + 1
-                                   
-                                   IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(VolatilityIngestModuleFactory.moduleName, \
-                                        artID_sql_evt, None))
+                                plan = ColumnPlan(registry, VolatilityIngestModuleFactory.moduleName, stmt2, table_name, "TSK_VOL_" + table_name + "_", \
+                                                  VOLATILITY_COLUMN_TYPES, VOLATILITY_DEFAULT_COLUMN)
+                                row_count = plan.postRows(poster, file, artID_sql, stmt3.executeQuery(SQL_String_1), progressBar, table_name)
+                                self.log(Level.INFO, " Number of Rows is " + str(row_count) + " ")
+
+                                poster.flush()
                                     
                         except SQLException as e:
                                self.log(Level.INFO, "Error getting values from table " +  resultSet.getString("tbl_name") + " (" + e.getMessage() + ")")
@@ -390,6 +359,122 @@ class VolatilityIngestModule(DataSourceIngestModule):
         IngestServices.getInstance().postMessage(message)
 
         return IngestModule.ProcessResult.OK                
+
+    def volatility_command(self, image_file, output_file, plugin_to_run):
+        if self.Python_Program:
+            if PlatformUtil.isWindowsOS():
+                command = ["Python.exe", self.Volatility_Executable]
+            else:
+                command = ["python", self.Volatility_Executable]
+        else:
+            command = [self.Volatility_Executable]
+        return command + ["-f", image_file, "--profile=" + self.Profile, "--output=sqlite", "--output-file=" + output_file, \
+                          self.Additional_Parms, plugin_to_run]
+
+    def memory_available(self):
+        # Free physical memory is only reported by JVMs that have the com.sun.management extension
+        if self.Free_Memory_MB <= 0:
+            return True
+        try:
+            free_memory_mb = ManagementFactory.getOperatingSystemMXBean().getFreePhysicalMemorySize() / (1024 * 1024)
+        except:
+            return True
+        return free_memory_mb > self.Free_Memory_MB
+
+    def run_plugins(self, image_file, shard_dir, progressBar):
+        # Keeps up to Number_Of_Workers plugins running, a new one is only started when there is
+        # enough free memory (unless nothing is running).  Returns the shards of the plugins that ran.
+        pending = list(self.Plugins)
+        running = []
+        shards = []
+        plugins_done = 0
+        progressBar.switchToDeterminate(len(pending))
+        while len(pending) > 0 or len(running) > 0:
+            if self.context.isJobCancelled():
+                for plugin_to_run, pipe, shard_file, output_file in running:
+                    pipe.kill()
+                    output_file.close()
+                return []
+
+            while len(pending) > 0 and len(running) < self.Number_Of_Workers and (len(running) == 0 or self.memory_available()):
+                plugin_to_run = pending.pop(0)
+                shard_file = os.path.join(shard_dir, plugin_to_run + ".db3")
+                if os.path.exists(shard_file):
+                    os.remove(shard_file)
+                command = self.volatility_command(image_file, shard_file, plugin_to_run)
+                self.log(Level.INFO, "Running program ==> " + " ".join(command))
+                output_file = open(os.path.join(shard_dir, plugin_to_run + ".log"), "w+")
+                running.append((plugin_to_run, Popen(command, stdout=output_file, stderr=STDOUT), shard_file, output_file))
+                progressBar.progress("Running " + plugin_to_run + " (" + str(len(running)) + " plugins running)", plugins_done)
+
+            still_running = []
+            for plugin_to_run, pipe, shard_file, output_file in running:
+                if pipe.poll() == None:
+                    still_running.append((plugin_to_run, pipe, shard_file, output_file))
+                    continue
+                output_file.seek(0)
+                self.log(Level.INFO, "Output from run of " + plugin_to_run + " is ==> " + output_file.read())
+                output_file.close()
+                shards.append(shard_file)
+                plugins_done = plugins_done + 1
+                progressBar.progress(plugin_to_run + " finished", plugins_done)
+            if len(still_running) == len(running):
+                time.sleep(0.5)
+            running = still_running
+
+        return shards
+
+    def merge_shards(self, shards):
+        # Copy the tables from each plugin's shard into the image database.  A table that is already
+        # there (plugin run again) gets the rows appended, the same as Volatility does when it writes
+        # to an existing output file, plugins_loaded_to_Autopsy then keeps it from being loaded twice.
+        try: 
+            Class.forName("org.sqlite.JDBC").newInstance()
+            dbConn = DriverManager.getConnection("jdbc:sqlite:%s"  % self.database_file)
+        except SQLException as e:
+            self.log(Level.INFO, "Could not open database file (not SQLite) " + self.database_file + " (" + e.getMessage() + ")")
+            return
+
+        stmt = dbConn.createStatement()
+        for shard_file in shards:
+            if not os.path.exists(shard_file):
+                self.log(Level.INFO, "Plugin did not create database " + shard_file)
+                continue
+            try:
+                stmt.execute("attach database '" + shard_file.replace("'", "''") + "' as shard")
+                tables = []
+                resultSet = stmt.executeQuery("select name, sql from shard.sqlite_master where type = 'table'")
+                while resultSet.next():
+                    tables.append((resultSet.getString("name"), resultSet.getString("sql")))
+                resultSet.close()
+
+                dbConn.setAutoCommit(False)
+                for table_name, create_sql in tables:
+                    resultSet = stmt.executeQuery("select 1 from main.sqlite_master where type = 'table' and upper(name) = upper('" + \
+                                                  table_name + "')")
+                    table_exists = resultSet.next()
+                    resultSet.close()
+                    if not table_exists:
+                        stmt.execute(create_sql)
+                    stmt.execute('insert into main."' + table_name + '" select * from shard."' + table_name + '"')
+                dbConn.commit()
+                dbConn.setAutoCommit(True)
+                stmt.execute("detach database shard")
+            except SQLException as e:
+                self.log(Level.INFO, "Error merging database " + shard_file + " (" + e.getMessage() + ")")
+                try:
+                    dbConn.rollback()
+                    dbConn.setAutoCommit(True)
+                    stmt.execute("detach database shard")
+                except SQLException as e:
+                    pass
+            try:
+                os.remove(shard_file)
+            except:
+                self.log(Level.INFO, "Could not remove database " + shard_file)
+
+        stmt.close()
+        dbConn.close()
 		
     def find_profile(self, image_file):
 
@@ -626,6 +711,12 @@ class VolatilitySettingsWithUISettingsPanel(IngestModuleIngestJobSettingsPanel):
     def keyPressed(self, event):
         self.local_settings.setSetting('AdditionalParms', self.Additional_Parms_TF.getText()) 
         #self.Error_Message.setText(self.Additional_Parms_TF.getText())
+
+    def workersChanged(self, event):
+        self.local_settings.setSetting('Workers', self.Workers_TF.getText()) 
+
+    def freeMemoryChanged(self, event):
+        self.local_settings.setSetting('Free_Memory_MB', self.Free_Memory_TF.getText()) 
         
     def onchange_version(self, event):
         self.local_settings.setSetting('Version', event.item)        
@@ -659,7 +750,7 @@ class VolatilitySettingsWithUISettingsPanel(IngestModuleIngestJobSettingsPanel):
         self.Error_Message = JLabel( "") 
         self.Error_Message.setEnabled(True)
         self.gbcPanel0.gridx = 2
-        self.gbcPanel0.gridy = 31
+        self.gbcPanel0.gridy = 35
         self.gbcPanel0.gridwidth = 1 
         self.gbcPanel0.gridheight = 1 
         self.gbcPanel0.fill = GridBagConstraints.BOTH 
@@ -883,10 +974,75 @@ class VolatilitySettingsWithUISettingsPanel(IngestModuleIngestJobSettingsPanel):
         self.gbPanel0.setConstraints( self.Blank_6, self.gbcPanel0 ) 
         self.panel0.add( self.Blank_6 ) 
 
+        self.Workers_Label = JLabel("Plugins To Run At Once (blank for one per processor):")
+        self.Workers_Label.setEnabled(True)
+        self.gbcPanel0.gridx = 2 
+        self.gbcPanel0.gridy = 28
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints( self.Workers_Label, self.gbcPanel0 ) 
+        self.panel0.add( self.Workers_Label ) 
+
+        self.Workers_TF = JTextField(5,focusLost=self.workersChanged) 
+        self.Workers_TF.setEnabled(True)
+        self.gbcPanel0.gridx = 6 
+        self.gbcPanel0.gridy = 28
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints( self.Workers_TF, self.gbcPanel0 ) 
+        self.panel0.add( self.Workers_TF ) 
+
+        self.Free_Memory_Label = JLabel("Memory To Keep Free In MB (blank for no limit):")
+        self.Free_Memory_Label.setEnabled(True)
+        self.gbcPanel0.gridx = 2 
+        self.gbcPanel0.gridy = 30
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints( self.Free_Memory_Label, self.gbcPanel0 ) 
+        self.panel0.add( self.Free_Memory_Label ) 
+
+        self.Free_Memory_TF = JTextField(5,focusLost=self.freeMemoryChanged) 
+        self.Free_Memory_TF.setEnabled(True)
+        self.gbcPanel0.gridx = 6 
+        self.gbcPanel0.gridy = 30
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints( self.Free_Memory_TF, self.gbcPanel0 ) 
+        self.panel0.add( self.Free_Memory_TF ) 
+
+        self.Blank_7 = JLabel( " ") 
+        self.Blank_7.setEnabled(True)
+        self.gbcPanel0.gridx = 2 
+        self.gbcPanel0.gridy = 31
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints( self.Blank_7, self.gbcPanel0 ) 
+        self.panel0.add( self.Blank_7 ) 
+
         self.Label_3 = JLabel( "Message:") 
         self.Label_3.setEnabled(True)
         self.gbcPanel0.gridx = 2 
-        self.gbcPanel0.gridy = 29
+        self.gbcPanel0.gridy = 33
         self.gbcPanel0.gridwidth = 1 
         self.gbcPanel0.gridheight = 1 
         self.gbcPanel0.fill = GridBagConstraints.BOTH 
@@ -901,6 +1057,8 @@ class VolatilitySettingsWithUISettingsPanel(IngestModuleIngestJobSettingsPanel):
     # Custom load any data field and initialize the values
     def customizeComponents(self):
         self.Program_Executable_TF.setText(self.local_settings.getSetting('Volatility_Directory'))
+        self.Workers_TF.setText(self.local_settings.getSetting('Workers'))
+        self.Free_Memory_TF.setText(self.local_settings.getSetting('Free_Memory_MB'))
         #pass
         
     # Return the settings used
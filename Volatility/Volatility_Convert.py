@@ -89,6 +89,9 @@ from org.sleuthkit.autopsy.casemodule import AddLocalFilesTask
 from org.sleuthkit.autopsy.casemodule.services.FileManager import FileAddProgressUpdater
 from org.sleuthkit.autopsy.ingest import ModuleContentEvent;
 
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 class ProgressUpdater(FileAddProgressUpdater):
 
     def __init__(self):
@@ -163,6 +166,8 @@ class VolatilityDumpIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(VolatilityDumpIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(VolatilityDumpIngestModuleFactory.moduleName, VolatilityDumpIngestModuleFactory().getModuleVersionNumber())
 
         #Show parameters that are passed in
         self.Volatility_Executable = self.local_settings.getSetting('Volatility_Directory')
@@ -208,16 +213,15 @@ class VolatilityDumpIngestModule(DataSourceIngestModule):
             # Set the database to be read to the once created by the prefetch parser program
             skCase = Case.getCurrentCase().getSleuthkitCase();
             fileManager = Case.getCurrentCase().getServices().getFileManager()
-            files = fileManager.findFiles(dataSource, "hiberfil.sys", "/")
+            files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "hiberfil.sys", "/"))
             numFiles = len(files)
             self.log(Level.INFO, "Number of files to process ==> " + str(numFiles))
 
             for file in files:
                 self.log(Level.INFO, "File to process is ==> " + str(file))
                 self.log(Level.INFO, "File name to process is ==> " + file.getName())
-                tmp_Dir = Case.getCurrentCase().getTempDirectory()
-                Hiber_File = os.path.join(tmp_Dir, file.getName())
-                ContentUtils.writeToFile(file, File(Hiber_File))
+                # Volatility only reads the hiberfil, so it reads the extraction cache copy
+                Hiber_File = self.extractionCache.getLocalPath(file)
                 self.log(Level.INFO, "File name to process is ==> " + Hiber_File)
                 # Create the directory to dump the hiberfil
                 dump_file = os.path.join(ModOut_Dir, "Memory-Image-from-hiberfil.img")
@@ -274,6 +278,9 @@ class VolatilityDumpIngestModule(DataSourceIngestModule):
             "HiberFil_Crash", " Hiberfil/Crash Dumps have been extracted fro Image. " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		
          
@@ -36,6 +36,8 @@
 #   Version 1.1 - Add code that will import the dumped files as derived files under the memory image.
 #                 Fix the code when imageinfo is selected.
 #   Version 1.2 - Fix spelling error for dervived file to derived.  More code clean needed
+#   Version 1.3 - Keep the profile imageinfo finds in a cache shared with the Volatility module
+#   Version 1.4 - Only look at the local files in the data source for memory images
 # 
 
 import jarray
@@ -88,6 +90,8 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Profile_Cache import ProfileCache
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -149,6 +153,7 @@ class VolatilityDumpIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.profileCache = ProfileCache(VolatilityDumpIngestModuleFactory.moduleName)
 
         #Show parameters that are passed in
         self.Volatility_Executable = self.local_settings.getSetting('Volatility_Directory')
@@ -220,7 +225,10 @@ class VolatilityDumpIngestModule(DataSourceIngestModule):
         # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase()
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "%", "/")
+        # Only the local files added to the data source have a path to hand to the program, ask
+        # for those instead of going through every file in the data source
+        files = skCase.findAllFilesWhere("data_source_obj_id = " + str(dataSource.getId()) + \
+                                         " and type = " + str(TskData.TSK_DB_FILES_TYPE_ENUM.LOCAL.getFileType()))
         numFiles = len(files)
         self.log(Level.INFO, "Number of files to process ==> " + str(numFiles))
         #file_name = os.path.basename(self.path_to_storage_file)
@@ -248,7 +256,13 @@ class VolatilityDumpIngestModule(DataSourceIngestModule):
                     derived_dir = os.path.join("ModuleOutput", "volatility", "Dump-Files")
                     dump_file = temp_dir
                     if self.isAutodetect:
-                        self.find_profile(image_file)
+                        # imageinfo only has to run the first time an image is seen
+                        self.Profile = self.profileCache.getProfile(image_file)
+                        if self.Profile == None:
+                            self.Profile = 'Autodetect'
+                            self.find_profile(image_file)
+                            if self.Profile != None and self.Profile != 'Autodetect':
+                                self.profileCache.putProfile(image_file, self.Profile)
                     if self.Profile == None:
                         continue
                     for plugin_to_run in self.Plugins:
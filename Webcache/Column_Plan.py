@@ -0,0 +1,132 @@
+# Column_Plan.py = Jython helper that turns the rows of a SQLite table into blackboard artifacts
+#
+# Contact: Mark McKinnon [Mark [dot] McKinnon <at> Davenport [dot] edu]
+#
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+# Used by the modules that load a whole SQLite table into the blackboard, a copy sits
+# next to each of them (needs Type_Registry.py and Blackboard_Poster.py as well).
+#
+# Comments
+#   Version 1.0 - Initial version - October 2026
+#   Version 1.1 - Add hasRows probe, fetch size and progress reporting to postRows - October 2026
+#
+# Usage:
+#   plan = ColumnPlan(registry, SomeIngestModuleFactory.moduleName, stmt, table_name, "TSK_SOME_PREFIX_", \
+#                     SQLITE_COLUMN_TYPES, SQLITE_DEFAULT_COLUMN)
+#   if hasRows(stmt, table_name):
+#       plan.postRows(poster, file, artID, stmt.executeQuery("Select * from " + table_name + ";"), progressBar, table_name)
+#
+# The table schema is read once (PRAGMA table_info), the attribute type for each column is
+# created and paired with a function that pulls the value out of the result set.  Each row
+# then just runs the list of column functions, the column type is never looked at again.
+# A column type map is declared type (upper case) ==> (attribute value type, value function),
+# declared types that are not in the map use the default column.
+#
+# hasRows stops at the first row instead of counting the whole table, so each table is
+# only scanned once, by the select that loads it.
+
+from org.sleuthkit.datamodel import BlackboardAttribute
+
+STRING = BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING
+LONG = BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG
+DATETIME = BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME
+
+def stringValue(resultSet, index):
+    return resultSet.getString(index)
+
+def blankStringValue(resultSet, index):
+    # Some columns are null, the blackboard will not take a null string
+    value = resultSet.getString(index)
+    if value == None:
+        return " "
+    return value
+
+def longValue(resultSet, index):
+    return long(resultSet.getInt(index))
+
+def longStringValue(resultSet, index):
+    return long(resultSet.getString(index))
+
+def realValue(resultSet, index):
+    return long(resultSet.getFloat(index))
+
+def blobValue(resultSet, index):
+    return "BLOBS Not Supported - Look at actual file"
+
+# Column types used by the parsers that load any SQLite database
+SQLITE_COLUMN_TYPES = {"TEXT": (STRING, stringValue),
+                       "": (STRING, stringValue),
+                       "LONGVARCHAR": (STRING, blobValue),
+                       "BLOB": (STRING, blobValue),
+                       "REAL": (LONG, realValue)}
+SQLITE_DEFAULT_COLUMN = (LONG, longValue)
+
+# Rows pulled from SQLite at a time, the progress bar is updated after each fetch
+FETCH_SIZE = 500
+
+def hasRows(stmt, table_name):
+    resultSet = stmt.executeQuery("Select 1 from " + table_name + " limit 1")
+    found = resultSet.next()
+    resultSet.close()
+    return found
+
+class ColumnPlan(object):
+
+    def __init__(self, registry, module_name, stmt, table_name, attribute_prefix, column_types, default_column):
+        self.module_name = module_name
+        self.columns = []
+        resultSet = stmt.executeQuery("PRAGMA table_info('" + table_name + "')")
+        while resultSet.next():
+            column_name = resultSet.getString("name")
+            column_type = resultSet.getString("type")
+            if column_type == None:
+                column_type = ""
+            value_type, value = column_types.get(column_type.upper(), default_column)
+            attribute_type = registry.getOrAddAttributeType(attribute_prefix + column_name.upper(), value_type, column_name)
+            self.columns.append(self._column(attribute_type, value, len(self.columns) + 1))
+        resultSet.close()
+
+    def _column(self, attribute_type, value, index):
+        module_name = self.module_name
+        def column(resultSet):
+            return BlackboardAttribute(attribute_type, module_name, value(resultSet, index))
+        return column
+
+    def attributes(self, resultSet):
+        # Attributes for the row the result set is on
+        return [column(resultSet) for column in self.columns]
+
+    def postRows(self, poster, content, artifact_id, resultSet, progressBar=None, table_name=""):
+        # Makes one artifact per row, returns the number of rows
+        columns = self.columns
+        rows = 0
+        resultSet.setFetchSize(FETCH_SIZE)
+        while resultSet.next():
+            poster.newArtifact(content, artifact_id, [column(resultSet) for column in columns])
+            rows = rows + 1
+            if progressBar != None and rows % FETCH_SIZE == 0:
+                progressBar.progress(table_name + " " + str(rows) + " rows")
+        resultSet.close()
+        return rows
@@ -35,6 +35,7 @@
 #   Version 1.0 - Initial version - June 2016
 #   Version 1.1 - Added custom artifacts/attributes - September 1, 2016
 #   Version 1.2 - Added Linux Support - November 2018
+#   Version 1.3 - Read each container through the container_name index with a column plan built once - October 2026
 # 
 
 import jarray
@@ -67,6 +68,15 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Column_Plan import ColumnPlan, STRING, LONG, stringValue, longValue
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
+WEBCACHE_COLUMN_TYPES = {"TEXT": (STRING, stringValue),
+                         "": (STRING, stringValue)}
+WEBCACHE_DEFAULT_COLUMN = (LONG, longValue)
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -106,6 +116,9 @@ class ParseWebcacheIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ParseWebcacheIngestModuleFactory.moduleName, self.context)
+        # Parse WebCache has no settings, only a new module version parses an unchanged Webcache again
+        self.ledger = IngestLedger(ParseWebcacheIngestModuleFactory.moduleName, ParseWebcacheIngestModuleFactory().getModuleVersionNumber())
 
         # Get path to EXE based on where this script is run from.
         # Assumes EXE is in same folder as script
@@ -133,8 +146,15 @@ class ParseWebcacheIngestModule(DataSourceIngestModule):
         
        # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(ParseWebcacheIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(ParseWebcacheIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "WebcacheV01.dat")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "WebcacheV01.dat"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -159,11 +179,10 @@ class ParseWebcacheIngestModule(DataSourceIngestModule):
             #self.log(Level.INFO, "Processing file: " + file.getName())
             fileCount += 1
 
-            # Save the DB locally in the temp folder. use file id as name to reduce collisions
-            lclDbPath = os.path.join(temp_dir, file.getName() + "-" + str(file.getId()))
+            # The program only reads the ESE database, so it reads the extraction cache copy
+            lclDbPath = self.extractionCache.getLocalPath(file)
             DbPath = os.path.join(temp_dir, file.getName() + "-" + str(file.getId()) + ".db3")
             self.log(Level.INFO, file.getName() + ' ==> ' + str(file.getId()) + ' ==> ' + file.getUniquePath()) 
-            ContentUtils.writeToFile(file, File(lclDbPath))
                         
             # Run the EXE, saving output to a sqlite database
             self.log(Level.INFO, "Running program on data source parm 1 ==> " + temp_dir + "  Parm 2 ==> " + DbPath)
@@ -203,83 +222,25 @@ class ParseWebcacheIngestModule(DataSourceIngestModule):
            #self.log(Level.INFO, "Number of containers ==> " + str(Container_List)           
 
                        
+           # All the containers have the same columns, so the attributes are set up once and each
+           # container is read through the container_name index
+           plan = ColumnPlan(registry, ParseWebcacheIngestModuleFactory.moduleName, stmt, "All_Containers", "TSK_", \
+                             WEBCACHE_COLUMN_TYPES, WEBCACHE_DEFAULT_COLUMN)
+           containerStmt = dbConn.prepareStatement("Select * from all_containers where container_name = ?")
+
            # Cycle through each row and create artifacts
-           for c_name in Container_List:
+           for container_name in Container_List:
                try: 
-                   container_name = c_name
-                   #self.log(Level.INFO, "Result (" + container_name + ")")
-                   #self.log(Level.INFO, "Result get information from table " + container_name + " ")
-                   SQL_String_1 = "Select * from all_containers where container_name = '" + container_name + "';"
-                   SQL_String_2 = "PRAGMA table_info('All_Containers')"
-                   #self.log(Level.INFO, SQL_String_1)
-                   #self.log(Level.INFO, SQL_String_2)
                    artifact_name = "TSK_WC_" + container_name.upper()
                    artifact_desc = "WebcacheV01 " + container_name.upper()
-                   #self.log(Level.INFO, "Artifact Name ==> " + artifact_name + "  Artifact Desc ==> " + artifact_desc)
-                   try:
-                        self.log(Level.INFO, "Begin Create New Artifacts")
-                        artID_web = skCase.addArtifactType( artifact_name, artifact_desc)
-                   except:		
-                        self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-                   artID_web = skCase.getArtifactTypeID(artifact_name)
-                   artID_web_evt = skCase.getArtifactType(artifact_name)
-				   
-                   Column_Names = []
-                   Column_Types = []
-                   resultSet2  = stmt.executeQuery(SQL_String_2)
-                   while resultSet2.next(): 
-                      Column_Names.append(resultSet2.getString("name").upper())
-                      Column_Types.append(resultSet2.getString("type").upper())
-                      #attID_ex1 = skCase.addAttrType("TSK_" + resultSet2.getString("name").upper(), resultSet2.getString("name"))
-                      #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                      #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + resultSet2.getString("type").upper())
-                      if resultSet2.getString("type").upper() == "TEXT":
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute. TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                              #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                          except:		
-                               self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
-                      elif resultSet2.getString("type").upper() == "":
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                              #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
-                      else:
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
-                              #self.log(Level.INFO, "attribure id for " + "TSK_" + resultSet2.getString("name") + " == " + str(attID_ex1))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
-
-										 
-                   resultSet3 = stmt.executeQuery(SQL_String_1)
-                   while resultSet3.next():
-                      art = file.newArtifact(artID_web)
-                      Column_Number = 1
-                      for col_name in Column_Names:
-                         #self.log(Level.INFO, "Result get information for column " + Column_Names[Column_Number - 1] + " ==> " + Column_Types[Column_Number - 1])
-                         #self.log(Level.INFO, "Result get information for column_number " + str(Column_Number) + " ")
-                         c_name = "TSK_" + col_name
-                         #self.log(Level.INFO, "Attribute Name is " + c_name + " ")
-                         attID_ex1 = skCase.getAttrTypeID(c_name)
-                         attID_ex1 = skCase.getAttributeType(c_name)
-                         if Column_Types[Column_Number - 1] == "TEXT":
-                             art.addAttribute(BlackboardAttribute(attID_ex1, ParseWebcacheIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
-                         elif Column_Types[Column_Number - 1] == "":
-                              art.addAttribute(BlackboardAttribute(attID_ex1, ParseWebcacheIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
-#                             elif Column_Types[Column_Number - 1] == "BLOB":
-#                                 art.addAttribute(BlackboardAttribute(attID_ex1, ParseSRUDBIngestModuleFactory.moduleName, "BLOBS Not Supported"))
-#                             elif Column_Types[Column_Number - 1] == "REAL":
-#                                 art.addAttribute(BlackboardAttribute(attID_ex1, ParseSRUDBIngestModuleFactory.moduleName, resultSet3.getFloat(Column_Number)))
-                         else:
-                             #self.log(Level.INFO, "Value for column type ==> " + str(resultSet3.getInt(Column_Number)) + " <== ")
-                             art.addAttribute(BlackboardAttribute(attID_ex1, ParseWebcacheIngestModuleFactory.moduleName, long(resultSet3.getInt(Column_Number))))
-                         Column_Number = Column_Number + 1
-                   IngestServices.getInstance().fireModuleDataEvent(
-                             ModuleDataEvent(ParseWebcacheIngestModuleFactory.moduleName, artID_web_evt, None))						
+                   artID_web = registry.getOrAddArtifactType( artifact_name, artifact_desc).getTypeID()
+
+                   containerStmt.setString(1, container_name)
+                   plan.postRows(poster, file, artID_web, containerStmt.executeQuery(), progressBar, container_name)
+                   poster.flush()
                except SQLException as e:
                    self.log(Level.INFO, "Error getting values from contacts table (" + e.getMessage() + ")")
+           containerStmt.close()
 
         # Clean up
            #stmt.close()
@@ -290,7 +251,6 @@ class ParseWebcacheIngestModule(DataSourceIngestModule):
 		#Clean up EventLog directory and files
         for file in files:
             try:
-                os.remove(os.path.join(temp_dir, file.getName() + "-" + str(file.getId())))
                 os.remove(os.path.join(temp_dir, file.getName() + "-" + str(file.getId()) + ".db3"))
             except:
 			    self.log(Level.INFO, "removal of Webcache file failed " + temp_dir + "\\" + file.getName() + "-" + str(file.getId()))
@@ -304,4 +264,7 @@ class ParseWebcacheIngestModule(DataSourceIngestModule):
             "Webcache Parser", " Webcache Has Been Parsed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
@@ -76,6 +76,10 @@ from org.sleuthkit.autopsy.casemodule.services import Services
 from org.sleuthkit.autopsy.casemodule.services import FileManager
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -133,6 +137,10 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
     # See: http://sleuthkit.org/autopsy/docs/api-docs/3.1/classorg_1_1sleuthkit_1_1autopsy_1_1ingest_1_1_ingest_job_context.html
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(Windows_InternalsIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(Windows_InternalsIngestModuleFactory.moduleName, Windows_InternalsIngestModuleFactory().getModuleVersionNumber(), \
+                                   self.local_settings, ['Recentlyused_Flag', 'Filehistory_Flag', 'Jumplist_Flag', 'Prefetch_Flag', \
+                                   'SAM_Flag', 'Shellbags_Flag', 'Shimcache_Flag', 'Usnj_Flag', 'Webcache_Flag'])
 
         if self.local_settings.getSetting('Recentlyused_Flag') == 'true':
             if PlatformUtil.isWindowsOS():
@@ -328,6 +336,9 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
             "Windows_Internals", " Windows_Internals Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 
     def process_Recentlyused(self, dataSource, progressBar):
@@ -337,11 +348,14 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
         # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
  
-        # Use blackboard class to index blackboard artifacts for keyword search
-        blackboard = Case.getCurrentCase().getServices().getBlackboard()
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(Windows_InternalsIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(Windows_InternalsIngestModuleFactory.moduleName)
 
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "%", "/Windows/System32/wbem/Repository/")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "%", "/Windows/System32/wbem/Repository/"), together=True)
         numFiles = len(files)
         progressBar.switchToDeterminate(numFiles)
         fileCount = 0;
@@ -369,7 +383,7 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
             else:
                 # Save the DB locally in the temp folder. use file id as name to reduce collisions
                 lclDbPath = os.path.join(Temp_Dir, file.getName())
-                ContentUtils.writeToFile(file, File(lclDbPath))
+                self.extractionCache.linkTo(file, lclDbPath)
 
         self.log(Level.INFO, "Running prog ==> " + self.path_to_Recentlyused_file + " win7 " + Temp_Dir + "\Recently_Used " + " " + \
                                      Temp_Dir + "\\recentlyUsedApps.db3")
@@ -385,85 +399,25 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
             IngestServices.getInstance().postMessage(message)
         else:
             # Add custom Artifact to blackboard
-            try:
-               self.log(Level.INFO, "Begin Create New Artifacts ==> TSK_CCM_RECENTLY_USED_APPS")
-               artID_art = skCase.addArtifactType("TSK_CCM_RECENTLY_USED_APPS", "WMI Recently Used Apps")
-            except:		
-               self.log(Level.INFO, "Artifacts Creation Error, artifact TSK_CCM_RECENTLY_USED_APPS exists. ==> ")
-
-            # Add Custom attributes to blackboard
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_EXPLORER_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Explorer File Name")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Explorer File Name ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_FILE_SIZE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Size")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, File Size ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_LAST_USED_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Last Used Time")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Last Used Time ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_TIME_ZONE_OFFSET", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Time Zone Offset")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Time Zone Offset ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_LAUNCH_COUNT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Launch Count")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Launch Count ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_ORIG_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Original File Name")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Original File Name ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_FILE_DESC", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Description")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, File Description ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_PROD_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Name")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Product Name ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_PROD_VERSION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Version")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Product Version ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_FILE_VERSION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Version")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, File Version ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_ADDITIONAL_PROD_CODES", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Additional Product Codes")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Additional Product Codes ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_MSI_VERSION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "MSI Version")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, MSI Version ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_MSI_DISPLAY_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "MSI Display Name")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, MSI Display Name ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_PRODUCT_CODE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Code")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Product Code ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_SOFTWARE_PROP_HASH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Software Property Hash")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Software Property Hash ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_PROD_LANG", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Language")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, Product Language ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_FILE_PROP_HASH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Property Hash")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, File Property Hash ==> ")
-            try:
-               attID_efn = skCase.addArtifactAttributeType("TSK_MSI_PUBLISHER", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "MSI Publisher")
-            except:		
-                 self.log(Level.INFO, "Attributes Creation Error, MSI Publisher ==> ")
+            artID_art = registry.getOrAddArtifactType("TSK_CCM_RECENTLY_USED_APPS", "WMI Recently Used Apps").getTypeID()
+            attID_efn = registry.getOrAddAttributeType("TSK_EXPLORER_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Explorer File Name")
+            attID_efn = registry.getOrAddAttributeType("TSK_FILE_SIZE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Size")
+            attID_efn = registry.getOrAddAttributeType("TSK_LAST_USED_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Last Used Time")
+            attID_efn = registry.getOrAddAttributeType("TSK_TIME_ZONE_OFFSET", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Time Zone Offset")
+            attID_efn = registry.getOrAddAttributeType("TSK_LAUNCH_COUNT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Launch Count")
+            attID_efn = registry.getOrAddAttributeType("TSK_ORIG_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Original File Name")
+            attID_efn = registry.getOrAddAttributeType("TSK_FILE_DESC", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Description")
+            attID_efn = registry.getOrAddAttributeType("TSK_PROD_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Name")
+            attID_efn = registry.getOrAddAttributeType("TSK_PROD_VERSION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Version")
+            attID_efn = registry.getOrAddAttributeType("TSK_FILE_VERSION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Version")
+            attID_efn = registry.getOrAddAttributeType("TSK_ADDITIONAL_PROD_CODES", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Additional Product Codes")
+            attID_efn = registry.getOrAddAttributeType("TSK_MSI_VERSION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "MSI Version")
+            attID_efn = registry.getOrAddAttributeType("TSK_MSI_DISPLAY_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "MSI Display Name")
+            attID_efn = registry.getOrAddAttributeType("TSK_PRODUCT_CODE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Code")
+            attID_efn = registry.getOrAddAttributeType("TSK_SOFTWARE_PROP_HASH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Software Property Hash")
+            attID_efn = registry.getOrAddAttributeType("TSK_PROD_LANG", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Product Language")
+            attID_efn = registry.getOrAddAttributeType("TSK_FILE_PROP_HASH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Property Hash")
+            attID_efn = registry.getOrAddAttributeType("TSK_MSI_PUBLISHER", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "MSI Publisher")
 
             for file in files:
                if (file.getName() == "OBJECTS.DATA"):
@@ -500,8 +454,7 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
                        self.log(Level.INFO, "Error querying database for recently_used table (" + e.getMessage() + ")")
                        return IngestModule.ProcessResult.OK
 
-                    artID_hst = skCase.getArtifactTypeID("TSK_CCM_RECENTLY_USED_APPS")
-                    artID_hst_evt = skCase.getArtifactType("TSK_CCM_RECENTLY_USED_APPS")
+                    artID_hst = registry.getArtifactTypeID("TSK_CCM_RECENTLY_USED_APPS")
 
                     meta = resultSet.getMetaData()
                     columncount = meta.getColumnCount()
@@ -518,54 +471,49 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
                            #self.log(Level.INFO, SQL_String_1)
                            self.log(Level.INFO, "Artifact Is ==> " + str(artID_hst))
                            
-                           art = file.newArtifact(artID_hst)
+                           attributes = []
                            self.log(Level.INFO, "Inserting attribute URL")
                            for col_name in column_names:
-                               attID_ex1 = skCase.getAttributeType(col_name)
+                               attID_ex1 = registry.getAttributeType(col_name)
                                self.log(Level.INFO, "Inserting attribute ==> " + str(attID_ex1))
                                self.log(Level.INFO, "Attribute Type ==> " + str(attID_ex1.getValueType()))
                                if attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet.getString(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet.getString(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes String Creation Error, " + col_name + " ==> ")
                                elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.INTEGER:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet.getInt(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet.getInt(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes Integer Creation Error, " + col_name + " ==> ")
                                elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet.getInt(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet.getInt(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes Long Creation Error, " + col_name + " ==> ")
                                elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DOUBLE:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet.getInt(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet.getInt(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes Double Creation Error, " + col_name + " ==> ")
                                elif attID_ex1.getValueType() == BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.BYTE:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet.getString(col_name)))
+                                        attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet.getString(col_name)))
                                     except:		
                                         self.log(Level.INFO, "Attributes Byte Creation Error, " + col_name + " ==> ")
                                else:
                                     try:
-                                        art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, int(resultSet.getString(col_name))))
+                                        attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, int(resultSet.getString(col_name))))
                                     except:		
                                         self.log(Level.INFO, "Attributes Datatime Creation Error, " + col_name + " ==> ")
 
-                           # index the artifact for keyword search
-                           try:
-                               blackboard.indexArtifact(art)
-                           except:
-                               self.log(Level.SEVERE, "Error indexing artifact " + art.getDisplayName())
+                           poster.newArtifact(file, artID_hst, attributes)
                 
                        except SQLException as e:
                            self.log(Level.INFO, "Error getting values from web_history table (" + e.getMessage() + ")")
 
-                    IngestServices.getInstance().fireModuleDataEvent(
-                           ModuleDataEvent(Windows_InternalsIngestModuleFactory.moduleName, artID_hst_evt, None))
+                    poster.flush()
 
                     stmt.close()
                     dbConn.close()
@@ -596,102 +544,59 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
 		# exist and if not then create them
         skCase = Case.getCurrentCase().getSleuthkitCase();
                 
-        # This will work in 4.0.1 and beyond
-        # Use blackboard class to index blackboard artifacts for keyword search
-        blackboard = Case.getCurrentCase().getServices().getBlackboard()
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(Windows_InternalsIngestModuleFactory.moduleName)
 
-        try:
-             self.log(Level.INFO, "Begin Create New Artifacts")
-             artID_cat1 = skCase.addArtifactType( "TSK_FH_CATALOG_1", "File History Catalog 1")
-        except:		
-             self.log(Level.INFO, "Artifacts Creation Error, Catalog 1. ==> ")
-             artID_cat1 = skCase.getArtifactTypeID("TSK_FH_CATALOG_1")
-        try:
-             self.log(Level.INFO, "Begin Create New Artifacts")
-             artID_cat2 = skCase.addArtifactType( "TSK_FH_CATALOG_2", "File History Catalog 2")
-        except:		
-             self.log(Level.INFO, "Artifacts Creation Error, Catalog 2. ==> ")
-             artID_cat2 = skCase.getArtifactTypeID("TSK_FH_CATALOG_2")
-             
-        # Create the attribute type, if it exists then catch the error
-        try:
-            attID_fh_pn = skCase.addArtifactAttributeType('TSK_FH_PATH', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Parent Path")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Prefetch Parent Path. ==> ")
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(Windows_InternalsIngestModuleFactory.moduleName)
 
-        try:
-            attID_fh_fn = skCase.addArtifactAttributeType('TSK_FH_FILE_NAME', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Name")			 
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, File Name. ==> ")
+        artID_cat1 = registry.getOrAddArtifactType( "TSK_FH_CATALOG_1", "File History Catalog 1").getTypeID()
+        artID_cat2 = registry.getOrAddArtifactType( "TSK_FH_CATALOG_2", "File History Catalog 2").getTypeID()
+        attID_fh_pn = registry.getOrAddAttributeType('TSK_FH_PATH', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Parent Path")
 
-        try:
-            attID_fh_fs = skCase.addArtifactAttributeType('TSK_FH_FILE_SIZE', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Size")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, File Size. ==> ")
+        attID_fh_fn = registry.getOrAddAttributeType('TSK_FH_FILE_NAME', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Name")
 
-        try:
-            attID_fh_usn = skCase.addArtifactAttributeType('TSK_FH_USN_JOURNAL_ENTRY', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "USN Journal Entry")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, USN Journal Entry. ==> ")
+        attID_fh_fs = registry.getOrAddAttributeType('TSK_FH_FILE_SIZE', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Size")
 
-        try:
-            attID_fh_fc = skCase.addArtifactAttributeType('TSK_FH_FILE_CREATED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "File Created")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, File Created. ==> ")
+        attID_fh_usn = registry.getOrAddAttributeType('TSK_FH_USN_JOURNAL_ENTRY', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "USN Journal Entry")
 
-        try:
-            attID_fh_fm = skCase.addArtifactAttributeType('TSK_FH_FILE_MODIFIED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "File Modified")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 3. ==> ")
+        attID_fh_fc = registry.getOrAddAttributeType('TSK_FH_FILE_CREATED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "File Created")
 
-        try:
-            attID_fh_bq = skCase.addArtifactAttributeType('TSK_FH_BACKUP_QUEUED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Queued")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Backup Queued ==> ")
+        attID_fh_fm = registry.getOrAddAttributeType('TSK_FH_FILE_MODIFIED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "File Modified")
 
-        try:
-            attID_fh_bc = skCase.addArtifactAttributeType('TSK_FH_BACKUP_CREATED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Created")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Backup Created ==> ")
+        attID_fh_bq = registry.getOrAddAttributeType('TSK_FH_BACKUP_QUEUED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Queued")
 
-        try:
-            attID_fh_bcp = skCase.addArtifactAttributeType('TSK_FH_BACKUP_CAPTURED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Captured")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Backup Captured. ==> ")
+        attID_fh_bc = registry.getOrAddAttributeType('TSK_FH_BACKUP_CREATED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Created")
 
-        try:
-            attID_fh_bu = skCase.addArtifactAttributeType('TSK_FH_BACKUP_UPDATED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Updated")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Backup Updated. ==> ")
+        attID_fh_bcp = registry.getOrAddAttributeType('TSK_FH_BACKUP_CAPTURED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Captured")
 
-        try:
-            attID_fh_bv = skCase.addArtifactAttributeType('TSK_FH_BACKUP_VISIBLE', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Visible")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Backup Visible ==> ")
+        attID_fh_bu = registry.getOrAddAttributeType('TSK_FH_BACKUP_UPDATED', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Updated")
+
+        attID_fh_bv = registry.getOrAddAttributeType('TSK_FH_BACKUP_VISIBLE', BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "Backup Visible")
 
         self.log(Level.INFO, "Get Artifacts after they were created.")
         # Get the new artifacts and attributes that were just created
-        #artID_wfh = skCase.getArtifactTypeID("TSK_PREFETCH")
-        #artID_cat1 = skCase.getArtifactType("TSK_FH_CATALOG_1")
-        #artID_cat2 = skCase.getArtifactType("TSK_FH_CATALOG_2")
-        attID_fh_pn = skCase.getAttributeType("TSK_FH_PATH")
-        attID_fh_fn = skCase.getAttributeType("TSK_FH_FILE_NAME")
-        attID_fh_fs = skCase.getAttributeType("TSK_FH_FILE_SIZE")
-        attID_fh_usn = skCase.getAttributeType("TSK_FH_USN_JOURNAL_ENTRY")
-        attID_fh_fc = skCase.getAttributeType("TSK_FH_FILE_CREATED")
-        attID_fh_fm = skCase.getAttributeType("TSK_FH_FILE_MODIFIED")
-        attID_fh_bq = skCase.getAttributeType("TSK_FH_BACKUP_QUEUED")
-        attID_fh_bc = skCase.getAttributeType("TSK_FH_BACKUP_CREATED")
-        attID_fh_bcp = skCase.getAttributeType("TSK_FH_BACKUP_CAPTURED")
-        attID_fh_bu = skCase.getAttributeType("TSK_FH_BACKUP_UPDATED")
-        attID_fh_bv = skCase.getAttributeType("TSK_FH_BACKUP_VISIBLE")
+        #artID_wfh = registry.getArtifactTypeID("TSK_PREFETCH")
+        #artID_cat1 = registry.getArtifactType("TSK_FH_CATALOG_1")
+        #artID_cat2 = registry.getArtifactType("TSK_FH_CATALOG_2")
+        attID_fh_pn = registry.getAttributeType("TSK_FH_PATH")
+        attID_fh_fn = registry.getAttributeType("TSK_FH_FILE_NAME")
+        attID_fh_fs = registry.getAttributeType("TSK_FH_FILE_SIZE")
+        attID_fh_usn = registry.getAttributeType("TSK_FH_USN_JOURNAL_ENTRY")
+        attID_fh_fc = registry.getAttributeType("TSK_FH_FILE_CREATED")
+        attID_fh_fm = registry.getAttributeType("TSK_FH_FILE_MODIFIED")
+        attID_fh_bq = registry.getAttributeType("TSK_FH_BACKUP_QUEUED")
+        attID_fh_bc = registry.getAttributeType("TSK_FH_BACKUP_CREATED")
+        attID_fh_bcp = registry.getAttributeType("TSK_FH_BACKUP_CAPTURED")
+        attID_fh_bu = registry.getAttributeType("TSK_FH_BACKUP_UPDATED")
+        attID_fh_bv = registry.getAttributeType("TSK_FH_BACKUP_VISIBLE")
 
         # we don't know how much work there is yet
         progressBar.switchToIndeterminate()
         
         # Find the file history files from the users folders
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "%edb", "%/Windows/FileHistory/%")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "%edb", "%/Windows/FileHistory/%"))
         
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
@@ -716,11 +621,10 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
             #self.log(Level.INFO, "Processing file: " + file.getName())
             fileCount += 1
 
-            # Save the DB locally in the temp folder. use file id as name to reduce collisions
-            lclDbPath = os.path.join(Temp_Dir, file.getName() + "_" + str(file.getId()))
+            # The program only reads the catalog, so it reads the extraction cache copy
+            lclDbPath = self.extractionCache.getLocalPath(file)
             db_name = os.path.splitext(file.getName())[0]
             lclSQLPath = os.path.join(Temp_Dir, db_name + "_" + str(file.getId()) + ".db3")
-            ContentUtils.writeToFile(file, File(lclDbPath))
                         
             # Run the EXE, saving output to a sqlite database
             self.log(Level.INFO, "Running program on data source parm 1 ==> " + self.path_to_Filehistory_file + " " + lclDbPath + " " + lclSQLPath)
@@ -730,11 +634,11 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
             self.log(Level.INFO, "Output from run is ==> " + out_text)                
 		
             if db_name == "Catalog1":
-                artID_fh = skCase.getArtifactTypeID("TSK_FH_CATALOG_1")
-                artID_fh_evt = skCase.getArtifactType("TSK_FH_CATALOG_1")
+                artID_fh = registry.getArtifactTypeID("TSK_FH_CATALOG_1")
+                artID_fh_evt = registry.getArtifactType("TSK_FH_CATALOG_1")
             else:
-                artID_fh = skCase.getArtifactTypeID("TSK_FH_CATALOG_2")
-                artID_fh_evt = skCase.getArtifactType("TSK_FH_CATALOG_2")
+                artID_fh = registry.getArtifactTypeID("TSK_FH_CATALOG_2")
+                artID_fh_evt = registry.getArtifactType("TSK_FH_CATALOG_2")
 
             userpath = file.getParentPath()
             username = userpath.split('/')
@@ -801,13 +705,9 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
                                   (BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), \
                                     Windows_InternalsIngestModuleFactory.moduleName, username[2]))))
                 
-                try:
-                    #index the artifact for keyword search
-                    blackboard.indexArtifact(art)
-                except Blackboard.BlackboardException as e:
-                    self.log(Level.SEVERE, "Error indexing artifact " + art.getDisplayName())
+                poster.postArtifact(art)
                 
-            IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(Windows_InternalsIngestModuleFactory.moduleName, artID_fh_evt, None))
+            poster.flush()
             
             # Clean up
             stmt.close()
@@ -829,125 +729,57 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
         skCase = Case.getCurrentCase().getSleuthkitCase();
         #skCase_Tran = skCase.beginTransaction()
 
-        # Use blackboard class to index blackboard artifacts for keyword search
-        blackboard = Case.getCurrentCase().getServices().getBlackboard()
-
-        try:
-             self.log(Level.INFO, "Begin Create New Artifacts")
-             artID_jl_ad = skCase.addArtifactType( "TSK_JL_AD", "Jump List Auto Dest")
-        except:		
-             self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-             artID_jl_ad = skCase.getArtifactTypeID("TSK_JL_AD")
-
-        try:
-            attID_jl_fn = skCase.addArtifactAttributeType("TSK_JLAD_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "JumpList File Name")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, JL AD File Name. ==> ")
-        try:
-            attID_jl_fg = skCase.addArtifactAttributeType("TSK_JLAD_FILE_DESCRIPTION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Description")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, File Description. ==> ")
-        try:
-            attID_jl_in = skCase.addArtifactAttributeType("TSK_JLAD_ITEM_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Item Name")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Item Name. ==> ")
-        try:
-            attID_jl_cl = skCase.addArtifactAttributeType("TSK_JLAD_COMMAND_LINE_ARGS", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Command Line Args")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Command Line Arguments. ==> ")
-        try:
-            attID_jl_dt = skCase.addArtifactAttributeType("TSK_JLAD_Drive Type", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "Drive Type")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Drive Type. ==> ")
-        try:
-            attID_jl_dsn = skCase.addArtifactAttributeType("TSK_JLAD_DRIVE_SERIAL_NUMBER", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "Drive Serial Number")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Drive Serial Number. ==> ")
-        try:
-            attID_jl_des = skCase.addArtifactAttributeType("TSK_JLAD_DESCRIPTION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Description")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Description. ==> ")
-        try:
-            attID_jl_evl = skCase.addArtifactAttributeType("TSK_JLAD_ENVIRONMENT_VARIABLES_LOCATION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Env Var Location")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Env Var Location. ==> ")
-        try:
-            attID_jl_fat = skCase.addArtifactAttributeType("TSK_JLAD_FILE_ACCESS_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Access Time")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, File Access Time. ==> ")
-        try:
-            attID_jl_faf = skCase.addArtifactAttributeType("TSK_JLAD_FILE_ATTRIBUTE_FLAGS", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "File Attribute Flags")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, File Attribute Flags. ==> ")
-        try:
-            attID_jl_fct = skCase.addArtifactAttributeType("TSK_JLAD_FILE_CREATION_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Creation Time")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, File Creation Time. ==> ")
-        try:
-            attID_jl_fmt = skCase.addArtifactAttributeType("TSK_JLAD_FILE_MODIFICATION_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Modification Time")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, File Modification Time. ==> ")
-        try:
-            attID_jl_fs = skCase.addArtifactAttributeType("TSK_JLAD_FILE_SIZE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "File Size")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, File Size. ==> ")
-        try:
-            attID_jl_ic = skCase.addArtifactAttributeType("TSK_JLAD_ICON_LOCATION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Icon Location")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Icon Location. ==> ")
-        try:
-            attID_jl_ltid = skCase.addArtifactAttributeType("TSK_JLAD_LINK_TARGET_IDENTIFIER_DATA", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Link Target Identifier Data")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Link Target Identifier Data. ==> ")
-        try:
-            attID_jl_lp = skCase.addArtifactAttributeType("TSK_JLAD_LOCAL_PATH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Local Path")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, File Modification Time. ==> ")
-        try:
-            attID_jl_mi = skCase.addArtifactAttributeType("TSK_JLAD_FILE_MACHINE_IDENTIFIER", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Machine Identifier")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Machine Identifier. ==> ")
-        try:
-            attID_jl_np = skCase.addArtifactAttributeType("TSK_JLAD_NETWORK_PATH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Network Path")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Network Path. ==> ")
-        try:
-            attID_jl_rp = skCase.addArtifactAttributeType("TSK_JLAD_RELATIVE_PATH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Relative Path")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Relative Path. ==> ")
-        try:
-            attID_jl_vl = skCase.addArtifactAttributeType("TSK_JLAD_VOLUME_LABEL", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Volume Label")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Volume Label. ==> ")
-        try:
-            attID_jl_wc = skCase.addArtifactAttributeType("TSK_JLAD_WORKING_DIRECTORY", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Working Directory")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Working Directory. ==> ")
-
-        # Get the new artifacts and attributes that were just created
-        artID_jl_ad = skCase.getArtifactTypeID("TSK_JL_AD")
-        artID_jl_ad_evt = skCase.getArtifactType("TSK_JL_AD")
-        attID_jl_fn = skCase.getAttributeType("TSK_JLAD_FILE_NAME")
-        attID_jl_fg = skCase.getAttributeType("TSK_JLAD_FILE_DESCRIPTION")
-        attID_jl_in = skCase.getAttributeType("TSK_JLAD_ITEM_NAME")			 
-        attID_jl_cl = skCase.getAttributeType("TSK_JLAD_COMMAND_LINE_ARGS")
-        attID_jl_dt = skCase.getAttributeType("TSK_JLAD_Drive Type")
-        attID_jl_dsn = skCase.getAttributeType("TSK_JLAD_DRIVE_SERIAL_NUMBER")
-        attID_jl_des = skCase.getAttributeType("TSK_JLAD_DESCRIPTION")
-        attID_jl_evl = skCase.getAttributeType("TSK_JLAD_ENVIRONMENT_VARIABLES_LOCATION")
-        attID_jl_fat = skCase.getAttributeType("TSK_JLAD_FILE_ACCESS_TIME")
-        attID_jl_faf = skCase.getAttributeType("TSK_JLAD_FILE_ATTRIBUTE_FLAGS")
-        attID_jl_fct = skCase.getAttributeType("TSK_JLAD_FILE_CREATION_TIME")
-        attID_jl_fmt = skCase.getAttributeType("TSK_JLAD_FILE_MODIFICATION_TIME")
-        attID_jl_fs = skCase.getAttributeType("TSK_JLAD_FILE_SIZE")
-        attID_jl_ic = skCase.getAttributeType("TSK_JLAD_ICON_LOCATION")
-        attID_jl_ltid = skCase.getAttributeType("TSK_JLAD_LINK_TARGET_IDENTIFIER_DATA")
-        attID_jl_lp = skCase.getAttributeType("TSK_JLAD_LOCAL_PATH")
-        attID_jl_mi = skCase.getAttributeType("TSK_JLAD_FILE_MACHINE_IDENTIFIER")
-        attID_jl_np = skCase.getAttributeType("TSK_JLAD_NETWORK_PATH")
-        attID_jl_rp = skCase.getAttributeType("TSK_JLAD_RELATIVE_PATH")
-        attID_jl_vl = skCase.getAttributeType("TSK_JLAD_VOLUME_LABEL")
-        attID_jl_wd = skCase.getAttributeType("TSK_JLAD_WORKING_DIRECTORY")
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(Windows_InternalsIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(Windows_InternalsIngestModuleFactory.moduleName)
+
+        artID_jl_ad = registry.getOrAddArtifactType( "TSK_JL_AD", "Jump List Auto Dest").getTypeID()
+
+        attID_jl_fn = registry.getOrAddAttributeType("TSK_JLAD_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "JumpList File Name")
+        attID_jl_fg = registry.getOrAddAttributeType("TSK_JLAD_FILE_DESCRIPTION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Description")
+        attID_jl_in = registry.getOrAddAttributeType("TSK_JLAD_ITEM_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Item Name")
+        attID_jl_cl = registry.getOrAddAttributeType("TSK_JLAD_COMMAND_LINE_ARGS", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Command Line Args")
+        attID_jl_dt = registry.getOrAddAttributeType("TSK_JLAD_Drive Type", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "Drive Type")
+        attID_jl_dsn = registry.getOrAddAttributeType("TSK_JLAD_DRIVE_SERIAL_NUMBER", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "Drive Serial Number")
+        attID_jl_des = registry.getOrAddAttributeType("TSK_JLAD_DESCRIPTION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Description")
+        attID_jl_evl = registry.getOrAddAttributeType("TSK_JLAD_ENVIRONMENT_VARIABLES_LOCATION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Env Var Location")
+        attID_jl_fat = registry.getOrAddAttributeType("TSK_JLAD_FILE_ACCESS_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Access Time")
+        attID_jl_faf = registry.getOrAddAttributeType("TSK_JLAD_FILE_ATTRIBUTE_FLAGS", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "File Attribute Flags")
+        attID_jl_fct = registry.getOrAddAttributeType("TSK_JLAD_FILE_CREATION_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Creation Time")
+        attID_jl_fmt = registry.getOrAddAttributeType("TSK_JLAD_FILE_MODIFICATION_TIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "File Modification Time")
+        attID_jl_fs = registry.getOrAddAttributeType("TSK_JLAD_FILE_SIZE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, "File Size")
+        attID_jl_ic = registry.getOrAddAttributeType("TSK_JLAD_ICON_LOCATION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Icon Location")
+        attID_jl_ltid = registry.getOrAddAttributeType("TSK_JLAD_LINK_TARGET_IDENTIFIER_DATA", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Link Target Identifier Data")
+        attID_jl_lp = registry.getOrAddAttributeType("TSK_JLAD_LOCAL_PATH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Local Path")
+        attID_jl_mi = registry.getOrAddAttributeType("TSK_JLAD_FILE_MACHINE_IDENTIFIER", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Machine Identifier")
+        attID_jl_np = registry.getOrAddAttributeType("TSK_JLAD_NETWORK_PATH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Network Path")
+        attID_jl_rp = registry.getOrAddAttributeType("TSK_JLAD_RELATIVE_PATH", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Relative Path")
+        attID_jl_vl = registry.getOrAddAttributeType("TSK_JLAD_VOLUME_LABEL", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Volume Label")
+        attID_jl_wc = registry.getOrAddAttributeType("TSK_JLAD_WORKING_DIRECTORY", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Working Directory")
+        artID_jl_ad = registry.getArtifactTypeID("TSK_JL_AD")
+        attID_jl_fn = registry.getAttributeType("TSK_JLAD_FILE_NAME")
+        attID_jl_fg = registry.getAttributeType("TSK_JLAD_FILE_DESCRIPTION")
+        attID_jl_in = registry.getAttributeType("TSK_JLAD_ITEM_NAME")			 
+        attID_jl_cl = registry.getAttributeType("TSK_JLAD_COMMAND_LINE_ARGS")
+        attID_jl_dt = registry.getAttributeType("TSK_JLAD_Drive Type")
+        attID_jl_dsn = registry.getAttributeType("TSK_JLAD_DRIVE_SERIAL_NUMBER")
+        attID_jl_des = registry.getAttributeType("TSK_JLAD_DESCRIPTION")
+        attID_jl_evl = registry.getAttributeType("TSK_JLAD_ENVIRONMENT_VARIABLES_LOCATION")
+        attID_jl_fat = registry.getAttributeType("TSK_JLAD_FILE_ACCESS_TIME")
+        attID_jl_faf = registry.getAttributeType("TSK_JLAD_FILE_ATTRIBUTE_FLAGS")
+        attID_jl_fct = registry.getAttributeType("TSK_JLAD_FILE_CREATION_TIME")
+        attID_jl_fmt = registry.getAttributeType("TSK_JLAD_FILE_MODIFICATION_TIME")
+        attID_jl_fs = registry.getAttributeType("TSK_JLAD_FILE_SIZE")
+        attID_jl_ic = registry.getAttributeType("TSK_JLAD_ICON_LOCATION")
+        attID_jl_ltid = registry.getAttributeType("TSK_JLAD_LINK_TARGET_IDENTIFIER_DATA")
+        attID_jl_lp = registry.getAttributeType("TSK_JLAD_LOCAL_PATH")
+        attID_jl_mi = registry.getAttributeType("TSK_JLAD_FILE_MACHINE_IDENTIFIER")
+        attID_jl_np = registry.getAttributeType("TSK_JLAD_NETWORK_PATH")
+        attID_jl_rp = registry.getAttributeType("TSK_JLAD_RELATIVE_PATH")
+        attID_jl_vl = registry.getAttributeType("TSK_JLAD_VOLUME_LABEL")
+        attID_jl_wd = registry.getAttributeType("TSK_JLAD_WORKING_DIRECTORY")
         
         # we don't know how much work there is yet
         progressBar.switchToIndeterminate()
@@ -956,7 +788,7 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
         files = []		
         
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "%.automaticDestinations-ms")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "%.automaticDestinations-ms"))
 
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
@@ -983,7 +815,7 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
 
             # Save the DB locally in the temp folder. use file id as name to reduce collisions
             lclDbPath = os.path.join(Temp_Dir, file.getName())
-            ContentUtils.writeToFile(file, File(lclDbPath))
+            self.extractionCache.linkTo(file, lclDbPath)
                         
         # Run the EXE, saving output to a sqlite database
         self.log(Level.INFO, "Running program on data source parm 1 ==> " + Temp_Dir + "  Parm 2 ==> " + os.path.join(Temp_Dir, "JL_AD.db3"))
@@ -1076,15 +908,10 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
                                    (BlackboardAttribute(attID_jl_vl, Windows_InternalsIngestModuleFactory.moduleName, Volume_Label)), \
                                    (BlackboardAttribute(attID_jl_wd, Windows_InternalsIngestModuleFactory.moduleName, Working_Directory))))
 			
-                try:
-                    # index the artifact for keyword search
-                    blackboard.indexArtifact(art)
-                except:
-                    self.log(Level.SEVERE, "Error indexing artifact " + art.getDisplayName())
+                poster.postArtifact(art)
                 
             # Fire an event to notify the UI and others that there are new artifacts  
-            IngestServices.getInstance().fireModuleDataEvent(
-                ModuleDataEvent(Windows_InternalsIngestModuleFactory.moduleName, artID_jl_ad_evt, None))
+            poster.flush()
                 
             # Clean up
             #skCase_Tran.commit()
@@ -1109,88 +936,49 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
 		# exist and if not then create them
         skCase = Case.getCurrentCase().getSleuthkitCase();
                 
-        # This will work in 4.0.1 and beyond
-        # Use blackboard class to index blackboard artifacts for keyword search
-        blackboard = Case.getCurrentCase().getServices().getBlackboard()
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(Windows_InternalsIngestModuleFactory.moduleName)
 
-        try:
-             self.log(Level.INFO, "Begin Create New Artifacts")
-             artID_pf = skCase.addArtifactType( "TSK_PREFETCH", "Windows Prefetch")
-        except:		
-             self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-             artID_pf = skCase.getArtifactTypeID("TSK_PREFETCH")
-             
-        # Create the attribute type, if it exists then catch the error
-        try:
-            attID_pf_fn = skCase.addArtifactAttributeType("TSK_PREFETCH_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Prefetch File Name")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Prefetch File Name. ==> ")
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(Windows_InternalsIngestModuleFactory.moduleName)
 
-        try:
-            attID_pf_an = skCase.addArtifactAttributeType("TSK_PREFETCH_ACTUAL_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Actual File Name")			 
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Actual File Name. ==> ")
+        artID_pf = registry.getOrAddArtifactType( "TSK_PREFETCH", "Windows Prefetch").getTypeID()
+        attID_pf_fn = registry.getOrAddAttributeType("TSK_PREFETCH_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Prefetch File Name")
 
-        try:
-            attID_nr = skCase.addArtifactAttributeType("TSK_PF_RUN_COUNT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Program Number Runs")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, Program Number Runs. ==> ")
+        attID_pf_an = registry.getOrAddAttributeType("TSK_PREFETCH_ACTUAL_FILE_NAME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Actual File Name")
 
-        try:
-            attID_ex1 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_1", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 1")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 1. ==> ")
+        attID_nr = registry.getOrAddAttributeType("TSK_PF_RUN_COUNT", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Program Number Runs")
 
-        try:
-            attID_ex2 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_2", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 2")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 2. ==> ")
+        attID_ex1 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_1", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 1")
 
-        try:
-            attID_ex3 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_3", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 3")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 3. ==> ")
+        attID_ex2 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_2", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 2")
 
-        try:
-            attID_ex4 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_4", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 4")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 4 ==> ")
+        attID_ex3 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_3", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 3")
 
-        try:
-            attID_ex5 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_5", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 5")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 5. ==> ")
+        attID_ex4 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_4", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 4")
 
-        try:
-            attID_ex6 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_6", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 6")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 6. ==> ")
+        attID_ex5 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_5", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 5")
 
-        try:
-            attID_ex7 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_7", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 7")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 7. ==> ")
+        attID_ex6 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_6", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 6")
 
-        try:
-            attID_ex8 = skCase.addArtifactAttributeType("TSK_PF_EXEC_DTTM_8", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 8")
-        except:		
-             self.log(Level.INFO, "Attributes Creation Error, PF Execution DTTM 8 ==> ")
+        attID_ex7 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_7", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 7")
+
+        attID_ex8 = registry.getOrAddAttributeType("TSK_PF_EXEC_DTTM_8", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, "PF Execution DTTM 8")
 
         self.log(Level.INFO, "Get Artifacts after they were created.")
         # Get the new artifacts and attributes that were just created
-        artID_pf = skCase.getArtifactTypeID("TSK_PREFETCH")
-        artID_pf_evt = skCase.getArtifactType("TSK_PREFETCH")
-        attID_pf_fn = skCase.getAttributeType("TSK_PREFETCH_FILE_NAME")
-        attID_pf_an = skCase.getAttributeType("TSK_PREFETCH_ACTUAL_FILE_NAME")
-        attID_nr = skCase.getAttributeType("TSK_PF_RUN_COUNT")
-        attID_ex1 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_1")
-        attID_ex2 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_2")
-        attID_ex3 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_3")
-        attID_ex4 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_4")
-        attID_ex5 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_5")
-        attID_ex6 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_6")
-        attID_ex7 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_7")
-        attID_ex8 = skCase.getAttributeType("TSK_PF_EXEC_DTTM_8")
+        artID_pf = registry.getArtifactTypeID("TSK_PREFETCH")
+        attID_pf_fn = registry.getAttributeType("TSK_PREFETCH_FILE_NAME")
+        attID_pf_an = registry.getAttributeType("TSK_PREFETCH_ACTUAL_FILE_NAME")
+        attID_nr = registry.getAttributeType("TSK_PF_RUN_COUNT")
+        attID_ex1 = registry.getAttributeType("TSK_PF_EXEC_DTTM_1")
+        attID_ex2 = registry.getAttributeType("TSK_PF_EXEC_DTTM_2")
+        attID_ex3 = registry.getAttributeType("TSK_PF_EXEC_DTTM_3")
+        attID_ex4 = registry.getAttributeType("TSK_PF_EXEC_DTTM_4")
+        attID_ex5 = registry.getAttributeType("TSK_PF_EXEC_DTTM_5")
+        attID_ex6 = registry.getAttributeType("TSK_PF_EXEC_DTTM_6")
+        attID_ex7 = registry.getAttributeType("TSK_PF_EXEC_DTTM_7")
+        attID_ex8 = registry.getAttributeType("TSK_PF_EXEC_DTTM_8")
 
         # Used to crossref ADS prefetch files
         prefetchFileName = {}
@@ -1201,7 +989,7 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
         
         # Find the prefetch files and the layout.ini file from the /windows/prefetch folder
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "%.pf")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "%.pf"))
         
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
@@ -1234,7 +1022,7 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
             else:
                 prefetchFileName[fileName] = file
             lclDbPath = os.path.join(Temp_Dir, file.getName())
-            ContentUtils.writeToFile(file, File(lclDbPath))
+            self.extractionCache.linkTo(file, lclDbPath)
                         
         # Run the EXE, saving output to a sqlite database
         self.log(Level.INFO, "Running program on data source parm 1 ==> " + Temp_Dir + "  Parm 2 ==> " + Case.getCurrentCase().getTempDirectory())
@@ -1307,13 +1095,9 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
                               (BlackboardAttribute(attID_ex7, Windows_InternalsIngestModuleFactory.moduleName, Time_7)), \
                               (BlackboardAttribute(attID_ex8, Windows_InternalsIngestModuleFactory.moduleName, Time_8))))
             
-            try:
-                #index the artifact for keyword search
-                blackboard.indexArtifact(art)
-            except:
-                self.log(Level.SEVERE, "Error indexing artifact " + art.getDisplayName())
+            poster.postArtifact(art)
 			
-        IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(Windows_InternalsIngestModuleFactory.moduleName, artID_pf_evt, None))
+        poster.flush()
         # Clean up
         try:
             stmt.close()
@@ -1335,11 +1119,14 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
         # Set the database to be read to the once created by the SAM parser program
         skCase = Case.getCurrentCase().getSleuthkitCase()
         
-        # Use blackboard class to index blackboard artifacts for keyword search
-        blackboard = Case.getCurrentCase().getServices().getBlackboard()
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(Windows_InternalsIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(Windows_InternalsIngestModuleFactory.moduleName)
 
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "SAM", "config")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "SAM", "config"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -1365,7 +1152,7 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
 
             # Save the DB locally in the temp folder. use file id as name to reduce collisions
             lclDbPath = os.path.join(Temp_Dir, file.getName())
-            ContentUtils.writeToFile(file, File(lclDbPath))
+            self.extractionCache.linkTo(file, lclDbPath)
                         
         # Run the EXE, saving output to a sqlite database
         self.log(Level.INFO, "Running program on data source parm 1 ==> " + Temp_Dir + "  Parm 2 ==> " + Temp_Dir + "\\SAM.db3")
@@ -1393,14 +1180,7 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
                self.log(Level.INFO, "Error querying database for SAM table (" + e.getMessage() + ")")
                return IngestModule.ProcessResult.OK
 
-           try:
-                self.log(Level.INFO, "Begin Create New Artifacts")
-                artID_sam = skCase.addArtifactType( "TSK_SAM", "SAM File")
-           except:		
-                self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-           artID_sam = skCase.getArtifactTypeID("TSK_SAM")
-           artID_sam_evt = skCase.getArtifactType("TSK_SAM")
+           artID_sam = registry.getOrAddArtifactType( "TSK_SAM", "SAM File").getTypeID()
              
            # Cycle through each row and create artifacts
            while resultSet.next():
@@ -1417,34 +1197,24 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
                       Column_Names.append(resultSet2.getString("name").upper())
                       Column_Types.append(resultSet2.getString("type"))
                       if resultSet2.getString("type") == "text":
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
+                          attID_ex1 = registry.getOrAddAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
                       else:
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, resultSet2.getString("name"))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
+                          attID_ex1 = registry.getOrAddAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, resultSet2.getString("name"))
 										 
                    resultSet3 = stmt.executeQuery(SQL_String_1)
                    while resultSet3.next():
-                      art = file.newArtifact(artID_sam)
+                      attributes = []
                       Column_Number = 1
                       for col_name in Column_Names:
                          c_name = "TSK_" + col_name
-                         attID_ex1 = skCase.getAttributeType(c_name)
+                         attID_ex1 = registry.getAttributeType(c_name)
                          if Column_Types[Column_Number - 1] == "text":
-                             art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
+                             attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
                          else:
-                             art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getInt(Column_Number)))
+                             attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getInt(Column_Number)))
                          Column_Number = Column_Number + 1
 
-                      # index the artifact for keyword search
-                      try:
-                          blackboard.indexArtifact(art)
-                      except:
-                          self.log(Level.SEVERE, "Error indexing artifact " + art.getDisplayName())
+                      poster.newArtifact(file, artID_sam, attributes)
                          
                except SQLException as e:
                    self.log(Level.INFO, "Error getting values from contacts table (" + e.getMessage() + ")")
@@ -1453,6 +1223,7 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
            stmt.close()
            dbConn.close()
            os.remove(lclDbPath)
+           poster.flush()
 			
 		#Clean up EventLog directory and files
         try:
@@ -1467,11 +1238,14 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
         # Set the database to be read to the once created by the SAM parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
  
-        # Use blackboard class to index blackboard artifacts for keyword search
-        blackboard = Case.getCurrentCase().getServices().getBlackboard()
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(Windows_InternalsIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(Windows_InternalsIngestModuleFactory.moduleName)
 
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "SYSTEM", "config")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "SYSTEM", "config"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -1493,14 +1267,13 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
            #self.log(Level.INFO, "Processing file: " + file.getName())
            fileCount += 1
 
-           # Save the DB locally in the temp folder. use file id as name to reduce collisions
-           lclDbPath = os.path.join(Temp_Dir, file.getName())
-           ContentUtils.writeToFile(file, File(lclDbPath))
+           # The program only reads the hive, so it reads the extraction cache copy
+           lclDbPath = self.extractionCache.getLocalPath(file)
            self.log(Level.INFO, "Saved File ==> " + lclDbPath)
 
            # Run the EXE, saving output to a sqlite database
-           self.log(Level.INFO, "Running program ==> " + self.path_to_Shimcache_file + " " + os.path.join(Temp_Dir, file.getName() + " " + os.path.join(Temp_Dir, "Shimcache_db.db3")))
-           pipe = Popen([self.path_to_Shimcache_file, os.path.join(Temp_Dir, file.getName()), os.path.join(Temp_Dir, "Shimcache_db.db3")], stdout=PIPE, stderr=PIPE)
+           self.log(Level.INFO, "Running program ==> " + self.path_to_Shimcache_file + " " + lclDbPath + " " + os.path.join(Temp_Dir, "Shimcache_db.db3"))
+           pipe = Popen([self.path_to_Shimcache_file, lclDbPath, os.path.join(Temp_Dir, "Shimcache_db.db3")], stdout=PIPE, stderr=PIPE)
            out_text = pipe.communicate()[0]
            self.log(Level.INFO, "Output from run is ==> " + out_text)               
                
@@ -1524,14 +1297,7 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
                self.log(Level.INFO, "Error querying database for system table (" + e.getMessage() + ")")
                return IngestModule.ProcessResult.OK
 
-           try:
-                self.log(Level.INFO, "Begin Create New Artifacts")
-                artID_shim = skCase.addArtifactType("TSK_SHIMCACHE", "Shimcache")
-           except:		
-                self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-           artID_shim = skCase.getArtifactTypeID("TSK_SHIMCACHE")
-           artID_shim_evt = skCase.getArtifactType("TSK_SHIMCACHE")
+           artID_shim = registry.getOrAddArtifactType("TSK_SHIMCACHE", "Shimcache").getTypeID()
              
              
            # Cycle through each row and create artifacts
@@ -1549,34 +1315,24 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
                       Column_Names.append(resultSet2.getString("name").upper())
                       Column_Types.append(resultSet2.getString("type"))
                       if resultSet2.getString("type").upper() == "TEXT":
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_SHIMCACHE_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
+                          attID_ex1 = registry.getOrAddAttributeType("TSK_SHIMCACHE_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
                       else:
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_SHIMCACHE_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, resultSet2.getString("name"))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
+                          attID_ex1 = registry.getOrAddAttributeType("TSK_SHIMCACHE_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME, resultSet2.getString("name"))
 										 
                    resultSet3 = stmt.executeQuery(SQL_String_1)
                    while resultSet3.next():
-                      art = file.newArtifact(artID_shim)
+                      attributes = []
                       Column_Number = 1
                       for col_name in Column_Names:
                          c_name = "TSK_SHIMCACHE_" + col_name
-                         attID_ex1 = skCase.getAttributeType(c_name)
+                         attID_ex1 = registry.getAttributeType(c_name)
                          if Column_Types[Column_Number - 1] == "TEXT":
-                             art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
+                             attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
                          else:
-                             art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getInt(Column_Number)))
+                             attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getInt(Column_Number)))
                          Column_Number = Column_Number + 1
 
-                      # index the artifact for keyword search
-                      try:
-                          blackboard.indexArtifact(art)
-                      except:
-                          self.log(Level.SEVERE, "Error indexing artifact " + art.getDisplayName())
+                      poster.newArtifact(file, artID_shim, attributes)
 						
                except SQLException as e:
                    self.log(Level.INFO, "Error getting values from Shimcache table (" + e.getMessage() + ")")
@@ -1585,6 +1341,7 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
            stmt.close()
            dbConn.close()
            os.remove(lclDbPath)
+           poster.flush()
 
         try:
              shutil.rmtree(Temp_Dir)		
@@ -1598,11 +1355,14 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
         # Set the database to be read to the once created by the SAM parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
 
-        # Use blackboard class to index blackboard artifacts for keyword search
-        blackboard = Case.getCurrentCase().getServices().getBlackboard()
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(Windows_InternalsIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(Windows_InternalsIngestModuleFactory.moduleName)
 
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "$UsnJrnl:$J", "$Extend")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "$UsnJrnl:$J", "$Extend"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -1624,14 +1384,13 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
            #self.log(Level.INFO, "Processing file: " + file.getName())
            fileCount += 1
 
-           # Save the DB locally in the temp folder. use file id as name to reduce collisions
-           lclDbPath = os.path.join(Temp_Dir, "usnj.txt")
-           ContentUtils.writeToFile(file, File(lclDbPath))
+           # The program only reads the journal, so it reads the extraction cache copy
+           lclDbPath = self.extractionCache.getLocalPath(file)
            self.log(Level.INFO, "Saved File ==> " + lclDbPath)
 
            # Run the EXE, saving output to a sqlite database
-           self.log(Level.INFO, "Running program ==> " + self.path_to_Usnj_file + " " + os.path.join(Temp_Dir, "usnj.txt") + " " + os.path.join(Temp_Dir, "usnj.db3"))
-           pipe = Popen([self.path_to_Usnj_file, os.path.join(Temp_Dir, "usnj.txt"), os.path.join(Temp_Dir, "usnj.db3")], stdout=PIPE, stderr=PIPE)
+           self.log(Level.INFO, "Running program ==> " + self.path_to_Usnj_file + " " + lclDbPath + " " + os.path.join(Temp_Dir, "usnj.db3"))
+           pipe = Popen([self.path_to_Usnj_file, lclDbPath, os.path.join(Temp_Dir, "usnj.db3")], stdout=PIPE, stderr=PIPE)
            out_text = pipe.communicate()[0]
            self.log(Level.INFO, "Output from run is ==> " + out_text)               
                
@@ -1655,14 +1414,7 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
                self.log(Level.INFO, "Error querying database for system table (" + e.getMessage() + ")")
                return IngestModule.ProcessResult.OK
 
-           try:
-                self.log(Level.INFO, "Begin Create New Artifacts")
-                artID_usnj = skCase.addArtifactType("TSK_USNJ", "NTFS UsrJrnl entries")
-           except:		
-                self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-           artID_usnj = skCase.getArtifactTypeID("TSK_USNJ")
-           artID_usnj_evt = skCase.getArtifactType("TSK_USNJ")
+           artID_usnj = registry.getOrAddArtifactType("TSK_USNJ", "NTFS UsrJrnl entries").getTypeID()
              
              
            # Cycle through each row and create artifacts
@@ -1680,34 +1432,24 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
                       Column_Names.append(resultSet2.getString("name").upper())
                       Column_Types.append(resultSet2.getString("type"))
                       if resultSet2.getString("type").upper() == "TEXT":
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_USNJ_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
+                          attID_ex1 = registry.getOrAddAttributeType("TSK_USNJ_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
                       else:
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_USNJ_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
+                          attID_ex1 = registry.getOrAddAttributeType("TSK_USNJ_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
 										 
                    resultSet3 = stmt.executeQuery(SQL_String_1)
                    while resultSet3.next():
-                      art = file.newArtifact(artID_usnj)
+                      attributes = []
                       Column_Number = 1
                       for col_name in Column_Names:
                          c_name = "TSK_USNJ_" + col_name
-                         attID_ex1 = skCase.getAttributeType(c_name)
+                         attID_ex1 = registry.getAttributeType(c_name)
                          if Column_Types[Column_Number - 1] == "TEXT":
-                             art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
+                             attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
                          else:
-                             art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getInt(Column_Number)))
+                             attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getInt(Column_Number)))
                          Column_Number = Column_Number + 1
 						
-                      # index the artifact for keyword search
-                      try:
-                          blackboard.indexArtifact(art)
-                      except:
-                          self.log(Level.SEVERE, "Error indexing artifact " + art.getDisplayName())
+                      poster.newArtifact(file, artID_usnj, attributes)
                         
                except SQLException as e:
                    self.log(Level.INFO, "Error getting values from Shimcache table (" + e.getMessage() + ")")
@@ -1716,8 +1458,7 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
            stmt.close()
            dbConn.close()
            # Fire an event to notify the UI and others that there are new artifacts  
-           IngestServices.getInstance().fireModuleDataEvent(
-               ModuleDataEvent(Windows_InternalsIngestModuleFactory.moduleName, artID_usnj_evt, None))
+           poster.flush()
 
            #Clean up EventLog directory and files
            os.remove(lclDbPath)
@@ -1734,11 +1475,14 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
        # Set the database to be read to the once created by the prefetch parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
 
-        # Use blackboard class to index blackboard artifacts for keyword search
-        blackboard = Case.getCurrentCase().getServices().getBlackboard()
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(Windows_InternalsIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(Windows_InternalsIngestModuleFactory.moduleName)
 
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "WebcacheV01.dat")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "WebcacheV01.dat"))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -1762,11 +1506,10 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
             #self.log(Level.INFO, "Processing file: " + file.getName())
             fileCount += 1
 
-            # Save the DB locally in the temp folder. use file id as name to reduce collisions
-            lclDbPath = os.path.join(Temp_Dir, file.getName() + "-" + str(file.getId()))
+            # The program only reads the ESE database, so it reads the extraction cache copy
+            lclDbPath = self.extractionCache.getLocalPath(file)
             DbPath = os.path.join(Temp_Dir, file.getName() + "-" + str(file.getId()) + ".db3")
             self.log(Level.INFO, file.getName() + ' ==> ' + str(file.getId()) + ' ==> ' + file.getUniquePath()) 
-            ContentUtils.writeToFile(file, File(lclDbPath))
                         
             # Run the EXE, saving output to a sqlite database
             self.log(Level.INFO, "Running program on data source parm 1 ==> " + lclDbPath + "  Parm 2 ==> " + DbPath)
@@ -1807,13 +1550,7 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
                    SQL_String_2 = "PRAGMA table_info('All_Containers')"
                    artifact_name = "TSK_WC_" + container_name.upper()
                    artifact_desc = "WebcacheV01 " + container_name.upper()
-                   try:
-                        self.log(Level.INFO, "Begin Create New Artifacts")
-                        artID_web = skCase.addArtifactType( artifact_name, artifact_desc)
-                   except:		
-                        self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-                   artID_web = skCase.getArtifactTypeID(artifact_name)
-                   artID_web_evt = skCase.getArtifactType(artifact_name)
+                   artID_web = registry.getOrAddArtifactType( artifact_name, artifact_desc).getTypeID()
 				   
                    Column_Names = []
                    Column_Types = []
@@ -1822,46 +1559,32 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
                       Column_Names.append(resultSet2.getString("name").upper())
                       Column_Types.append(resultSet2.getString("type").upper())
                       if resultSet2.getString("type").upper() == "TEXT":
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute. TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                          except:		
-                               self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
+                          attID_ex1 = registry.getOrAddAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute. TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
                       elif resultSet2.getString("type").upper() == "":
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
+                          attID_ex1 = registry.getOrAddAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
                       else:
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
+                          attID_ex1 = registry.getOrAddAttributeType("TSK_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
 
 										 
                    resultSet3 = stmt.executeQuery(SQL_String_1)
                    while resultSet3.next():
-                      art = file.newArtifact(artID_web)
+                      attributes = []
                       Column_Number = 1
                       for col_name in Column_Names:
                          c_name = "TSK_" + col_name
                          attID_ex1 = skCase.getAttrTypeID(c_name)
-                         attID_ex1 = skCase.getAttributeType(c_name)
+                         attID_ex1 = registry.getAttributeType(c_name)
                          if Column_Types[Column_Number - 1] == "TEXT":
-                             art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
+                             attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
                          elif Column_Types[Column_Number - 1] == "":
-                              art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
+                              attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
                          else:
-                             art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, long(resultSet3.getInt(Column_Number))))
+                             attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, long(resultSet3.getInt(Column_Number))))
                          Column_Number = Column_Number + 1
                          
-                      # index the artifact for keyword search
-                      try:
-                          blackboard.indexArtifact(art)
-                      except:
-                          self.log(Level.SEVERE, "Error indexing artifact " + art.getDisplayName())
+                      poster.newArtifact(file, artID_web, attributes)
    
-                   IngestServices.getInstance().fireModuleDataEvent(
-                             ModuleDataEvent(Windows_InternalsIngestModuleFactory.moduleName, artID_web_evt, None))						
+                   poster.flush()
                except SQLException as e:
                    self.log(Level.INFO, "Error getting values from contacts table (" + e.getMessage() + ")")
 
@@ -1886,11 +1609,14 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
         # Set the database to be read to the once created by the SAM parser program
         skCase = Case.getCurrentCase().getSleuthkitCase();
 
-        # Use blackboard class to index blackboard artifacts for keyword search
-        blackboard = Case.getCurrentCase().getServices().getBlackboard()
+        # Look up the artifact and attribute types once for the whole job
+        registry = TypeRegistry(Windows_InternalsIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        poster = BlackboardPoster(Windows_InternalsIngestModuleFactory.moduleName)
 
         fileManager = Case.getCurrentCase().getServices().getFileManager()
-        files = fileManager.findFiles(dataSource, "ntuser.dat", "")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "ntuser.dat", ""))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
         progressBar.switchToDeterminate(numFiles)
@@ -1912,15 +1638,14 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
            #self.log(Level.INFO, "Processing file: " + file.getName())
            fileCount += 1
 
-           # Save the DB locally in the temp folder. use file id as name to reduce collisions
-           lclDbPath = os.path.join(Temp_Dir, file.getName())
-           ContentUtils.writeToFile(file, File(lclDbPath))
+           # The program only reads the hive, so it reads the extraction cache copy
+           lclDbPath = self.extractionCache.getLocalPath(file)
            self.log(Level.INFO, "Saved File ==> " + lclDbPath)
 
            # Run the EXE, saving output to a sqlite database
-           self.log(Level.INFO, "Running program ==> " + self.path_to_Shellbags_file + " " + os.path.join(Temp_Dir, file.getName()) + " " + \
+           self.log(Level.INFO, "Running program ==> " + self.path_to_Shellbags_file + " " + lclDbPath + " " + \
                     os.path.join(Temp_Dir, "shellbag_db.db3") + " " + file.getUniquePath())
-           pipe = Popen([self.path_to_Shellbags_file, os.path.join(Temp_Dir, file.getName()), os.path.join(Temp_Dir, "Shellbag_db.db3", file.getUniquePath())], stdout=PIPE, stderr=PIPE)
+           pipe = Popen([self.path_to_Shellbags_file, lclDbPath, os.path.join(Temp_Dir, "Shellbag_db.db3", file.getUniquePath())], stdout=PIPE, stderr=PIPE)
            out_text = pipe.communicate()[0]
            self.log(Level.INFO, "Output from run is ==> " + out_text)               
                
@@ -1944,14 +1669,7 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
                self.log(Level.INFO, "Error querying database for system table (" + e.getMessage() + ")")
                return IngestModule.ProcessResult.OK
 
-           try:
-                self.log(Level.INFO, "Begin Create New Artifacts")
-                artID_shell = skCase.addArtifactType("TSK_SHELLBAGS", "Shellbags")
-           except:		
-                self.log(Level.INFO, "Artifacts Creation Error, some artifacts may not exist now. ==> ")
-
-           artID_shell = skCase.getArtifactTypeID("TSK_SHELLBAGS")
-           artID_shell_evt = skCase.getArtifactType("TSK_SHELLBAGS")
+           artID_shell = registry.getOrAddArtifactType("TSK_SHELLBAGS", "Shellbags").getTypeID()
              
              
            # Cycle through each row and create artifacts
@@ -1969,34 +1687,24 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
                       Column_Names.append(resultSet2.getString("name").upper())
                       Column_Types.append(resultSet2.getString("type"))
                       if resultSet2.getString("type").upper() == "TEXT":
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_SHELLBAG_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
+                          attID_ex1 = registry.getOrAddAttributeType("TSK_SHELLBAG_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, resultSet2.getString("name"))
                       else:
-                          try:
-                              attID_ex1 = skCase.addArtifactAttributeType("TSK_SHELLBAG_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
-                          except:		
-                              self.log(Level.INFO, "Attributes Creation Error, " + resultSet2.getString("name") + " ==> ")
+                          attID_ex1 = registry.getOrAddAttributeType("TSK_SHELLBAG_" + resultSet2.getString("name").upper(), BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, resultSet2.getString("name"))
 										 
                    resultSet3 = stmt.executeQuery(SQL_String_1)
                    while resultSet3.next():
-                      art = file.newArtifact(artID_shell)
+                      attributes = []
                       Column_Number = 1
                       for col_name in Column_Names:
                          c_name = "TSK_SHELLBAG_" + col_name
-                         attID_ex1 = skCase.getAttributeType(c_name)
+                         attID_ex1 = registry.getAttributeType(c_name)
                          if Column_Types[Column_Number - 1] == "TEXT":
-                             art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
+                             attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getString(Column_Number)))
                          else:
-                             art.addAttribute(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getInt(Column_Number)))
+                             attributes.append(BlackboardAttribute(attID_ex1, Windows_InternalsIngestModuleFactory.moduleName, resultSet3.getInt(Column_Number)))
                          Column_Number = Column_Number + 1
 						
-                      # index the artifact for keyword search
-                      try:
-                          blackboard.indexArtifact(art)
-                      except:
-                          self.log(Level.SEVERE, "Error indexing artifact " + art.getDisplayName())
+                      poster.newArtifact(file, artID_shell, attributes)
             
                except SQLException as e:
                    self.log(Level.INFO, "Error getting values from Shellbag table (" + e.getMessage() + ")")
@@ -2005,16 +1713,10 @@ class Windows_InternalsIngestModule(DataSourceIngestModule):
            stmt.close()
            dbConn.close()
            # Fire an event to notify the UI and others that there are new artifacts  
-           IngestServices.getInstance().fireModuleDataEvent(
-               ModuleDataEvent(Windows_InternalsIngestModuleFactory.moduleName, artID_shell_evt, None))
+           poster.flush()
 
 		#Clean up EventLog directory and files
            #os.remove(lclDbPath)
-           for file in files:
-              try:
-			     os.remove(os.path.join(Temp_Dir, file.getName()))
-              except:
-			     self.log(Level.INFO, "removal of shellbag file failed " + Temp_Dir + "\\" + file.getName())
         try:
             os.remove(os.path.join(Temp_Dir, "Shellbag_db.db3"))
             shutil.rmtree(Temp_Dir)		
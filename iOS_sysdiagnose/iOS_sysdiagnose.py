@@ -73,6 +73,11 @@ from org.sleuthkit.datamodel import Relationship
 from org.sleuthkit.datamodel import Account
 from org.sleuthkit.datamodel import TskCoreException
 
+from Blackboard_Poster import BlackboardPoster
+from Type_Registry import TypeRegistry
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 
 # Factory that defines the name and details of the module and allows Autopsy
@@ -116,6 +121,8 @@ class ProcessiOSSysdiagnoseIngestModule(DataSourceIngestModule):
 
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(ProcessiOSSysdiagnoseIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(ProcessiOSSysdiagnoseIngestModuleFactory.moduleName, ProcessiOSSysdiagnoseIngestModuleFactory().getModuleVersionNumber())
         self.executablePrograms = self.checkExecutables()
 
         pass
@@ -143,6 +150,13 @@ class ProcessiOSSysdiagnoseIngestModule(DataSourceIngestModule):
 
         # Get the current case and a file manager
         self.skCase = Case.getCurrentCase().getSleuthkitCase();
+
+        # Look up the artifact and attribute types once for the whole job
+        self.registry = TypeRegistry(ProcessiOSSysdiagnoseIngestModuleFactory.moduleName)
+
+        # Post the artifacts to the blackboard in batches for keyword search
+        self.poster = BlackboardPoster(ProcessiOSSysdiagnoseIngestModuleFactory.moduleName)
+
         fileManager = Case.getCurrentCase().getServices().getFileManager()
         
         for executableProgram in self.executablePrograms:
@@ -232,10 +246,15 @@ class ProcessiOSSysdiagnoseIngestModule(DataSourceIngestModule):
                             self.executeProgram(executableProgram, os.path.join(temporaryDirectory, str(abstractFile.getId()) + "-" + abstractFile.getName()), os.path.join(moduleDirectory, abstractFile.getName() + '.out'))
                             self.processOutput( os.path.join(moduleDirectory, abstractFile.getName() + '.out'), 'IOS_APPUPDATES', "iOS sysdiagnose Update Info", abstractFile)
 
+        self.poster.flush()
+
         # After all databases, post a message to the ingest messages in box.
         message = IngestMessage.createMessage(IngestMessage.MessageType.DATA, "iOS sysdiagnose", " iOS sysdiagnose Has Been Analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 		               
     def checkExecutables(self):
@@ -267,7 +286,7 @@ class ProcessiOSSysdiagnoseIngestModule(DataSourceIngestModule):
                
     def extractFile(self, fileName, temporaryDirectory, fileManager, dataSource):
 
-        files = fileManager.findFiles(dataSource, fileName)
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, fileName))
         numFiles = len(files)
         self.log(Level.INFO, "found " + str(numFiles) + " files")
 
@@ -282,7 +301,7 @@ class ProcessiOSSysdiagnoseIngestModule(DataSourceIngestModule):
                 if (not ('PaxHeader' in file.getParentPath())):
                     #self.log(Level.INFO, "Writing file ==> " + file.getName())
                     extractedFile = os.path.join(temporaryDirectory, str(file.getId()) + "-" + file.getName())
-                    ContentUtils.writeToFile(file, File(extractedFile))
+                    self.extractionCache.linkTo(file, extractedFile)
                     fileList.append(file)
             except:
                 self.log(Level.INFO, "Error writing File " + os.path.join(temporaryDirectory, file.getName()))
@@ -364,18 +383,11 @@ class ProcessiOSSysdiagnoseIngestModule(DataSourceIngestModule):
 
     def createArtifact(self, artifactName, artifactDescription):
 
-        try:
-            artifactId = self.skCase.addArtifactType( artifactName, artifactDescription)
-        except:
-           pass
-#           self.log(Level.INFO, "Artifact " + artifactName + "Already Exists ")
-        
-        return self.skCase.getArtifactTypeID(artifactName)    
+        return self.registry.getOrAddArtifactType(artifactName, artifactDescription).getTypeID()
                 
     def processAttributes(self, attributeList, abstractFile, artifactId):
     
         attributes = []
-        artifact = abstractFile.newArtifact(artifactId)
         attributeName = attributeList.keys()
         for name in attributeName:
             attributeType = self.checkDataType(attributeList[name])
@@ -383,30 +395,13 @@ class ProcessiOSSysdiagnoseIngestModule(DataSourceIngestModule):
             attributeId = self.createAttribute(attributeType, name)
             attributes.append(BlackboardAttribute(attributeId, ProcessiOSSysdiagnoseIngestModuleFactory.moduleName, attributeList[name]))
             
-        artifact.addAttributes(attributes)
+        self.poster.newArtifact(abstractFile, artifactId, attributes)
 
     def createAttribute(self, attributeType, attributeName):            
           if (attributeType == "STRING"):
-              try:
-                  attID = self.skCase.addArtifactAttributeType("IOS_" + attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, attributeName)
-#                  self.log(Level.INFO, "attribure id for " + "TSK_" + attributeName + " is STRING")
-                  return self.skCase.getAttributeType("IOS_" + attributeName)
-              except:		
-                  return self.skCase.getAttributeType("IOS_" + attributeName)
-          elif (attributeType == "LONG"):
-              try:
-                  attID = self.skCase.addArtifactAttributeType("IOS_" + attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, long(attributeName))
-  #                self.log(Level.INFO, "attribure id for " + "TSK_" + attributeName + " is LONG")
-                  return self.skCase.getAttributeType("IOS_" + attributeName)
-              except:		
-                  return self.skCase.getAttributeType("IOS_" + attributeName)
+              return self.registry.getOrAddAttributeType("IOS_" + attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, attributeName)
           else:
-              try:
-                  attID = self.skCase.addArtifactAttributeType("IOS_" + attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, attributeName)
- #                 self.log(Level.INFO, "attribure id for " + "TSK_" + attributeName + " is DATETIME")
-                  return self.skCase.getAttributeType("IOS_" + attributeName)
-              except:		
-                  return self.skCase.getAttributeType("IOS_" + attributeName)
+              return self.registry.getOrAddAttributeType("IOS_" + attributeName, BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG, attributeName)
 
 
     def checkDataType(self, attributeData):
@@ -68,6 +68,9 @@ from org.sleuthkit.autopsy.datamodel import ContentUtils
 from org.sleuthkit.autopsy.casemodule import AddLocalFilesTask
 from org.sleuthkit.autopsy.casemodule.services.FileManager import FileAddProgressUpdater
 
+from Extraction_Cache import ExtractionCache
+from Ingest_Ledger import IngestLedger
+
 
 # Factory that defines the name and details of the module and allows Autopsy
 # to create instances of the modules that will do the analysis.
@@ -110,6 +113,8 @@ class iTunesBackupIngestModule(DataSourceIngestModule):
     # Where any setup and configuration is done
     def startUp(self, context):
         self.context = context
+        self.extractionCache = ExtractionCache(iTunesBackupIngestModuleFactory.moduleName, self.context)
+        self.ledger = IngestLedger(iTunesBackupIngestModuleFactory.moduleName, iTunesBackupIngestModuleFactory().getModuleVersionNumber())
         
     # Where the analysis is done.
     def process(self, dataSource, progressBar):
@@ -136,7 +141,7 @@ class iTunesBackupIngestModule(DataSourceIngestModule):
         except:
 		    self.log(Level.INFO, "iTunes Directory already exists " + modDir)
 
-        files = fileManager.findFiles(dataSource, "Manifest.db", "Apple Computer/MobileSync/Backup/")
+        files = self.ledger.unprocessed(fileManager.findFiles(dataSource, "Manifest.db", "Apple Computer/MobileSync/Backup/"))
         numFiles = len(files)
         self.log(Level.INFO, "Number of Manifestdb Files found ==> " + str(numFiles))
         
@@ -160,7 +165,7 @@ class iTunesBackupIngestModule(DataSourceIngestModule):
 
                 # Save the DB locally in the temp folder. use file id as name to reduce collisions
                 lclDbPath = os.path.join(tempDir, str(file.getId()) + "-" + file.getName())
-                ContentUtils.writeToFile(file, File(lclDbPath))
+                self.extractionCache.copyTo(file, lclDbPath)
                 # Process the SAM Registry File getting the Username and RID
                 dbConnection = self.connnectToManifestDb(lclDbPath)
                 fileInfo = self.processManifestDb(dbConnection, os.path.join(modDir, backupDir))
@@ -178,6 +183,9 @@ class iTunesBackupIngestModule(DataSourceIngestModule):
             "ItunesBackup", " Itunes Backup has been analyzed " )
         IngestServices.getInstance().postMessage(message)
 
+        # Remember what was processed so the next run skips it
+        self.ledger.commit()
+
         return IngestModule.ProcessResult.OK                
 
     def addBackupFilesToDataSource(self, dataSource, modDir):